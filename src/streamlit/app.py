@@ -5,6 +5,8 @@ import streamlit as st
 from config import APP_CONFIG, MODEL_CONFIG, ASSETS_DIR
 from utils.ui_utils import load_css
 from utils.category_mapping import get_all_categories
+from utils.prediction_cache import CachedClassifier
+from utils.warmup import start_warmup, get_warmed_classifier
 
 # Configuration
 st.set_page_config(
@@ -16,10 +18,15 @@ st.set_page_config(
 
 load_css(ASSETS_DIR / "style.css")
 
+# Préchauffage des modèles en arrière-plan (partagé par toutes les sessions)
+warmup = start_warmup()
+
 # Session state
 if "classifier" not in st.session_state:
-    from utils.mock_classifier import DemoClassifier
-    st.session_state.classifier = DemoClassifier()
+    classifier = get_warmed_classifier()
+    if classifier is not None:
+        # Même enveloppe que la page Démo: cache de prédictions partagé
+        st.session_state.classifier = CachedClassifier(classifier)
 if "use_mock" not in st.session_state:
     st.session_state.use_mock = MODEL_CONFIG["use_mock"]
 
@@ -101,3 +108,5 @@ with st.sidebar:
         st.warning("Mode Démo")
     else:
         st.success("Production")
+    if not warmup.is_ready:
+        st.caption("Préchauffage des modèles...")
@@ -0,0 +1,18 @@
+"""
+Mesures de performance du code de l'application (hors chemin de service).
+
+Les fonctions de benchmark sont tenues à l'écart de utils/ pour que les
+modules chargés par l'application restent limités au code de service.
+Chaque module retourne des lignes (dicts) prêtes pour un DataFrame:
+
+- batching: débit et latence du MicroBatcher selon la taille de lot
+- image_loader: débit du chargement parallèle selon le nombre de processus
+- image_processing: décodage JPEG complet ou réduit, coût et écart des
+  niveaux de rééchantillonnage, validation sur en-tête ou après décodage
+
+Usage:
+    import pandas as pd
+    from benchmarks.batching import benchmark_batching
+
+    print(pd.DataFrame(benchmark_batching(DemoClassifier(), texts)))
+"""
@@ -0,0 +1,66 @@
+"""
+Benchmark du regroupement en micro-lots (utils/batching.py).
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.batching import MicroBatcher
+from utils.model_interface import BaseClassifier
+
+
+def benchmark_batching(
+    classifier: BaseClassifier,
+    texts: Sequence[str],
+    batch_sizes: Sequence[int] = (1, 4, 16, 64),
+    n_requests: int = 512,
+    concurrency: int = 64,
+    max_wait_ms: float = 5.0
+) -> List[Dict[str, float]]:
+    """
+    Mesure débit et latence du MicroBatcher pour plusieurs tailles de lot.
+
+    Pour chaque taille, `concurrency` threads clients envoient au total
+    `n_requests` prédictions unitaires à travers un MicroBatcher.
+
+    Args:
+        classifier: Classifieur à mesurer
+        texts: Textes envoyés (réutilisés en boucle)
+        batch_sizes: Tailles maximales de lot à comparer
+        n_requests: Nombre total de prédictions par mesure
+        concurrency: Nombre de clients simultanés
+        max_wait_ms: Attente maximale avant envoi d'un lot incomplet
+
+    Returns:
+        Une ligne par taille de lot: max_batch_size, throughput_rps,
+        latency_p50_ms, latency_p95_ms, latency_p99_ms, avg_batch_size
+    """
+    rows = []
+    for max_batch_size in batch_sizes:
+        batcher = MicroBatcher(classifier, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+        def _timed_request(i: int) -> float:
+            start = time.perf_counter()
+            batcher.predict(text=texts[i % len(texts)])
+            return (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as clients:
+            latencies = np.array(list(clients.map(_timed_request, range(n_requests))))
+        elapsed = time.perf_counter() - start
+        batcher.close()
+
+        rows.append({
+            "max_batch_size": max_batch_size,
+            "throughput_rps": n_requests / elapsed,
+            "latency_p50_ms": float(np.percentile(latencies, 50)),
+            "latency_p95_ms": float(np.percentile(latencies, 95)),
+            "latency_p99_ms": float(np.percentile(latencies, 99)),
+            "avg_batch_size": batcher.get_stats()["avg_batch_size"],
+        })
+    return rows
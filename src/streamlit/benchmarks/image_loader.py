@@ -0,0 +1,47 @@
+"""
+Benchmark du chargement parallèle des images (utils/image_loader.py).
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.image_loader import ImageKey, ParallelImageLoader
+
+
+def benchmark_image_loader(
+    pairs: Sequence[ImageKey],
+    images_dir: Optional[Path] = None,
+    worker_counts: Sequence[int] = (1, 2, 4, 8),
+    batch_size: Optional[int] = None
+) -> List[Dict[str, float]]:
+    """
+    Mesure le débit du chargement pour plusieurs nombres de processus.
+
+    Args:
+        pairs: Couples (imageid, productid) chargés à chaque mesure
+        images_dir: Dossier des images. Par défaut: IMAGES_TRAIN_DIR
+        worker_counts: Nombres de processus à comparer (0 = séquentiel)
+        batch_size: Images par lot. Par défaut: IMAGE_CONFIG["loader_batch_size"]
+
+    Returns:
+        Une ligne par nombre de processus: max_workers, images_per_s, elapsed_s
+    """
+    rows = []
+    for max_workers in worker_counts:
+        with ParallelImageLoader(
+            images_dir=images_dir, batch_size=batch_size, max_workers=max_workers
+        ) as loader:
+            # Démarrage du pool hors mesure
+            loader.load(pairs[:1])
+            start = time.perf_counter()
+            n_images = sum(len(batch) for batch in loader.iter_batches(pairs, ordered=False))
+            elapsed = time.perf_counter() - start
+
+        rows.append({
+            "max_workers": max_workers,
+            "images_per_s": n_images / elapsed if elapsed > 0 else float("inf"),
+            "elapsed_s": elapsed,
+        })
+    return rows
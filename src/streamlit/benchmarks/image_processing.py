@@ -0,0 +1,179 @@
+"""
+Benchmarks du traitement d'images (utils/image_utils.py).
+"""
+import io
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import IMAGE_CONFIG
+from utils.image_utils import (
+    RESAMPLING_TIERS,
+    load_image_from_upload,
+    resize_image,
+    validate_image,
+    validate_image_upload,
+)
+
+
+def _decode(payload: bytes, draft_size: Optional[Tuple[int, int]]) -> Image.Image:
+    """Décode en RGB, réduit ou non quel que soit IMAGE_CONFIG["jpeg_draft_decode"]."""
+    image = Image.open(io.BytesIO(payload))
+    if draft_size is not None:
+        image.draft("RGB", draft_size)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return image
+
+
+def benchmark_image_decoding(
+    payloads: Sequence[bytes],
+    target_size: Optional[Tuple[int, int]] = None,
+    repeats: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    Compare décodage complet et décodage JPEG réduit sur des fichiers encodés.
+
+    Chaque mesure couvre le décodage puis le redimensionnement avec padding
+    vers target_size, c'est-à-dire le chemin complet jusqu'à l'entrée du
+    modèle.
+
+    Args:
+        payloads: Contenus de fichiers images (ex: JPEG de plusieurs mégapixels)
+        target_size: Taille cible (width, height). Par défaut: config.IMAGE_CONFIG
+        repeats: Nombre de passages sur les payloads
+
+    Returns:
+        Une ligne par mode ("full", "draft"): mode, decode_ms (moyenne par
+        image), decoded_mb (taille moyenne des pixels décodés, soit le pic
+        mémoire du décodage), decoded_size (taille décodée de la 1re image)
+    """
+    if target_size is None:
+        target_size = IMAGE_CONFIG["target_size"]
+
+    rows = []
+    for mode, draft_size in (("full", None), ("draft", target_size)):
+        durations, decoded_bytes = [], []
+        decoded_size = None
+        for _ in range(repeats):
+            for payload in payloads:
+                start = time.perf_counter()
+                image = _decode(payload, draft_size)
+                resize_image(image, target_size)
+                durations.append((time.perf_counter() - start) * 1000)
+                decoded_bytes.append(image.width * image.height * len(image.getbands()))
+                if decoded_size is None:
+                    decoded_size = image.size
+
+        rows.append({
+            "mode": mode,
+            "decode_ms": float(np.mean(durations)),
+            "decoded_mb": float(np.mean(decoded_bytes)) / (1024 * 1024),
+            "decoded_size": decoded_size,
+        })
+    return rows
+
+
+def benchmark_resampling(
+    images: Sequence[Image.Image],
+    target_size: Optional[Tuple[int, int]] = None,
+    repeats: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    Mesure le coût de chaque niveau de rééchantillonnage et l'écart des
+    tenseurs d'entrée du modèle par rapport au niveau "best" (LANCZOS).
+
+    L'écart est mesuré sur les tenseurs uint8 (H, W, 3) produits par
+    resize_image() avec padding: la soustraction de la moyenne ImageNet
+    ne le modifie pas, c'est donc aussi l'écart en entrée de ResNet50.
+
+    Args:
+        images: Images PIL en RGB (ex: photos produits pleine résolution)
+        target_size: Taille cible (width, height). Par défaut: config.IMAGE_CONFIG
+        repeats: Nombre de passages sur les images
+
+    Returns:
+        Une ligne par niveau: quality, resize_ms (moyenne par image),
+        drift_mean (écart absolu moyen en niveaux 0-255), drift_max
+        (écart maximal) et drift_rmse
+    """
+    if target_size is None:
+        target_size = IMAGE_CONFIG["target_size"]
+
+    reference = [
+        np.asarray(resize_image(image, target_size, quality="best"), dtype=np.float32)
+        for image in images
+    ]
+    rows = []
+    for quality in RESAMPLING_TIERS:
+        durations = []
+        for _ in range(repeats):
+            for image in images:
+                start = time.perf_counter()
+                resize_image(image, target_size, quality=quality)
+                durations.append((time.perf_counter() - start) * 1000)
+
+        differences = np.stack([
+            np.asarray(resize_image(image, target_size, quality=quality), dtype=np.float32) - ref
+            for image, ref in zip(images, reference)
+        ]) if images else np.zeros(1, dtype=np.float32)
+        rows.append({
+            "quality": quality,
+            "resize_ms": float(np.mean(durations)) if durations else 0.0,
+            "drift_mean": float(np.abs(differences).mean()),
+            "drift_max": float(np.abs(differences).max()),
+            "drift_rmse": float(np.sqrt(np.mean(differences ** 2))),
+        })
+    return rows
+
+
+def benchmark_image_validation(
+    payloads: Sequence[bytes],
+    repeats: int = 3,
+    **limits
+) -> List[Dict[str, Any]]:
+    """
+    Compare le coût de la validation sur en-tête et de la validation après décodage.
+
+    Args:
+        payloads: Contenus de fichiers images (ex: uploads à rejeter)
+        repeats: Nombre de passages sur les payloads
+        **limits: Limites passées à validate_image_upload() (ex: max_pixels)
+
+    Returns:
+        Une ligne par mode ("header": validate_image_upload, "decode":
+        load_image_from_upload puis validate_image): mode, check_us (moyenne
+        par fichier, en microsecondes) et rejected (fichiers rejetés par passage)
+    """
+    def check_header(payload: bytes) -> bool:
+        return validate_image_upload(io.BytesIO(payload), **limits)[0]
+
+    def check_decoded(payload: bytes) -> bool:
+        try:
+            image = load_image_from_upload(io.BytesIO(payload))
+            # Décodage effectif (fait sinon par le premier affichage)
+            image.load()
+        except (ValueError, OSError, Image.DecompressionBombError):
+            return False
+        return validate_image(image)[0]
+
+    rows = []
+    for mode, check in (("header", check_header), ("decode", check_decoded)):
+        durations, rejected = [], 0
+        for _ in range(repeats):
+            for payload in payloads:
+                start = time.perf_counter()
+                is_valid = check(payload)
+                durations.append((time.perf_counter() - start) * 1e6)
+                rejected += not is_valid
+        rows.append({
+            "mode": mode,
+            "check_us": float(np.mean(durations)),
+            "rejected": rejected // max(repeats, 1),
+        })
+    return rows
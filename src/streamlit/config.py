@@ -17,12 +17,20 @@ DATA_DIR = PROJECT_ROOT / "data"
 RAW_DATA_DIR = DATA_DIR / "raw"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 IMAGES_DIR = RAW_DATA_DIR / "images"
+# Images d'entraînement letterboxées 224x224 uint8 (memmap .npy + index)
+IMAGE_STORE_PATH = PROCESSED_DATA_DIR / "image_train_224.npy"
+# Index des images en double (empreintes dHash 64 bits + groupes)
+DEDUP_INDEX_PATH = PROCESSED_DATA_DIR / "image_dedup_index.npz"
+# Cache disque des miniatures / aperçus (clé: empreinte du contenu + taille)
+THUMBNAIL_CACHE_DIR = DATA_DIR / "cache" / "thumbnails"
 
 # Chemins des modèles
 MODELS_DIR = PROJECT_ROOT / "models"
 IMAGE_MODEL_PATH = MODELS_DIR / "image_classifier.joblib"
 TEXT_MODEL_PATH = MODELS_DIR / "text_classifier.joblib"
 TFIDF_VECTORIZER_PATH = MODELS_DIR / "tfidf_vectorizer.joblib"
+# Bundle NumPy du pipeline texte (inférence sans sklearn)
+TEXT_MODEL_NPZ_PATH = MODELS_DIR / "text_classifier.npz"
 RESNET_EXTRACTOR_PATH = MODELS_DIR / "resnet50_extractor.h5"
 CATEGORY_MAPPING_PATH = MODELS_DIR / "category_mapping.json"
 
@@ -30,6 +38,10 @@ CATEGORY_MAPPING_PATH = MODELS_DIR / "category_mapping.json"
 IMPLEMENTATION_DIR = PROJECT_ROOT / "implementation"
 FEATURES_DIR = IMPLEMENTATION_DIR / "outputs"
 METADATA_PATH = FEATURES_DIR / "metadata_augmented.json"
+# Conversion colonne par colonne de metadata_augmented.json (une clé .npz par champ)
+METADATA_COLUMNS_PATH = FEATURES_DIR / "metadata_columns.npz"
+# Features CNN en float16 mappées en mémoire (<nom>.f16.npy + <nom>.ids.npy)
+FEATURE_STORE_DIR = FEATURES_DIR / "feature_store"
 
 # Chemins des assets Streamlit
 STREAMLIT_DIR = Path(__file__).parent
@@ -61,6 +73,30 @@ MODEL_CONFIG = {
 
     # Seuil de confiance minimum pour affichage
     "confidence_threshold": 0.1,
+
+    # Budget mémoire (MB) des modèles chargés simultanément (None = illimité)
+    "memory_budget_mb": 4096,
+
+    # Micro-batching: taille max d'un lot et attente max avant envoi (ms)
+    "batch_max_size": 32,
+    "batch_max_wait_ms": 5.0,
+
+    # Cache de prédictions partagé: nombre max d'entrées et durée de vie (s)
+    "prediction_cache_size": 1024,
+    "prediction_cache_ttl_s": 3600,
+
+    # Échéance (ms) d'une prédiction multimodale (None = pas d'échéance)
+    "prediction_deadline_ms": 2000,
+
+    # Branches multimodales en cours (abandonnées comprises) pour tout le
+    # processus: au-delà, une branche est refusée au lieu d'être mise en file
+    "fusion_max_workers": 16,
+
+    # Threads du pool partagé par les comparaisons multi-modèles (page Modèles)
+    "comparison_max_workers": 8,
+
+    # Mocks: simuler latence et mémoire des ModelConfig (benchmarks de charge)
+    "simulate_model_cost": False,
 }
 
 # =============================================================================
@@ -75,6 +111,42 @@ IMAGE_CONFIG = {
 
     # Taille max en MB
     "max_size_mb": 10,
+
+    # Dimensions acceptées (côté min/max en pixels) et nombre max de pixels,
+    # vérifiés sur l'en-tête avant tout décodage (garde anti "decompression
+    # bomb": 40 Mpx = ~115 MB une fois décodé en RGB)
+    "min_image_side": 32,
+    "max_image_side": 10000,
+    "max_image_pixels": 40_000_000,
+
+    # Qualité du rééchantillonnage ("fast", "balanced", "best", voir
+    # image_utils.RESAMPLING_TIERS): rapide pour les entrées du modèle
+    # (extraction de features en masse), LANCZOS pour l'affichage
+    "resample_quality": "fast",
+    "display_resample_quality": "best",
+
+    # Décodage JPEG réduit (draft 1/2, 1/4, 1/8) avant le redimensionnement
+    # vers target_size, pour les images destinées au modèle
+    "jpeg_draft_decode": True,
+
+    # Chargement parallèle des images du dataset: images par lot, lots
+    # préchargés au maximum, processus (None = nombre de coeurs)
+    "loader_batch_size": 64,
+    "loader_prefetch_batches": 4,
+    "loader_max_workers": None,
+
+    # Dédoublonnage: distance de Hamming max entre dHash de deux images
+    # considérées comme identiques (recompression, redimensionnement)
+    "dedup_hamming_radius": 3,
+    # Bits à 1 (et à 0) minimum d'un dHash pour le regrouper: en dessous
+    # (fond blanc uni, image quasi unie), l'empreinte ne distingue plus les produits
+    "dedup_min_hash_bits": 8,
+
+    # Cache des miniatures: entrées en mémoire, taille max du cache disque (MB)
+    "thumbnail_cache_entries": 256,
+    "thumbnail_cache_disk_mb": 200,
+    # Taille des aperçus affichés par la page Démo (2x la largeur affichée)
+    "preview_size": (400, 400),
 }
 
 # =============================================================================
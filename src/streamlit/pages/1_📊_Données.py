@@ -19,6 +19,7 @@ from utils.data_loader import (
     get_dataset_summary,
     load_training_data
 )
+from utils.image_store import get_shared_image_store
 from utils.ui_utils import load_css
 
 st.set_page_config(
@@ -111,10 +112,15 @@ selected = st.selectbox("Catégorie", categories_list, format_func=lambda x: x[0
 
 X_train, Y_train = load_training_data()
 samples = get_sample_products(X_train, Y_train, category_code=selected[1], n_samples=3)
+# Images pré-décodées (memmap), si le store a été construit
+image_store = get_shared_image_store()
 
 if len(samples) > 0:
     for _, row in samples.iterrows():
         with st.expander(f"{row['designation'][:60]}..."):
+            key = (row.get('productid'), row.get('imageid'))
+            if image_store is not None and key in image_store:
+                st.image(image_store.get(*key), width=224)
             st.write(f"**Désignation:** {row['designation']}")
             desc = row.get('description', '')
             if pd.notna(desc) and str(desc).strip():
@@ -9,7 +9,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config import APP_CONFIG, ASSETS_DIR
+from config import APP_CONFIG, ASSETS_DIR, IMAGE_CONFIG
 from utils.mock_classifier import (
     MultiModelClassifier,
     TEXT_MODELS,
@@ -17,10 +17,14 @@ from utils.mock_classifier import (
     get_available_text_models,
     get_available_image_models,
 )
+from utils.agreement_analytics import collect_probability_tensor, compute_agreement
 from utils.category_mapping import get_category_info
-from utils.image_utils import load_image_from_upload, validate_image
+from utils.data_loader import load_training_data, get_sample_products
+from utils.image_utils import load_image_for_model, validate_image_upload
 from utils.preprocessing import preprocess_product_text
+from utils.thumbnail_cache import get_shared_thumbnail_cache
 from utils.ui_utils import load_css
+from utils.warmup import start_warmup
 
 st.set_page_config(
     page_title=f"Modèles - {APP_CONFIG['title']}",
@@ -30,13 +34,18 @@ st.set_page_config(
 
 load_css(ASSETS_DIR / "style.css")
 
+@st.cache_resource
+def get_multi_model_classifier():
+    # Un seul comparateur par processus, sur le registre partagé préchauffé
+    return MultiModelClassifier(registry=start_warmup().registry)
+
 # Session state
-if "multi_model_classifier" not in st.session_state:
-    st.session_state.multi_model_classifier = MultiModelClassifier()
 if "model_comparison_results" not in st.session_state:
     st.session_state.model_comparison_results = None
 if "comparison_mode" not in st.session_state:
     st.session_state.comparison_mode = "text"
+if "dataset_agreement" not in st.session_state:
+    st.session_state.dataset_agreement = None
 
 # Header
 st.title("Comparaison des Modèles")
@@ -50,12 +59,14 @@ with col1:
                  type="primary" if st.session_state.comparison_mode == "text" else "secondary"):
         st.session_state.comparison_mode = "text"
         st.session_state.model_comparison_results = None
+        st.session_state.dataset_agreement = None
         st.rerun()
 with col2:
     if st.button("Modèles Image", use_container_width=True,
                  type="primary" if st.session_state.comparison_mode == "image" else "secondary"):
         st.session_state.comparison_mode = "image"
         st.session_state.model_comparison_results = None
+        st.session_state.dataset_agreement = None
         st.rerun()
 
 # Modèles disponibles
@@ -89,30 +100,40 @@ if st.session_state.comparison_mode == "text":
         else:
             with st.spinner("Analyse..."):
                 full_text = preprocess_product_text(designation, description)
-                results = st.session_state.multi_model_classifier.predict_all_text_models(full_text)
-                metrics = st.session_state.multi_model_classifier.get_comparison_metrics(results)
+                multi = get_multi_model_classifier()
+                results = multi.predict_all_text_models(full_text)
+                metrics = multi.get_comparison_metrics(results)
                 st.session_state.model_comparison_results = {
                     "results": results, "metrics": metrics, "mode": "text"
                 }
 else:
     uploaded_file = st.file_uploader("Image", type=["jpg", "jpeg", "png", "webp"])
-    compare_image = None
+    preview = None
     if uploaded_file:
-        compare_image = load_image_from_upload(uploaded_file)
-        is_valid, msg = validate_image(compare_image)
+        # En-tête vérifié avant décodage (taille, format, dimensions)
+        is_valid, msg = validate_image_upload(uploaded_file)
         if is_valid:
-            st.image(compare_image, width=200)
+            try:
+                preview = get_shared_thumbnail_cache().get_upload_thumbnail(
+                    uploaded_file, IMAGE_CONFIG["preview_size"]
+                )
+            except ValueError as e:
+                msg = str(e)
+        if preview is not None:
+            st.image(preview, width=200)
         else:
             st.error(msg)
-            compare_image = None
 
     if st.button("Comparer", type="primary", use_container_width=True):
-        if compare_image is None:
+        if preview is None:
             st.error("Veuillez uploader une image.")
         else:
             with st.spinner("Analyse..."):
-                results = st.session_state.multi_model_classifier.predict_all_image_models(compare_image)
-                metrics = st.session_state.multi_model_classifier.get_comparison_metrics(results)
+                # Décodage réduit à la taille du modèle, uniquement à la comparaison
+                compare_image = load_image_for_model(uploaded_file)
+                multi = get_multi_model_classifier()
+                results = multi.predict_all_image_models(compare_image)
+                metrics = multi.get_comparison_metrics(results)
                 st.session_state.model_comparison_results = {
                     "results": results, "metrics": metrics, "mode": "image"
                 }
@@ -149,6 +170,8 @@ if st.session_state.model_comparison_results:
             st.markdown(f"**{config.short_name}**: {cat_emoji} {cat_name}")
         with col3:
             st.markdown(f"**{result.confidence*100:.1f}%**")
+            if result.latency_ms is not None:
+                st.caption(f"{result.latency_ms:.1f} ms")
 
     # Bar chart
     st.divider()
@@ -163,6 +186,63 @@ if st.session_state.model_comparison_results:
     fig.update_layout(height=200, showlegend=False, coloraxis_showscale=False)
     st.plotly_chart(fig, use_container_width=True)
 
+# Accord sur le dataset
+st.divider()
+st.header("Accord sur le dataset")
+st.markdown("Accord des 3 modèles texte sur un échantillon de produits, et non plus sur un seul exemple.")
+
+@st.cache_data
+def get_agreement_dataset():
+    # Lecture des CSV une fois par processus, pas à chaque rerun de la page
+    X_train, Y_train = load_training_data()
+    if X_train is not None and Y_train is not None:
+        return X_train.join(Y_train)
+    return get_sample_products(n_samples=10)
+
+dataset = get_agreement_dataset()
+n_available = len(dataset)
+n_products = st.slider(
+    "Nombre de produits", min_value=1, max_value=n_available,
+    value=min(5000, n_available),
+)
+
+if st.button("Analyser le dataset", use_container_width=True):
+    with st.spinner("Analyse..."):
+        # Échantillon aléatoire reproductible: le début du CSV n'est pas représentatif
+        sample = dataset.sample(n_products, random_state=42)
+        texts = [
+            preprocess_product_text(designation, description if isinstance(description, str) else "")
+            for designation, description in zip(sample["designation"], sample["description"])
+        ]
+        multi = get_multi_model_classifier()
+        classifiers = {model_id: multi.get_text_classifier(model_id) for model_id in TEXT_MODELS}
+        tensor = collect_probability_tensor(classifiers, texts=texts)
+        report = compute_agreement(tensor, model_ids=list(classifiers), labels=sample["prdtypecode"].tolist())
+        st.session_state.dataset_agreement = report.summary()
+
+if st.session_state.dataset_agreement:
+    summary = st.session_state.dataset_agreement
+    names = {model_id: TEXT_MODELS[model_id].short_name for model_id in summary["confidence"]}
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Produits", f"{summary['n_items']:,}".replace(",", " "))
+    col2.metric("Unanimité", f"{summary['unanimity_rate']*100:.1f}%")
+    col3.metric("Accord moyen", f"{summary['mean_agreement']*100:.1f}%")
+
+    pairwise = pd.DataFrame(summary["pairwise_agreement"]).rename(index=names, columns=names)
+    fig = px.imshow(pairwise * 100, text_auto=".1f", zmin=0, zmax=100,
+                    color_continuous_scale=['#FFE5E5', '#BF0000'])
+    fig.update_layout(height=300, coloraxis_showscale=False)
+    st.plotly_chart(fig, use_container_width=True)
+
+    confidence = pd.DataFrame(summary["confidence"]).T.rename(index=names)
+    table = confidence[["mean", "mean_when_agreeing", "mean_when_disagreeing", "consensus_agreement"]] * 100
+    table.columns = ["Confiance moy. (%)", "En accord (%)", "En désaccord (%)", "Suit le consensus (%)"]
+    if summary["accuracy"]:
+        table["Précision (%)"] = [summary["accuracy"][model_id] * 100 for model_id in summary["confidence"]]
+        st.caption(f"Précision du consensus: {summary['accuracy']['consensus']*100:.1f}%")
+    st.dataframe(table.round(1), use_container_width=True)
+
 # Sidebar
 with st.sidebar:
     st.markdown("### Modèles")
@@ -174,4 +254,5 @@ with st.sidebar:
     st.divider()
     if st.button("Réinitialiser"):
         st.session_state.model_comparison_results = None
+        st.session_state.dataset_agreement = None
         st.rerun()
@@ -9,12 +9,16 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config import APP_CONFIG, ASSETS_DIR
+from config import APP_CONFIG, ASSETS_DIR, IMAGE_CONFIG
 from utils.category_mapping import get_category_info
 from utils.mock_classifier import DemoClassifier, TEXT_MODELS, IMAGE_MODELS
-from utils.image_utils import load_image_from_upload, validate_image
+from utils.image_utils import load_image_for_model, validate_image_upload
+from utils.multimodal_classifier import MultimodalClassifier
+from utils.prediction_cache import CachedClassifier
 from utils.preprocessing import preprocess_product_text
+from utils.thumbnail_cache import get_shared_thumbnail_cache
 from utils.ui_utils import load_css
+from utils.warmup import start_warmup, get_warmed_classifier, STATUS_FAILED
 
 st.set_page_config(
     page_title=f"Démo - {APP_CONFIG['title']}",
@@ -24,9 +28,24 @@ st.set_page_config(
 
 load_css(ASSETS_DIR / "style.css")
 
+# Préchauffage partagé: les modèles sont chargés en arrière-plan
+warmup = start_warmup()
+
+# Aperçus mis en cache par contenu du fichier: un rerun ne décode pas l'upload
+thumbnails = get_shared_thumbnail_cache()
+PREVIEW_SIZE = IMAGE_CONFIG["preview_size"]
+
 # Session state
 if "classifier" not in st.session_state:
-    st.session_state.classifier = DemoClassifier()
+    classifier = get_warmed_classifier()
+    if classifier is None and warmup.status == STATUS_FAILED:
+        # Fallback: classifieur construit localement
+        classifier = DemoClassifier()
+    if classifier is not None:
+        st.session_state.classifier = classifier
+if "classifier" in st.session_state and not isinstance(st.session_state.classifier, CachedClassifier):
+    # Cache partagé: un produit déjà classé par une autre session n'est pas recalculé
+    st.session_state.classifier = CachedClassifier(st.session_state.classifier)
 if "last_result" not in st.session_state:
     st.session_state.last_result = None
 
@@ -49,8 +68,28 @@ if st.session_state.get("use_mock", True):
 
 st.divider()
 
+if "classifier" not in st.session_state:
+    st.info("Préchauffage des modèles en cours...")
+    st.progress(warmup.progress)
+    if st.button("Actualiser"):
+        st.rerun()
+    st.stop()
+
+# Fusion texte + image (branches exécutées en parallèle)
+if "multimodal_classifier" not in st.session_state:
+    if warmup.is_ready:
+        # Poignées du registre: la session ne retient pas les modèles évincés
+        text_clf = warmup.registry.get_handle("camembert")
+        image_clf = warmup.registry.get_handle("resnet50_svm")
+    else:
+        text_clf = DemoClassifier(model_config=TEXT_MODELS["camembert"])
+        image_clf = DemoClassifier(model_config=IMAGE_MODELS["resnet50_svm"])
+    st.session_state.multimodal_classifier = CachedClassifier(
+        MultimodalClassifier(text_clf, image_clf)
+    )
+
 # Tabs
-tab_text, tab_image, tab_examples = st.tabs(["Texte", "Image", "Exemples"])
+tab_text, tab_image, tab_multi, tab_examples = st.tabs(["Texte", "Image", "Multimodal", "Exemples"])
 
 with tab_text:
     st.subheader("Classification par Texte")
@@ -74,19 +113,67 @@ with tab_image:
     uploaded = st.file_uploader("Image", type=["jpg", "jpeg", "png", "webp"])
 
     if uploaded:
-        image = load_image_from_upload(uploaded)
-        is_valid, msg = validate_image(image)
-
+        # En-tête vérifié avant décodage (taille, format, dimensions)
+        is_valid, msg = validate_image_upload(uploaded)
+        preview = None
         if is_valid:
-            st.image(image, width=200)
+            try:
+                preview = thumbnails.get_upload_thumbnail(uploaded, PREVIEW_SIZE)
+            except ValueError as e:
+                msg = str(e)
+
+        if preview is not None:
+            st.image(preview, width=200)
             if st.button("Classifier", key="btn_image", type="primary", use_container_width=True):
                 with st.spinner("Classification..."):
+                    # Décodage réduit à la taille du modèle, uniquement à la classification
+                    image = load_image_for_model(uploaded)
                     result = st.session_state.classifier.predict(image=image, top_k=5)
                     st.session_state.last_result = result
-                    st.session_state.last_image = image
+                    st.session_state.last_image = preview
         else:
             st.error(msg)
 
+with tab_multi:
+    st.subheader("Classification Texte + Image")
+
+    multi_designation = st.text_input("Désignation", key="multi_designation",
+                                      placeholder="Ex: Piscine gonflable ronde")
+    multi_description = st.text_area("Description (optionnel)", key="multi_description", height=80)
+    multi_uploaded = st.file_uploader("Image", type=["jpg", "jpeg", "png", "webp"], key="multi_upload")
+
+    multi_preview = None
+    if multi_uploaded:
+        is_valid, msg = validate_image_upload(multi_uploaded)
+        if is_valid:
+            try:
+                multi_preview = thumbnails.get_upload_thumbnail(multi_uploaded, PREVIEW_SIZE)
+            except ValueError as e:
+                msg = str(e)
+        if multi_preview is not None:
+            st.image(multi_preview, width=200)
+        else:
+            st.error(msg)
+
+    if st.button("Classifier", key="btn_multi", type="primary", use_container_width=True):
+        if not multi_designation.strip() or multi_preview is None:
+            st.error("Veuillez saisir une désignation et uploader une image.")
+        else:
+            with st.spinner("Classification..."):
+                text = preprocess_product_text(multi_designation, multi_description)
+                multi_image = load_image_for_model(multi_uploaded)
+                try:
+                    result = st.session_state.multimodal_classifier.predict(
+                        image=multi_image, text=text, top_k=5
+                    )
+                except TimeoutError:
+                    st.error("La classification a dépassé le délai imparti. Réessayez.")
+                else:
+                    if result.is_partial:
+                        st.warning("Délai dépassé: résultat basé sur une seule modalité.")
+                    st.session_state.last_result = result
+                    st.session_state.last_image = multi_preview
+
 with tab_examples:
     st.subheader("Exemples")
 
@@ -122,7 +209,7 @@ if st.session_state.last_result:
         st.metric("Confiance", f"{conf:.1f}%")
         st.progress(conf / 100)
 
-    # Image si disponible
+    # Aperçu de l'image analysée si disponible
     if st.session_state.get("last_image") is not None:
         st.image(st.session_state.last_image, width=150, caption="Image analysée")
 
@@ -150,6 +237,8 @@ with st.sidebar:
     st.markdown("**Modèles**")
     st.markdown("- Texte: CamemBERT")
     st.markdown("- Image: ResNet50+SVM")
+    image_w, text_w = st.session_state.multimodal_classifier.classifier.fusion_weights
+    st.markdown(f"- Fusion: image {image_w:.0%} / texte {text_w:.0%}")
 
     st.divider()
     if st.button("Réinitialiser"):
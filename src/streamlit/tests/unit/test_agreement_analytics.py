@@ -0,0 +1,203 @@
+"""
+Tests unitaires pour utils/agreement_analytics.py
+
+Ce module teste:
+- compute_agreement(): consensus, taux d'accord, matrice par paires
+- AgreementReport: statistiques de confiance, précision, résumé
+- Construction du tenseur depuis des classifieurs ou des résultats
+- Performance sur un tenseur de la taille du dataset d'entraînement
+"""
+import time
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.agreement_analytics import (
+    CATEGORY_CODES,
+    NUM_CLASSES,
+    collect_probability_tensor,
+    compute_agreement,
+    encode_labels,
+    results_to_tensor,
+)
+from utils.mock_classifier import DemoClassifier, TEXT_MODELS
+
+
+@pytest.fixture
+def product_texts(sample_product_texts):
+    """Textes produits (désignation + description)."""
+    return [f"{designation} {description}" for designation, description in sample_product_texts]
+
+
+def _one_hot_tensor(predictions, confidence=0.9):
+    """Tenseur (M, N, 27) dont la classe prédite porte `confidence`."""
+    predictions = np.asarray(predictions)
+    rest = (1.0 - confidence) / (NUM_CLASSES - 1)
+    tensor = np.full(predictions.shape + (NUM_CLASSES,), rest)
+    np.put_along_axis(tensor, predictions[:, :, None], confidence, axis=2)
+    return tensor
+
+
+# =============================================================================
+# TESTS Consensus
+# =============================================================================
+@pytest.mark.unit
+class TestComputeAgreement:
+    """Tests pour compute_agreement()."""
+
+    def test_consensus_and_ratio(self):
+        """Le consensus est la classe majoritaire, le ratio la part de votes."""
+        report = compute_agreement(_one_hot_tensor([[0, 1, 2], [0, 1, 3], [0, 4, 3]]))
+        assert report.consensus.tolist() == [0, 1, 3]
+        assert report.agreement_ratio.tolist() == pytest.approx([1.0, 2 / 3, 2 / 3])
+        assert report.unanimous.tolist() == [True, False, False]
+
+    def test_tie_broken_by_mean_probability(self):
+        """À égalité de votes, la classe de plus forte probabilité moyenne gagne."""
+        tensor = np.zeros((2, 1, NUM_CLASSES))
+        tensor[0, 0, 5], tensor[0, 0, 7] = 0.6, 0.4
+        tensor[1, 0, 7], tensor[1, 0, 5] = 0.9, 0.1
+        report = compute_agreement(tensor)
+        assert report.consensus.tolist() == [7]
+        assert report.agreement_ratio.tolist() == [0.5]
+
+    def test_pairwise_matrix(self):
+        """La matrice par paires est symétrique, de diagonale 1."""
+        report = compute_agreement(_one_hot_tensor([[0, 1, 2, 3], [0, 1, 9, 9], [0, 8, 2, 9]]))
+        pairwise = report.pairwise_agreement
+        assert pairwise.shape == (3, 3)
+        np.testing.assert_allclose(np.diag(pairwise), 1.0)
+        np.testing.assert_allclose(pairwise, pairwise.T)
+        assert pairwise[0, 1] == pytest.approx(0.5)
+        assert pairwise[1, 2] == pytest.approx(0.5)
+
+    def test_vote_histogram(self):
+        """L'histogramme compte les produits par nombre de votes du consensus."""
+        report = compute_agreement(_one_hot_tensor([[0, 1, 2], [0, 1, 3], [0, 4, 5]]))
+        assert report.vote_histogram() == {1: 1, 2: 1, 3: 1}
+
+    def test_consensus_categories(self):
+        """Les indices du consensus sont convertis en codes catégorie."""
+        report = compute_agreement(_one_hot_tensor([[2], [2]]))
+        assert report.consensus_categories.tolist() == [CATEGORY_CODES[2]]
+
+    def test_invalid_inputs_raise(self):
+        """Forme du tenseur et tailles incohérentes lèvent ValueError."""
+        with pytest.raises(ValueError):
+            compute_agreement(np.zeros((2, 3, 10)))
+        with pytest.raises(ValueError):
+            compute_agreement(np.zeros((0, 3, NUM_CLASSES)))
+        with pytest.raises(ValueError):
+            compute_agreement(_one_hot_tensor([[0], [0]]), model_ids=["a"])
+        with pytest.raises(ValueError):
+            compute_agreement(_one_hot_tensor([[0], [0]]), labels=["10", "40"])
+
+
+# =============================================================================
+# TESTS Statistiques
+# =============================================================================
+@pytest.mark.unit
+class TestAgreementReport:
+    """Tests pour les statistiques d'AgreementReport."""
+
+    def test_confidence_stats(self):
+        """Confiance moyenne globale, en accord et en désaccord."""
+        tensor = _one_hot_tensor([[0, 1], [0, 1], [0, 2]])
+        tensor[2, 1] = _one_hot_tensor([[2]], confidence=0.5)[0, 0]
+        stats = compute_agreement(tensor, model_ids=["a", "b", "c"]).confidence_stats()
+
+        assert stats["a"]["mean"] == pytest.approx(0.9)
+        assert stats["c"]["mean_when_agreeing"] == pytest.approx(0.9)
+        assert stats["c"]["mean_when_disagreeing"] == pytest.approx(0.5)
+        assert stats["c"]["consensus_agreement"] == pytest.approx(0.5)
+        assert np.isnan(stats["a"]["mean_when_disagreeing"])
+
+    def test_accuracy_with_labels(self):
+        """La précision ignore les codes inconnus."""
+        labels = [CATEGORY_CODES[0], CATEGORY_CODES[1], "inconnu"]
+        report = compute_agreement(
+            _one_hot_tensor([[0, 1, 2], [0, 3, 2]]), model_ids=["a", "b"], labels=labels
+        )
+        accuracy = report.accuracy()
+        assert accuracy["a"] == pytest.approx(1.0)
+        assert accuracy["b"] == pytest.approx(0.5)
+        assert accuracy["consensus"] == pytest.approx(1.0)
+
+    def test_accuracy_without_labels(self):
+        """Sans labels, accuracy() retourne None."""
+        assert compute_agreement(_one_hot_tensor([[0]])).accuracy() is None
+
+    def test_encode_labels_accepts_ints(self):
+        """Les codes entiers (CSV) sont reconnus."""
+        assert encode_labels([int(CATEGORY_CODES[3]), "x"]).tolist() == [3, -1]
+
+    def test_summary_keys(self):
+        """Le résumé contient les indicateurs affichés par la page Modèles."""
+        summary = compute_agreement(_one_hot_tensor([[0, 1], [0, 2]]), model_ids=["a", "b"]).summary()
+        assert summary["n_models"] == 2
+        assert summary["n_items"] == 2
+        assert summary["unanimity_rate"] == pytest.approx(0.5)
+        assert summary["pairwise_agreement"]["a"]["b"] == pytest.approx(0.5)
+        assert set(summary["confidence"]) == {"a", "b"}
+        assert summary["accuracy"] is None
+
+
+# =============================================================================
+# TESTS Construction du tenseur
+# =============================================================================
+@pytest.mark.unit
+class TestProbabilityTensor:
+    """Tests pour collect_probability_tensor() et results_to_tensor()."""
+
+    def test_collect_matches_predict(self, product_texts):
+        """Le tenseur par lots reproduit les probabilités de predict()."""
+        classifiers = {
+            model_id: DemoClassifier(model_config=config) for model_id, config in TEXT_MODELS.items()
+        }
+        tensor = collect_probability_tensor(classifiers, texts=product_texts, batch_size=2)
+
+        assert tensor.shape == (len(classifiers), len(product_texts), NUM_CLASSES)
+        for m, classifier in enumerate(classifiers.values()):
+            expected = classifier.predict(text=product_texts[0]).raw_probabilities
+            np.testing.assert_allclose(tensor[m, 0], expected, rtol=1e-6)
+
+    def test_results_to_tensor(self, product_texts):
+        """Les résultats de plusieurs modèles sont empilés dans l'ordre."""
+        classifier = DemoClassifier()
+        results = classifier.predict_batch(texts=product_texts)
+        tensor = results_to_tensor({"a": results, "b": results})
+        assert tensor.shape == (2, len(results), NUM_CLASSES)
+        np.testing.assert_allclose(tensor[1, -1], results[-1].raw_probabilities, rtol=1e-6)
+
+    def test_results_to_tensor_length_mismatch(self, product_texts):
+        """Des nombres de résultats différents lèvent ValueError."""
+        results = DemoClassifier().predict_batch(texts=product_texts)
+        with pytest.raises(ValueError):
+            results_to_tensor({"a": results, "b": results[:-1]})
+
+
+# =============================================================================
+# TESTS Performance
+# =============================================================================
+@pytest.mark.unit
+class TestAgreementPerformance:
+    """Tests de performance sur la taille du dataset d'entraînement."""
+
+    def test_full_training_set_under_one_second(self):
+        """84 916 produits x 6 modèles sont analysés en moins d'une seconde."""
+        rng = np.random.default_rng(0)
+        tensor = rng.random((6, 84916, NUM_CLASSES), dtype=np.float32)
+        tensor /= tensor.sum(axis=2, keepdims=True)
+        labels = rng.choice(CATEGORY_CODES, size=84916)
+
+        start = time.perf_counter()
+        report = compute_agreement(tensor, labels=labels)
+        report.summary()
+        elapsed = time.perf_counter() - start
+
+        assert report.n_items == 84916
+        assert elapsed < 1.0
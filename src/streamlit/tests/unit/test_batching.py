@@ -0,0 +1,196 @@
+"""
+Tests unitaires pour utils/batching.py
+
+Ce module teste:
+- BaseClassifier.predict_batch(): implémentation par défaut
+- MicroBatcher: regroupement, délai max, isolation des erreurs
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.batching import MicroBatcher
+from utils.mock_classifier import DemoClassifier
+
+
+class _RecordingClassifier(DemoClassifier):
+    """DemoClassifier qui enregistre la taille de chaque lot reçu."""
+
+    def __init__(self, fail_on: str = None):
+        super().__init__()
+        self.batch_sizes = []
+        self._fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def predict(self, image=None, text=None, top_k=5):
+        if self._fail_on is not None and text == self._fail_on:
+            raise ValueError("entrée invalide")
+        return super().predict(image=image, text=text, top_k=top_k)
+
+    def predict_batch(self, images=None, texts=None, top_k=5):
+        with self._lock:
+            self.batch_sizes.append(len(texts))
+        if self._fail_on is not None and self._fail_on in texts:
+            raise ValueError("entrée invalide")
+        return super().predict_batch(images=images, texts=texts, top_k=top_k)
+
+
+TEXTS = [f"produit numéro {i} console piscine livre" for i in range(16)]
+
+
+# =============================================================================
+# TESTS predict_batch() par défaut
+# =============================================================================
+@pytest.mark.unit
+class TestDefaultPredictBatch:
+    """Tests de BaseClassifier.predict_batch()."""
+
+    def test_matches_individual_predictions(self, demo_classifier):
+        """Chaque résultat du lot est identique à la prédiction unitaire."""
+        results = demo_classifier.predict_batch(texts=TEXTS[:4])
+        for text, result in zip(TEXTS[:4], results):
+            assert result.category == demo_classifier.predict(text=text).category
+
+    def test_mixed_inputs(self, demo_classifier, sample_image):
+        """Images et textes peuvent être mélangés, None pour une modalité absente."""
+        results = demo_classifier.predict_batch(
+            images=[sample_image, None], texts=[None, "console"]
+        )
+        assert len(results) == 2
+
+    def test_length_mismatch_raises(self, demo_classifier, sample_image):
+        """Des listes de longueurs différentes lèvent ValueError."""
+        with pytest.raises(ValueError):
+            demo_classifier.predict_batch(images=[sample_image], texts=["a", "b"])
+
+    def test_empty_batch(self, demo_classifier):
+        """Un lot vide retourne une liste vide."""
+        assert demo_classifier.predict_batch() == []
+
+
+# =============================================================================
+# TESTS MicroBatcher
+# =============================================================================
+@pytest.mark.unit
+class TestMicroBatcher:
+    """Tests du regroupement en micro-lots."""
+
+    def test_each_caller_gets_its_result(self, demo_classifier):
+        """Chaque appelant concurrent reçoit le résultat de son entrée."""
+        batcher = MicroBatcher(demo_classifier, max_batch_size=8, max_wait_ms=20)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda t: batcher.predict(text=t), TEXTS))
+        batcher.close()
+
+        for text, result in zip(TEXTS, results):
+            expected = demo_classifier.predict(text=text)
+            assert result.category == expected.category
+            assert result.confidence == pytest.approx(expected.confidence)
+
+    def test_concurrent_requests_are_coalesced(self):
+        """Des requêtes simultanées partagent un même lot."""
+        clf = _RecordingClassifier()
+        batcher = MicroBatcher(clf, max_batch_size=8, max_wait_ms=200)
+        futures = [batcher.submit(text=t) for t in TEXTS[:8]]
+        for future in futures:
+            future.result(timeout=5)
+        batcher.close()
+
+        assert clf.batch_sizes == [8]
+        assert batcher.get_stats()["avg_batch_size"] == 8
+
+    def test_max_batch_size_respected(self):
+        """Aucun lot ne dépasse max_batch_size."""
+        clf = _RecordingClassifier()
+        batcher = MicroBatcher(clf, max_batch_size=4, max_wait_ms=50)
+        futures = [batcher.submit(text=t) for t in TEXTS]
+        for future in futures:
+            future.result(timeout=5)
+        batcher.close()
+
+        assert max(clf.batch_sizes) <= 4
+        assert sum(clf.batch_sizes) == len(TEXTS)
+
+    def test_deadline_flushes_partial_batch(self):
+        """Une requête seule part après max_wait_ms sans attendre un lot plein."""
+        batcher = MicroBatcher(DemoClassifier(), max_batch_size=64, max_wait_ms=5)
+        start = time.perf_counter()
+        batcher.predict(text="console")
+        elapsed = time.perf_counter() - start
+        batcher.close()
+
+        assert elapsed < 0.5
+
+    def test_failure_is_isolated(self):
+        """Une entrée invalide n'échoue que pour son appelant."""
+        clf = _RecordingClassifier(fail_on="mauvais")
+        batcher = MicroBatcher(clf, max_batch_size=8, max_wait_ms=100)
+        good = batcher.submit(text="console")
+        bad = batcher.submit(text="mauvais")
+
+        assert good.result(timeout=5).category is not None
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+        batcher.close()
+
+    def test_different_top_k_in_same_batch(self):
+        """Chaque requête reçoit le top_k demandé."""
+        batcher = MicroBatcher(DemoClassifier(), max_batch_size=8, max_wait_ms=100)
+        f3 = batcher.submit(text="console", top_k=3)
+        f5 = batcher.submit(text="piscine", top_k=5)
+
+        assert len(f3.result(timeout=5).top_k_predictions) == 3
+        assert len(f5.result(timeout=5).top_k_predictions) == 5
+        batcher.close()
+
+    def test_closed_batcher_rejects_requests(self):
+        """Après close(), les nouvelles requêtes sont refusées."""
+        batcher = MicroBatcher(DemoClassifier())
+        batcher.close()
+        assert not batcher.is_ready
+        with pytest.raises(RuntimeError):
+            batcher.submit(text="console")
+
+    def test_cancelled_request_does_not_stop_dispatch(self):
+        """Une requête annulée est ignorée et les suivantes sont servies."""
+        clf = _RecordingClassifier()
+        batcher = MicroBatcher(clf, max_batch_size=8, max_wait_ms=100)
+        cancelled = batcher.submit(text="console")
+        assert cancelled.cancel()
+
+        assert batcher.submit(text="piscine").result(timeout=2).category is not None
+        assert batcher.submit(text="livre").result(timeout=2).category is not None
+        assert sum(clf.batch_sizes) == 2
+        batcher.close()
+
+    def test_close_racing_submit_resolves_all(self):
+        """Une requête acceptée pendant close() est toujours résolue."""
+        for _ in range(20):
+            batcher = MicroBatcher(DemoClassifier(), max_wait_ms=1)
+            accepted = []
+            start = threading.Event()
+
+            def submit_many():
+                start.wait()
+                for text in TEXTS:
+                    try:
+                        accepted.append(batcher.submit(text=text))
+                    except RuntimeError:
+                        return
+
+            threads = [threading.Thread(target=submit_many) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            start.set()
+            batcher.close()
+            for thread in threads:
+                thread.join()
+            for future in accepted:
+                assert future.result(timeout=5).category is not None
+
@@ -0,0 +1,140 @@
+"""
+Tests unitaires pour benchmarks/
+
+Ce module teste:
+- benchmark_batching(): courbes débit/latence du MicroBatcher
+- benchmark_image_loader(): débit selon le nombre de processus
+- benchmark_image_decoding(): décodage complet / réduit
+- benchmark_resampling(): coût et écart des niveaux de rééchantillonnage
+- benchmark_image_validation(): rejet sur en-tête / après décodage
+"""
+import io
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from benchmarks.batching import benchmark_batching
+from benchmarks.image_loader import benchmark_image_loader
+from benchmarks.image_processing import (
+    benchmark_image_decoding,
+    benchmark_image_validation,
+    benchmark_resampling,
+)
+from utils import image_utils
+from utils.data_loader import get_image_path
+from utils.image_utils import RESAMPLING_TIERS, load_image_from_upload
+from utils.mock_classifier import DemoClassifier
+
+
+TEXTS = [f"produit numéro {i} console piscine livre" for i in range(16)]
+
+
+@pytest.fixture(scope="module")
+def large_jpeg():
+    """JPEG 3200x2400 (photo produit de plusieurs mégapixels)."""
+    x = np.linspace(0, 255, 640)
+    y = np.linspace(0, 255, 480)[:, None]
+    array = np.stack([x + 0 * y, y + 0 * x, np.full((480, 640), 128.0)], axis=-1)
+    array[100:250, 400:550] = 20
+    buffer = io.BytesIO()
+    Image.fromarray(array.astype(np.uint8), mode="RGB").resize((3200, 2400)).save(
+        buffer, format="JPEG", quality=90
+    )
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="module")
+def images_dir(tmp_path_factory):
+    """Dossier de 8 JPEG nommés comme image_train."""
+    directory = tmp_path_factory.mktemp("image_train")
+    rng = np.random.default_rng(0)
+    for n in range(8):
+        pixels = rng.integers(0, 255, (200, 300, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(get_image_path(1000 + n, 2000 + n, directory), format="JPEG")
+    return directory
+
+
+# =============================================================================
+# TESTS benchmark_batching()
+# =============================================================================
+@pytest.mark.unit
+def test_benchmark_batching_rows():
+    """Le benchmark retourne une ligne par taille de lot."""
+    rows = benchmark_batching(
+        DemoClassifier(), TEXTS, batch_sizes=(1, 8), n_requests=32, concurrency=8
+    )
+    assert [row["max_batch_size"] for row in rows] == [1, 8]
+    for row in rows:
+        assert row["throughput_rps"] > 0
+        assert row["latency_p50_ms"] <= row["latency_p99_ms"]
+        assert 1 <= row["avg_batch_size"] <= row["max_batch_size"]
+
+
+# =============================================================================
+# TESTS benchmark_image_loader()
+# =============================================================================
+@pytest.mark.unit
+def test_benchmark_image_loader_rows(images_dir):
+    """Le benchmark retourne une ligne par nombre de processus."""
+    pairs = [(1000 + n, 2000 + n) for n in range(8)]
+    rows = benchmark_image_loader(pairs, images_dir, worker_counts=(0, 2), batch_size=4)
+    assert [row["max_workers"] for row in rows] == [0, 2]
+    for row in rows:
+        assert row["images_per_s"] > 0
+
+
+# =============================================================================
+# TESTS benchmark_image_decoding()
+# =============================================================================
+@pytest.mark.unit
+class TestBenchmarkImageDecoding:
+    """Tests pour benchmark_image_decoding()."""
+
+    def test_rows(self, large_jpeg):
+        """Le décodage réduit est plus rapide et décode moins de pixels."""
+        rows = {row["mode"]: row for row in benchmark_image_decoding([large_jpeg], repeats=2)}
+        assert set(rows) == {"full", "draft"}
+        assert rows["full"]["decoded_size"] == (3200, 2400)
+        assert rows["draft"]["decoded_mb"] < rows["full"]["decoded_mb"] / 4
+        assert rows["draft"]["decode_ms"] < rows["full"]["decode_ms"]
+
+    def test_measures_draft_even_if_disabled(self, large_jpeg, monkeypatch):
+        """Les deux modes sont mesurés quelle que soit la configuration."""
+        monkeypatch.setitem(image_utils.IMAGE_CONFIG, "jpeg_draft_decode", False)
+        rows = {row["mode"]: row for row in benchmark_image_decoding([large_jpeg], repeats=1)}
+        assert rows["draft"]["decoded_size"] != rows["full"]["decoded_size"]
+
+
+# =============================================================================
+# TESTS benchmark_resampling()
+# =============================================================================
+@pytest.mark.unit
+def test_benchmark_resampling_drift(large_jpeg):
+    """Les niveaux rapides restent proches de LANCZOS sur les tenseurs 224x224."""
+    image = load_image_from_upload(io.BytesIO(large_jpeg))
+    rows = {row["quality"]: row for row in benchmark_resampling([image], repeats=1)}
+    assert set(rows) == set(RESAMPLING_TIERS)
+    assert rows["best"]["drift_max"] == 0
+    assert rows["fast"]["drift_mean"] < 2
+    assert rows["balanced"]["drift_mean"] <= rows["fast"]["drift_mean"]
+    assert rows["fast"]["resize_ms"] < rows["best"]["resize_ms"]
+
+
+# =============================================================================
+# TESTS benchmark_image_validation()
+# =============================================================================
+@pytest.mark.unit
+def test_benchmark_image_validation_rows(large_jpeg):
+    """Le rejet sur en-tête est bien plus rapide que le décodage."""
+    rows = {
+        row["mode"]: row
+        for row in benchmark_image_validation([large_jpeg], repeats=2, max_pixels=1_000_000)
+    }
+    assert rows["header"]["rejected"] == 1
+    assert rows["decode"]["rejected"] == 0
+    assert rows["header"]["check_us"] * 10 < rows["decode"]["check_us"]
@@ -0,0 +1,164 @@
+"""
+Tests unitaires pour utils/cascade_classifier.py
+
+Ce module teste:
+- CascadeClassifier: sortie anticipée selon la confiance
+- CascadeStage: seuils et entrées par étage
+- Statistiques de sortie par étage
+"""
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config import MODEL_CONFIG
+from utils.mock_classifier import DemoClassifier
+from utils.cascade_classifier import (
+    CascadeClassifier,
+    CascadeStage,
+    INPUTS_TEXT,
+    INPUTS_IMAGE,
+    INPUTS_MULTIMODAL,
+)
+
+
+class _FixedConfidenceClassifier(DemoClassifier):
+    """Classifieur retournant toujours la même confiance."""
+
+    def __init__(self, confidence: float):
+        super().__init__()
+        self._confidence = confidence
+        self.calls = []
+
+    def predict(self, image=None, text=None, top_k=5):
+        self.calls.append({"image": image is not None, "text": text is not None})
+        probabilities = np.full(self.NUM_CLASSES, (1 - self._confidence) / (self.NUM_CLASSES - 1))
+        probabilities[0] = self._confidence
+        return self._result_from_probabilities(probabilities, top_k, source="fixed")
+
+    def load_model(self, path):
+        self.calls.append({"load": path})
+
+
+def _cascade(text_conf, image_conf, fusion_conf, threshold=0.8):
+    text_clf = _FixedConfidenceClassifier(text_conf)
+    image_clf = _FixedConfidenceClassifier(image_conf)
+    fusion_clf = _FixedConfidenceClassifier(fusion_conf)
+    cascade = CascadeClassifier([
+        CascadeStage("text", text_clf, inputs=INPUTS_TEXT, threshold=threshold),
+        CascadeStage("image", image_clf, inputs=INPUTS_IMAGE, threshold=threshold),
+        CascadeStage("fusion", fusion_clf, inputs=INPUTS_MULTIMODAL, threshold=threshold),
+    ])
+    return cascade, text_clf, image_clf, fusion_clf
+
+
+# =============================================================================
+# TESTS Sortie anticipée
+# =============================================================================
+@pytest.mark.unit
+class TestCascadeEarlyExit:
+    """Tests de la logique de sortie anticipée."""
+
+    def test_confident_text_exits_first_stage(self, sample_text, sample_image):
+        """Un texte confiant n'appelle pas les étages coûteux."""
+        cascade, text_clf, image_clf, fusion_clf = _cascade(0.9, 0.9, 0.9)
+        result = cascade.predict(image=sample_image, text=sample_text)
+
+        assert result.source == "cascade_text"
+        assert len(text_clf.calls) == 1
+        assert image_clf.calls == [] and fusion_clf.calls == []
+
+    def test_low_confidence_escalates(self, sample_text, sample_image):
+        """Sous le seuil, l'étage suivant est appelé."""
+        cascade, text_clf, image_clf, fusion_clf = _cascade(0.3, 0.95, 0.9)
+        result = cascade.predict(image=sample_image, text=sample_text)
+
+        assert result.source == "cascade_image"
+        assert fusion_clf.calls == []
+
+    def test_last_stage_always_answers(self, sample_text, sample_image):
+        """Le dernier étage répond même sous son seuil."""
+        cascade, *_ = _cascade(0.3, 0.3, 0.3)
+        result = cascade.predict(image=sample_image, text=sample_text)
+        assert result.source == "cascade_fusion"
+        assert result.confidence == pytest.approx(0.3)
+
+    def test_stages_receive_only_their_inputs(self, sample_text, sample_image):
+        """Chaque étage ne reçoit que les entrées qu'il consomme."""
+        cascade, text_clf, image_clf, fusion_clf = _cascade(0.1, 0.1, 0.1)
+        cascade.predict(image=sample_image, text=sample_text)
+
+        assert text_clf.calls == [{"image": False, "text": True}]
+        assert image_clf.calls == [{"image": True, "text": False}]
+        assert fusion_clf.calls == [{"image": True, "text": True}]
+
+    def test_stages_without_inputs_are_skipped(self, sample_text):
+        """Sans image, les étages image et fusion sont ignorés."""
+        cascade, text_clf, image_clf, fusion_clf = _cascade(0.1, 0.9, 0.9)
+        result = cascade.predict(text=sample_text)
+
+        assert result.source == "cascade_text"
+        assert image_clf.calls == []
+
+    def test_no_applicable_stage_raises(self, sample_image):
+        """Aucun étage applicable: ValueError."""
+        cascade = CascadeClassifier([
+            CascadeStage("text", _FixedConfidenceClassifier(0.9), inputs=INPUTS_TEXT),
+        ])
+        with pytest.raises(ValueError):
+            cascade.predict(image=sample_image)
+
+    def test_default_threshold_from_config(self):
+        """Sans seuil explicite, MODEL_CONFIG['confidence_threshold'] s'applique."""
+        stage = CascadeStage("text", DemoClassifier())
+        assert stage.effective_threshold == MODEL_CONFIG["confidence_threshold"]
+
+    def test_invalid_stage_definition(self):
+        """Entrées inconnues, cascade vide ou noms dupliqués sont refusés."""
+        with pytest.raises(ValueError):
+            CascadeStage("x", DemoClassifier(), inputs="audio")
+        with pytest.raises(ValueError):
+            CascadeClassifier([])
+        with pytest.raises(ValueError):
+            CascadeClassifier([
+                CascadeStage("a", DemoClassifier()),
+                CascadeStage("a", DemoClassifier()),
+            ])
+
+    def test_load_model_delegates_to_stages(self, tmp_path):
+        """load_model() charge chaque étage depuis son sous-dossier."""
+        cascade, text_clf, image_clf, fusion_clf = _cascade(0.9, 0.9, 0.9)
+        cascade.load_model(str(tmp_path))
+
+        assert text_clf.calls == [{"load": str(tmp_path / "text")}]
+        assert image_clf.calls == [{"load": str(tmp_path / "image")}]
+        assert fusion_clf.calls == [{"load": str(tmp_path / "fusion")}]
+
+
+# =============================================================================
+# TESTS Statistiques
+# =============================================================================
+@pytest.mark.unit
+class TestCascadeStats:
+    """Tests des statistiques de sortie par étage."""
+
+    def test_exit_fractions(self, sample_text, sample_image):
+        """Les fractions de sortie reflètent le trafic."""
+        cascade, *_ = _cascade(0.3, 0.9, 0.9)
+        cascade.predict(image=sample_image, text=sample_text)  # sort à "image"
+        cascade.predict(text=sample_text)                      # sort à "text" (seul étage)
+
+        stats = cascade.get_stats()
+        assert stats["total"] == 2
+        assert stats["exit_fractions"] == {"text": 0.5, "image": 0.5, "fusion": 0.0}
+        assert stats["invocations"]["text"] == 2
+        assert stats["avg_stages_run"] == pytest.approx(1.5)
+
+    def test_reset_stats(self, sample_text):
+        """reset_stats() remet les compteurs à zéro."""
+        cascade, *_ = _cascade(0.9, 0.9, 0.9)
+        cascade.predict(text=sample_text)
+        cascade.reset_stats()
+        assert cascade.get_stats()["total"] == 0
@@ -0,0 +1,252 @@
+"""
+Tests unitaires pour utils/dedup_index.py
+
+Ce module teste:
+- popcount64(): distance de Hamming vectorisée
+- DuplicateIndex: recherche par rayon (multi-index), groupes de doublons,
+  représentants (groupes non transitifs, empreintes à faible entropie
+  isolées) et recopie des valeurs par groupe
+- Persistance de l'index
+- build_dedup_index(): empreintes calculées sur un dossier d'images
+- compute_file_fingerprint(): même empreinte pour l'index et les requêtes
+"""
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.data_loader import get_image_path
+from utils.dedup_index import (
+    DuplicateIndex,
+    build_dedup_index,
+    compute_file_fingerprint,
+    compute_fingerprints,
+    popcount64,
+)
+from utils.image_utils import hamming_distance
+
+
+def _keys(n):
+    return np.stack([np.arange(n) + 1000, np.arange(n) + 2000], axis=1)
+
+
+@pytest.fixture
+def random_fingerprints():
+    """Empreintes aléatoires, plus des copies exactes et à 1-2 bits près."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 2 ** 63, size=200, dtype=np.uint64) * np.uint64(2)
+    copies = base[:20]
+    one_bit = base[20:40] ^ np.uint64(1 << 40)
+    two_bits = base[40:60] ^ np.uint64((1 << 3) | (1 << 60))
+    return np.concatenate([base, copies, one_bit, two_bits])
+
+
+def _brute_force(fingerprints, query, radius):
+    return set(np.flatnonzero(popcount64(fingerprints ^ np.uint64(query)) <= radius).tolist())
+
+
+# =============================================================================
+# TESTS popcount64()
+# =============================================================================
+@pytest.mark.unit
+class TestPopcount:
+    """Tests pour popcount64()."""
+
+    def test_matches_hamming_distance(self):
+        """Même résultat que hamming_distance() entier par entier."""
+        rng = np.random.default_rng(1)
+        a = rng.integers(0, 2 ** 63, size=50, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        b = rng.integers(0, 2 ** 63, size=50, dtype=np.uint64)
+        expected = [hamming_distance(int(x), int(y)) for x, y in zip(a, b)]
+        assert popcount64(a ^ b).tolist() == expected
+
+    def test_preserves_shape(self):
+        """La forme du tableau est conservée."""
+        assert popcount64(np.zeros((3, 4), dtype=np.uint64)).shape == (3, 4)
+        assert popcount64(np.array([2 ** 64 - 1], dtype=np.uint64))[0] == 64
+
+
+# =============================================================================
+# TESTS DuplicateIndex
+# =============================================================================
+@pytest.mark.unit
+class TestDuplicateIndex:
+    """Tests pour DuplicateIndex."""
+
+    @pytest.mark.parametrize("radius", [0, 2, 3, 6])
+    def test_query_matches_brute_force(self, random_fingerprints, radius):
+        """La recherche par tiroirs trouve exactement les images du rayon."""
+        index = DuplicateIndex(_keys(len(random_fingerprints)), random_fingerprints, radius=radius)
+        for row in (0, 5, 25, 45, 150):
+            query = int(random_fingerprints[row])
+            found = {key[0] - 1000 for key, _ in index.query(query)}
+            assert found == _brute_force(random_fingerprints, query, radius)
+
+    def test_query_sorted_by_distance(self, random_fingerprints):
+        """Les résultats sont triés par distance croissante."""
+        index = DuplicateIndex(_keys(len(random_fingerprints)), random_fingerprints, radius=3)
+        results = index.query(int(random_fingerprints[45]) ^ (1 << 10))
+        distances = [distance for _, distance in results]
+        assert distances == sorted(distances)
+        assert distances[0] >= 1
+
+    def test_query_radius_bounded_by_index(self, random_fingerprints):
+        """Un rayon de recherche supérieur à celui de l'index lève ValueError."""
+        index = DuplicateIndex(_keys(len(random_fingerprints)), random_fingerprints, radius=2)
+        assert index.query(int(random_fingerprints[0]), radius=0)
+        with pytest.raises(ValueError):
+            index.query(int(random_fingerprints[0]), radius=3)
+
+    def test_groups(self, random_fingerprints):
+        """Copies exactes et quasi-copies forment des groupes de 2 images."""
+        index = DuplicateIndex(_keys(len(random_fingerprints)), random_fingerprints, radius=3)
+        groups = index.duplicate_groups()
+        assert len(groups) == 60
+        assert all(len(group) == 2 for group in groups)
+        # Le représentant est la première image du groupe
+        assert all(group[0][0] < group[1][0] for group in groups)
+        stats = index.get_stats()
+        assert stats["groups"] == 200
+        assert stats["duplicates"] == 60
+        assert stats["duplicate_groups"] == 60
+
+    def test_radius_zero_groups_exact_copies_only(self, random_fingerprints):
+        """Avec un rayon nul, seules les copies exactes sont regroupées."""
+        index = DuplicateIndex(_keys(len(random_fingerprints)), random_fingerprints, radius=0)
+        assert index.get_stats()["duplicates"] == 20
+
+    def test_chain_does_not_merge(self):
+        """A~B et B~C ne placent pas C dans le groupe de A si A et C sont loin."""
+        base = 0x5A5A_5A5A_5A5A_5A5A
+        fingerprints = np.array([base, base ^ 0b11, base ^ 0b1111], dtype=np.uint64)
+        index = DuplicateIndex(_keys(3), fingerprints, radius=2)
+        assert index.representative_rows.tolist() == [0, 0, 2]
+        assert index.duplicate_groups() == [[(1000, 2000), (1001, 2001)]]
+        # Chaque image est à distance <= rayon de son représentant
+        representatives = fingerprints[index.representative_rows]
+        assert (popcount64(fingerprints ^ representatives) <= 2).all()
+
+    def test_low_entropy_fingerprints_not_grouped(self):
+        """Les empreintes presque unies ne sont regroupées avec aucune image."""
+        base = 0x5A5A_5A5A_5A5A_5A5A
+        fingerprints = np.array([0, 0, 0b1, 2 ** 64 - 1, base, base], dtype=np.uint64)
+        index = DuplicateIndex(_keys(6), fingerprints, radius=3, min_hash_bits=8)
+        assert index.representative_rows.tolist() == [0, 1, 2, 3, 4, 4]
+        # Toujours trouvées par une recherche
+        assert len(index.query(0)) == 3
+        unfiltered = DuplicateIndex(_keys(6), fingerprints, radius=3, min_hash_bits=0)
+        assert unfiltered.representative_rows.tolist() == [0, 0, 0, 3, 4, 4]
+
+    def test_large_bucket(self):
+        """Un tiroir de plusieurs blocs (images quasi unies) est entièrement comparé."""
+        rng = np.random.default_rng(2)
+        # Tranche basse commune, bits hauts aléatoires: un seul gros tiroir
+        high = rng.integers(0, 2 ** 47, size=600, dtype=np.uint64) << np.uint64(17)
+        fingerprints = np.concatenate([high, high[:10] ^ np.uint64(1 << 30)])
+        index = DuplicateIndex(_keys(len(fingerprints)), fingerprints, radius=3)
+        for row in (600, 605, 609):
+            assert index.representative_rows[row] == row - 600
+
+    def test_expand(self, random_fingerprints):
+        """Les valeurs calculées par groupe sont recopiées sur chaque image."""
+        index = DuplicateIndex(_keys(len(random_fingerprints)), random_fingerprints, radius=3)
+        representatives = index.representative_pairs()
+        values = np.array([[imageid, productid] for imageid, productid in representatives])
+        expanded = index.expand(values)
+        assert expanded.shape == (len(random_fingerprints), 2)
+        np.testing.assert_array_equal(expanded, index.keys[index.representative_rows])
+        with pytest.raises(ValueError):
+            index.expand(values[:-1])
+
+    def test_invalid_arguments(self):
+        """Rayon hors bornes ou tailles incohérentes lèvent ValueError."""
+        with pytest.raises(ValueError):
+            DuplicateIndex(_keys(2), np.zeros(2, dtype=np.uint64), radius=64)
+        with pytest.raises(ValueError):
+            DuplicateIndex(_keys(2), np.zeros(3, dtype=np.uint64))
+        with pytest.raises(ValueError):
+            DuplicateIndex(_keys(2), np.zeros(2, dtype=np.uint64), min_hash_bits=33)
+
+    def test_empty(self):
+        """Un index vide est valide."""
+        index = DuplicateIndex(_keys(0), np.zeros(0, dtype=np.uint64))
+        assert len(index) == 0
+        assert index.query(123) == []
+        assert index.get_stats()["saved_ratio"] == 0.0
+
+    def test_save_and_load(self, random_fingerprints, tmp_path):
+        """L'index relu donne les mêmes groupes."""
+        index = DuplicateIndex(
+            _keys(len(random_fingerprints)), random_fingerprints, radius=2, min_hash_bits=4
+        )
+        path = index.save(tmp_path / "dedup.npz")
+        loaded = DuplicateIndex.load(path)
+        assert loaded.radius == 2
+        assert loaded.min_hash_bits == 4
+        np.testing.assert_array_equal(loaded.representative_rows, index.representative_rows)
+        with pytest.raises(FileNotFoundError):
+            DuplicateIndex.load(tmp_path / "absent.npz")
+
+
+# =============================================================================
+# TESTS build_dedup_index()
+# =============================================================================
+@pytest.fixture(scope="module")
+def images_dir(tmp_path_factory):
+    """Dossier image_train: 4 photos distinctes, dont 2 republiées (taille / qualité)."""
+    directory = tmp_path_factory.mktemp("image_train")
+    rng = np.random.default_rng(0)
+    for n in range(4):
+        smooth = rng.integers(0, 255, (6, 8, 3), dtype=np.uint8)
+        image = Image.fromarray(smooth).resize((800, 600), Image.Resampling.BICUBIC)
+        image.save(get_image_path(1000 + n, 2000 + n, directory), format="JPEG", quality=95)
+        if n < 2:
+            image.resize((500, 375)).save(
+                get_image_path(1100 + n, 2100 + n, directory), format="JPEG", quality=70
+            )
+    return directory
+
+
+@pytest.mark.unit
+class TestBuildDedupIndex:
+    """Tests pour compute_fingerprints() et build_dedup_index()."""
+
+    PAIRS = [(1000, 2000), (1001, 2001), (1002, 2002), (1003, 2003), (1100, 2100), (1101, 2101)]
+
+    def test_republished_images_grouped(self, images_dir):
+        """Une photo republiée rejoint le groupe de l'originale."""
+        index = build_dedup_index(self.PAIRS, images_dir, max_workers=0)
+        groups = index.duplicate_groups()
+        assert sorted(groups) == [[(1000, 2000), (1100, 2100)], [(1001, 2001), (1101, 2101)]]
+        assert index.representative_pairs() == self.PAIRS[:4]
+
+    def test_missing_images_reported(self, images_dir):
+        """Les images absentes sont signalées et exclues."""
+        keys, fingerprints, errors = compute_fingerprints(
+            self.PAIRS[:2] + [(9, 9)], images_dir, max_workers=0, batch_size=2
+        )
+        assert keys.tolist() == [[1000, 2000], [1001, 2001]]
+        assert fingerprints.dtype == np.uint64
+        assert list(errors) == [(9, 9)]
+
+    def test_process_pool_matches_inline(self, images_dir):
+        """Le pool de processus donne les mêmes empreintes que le mode séquentiel."""
+        inline = compute_fingerprints(self.PAIRS, images_dir, max_workers=0)
+        pooled = compute_fingerprints(self.PAIRS, images_dir, max_workers=2, batch_size=4)
+        np.testing.assert_array_equal(inline[0], pooled[0])
+        np.testing.assert_array_equal(inline[1], pooled[1])
+
+    def test_file_fingerprint_matches_index(self, images_dir):
+        """compute_file_fingerprint() redonne l'empreinte stockée dans l'index."""
+        index = build_dedup_index(self.PAIRS, images_dir, max_workers=0)
+        for row, (imageid, productid) in enumerate(self.PAIRS):
+            path = get_image_path(imageid, productid, images_dir)
+            fingerprint = compute_file_fingerprint(path)
+            assert fingerprint == int(index.fingerprints[row])
+            with open(path, "rb") as f:
+                assert compute_file_fingerprint(f) == fingerprint
+            assert ((imageid, productid), 0) in index.query(fingerprint)
@@ -0,0 +1,158 @@
+"""
+Tests unitaires pour utils/feature_store.py
+
+Ce module teste:
+- write_feature_store(): tri par identifiant, conversion float16, validations
+- FeatureStore: recherche dichotomique, vues, gather vectorisé
+- Stores partagés
+"""
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils import feature_store
+from utils.feature_store import (
+    FeatureStore,
+    get_feature_store_paths,
+    get_shared_feature_store,
+    is_feature_store_available,
+    write_feature_store,
+)
+
+
+@pytest.fixture
+def features():
+    """Identifiants non triés et features ResNet50 simulées."""
+    rng = np.random.default_rng(0)
+    ids = rng.permutation(np.arange(1000, 1300, 3))
+    return ids, rng.random((len(ids), 2048), dtype=np.float32) * 8
+
+
+@pytest.fixture
+def store(tmp_path, features):
+    ids, matrix = features
+    write_feature_store(ids, matrix, "resnet50", tmp_path)
+    return FeatureStore.open("resnet50", tmp_path)
+
+
+# =============================================================================
+# TESTS Écriture
+# =============================================================================
+@pytest.mark.unit
+class TestWriteFeatureStore:
+    """Tests pour write_feature_store()."""
+
+    def test_files_written_sorted(self, tmp_path, features):
+        """Les ids sont triés et la matrice est en float16."""
+        ids, matrix = features
+        paths = write_feature_store(ids, matrix, "resnet50", tmp_path)
+
+        stored_ids = np.load(paths["ids"])
+        assert np.all(np.diff(stored_ids) > 0)
+        assert np.load(paths["features"], mmap_mode="r").dtype == np.float16
+        assert is_feature_store_available("resnet50", tmp_path)
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_chunked_write_keeps_alignment(self, tmp_path, features, monkeypatch):
+        """L'écriture par blocs garde chaque ligne alignée sur son id."""
+        monkeypatch.setattr(feature_store, "_WRITE_CHUNK_ROWS", 7)
+        ids, matrix = features
+        write_feature_store(ids, matrix, "resnet50", tmp_path)
+        store = FeatureStore.open("resnet50", tmp_path)
+
+        for i in (0, 13, len(ids) - 1):
+            np.testing.assert_allclose(store.get(ids[i]), matrix[i], rtol=1e-3)
+
+    def test_accepts_memmap_source(self, tmp_path, features):
+        """Une source memmap float32 est convertie sans copie complète."""
+        ids, matrix = features
+        source = np.lib.format.open_memmap(tmp_path / "src.npy", mode="w+", dtype=np.float32, shape=matrix.shape)
+        source[:] = matrix
+        write_feature_store(ids, source, "resnet50", tmp_path)
+        assert len(FeatureStore.open("resnet50", tmp_path)) == len(ids)
+
+    def test_validations(self, tmp_path):
+        """Tailles, dimension, doublons et plage float16 sont vérifiés."""
+        with pytest.raises(ValueError):
+            write_feature_store([1, 2], np.zeros((3, 2048)), "resnet50", tmp_path)
+        with pytest.raises(ValueError):
+            write_feature_store([1, 2], np.zeros((2, 100)), "vgg16", tmp_path)
+        with pytest.raises(ValueError):
+            write_feature_store([1, 1], np.zeros((2, 2048)), "resnet50", tmp_path)
+        with pytest.raises(ValueError):
+            write_feature_store([1], np.full((1, 2048), 1e6), "resnet50", tmp_path)
+        assert not is_feature_store_available("resnet50", tmp_path)
+
+    def test_custom_dimension(self, tmp_path):
+        """Un nom hors FEATURE_DIMS accepte toute dimension."""
+        write_feature_store([5, 3], np.ones((2, 16)), "custom", tmp_path)
+        assert FeatureStore.open("custom", tmp_path).dim == 16
+
+
+# =============================================================================
+# TESTS Lecture
+# =============================================================================
+@pytest.mark.unit
+class TestFeatureStore:
+    """Tests pour FeatureStore."""
+
+    def test_lookup(self, store, features):
+        """lookup() trouve les lignes et renvoie -1 pour un id absent."""
+        ids, _ = features
+        rows = store.lookup([ids[0], 1, 10 ** 9])
+        assert store.ids[rows[0]] == ids[0]
+        assert rows[1:].tolist() == [-1, -1]
+
+    def test_get_is_float16_view(self, store, features):
+        """get() renvoie une vue float16 sur le memmap."""
+        ids, matrix = features
+        view = store.get(ids[5])
+        assert view.dtype == np.float16
+        assert isinstance(store._features, np.memmap)
+        np.testing.assert_allclose(view, matrix[5], rtol=1e-3)
+
+    def test_gather_preserves_order(self, store, features):
+        """gather() suit l'ordre demandé, doublons compris, en float32."""
+        ids, matrix = features
+        wanted = [ids[7], ids[2], ids[7]]
+        batch = store.gather(wanted)
+
+        assert batch.shape == (3, 2048)
+        assert batch.dtype == np.float32
+        np.testing.assert_allclose(batch, matrix[[7, 2, 7]], rtol=1e-3)
+
+    def test_gather_missing(self, store, features):
+        """Un id absent lève KeyError, ou donne des zéros avec missing='zero'."""
+        ids, _ = features
+        with pytest.raises(KeyError):
+            store.gather([ids[0], 1])
+        batch = store.gather([1, ids[0]], missing="zero")
+        assert not batch[0].any()
+        assert batch[1].any()
+
+    def test_contains(self, store, features):
+        """Appartenance unitaire et vectorisée."""
+        ids, _ = features
+        assert ids[0] in store
+        assert 1 not in store
+        assert store.contains([ids[0], 1]).tolist() == [True, False]
+
+    def test_open_missing_raises(self, tmp_path):
+        """Un store absent lève FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            FeatureStore.open("vgg16", tmp_path)
+
+    def test_paths(self, tmp_path):
+        """Les fichiers sont nommés d'après le store."""
+        paths = get_feature_store_paths("vgg16", tmp_path)
+        assert paths["features"].name == "vgg16.f16.npy"
+        assert paths["ids"].name == "vgg16.ids.npy"
+
+    def test_shared_store_absent(self, monkeypatch, tmp_path):
+        """Sans fichiers, le store partagé est None."""
+        monkeypatch.setattr(feature_store, "FEATURE_STORE_DIR", tmp_path)
+        assert get_shared_feature_store("absent") is None
@@ -0,0 +1,164 @@
+"""
+Tests unitaires pour utils/image_loader.py
+
+Ce module teste:
+- get_image_path(): nommage des images du dataset
+- ParallelImageLoader: lots ordonnés / non ordonnés, erreurs, préchargement borné
+- InlineExecutor: exécution synchrone (max_workers=0)
+- Équivalence avec le prétraitement ResNet unitaire
+"""
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.data_loader import get_image_path, IMAGES_TRAIN_DIR
+from utils.image_loader import (
+    InlineExecutor,
+    ParallelImageLoader,
+    normalize_for_resnet,
+)
+from utils.image_utils import load_image_for_model, preprocess_for_resnet_batch
+
+
+N_IMAGES = 10
+
+
+@pytest.fixture(scope="module")
+def images_dir(tmp_path_factory):
+    """Dossier de JPEG nommés comme image_train, de tailles variées."""
+    directory = tmp_path_factory.mktemp("image_train")
+    rng = np.random.default_rng(0)
+    for n in range(N_IMAGES):
+        size = (300 + 40 * n, 200 + 30 * n)
+        pixels = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(get_image_path(1000 + n, 2000 + n, directory), format="JPEG")
+    return directory
+
+
+@pytest.fixture
+def pairs():
+    return [(1000 + n, 2000 + n) for n in range(N_IMAGES)]
+
+
+# =============================================================================
+# TESTS get_image_path()
+# =============================================================================
+@pytest.mark.unit
+class TestGetImagePath:
+    """Tests pour get_image_path()."""
+
+    def test_naming_convention(self, tmp_path):
+        """Le nom suit image_{imageid}_product_{productid}.jpg."""
+        assert get_image_path(1263597046, 3804725264, tmp_path).name == \
+            "image_1263597046_product_3804725264.jpg"
+
+    def test_defaults_to_train_dir(self):
+        """Le dossier par défaut est IMAGES_TRAIN_DIR."""
+        assert get_image_path(1, 2).parent == IMAGES_TRAIN_DIR
+
+
+# =============================================================================
+# TESTS ParallelImageLoader
+# =============================================================================
+@pytest.mark.unit
+class TestParallelImageLoader:
+    """Tests pour ParallelImageLoader."""
+
+    def test_ordered_batches(self, images_dir, pairs):
+        """Les lots sont produits dans l'ordre d'entrée, bornés par batch_size."""
+        with ParallelImageLoader(images_dir, batch_size=4, max_workers=2) as loader:
+            batches = list(loader.iter_batches(pairs))
+
+        assert [b.index for b in batches] == [0, 1, 2]
+        assert [len(b) for b in batches] == [4, 4, 2]
+        assert [key for b in batches for key in b.keys] == pairs
+        assert batches[0].pixels.shape == (4, 224, 224, 3)
+        assert batches[0].pixels.dtype == np.float32
+
+    def test_unordered_yields_all_batches(self, images_dir, pairs):
+        """En mode non ordonné, tous les lots sont produits une seule fois."""
+        with ParallelImageLoader(images_dir, batch_size=3, max_workers=2) as loader:
+            batches = list(loader.iter_batches(pairs, ordered=False))
+
+        assert sorted(b.index for b in batches) == [0, 1, 2, 3]
+        assert sorted(key for b in batches for key in b.keys) == sorted(pairs)
+
+    def test_matches_single_process_preprocessing(self, images_dir, pairs):
+        """Les pixels égalent preprocess_for_resnet_batch() sur les mêmes fichiers."""
+        with ParallelImageLoader(images_dir, batch_size=4, max_workers=2) as loader:
+            batch = loader.load(pairs[:3])
+
+        images = [load_image_for_model(get_image_path(i, p, images_dir)) for i, p in pairs[:3]]
+        np.testing.assert_array_equal(batch.pixels, preprocess_for_resnet_batch(images))
+
+    def test_uint8_output(self, images_dir, pairs):
+        """normalize=False renvoie des pixels RGB letterboxés uint8."""
+        loader = ParallelImageLoader(images_dir, batch_size=4, max_workers=0, normalize=False)
+        batch = loader.load(pairs[:2])
+        assert batch.pixels.dtype == np.uint8
+        np.testing.assert_array_equal(
+            normalize_for_resnet(batch.pixels),
+            ParallelImageLoader(images_dir, max_workers=0).load(pairs[:2]).pixels,
+        )
+
+    def test_missing_images_reported(self, images_dir, pairs):
+        """Une image absente est listée dans errors sans bloquer le lot."""
+        loader = ParallelImageLoader(images_dir, batch_size=8, max_workers=0)
+        batch = loader.load([pairs[0], (1, 2), pairs[1]])
+
+        assert batch.keys == [pairs[0], pairs[1]]
+        assert list(batch.errors) == [(1, 2)]
+        assert len(batch.pixels) == 2
+        assert loader.get_stats()["failed"] == 1
+
+    def test_prefetch_is_bounded(self, images_dir, pairs):
+        """Jamais plus de `prefetch` lots en vol."""
+        loader = ParallelImageLoader(images_dir, batch_size=1, max_workers=0, prefetch=2)
+        for _ in loader.iter_batches(iter(pairs)):
+            pass
+
+        stats = loader.get_stats()
+        assert stats["max_in_flight"] == 2
+        assert stats["batches"] == N_IMAGES
+        assert stats["images"] == N_IMAGES
+
+    def test_early_stop_cancels_pending(self, images_dir, pairs):
+        """Interrompre l'itération ne laisse pas le loader inutilisable."""
+        with ParallelImageLoader(images_dir, batch_size=2, max_workers=2) as loader:
+            next(loader.iter_batches(pairs))
+            assert len(loader.load(pairs[:2])) == 2
+
+    def test_empty_input(self, images_dir):
+        """Aucune paire: aucun lot, load() renvoie un tableau vide."""
+        loader = ParallelImageLoader(images_dir, max_workers=0)
+        assert list(loader.iter_batches([])) == []
+        assert loader.load([]).pixels.shape == (0, 224, 224, 3)
+
+    def test_invalid_parameters_raise(self, images_dir):
+        """Des paramètres invalides lèvent ValueError."""
+        with pytest.raises(ValueError):
+            ParallelImageLoader(images_dir, batch_size=0)
+        with pytest.raises(ValueError):
+            ParallelImageLoader(images_dir, prefetch=0)
+        with pytest.raises(ValueError):
+            ParallelImageLoader(images_dir, max_workers=-1)
+
+
+# =============================================================================
+# TESTS InlineExecutor
+# =============================================================================
+@pytest.mark.unit
+def test_inline_executor():
+    """InlineExecutor exécute immédiatement et transmet les exceptions par le Future."""
+    executor = InlineExecutor()
+    assert executor.submit(pow, 2, 10).result() == 1024
+    future = executor.submit(int, "x")
+    assert future.done()
+    with pytest.raises(ValueError):
+        future.result()
+
@@ -0,0 +1,162 @@
+"""
+Tests unitaires pour utils/image_store.py
+
+Ce module teste:
+- pack_image_store(): construction du tenseur uint8 et de l'index
+- ImageStore: vues sans copie, accès groupés, lecture par plusieurs processus
+- is_image_store_available()
+"""
+import subprocess
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.data_loader import get_image_path
+from utils.image_loader import ParallelImageLoader
+from utils.image_store import (
+    ImageStore,
+    get_index_path,
+    is_image_store_available,
+    pack_image_store,
+)
+
+
+N_IMAGES = 6
+
+
+@pytest.fixture(scope="module")
+def images_dir(tmp_path_factory):
+    """Dossier de JPEG nommés comme image_train."""
+    directory = tmp_path_factory.mktemp("image_train")
+    rng = np.random.default_rng(1)
+    for n in range(N_IMAGES):
+        pixels = rng.integers(0, 255, (180 + 20 * n, 260, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(get_image_path(10 + n, 500 + n, directory), format="JPEG")
+    return directory
+
+
+@pytest.fixture
+def pairs():
+    """Couples (imageid, productid)."""
+    return [(10 + n, 500 + n) for n in range(N_IMAGES)]
+
+
+@pytest.fixture
+def store_path(tmp_path, images_dir, pairs):
+    """Store construit à partir du dossier de test."""
+    path = tmp_path / "store.npy"
+    pack_image_store(pairs, path, images_dir=images_dir, max_workers=0)
+    return path
+
+
+# =============================================================================
+# TESTS Construction
+# =============================================================================
+@pytest.mark.unit
+class TestPackImageStore:
+    """Tests pour pack_image_store()."""
+
+    def test_writes_store_and_index(self, tmp_path, images_dir, pairs):
+        """Le tenseur et l'index sont écrits, sans fichier temporaire restant."""
+        path = tmp_path / "store.npy"
+        report = pack_image_store(pairs, path, images_dir=images_dir, max_workers=2)
+
+        assert report == {"images": N_IMAGES, "failed": 0}
+        assert is_image_store_available(path)
+        assert not list(tmp_path.glob("*.tmp"))
+        assert np.load(path, mmap_mode="r").shape == (N_IMAGES, 224, 224, 3)
+
+    def test_pixels_match_loader(self, store_path, images_dir, pairs):
+        """Les lignes égalent les pixels letterboxés du loader, dans l'ordre."""
+        expected = ParallelImageLoader(images_dir, max_workers=0, normalize=False).load(pairs).pixels
+        store = ImageStore.open(store_path)
+        for (imageid, productid), pixels in zip(pairs, expected):
+            np.testing.assert_array_equal(store.get(productid, imageid), pixels)
+
+    def test_missing_images_not_indexed(self, tmp_path, images_dir, pairs):
+        """Une image illisible n'est pas indexée."""
+        path = tmp_path / "store.npy"
+        report = pack_image_store(pairs + [(1, 2)], path, images_dir=images_dir, max_workers=0)
+        store = ImageStore.open(path)
+
+        assert report["failed"] == 1
+        assert len(store) == N_IMAGES
+        assert (2, 1) not in store
+
+    def test_empty_input_raises(self, tmp_path):
+        """Aucune image: ValueError."""
+        with pytest.raises(ValueError):
+            pack_image_store([], tmp_path / "store.npy")
+
+
+# =============================================================================
+# TESTS Lecture
+# =============================================================================
+@pytest.mark.unit
+class TestImageStore:
+    """Tests pour ImageStore."""
+
+    def test_get_is_zero_copy_view(self, store_path, pairs):
+        """get() renvoie une vue sur le memmap, en lecture seule."""
+        store = ImageStore.open(store_path)
+        imageid, productid = pairs[0]
+        view = store.get(productid, imageid)
+
+        assert view.shape == (224, 224, 3)
+        assert view.dtype == np.uint8
+        assert np.shares_memory(view, store.pixels)
+        assert isinstance(store.pixels, np.memmap)
+        with pytest.raises(ValueError):
+            view[0, 0, 0] = 1
+
+    def test_get_many_preserves_order(self, store_path, pairs):
+        """get_many() suit l'ordre des clés demandées."""
+        store = ImageStore.open(store_path)
+        keys = [(productid, imageid) for imageid, productid in reversed(pairs)]
+        batch = store.get_many(keys)
+
+        assert batch.shape == (N_IMAGES, 224, 224, 3)
+        np.testing.assert_array_equal(batch[0], store.get(*keys[0]))
+
+    def test_unknown_key_raises(self, store_path):
+        """Une clé absente lève KeyError."""
+        with pytest.raises(KeyError):
+            ImageStore.open(store_path).get(0, 0)
+
+    def test_get_image(self, store_path, pairs):
+        """get_image() renvoie une image PIL RGB 224x224."""
+        imageid, productid = pairs[0]
+        image = ImageStore.open(store_path).get_image(productid, imageid)
+        assert image.size == (224, 224)
+        assert image.mode == "RGB"
+
+    def test_shared_between_processes(self, store_path, pairs):
+        """Un autre processus lit les mêmes pixels sans décoder."""
+        imageid, productid = pairs[2]
+        code = (
+            "import sys; sys.path.insert(0, sys.argv[1]);"
+            "from utils.image_store import ImageStore;"
+            "store = ImageStore.open(sys.argv[2]);"
+            "print(int(store.get(int(sys.argv[3]), int(sys.argv[4])).sum()))"
+        )
+        root = str(Path(__file__).parent.parent.parent)
+        output = subprocess.run(
+            [sys.executable, "-c", code, root, str(store_path), str(productid), str(imageid)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        assert int(output) == int(ImageStore.open(store_path).get(productid, imageid).sum())
+
+    def test_open_missing_store_raises(self, tmp_path):
+        """Ouvrir un store absent lève FileNotFoundError."""
+        assert not is_image_store_available(tmp_path / "absent.npy")
+        with pytest.raises(FileNotFoundError):
+            ImageStore.open(tmp_path / "absent.npy")
+
+    def test_index_path(self, tmp_path):
+        """L'index est à côté du store."""
+        assert get_index_path(tmp_path / "a.npy") == tmp_path / "a.index.npz"
@@ -0,0 +1,415 @@
+"""
+Tests unitaires pour utils/image_utils.py
+
+Ce module teste:
+- compute_image_fingerprint(): dHash 64 bits mémoïsé par image
+- compute_image_digest(): empreinte exacte mémoïsée
+- hamming_distance()
+- preprocess_for_resnet_batch(): lot prétraité dans un buffer réutilisable
+- load_image_for_model(): décodage JPEG réduit avant redimensionnement
+- validate_image_upload(): rejet sur l'en-tête, avant décodage
+- resize_image() / create_thumbnail(): niveaux de qualité du rééchantillonnage
+"""
+import gc
+import io
+import struct
+import time
+import zlib
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils import image_utils
+from utils.image_utils import (
+    compute_image_fingerprint,
+    compute_image_digest,
+    hamming_distance,
+    preprocess_for_resnet,
+    preprocess_for_resnet_batch,
+    resize_image,
+    IMAGENET_BGR_MEAN,
+    load_image_from_upload,
+    load_image_for_model,
+    read_image_header,
+    validate_image_upload,
+    create_thumbnail,
+    get_resampling,
+    RESAMPLING_TIERS,
+)
+
+
+@pytest.fixture
+def gradient_image():
+    """Image RGB 640x480: dégradé horizontal avec un carré sombre."""
+    x = np.linspace(0, 255, 640)
+    y = np.linspace(0, 255, 480)[:, None]
+    array = np.stack([x + 0 * y, y + 0 * x, np.full((480, 640), 128.0)], axis=-1)
+    array[100:250, 400:550] = 20
+    return Image.fromarray(array.astype(np.uint8), mode="RGB")
+
+
+@pytest.fixture
+def large_jpeg(gradient_image):
+    """JPEG 3200x2400 (photo produit de plusieurs mégapixels)."""
+    buffer = io.BytesIO()
+    gradient_image.resize((3200, 2400)).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+# =============================================================================
+# TESTS Empreinte perceptuelle
+# =============================================================================
+@pytest.mark.unit
+class TestImageFingerprint:
+    """Tests pour compute_image_fingerprint()."""
+
+    def test_returns_64_bit_int(self, gradient_image):
+        """L'empreinte est un entier non signé de 64 bits."""
+        fingerprint = compute_image_fingerprint(gradient_image)
+        assert isinstance(fingerprint, int)
+        assert 0 <= fingerprint < 2 ** 64
+
+    def test_deterministic_across_copies(self, gradient_image):
+        """Deux copies d'une image ont la même empreinte."""
+        assert compute_image_fingerprint(gradient_image.copy()) == compute_image_fingerprint(gradient_image)
+
+    def test_robust_to_resize(self, gradient_image):
+        """Un redimensionnement change peu l'empreinte."""
+        resized = gradient_image.resize((320, 240))
+        distance = hamming_distance(
+            compute_image_fingerprint(resized), compute_image_fingerprint(gradient_image)
+        )
+        assert distance <= 4
+
+    def test_different_images_differ(self, gradient_image):
+        """Des images différentes ont des empreintes éloignées."""
+        flipped = gradient_image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+        distance = hamming_distance(
+            compute_image_fingerprint(flipped), compute_image_fingerprint(gradient_image)
+        )
+        assert distance > 16
+
+    @pytest.mark.parametrize("mode", ["L", "RGBA", "P", "CMYK"])
+    def test_supports_modes(self, gradient_image, mode):
+        """Les modes courants sont supportés."""
+        assert 0 <= compute_image_fingerprint(gradient_image.convert(mode)) < 2 ** 64
+
+    def test_hamming_distance(self):
+        """hamming_distance compte les bits différents."""
+        assert hamming_distance(0b1011, 0b0001) == 2
+        assert hamming_distance(2 ** 64 - 1, 0) == 64
+
+
+# =============================================================================
+# TESTS Mémoïsation
+# =============================================================================
+@pytest.mark.unit
+class TestImageMemoization:
+    """Tests de la mémoïsation par objet image."""
+
+    def test_computed_once_per_image(self, gradient_image, monkeypatch):
+        """Le calcul n'est fait qu'une fois pour un même objet."""
+        calls = []
+        original = image_utils._compute_dhash
+        monkeypatch.setattr(image_utils, "_compute_dhash", lambda img: calls.append(1) or original(img))
+
+        image = gradient_image.copy()
+        first = image_utils._memoized(image, "dhash_test", image_utils._compute_dhash)
+        second = image_utils._memoized(image, "dhash_test", image_utils._compute_dhash)
+
+        assert first == second
+        assert len(calls) == 1
+
+    def test_digest_and_fingerprint_share_entry(self, gradient_image):
+        """Empreinte exacte et perceptuelle sont stockées pour le même objet."""
+        image = gradient_image.copy()
+        compute_image_digest(image)
+        compute_image_fingerprint(image)
+
+        _, values = image_utils._image_memo[id(image)]
+        assert {"digest_16", "dhash"} <= set(values)
+
+    def test_release_while_lock_held(self, gradient_image):
+        """Le callback de destruction peut s'exécuter sous le verrou (GC pendant une allocation)."""
+        image = gradient_image.copy()
+        image_id = id(image)
+        compute_image_fingerprint(image)
+
+        def collect_under_lock():
+            nonlocal image
+            with image_utils._image_memo_lock:
+                del image
+                gc.collect()
+
+        worker = threading.Thread(target=collect_under_lock, daemon=True)
+        worker.start()
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+        assert image_id not in image_utils._image_memo
+
+    def test_entry_released_with_image(self, gradient_image):
+        """L'entrée disparaît quand l'image est détruite."""
+        image = gradient_image.copy()
+        image_id = id(image)
+        compute_image_fingerprint(image)
+        assert image_id in image_utils._image_memo
+
+        del image
+        gc.collect()
+        assert image_id not in image_utils._image_memo
+
+
+# =============================================================================
+# TESTS Prétraitement ResNet par lot
+# =============================================================================
+def _reference_preprocess(image):
+    """Prétraitement ResNet unitaire historique (float32, BGR, moyenne ImageNet)."""
+    array = np.array(resize_image(image, (224, 224)), dtype=np.float32)[..., ::-1]
+    return array - np.array([103.939, 116.779, 123.68], dtype=np.float32)
+
+
+@pytest.mark.unit
+class TestPreprocessForResnetBatch:
+    """Tests pour preprocess_for_resnet_batch()."""
+
+    def test_matches_single_image_preprocessing(self, gradient_image, sample_image):
+        """Chaque ligne du lot égale le prétraitement unitaire historique."""
+        batch = preprocess_for_resnet_batch([gradient_image, sample_image])
+        assert batch.shape == (2, 224, 224, 3)
+        assert batch.dtype == np.float32
+        np.testing.assert_array_equal(batch[0], _reference_preprocess(gradient_image))
+        np.testing.assert_array_equal(batch[1], _reference_preprocess(sample_image))
+
+    def test_single_image_api_unchanged(self, gradient_image):
+        """preprocess_for_resnet() garde sa shape (1, 224, 224, 3)."""
+        result = preprocess_for_resnet(gradient_image)
+        assert result.shape == (1, 224, 224, 3)
+        np.testing.assert_array_equal(result[0], _reference_preprocess(gradient_image))
+
+    def test_padding_is_white_in_bgr(self, gradient_image):
+        """Le padding blanc vaut 255 moins la moyenne ImageNet."""
+        batch = preprocess_for_resnet_batch([gradient_image])
+        np.testing.assert_allclose(batch[0, 0, 0], 255.0 - IMAGENET_BGR_MEAN)
+
+    def test_reuses_buffer(self, gradient_image, sample_image):
+        """Le résultat est une vue sur le buffer fourni, réutilisable."""
+        buffer = np.empty((4, 224, 224, 3), dtype=np.float32)
+        first = preprocess_for_resnet_batch([gradient_image, sample_image], out=buffer)
+        assert first.shape == (2, 224, 224, 3)
+        assert np.shares_memory(first, buffer)
+
+        second = preprocess_for_resnet_batch([sample_image], out=buffer)
+        assert np.shares_memory(second, buffer)
+        np.testing.assert_array_equal(second[0], _reference_preprocess(sample_image))
+
+    def test_invalid_buffer_raises(self, gradient_image):
+        """Un buffer trop petit ou mal typé lève ValueError."""
+        with pytest.raises(ValueError):
+            preprocess_for_resnet_batch(
+                [gradient_image] * 2, out=np.empty((1, 224, 224, 3), dtype=np.float32)
+            )
+        with pytest.raises(ValueError):
+            preprocess_for_resnet_batch(
+                [gradient_image], out=np.empty((1, 224, 224, 3), dtype=np.float64)
+            )
+        with pytest.raises(ValueError):
+            preprocess_for_resnet_batch(
+                [gradient_image], out=np.empty((1, 3, 224, 224), dtype=np.float32)
+            )
+
+    def test_empty_batch(self):
+        """Un lot vide donne un tableau vide."""
+        assert preprocess_for_resnet_batch([]).shape == (0, 224, 224, 3)
+
+
+# =============================================================================
+# TESTS Décodage JPEG réduit
+# =============================================================================
+@pytest.mark.unit
+class TestDraftDecoding:
+    """Tests pour load_image_for_model() et le décodage réduit."""
+
+    def test_upload_decodes_full_resolution_by_default(self, large_jpeg):
+        """Sans draft_size, l'image est décodée en pleine résolution."""
+        image = load_image_from_upload(io.BytesIO(large_jpeg))
+        assert image.size == (3200, 2400)
+        assert image.mode == "RGB"
+
+    def test_model_load_decodes_reduced_resolution(self, large_jpeg):
+        """Le décodage réduit reste au-dessus de la taille cible."""
+        image = load_image_for_model(io.BytesIO(large_jpeg), target_size=(224, 224))
+        assert image.mode == "RGB"
+        assert image.width < 3200
+        assert image.width >= 224 and image.height >= 224
+
+    def test_model_input_close_to_full_decode(self, large_jpeg):
+        """L'entrée 224x224 du modèle est quasi identique au chemin complet."""
+        full = resize_image(load_image_from_upload(io.BytesIO(large_jpeg)), (224, 224))
+        draft = resize_image(load_image_for_model(io.BytesIO(large_jpeg)), (224, 224))
+        difference = np.abs(np.asarray(full, dtype=np.int16) - np.asarray(draft, dtype=np.int16))
+        assert difference.mean() < 3
+
+    def test_non_jpeg_unaffected(self, gradient_image):
+        """Un PNG est décodé normalement."""
+        buffer = io.BytesIO()
+        gradient_image.save(buffer, format="PNG")
+        buffer.seek(0)
+        assert load_image_for_model(buffer).size == gradient_image.size
+
+    def test_config_can_disable_draft(self, large_jpeg, monkeypatch):
+        """IMAGE_CONFIG["jpeg_draft_decode"] = False force le décodage complet."""
+        monkeypatch.setitem(image_utils.IMAGE_CONFIG, "jpeg_draft_decode", False)
+        assert load_image_for_model(io.BytesIO(large_jpeg)).size == (3200, 2400)
+
+    def test_invalid_payload_raises(self):
+        """Un contenu invalide lève ValueError."""
+        with pytest.raises(ValueError):
+            load_image_for_model(io.BytesIO(b"pas une image"))
+
+
+# =============================================================================
+# TESTS Validation avant décodage
+# =============================================================================
+def _png_claiming_size(width, height):
+    """PNG de quelques octets dont l'en-tête annonce width x height pixels."""
+    buffer = io.BytesIO()
+    Image.new("L", (64, 64)).save(buffer, format="PNG")
+    payload = bytearray(buffer.getvalue())
+    # Chunk IHDR: longueur (4) + type (4) après la signature (8)
+    payload[16:24] = struct.pack(">II", width, height)
+    payload[29:33] = struct.pack(">I", zlib.crc32(bytes(payload[12:29])))
+    return bytes(payload)
+
+
+@pytest.mark.unit
+class TestUploadValidation:
+    """Tests pour read_image_header() et validate_image_upload()."""
+
+    def test_header_without_decoding(self, large_jpeg):
+        """L'en-tête donne format, dimensions et taille du fichier."""
+        header = read_image_header(io.BytesIO(large_jpeg))
+        assert header["format"] == "JPEG"
+        assert (header["width"], header["height"]) == (3200, 2400)
+        assert header["n_bytes"] == len(large_jpeg)
+
+    def test_stream_position_restored(self, large_jpeg):
+        """Le flux reste lisible par load_image_from_upload()."""
+        stream = io.BytesIO(large_jpeg)
+        assert validate_image_upload(stream)[0]
+        assert stream.tell() == 0
+        assert load_image_from_upload(stream).size == (3200, 2400)
+
+    def test_accepts_path(self, large_jpeg, tmp_path):
+        """Un chemin de fichier est accepté."""
+        path = tmp_path / "produit.jpg"
+        path.write_bytes(large_jpeg)
+        assert read_image_header(path)["n_bytes"] == len(large_jpeg)
+        assert validate_image_upload(path) == (True, "Image valide")
+
+    def test_rejects_heavy_file(self, large_jpeg):
+        """IMAGE_CONFIG["max_size_mb"] est appliqué."""
+        is_valid, msg = validate_image_upload(io.BytesIO(large_jpeg), max_size_mb=0.01)
+        assert not is_valid
+        assert "lourd" in msg
+
+    def test_rejects_format(self, gradient_image):
+        """Un format hors de la liste autorisée est rejeté."""
+        buffer = io.BytesIO()
+        gradient_image.save(buffer, format="BMP")
+        is_valid, msg = validate_image_upload(io.BytesIO(buffer.getvalue()))
+        assert not is_valid
+        assert "BMP" in msg
+
+    def test_rejects_non_image(self):
+        """Un contenu non image est rejeté sans exception."""
+        is_valid, _ = validate_image_upload(io.BytesIO(b"pas une image"))
+        assert not is_valid
+
+    @pytest.mark.parametrize("size", [(9000, 9000), (20000, 200), (100000, 100000)])
+    def test_rejects_decompression_bomb(self, size):
+        """Un petit PNG annonçant des dimensions démesurées est rejeté."""
+        payload = _png_claiming_size(*size)
+        assert len(payload) < 1024
+        is_valid, msg = validate_image_upload(io.BytesIO(payload))
+        assert not is_valid
+        assert "grande" in msg or "suspectes" in msg
+
+    def test_rejects_too_small(self):
+        """Les dimensions minimales sont vérifiées sur l'en-tête."""
+        is_valid, msg = validate_image_upload(io.BytesIO(_png_claiming_size(16, 16)))
+        assert not is_valid
+        assert "petite" in msg
+
+
+# =============================================================================
+# TESTS Niveaux de rééchantillonnage
+# =============================================================================
+@pytest.mark.unit
+class TestResamplingTiers:
+    """Tests pour get_resampling(), resize_image(quality=...) et create_thumbnail()."""
+
+    def test_tiers(self):
+        """Les trois niveaux sont définis, "best" en LANCZOS sans réduction préalable."""
+        assert set(RESAMPLING_TIERS) == {"fast", "balanced", "best"}
+        assert get_resampling("best") == (Image.Resampling.LANCZOS, None)
+        assert get_resampling("fast")[0] == Image.Resampling.BILINEAR
+
+    def test_default_from_config(self, monkeypatch):
+        """Sans argument, le niveau vient de IMAGE_CONFIG["resample_quality"]."""
+        monkeypatch.setitem(image_utils.IMAGE_CONFIG, "resample_quality", "balanced")
+        assert get_resampling() == RESAMPLING_TIERS["balanced"]
+
+    def test_unknown_tier_raises(self):
+        """Un niveau inconnu lève ValueError."""
+        with pytest.raises(ValueError):
+            get_resampling("ultra")
+
+    @pytest.mark.parametrize("quality", ["fast", "balanced", "best"])
+    def test_resize_shape(self, gradient_image, quality):
+        """Chaque niveau produit la taille demandée, avec ou sans padding."""
+        assert resize_image(gradient_image, (224, 224), quality=quality).size == (224, 224)
+        assert resize_image(
+            gradient_image, (100, 50), maintain_aspect_ratio=False, quality=quality
+        ).size == (100, 50)
+
+    def test_best_matches_lanczos(self, gradient_image):
+        """Le niveau "best" reproduit le redimensionnement LANCZOS historique."""
+        expected = gradient_image.resize((100, 50), Image.Resampling.LANCZOS)
+        resized = resize_image(gradient_image, (100, 50), maintain_aspect_ratio=False, quality="best")
+        assert resized.tobytes() == expected.tobytes()
+
+    def test_thumbnail_uses_display_quality(self, gradient_image, monkeypatch):
+        """create_thumbnail() suit IMAGE_CONFIG["display_resample_quality"]."""
+        monkeypatch.setitem(image_utils.IMAGE_CONFIG, "display_resample_quality", "fast")
+        assert create_thumbnail(gradient_image).tobytes() == \
+            create_thumbnail(gradient_image, quality="fast").tobytes()
+        assert create_thumbnail(gradient_image, quality="best").width == 150
+
+    def test_thumbnail_matches_baseline(self, large_jpeg):
+        """La miniature "best" est celle de thumbnail(LANCZOS), au même coût."""
+        image = load_image_from_upload(io.BytesIO(large_jpeg))
+        image.load()
+
+        def baseline():
+            thumbnail = image.copy()
+            thumbnail.thumbnail((400, 400), Image.Resampling.LANCZOS)
+            return thumbnail
+
+        assert create_thumbnail(image, (400, 400), quality="best").tobytes() == baseline().tobytes()
+
+        def best_of(function, repeats=3):
+            durations = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                function()
+                durations.append(time.perf_counter() - start)
+            return min(durations)
+
+        cost = best_of(lambda: create_thumbnail(image, (400, 400), quality="best"))
+        assert cost < 1.5 * best_of(baseline)
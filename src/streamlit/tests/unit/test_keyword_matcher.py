@@ -0,0 +1,130 @@
+"""
+Tests unitaires pour utils/keyword_matcher.py
+
+Ce module teste:
+- KeywordMatcher: compilation et recherche multi-motifs
+- Priorité déterministe (plus long, puis plus précoce)
+- Équivalence avec la recherche naïve `keyword in text`
+- Intégration dans DemoClassifier
+"""
+import random
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.mock_classifier import DemoClassifier
+
+
+# =============================================================================
+# TESTS Recherche
+# =============================================================================
+@pytest.mark.unit
+class TestKeywordMatcher:
+    """Tests pour KeywordMatcher."""
+
+    def test_finds_all_occurrences(self):
+        """Toutes les occurrences, chevauchantes comprises, sont trouvées."""
+        matcher = KeywordMatcher({"he": 1, "she": 2, "his": 3, "hers": 4})
+        found = {(m.keyword, m.start) for m in matcher.find_all("ushers")}
+        assert found == {("she", 1), ("he", 2), ("hers", 2)}
+
+    def test_case_insensitive(self):
+        """La recherche ignore la casse."""
+        matcher = KeywordMatcher({"PlayStation": "2462"})
+        match = matcher.best_match("Console PLAYSTATION 5")
+        assert match.keyword == "playstation"
+        assert match.value == "2462"
+
+    def test_longest_match_wins(self):
+        """Le mot-clé le plus long l'emporte, quel que soit l'ordre de la table."""
+        matcher = KeywordMatcher({"console": "a", "console de jeux": "b"})
+        assert matcher.best_match("Une console de jeux portable").value == "b"
+
+    def test_earliest_match_breaks_ties(self):
+        """À longueur égale, la première occurrence l'emporte."""
+        matcher = KeywordMatcher({"livre": "a", "roman": "b"})
+        match = matcher.best_match("roman et livre")
+        assert match.value == "b"
+        assert match.start == 0
+
+    def test_no_match_returns_none(self):
+        """Sans occurrence, best_match retourne None."""
+        matcher = KeywordMatcher({"piscine": 1})
+        assert matcher.best_match("table de jardin") is None
+        assert matcher.find_all("") == []
+
+    def test_match_positions(self):
+        """start/end délimitent le mot-clé dans le texte normalisé."""
+        text = "coffret harry potter"
+        match = KeywordMatcher({"harry potter": 1}).best_match(text)
+        assert text[match.start:match.end] == "harry potter"
+        assert match.length == len("harry potter")
+
+    def test_invalid_keywords_raise(self):
+        """Les mots-clés vides ou dupliqués (à la casse près) sont refusés."""
+        with pytest.raises(ValueError):
+            KeywordMatcher({"": 1})
+        with pytest.raises(ValueError):
+            KeywordMatcher({"Lego": 1, "lego": 2})
+
+    def test_introspection(self):
+        """Taille, appartenance et nombre d'états."""
+        matcher = KeywordMatcher({"ab": 1, "abc": 2})
+        assert len(matcher) == 2
+        assert "ABC" in matcher
+        assert matcher.n_states == 4
+
+    def test_equivalent_to_naive_search(self):
+        """Les occurrences correspondent à une recherche naïve exhaustive."""
+        rng = random.Random(0)
+        alphabet = "abcé "
+        keywords = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)}
+        keywords.discard("")
+        matcher = KeywordMatcher({k: k for k in keywords})
+
+        for _ in range(50):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            expected = {
+                (k, i) for k in keywords
+                for i in range(len(text) - len(k) + 1) if text.startswith(k, i)
+            }
+            found = {(m.keyword, m.start) for m in matcher.find_all(text)}
+            assert found == expected
+
+
+# =============================================================================
+# TESTS DemoClassifier
+# =============================================================================
+@pytest.mark.unit
+class TestDemoClassifierKeywords:
+    """Tests de l'utilisation de l'automate par DemoClassifier."""
+
+    def test_matcher_compiled_once(self):
+        """L'automate est partagé par toutes les instances."""
+        assert DemoClassifier().get_keyword_matcher() is DemoClassifier().get_keyword_matcher()
+        assert len(DemoClassifier.get_keyword_matcher()) == len(DemoClassifier.KEYWORD_PREDICTIONS)
+
+    def test_longest_keyword_drives_prediction(self):
+        """'playstation' (plus long) l'emporte sur 'console'."""
+        result = DemoClassifier().predict(text="Console PlayStation 5")
+        assert result.category == "2462"
+        assert result.confidence == pytest.approx(DemoClassifier.KEYWORD_PREDICTIONS["playstation"][1])
+
+    def test_subclass_gets_own_matcher(self):
+        """Une sous-classe avec sa propre table compile son propre automate."""
+
+        class _CustomDemo(DemoClassifier):
+            KEYWORD_PREDICTIONS = {"aquarium": ("2583", 0.9)}
+
+        result = _CustomDemo().predict(text="Grand aquarium")
+        assert result.category == "2583"
+        assert _CustomDemo.get_keyword_matcher() is not DemoClassifier.get_keyword_matcher()
+
+    def test_no_keyword_falls_back_to_mock(self):
+        """Sans mot-clé, la prédiction standard du mock est utilisée."""
+        result = DemoClassifier().predict(text="xyz sans rapport")
+        assert result.source.startswith("mock")
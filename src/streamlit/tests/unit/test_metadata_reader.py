@@ -0,0 +1,162 @@
+"""
+Tests unitaires pour utils/metadata_reader.py
+
+Ce module teste:
+- iter_json_records(): parcours incrémental (tableau ou objet englobant)
+- iter_metadata(): projection des champs
+- convert_metadata_to_columns() / load_metadata_columns(): colonnes typées
+"""
+import io
+import json
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.metadata_reader import (
+    convert_metadata_to_columns,
+    iter_json_records,
+    iter_metadata,
+    load_metadata_columns,
+)
+
+
+def _records(n: int = 50):
+    return [
+        {
+            "productid": 3800000000 + i,
+            "imageid": 1200000000 + i,
+            "prdtypecode": [10, 2583, 1560][i % 3],
+            "designation": f"Produit n°{i} — \"édition\" spéciale",
+            "score": i / 7,
+            "augmented": i % 2 == 0,
+            "tags": ["a", i],
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def metadata_file(tmp_path):
+    """Fichier JSON indenté: objet avec catégories puis enregistrements."""
+    path = tmp_path / "metadata_augmented.json"
+    document = {"categories": ["10", "2583", "1560"], "samples": _records()}
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+# =============================================================================
+# TESTS Parcours incrémental
+# =============================================================================
+@pytest.mark.unit
+class TestIterJsonRecords:
+    """Tests pour iter_json_records()."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 17, 4096])
+    def test_top_level_array(self, chunk_size):
+        """Un tableau au premier niveau est relu à l'identique, quelle que soit la taille des blocs."""
+        records = _records(20)
+        text = json.dumps(records, ensure_ascii=False)
+        assert list(iter_json_records(io.StringIO(text), chunk_size=chunk_size)) == records
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 64])
+    def test_numbers_split_across_chunks(self, chunk_size):
+        """Un nombre coupé par la fin d'un bloc n'est pas tronqué."""
+        text = "[123456789, 1.5e10, -42, true, null]"
+        assert list(iter_json_records(io.StringIO(text), chunk_size=chunk_size)) == \
+            [123456789, 1.5e10, -42, True, None]
+
+    def test_wrapped_array_first_list(self):
+        """Sans records_key, le premier champ tableau est utilisé."""
+        text = json.dumps({"version": 2, "samples": [{"a": 1}, {"a": 2}]})
+        assert list(iter_json_records(io.StringIO(text), chunk_size=4)) == [{"a": 1}, {"a": 2}]
+
+    def test_records_key_skips_other_arrays(self):
+        """records_key ignore les autres tableaux."""
+        text = json.dumps({"categories": ["10"], "samples": [{"a": 1}]})
+        assert list(iter_json_records(io.StringIO(text), records_key="samples")) == [{"a": 1}]
+
+    def test_empty_array(self):
+        """Un tableau vide ne produit rien."""
+        assert list(iter_json_records(io.StringIO(" [ ] "))) == []
+
+    def test_invalid_documents_raise(self):
+        """Documents mal formés ou sans tableau: erreur."""
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO('"texte"')))
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO('{"a": 1}')))
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO('[{"a": 1} {"a": 2}]')))
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO('[{"a": 1')))
+
+    def test_is_lazy(self):
+        """Le premier enregistrement est produit sans lire tout le fichier."""
+        text = json.dumps(_records(2000))
+        fp = io.StringIO(text)
+        first = next(iter_json_records(fp, chunk_size=1024))
+        assert first["productid"] == 3800000000
+        assert fp.tell() < len(text) // 10
+
+
+# =============================================================================
+# TESTS Métadonnées
+# =============================================================================
+@pytest.mark.unit
+class TestMetadata:
+    """Tests pour iter_metadata() et la conversion en colonnes."""
+
+    def test_iter_metadata_fields(self, metadata_file):
+        """La projection ne garde que les champs demandés."""
+        records = list(iter_metadata(metadata_file, fields=["productid", "absent"]))
+        assert len(records) == 50
+        assert records[1] == {"productid": 3800000001, "absent": None}
+
+    def test_matches_json_load(self, metadata_file):
+        """Les enregistrements sont ceux de json.load()."""
+        expected = json.loads(metadata_file.read_text(encoding="utf-8"))["samples"]
+        assert list(iter_metadata(metadata_file)) == expected
+
+    def test_columns_typed(self, metadata_file, tmp_path):
+        """Chaque champ devient une colonne NumPy typée."""
+        output = tmp_path / "columns.npz"
+        report = convert_metadata_to_columns(metadata_file, output)
+        columns = load_metadata_columns(output)
+
+        assert report == {"records": 50, "fields": 7}
+        assert columns["productid"].dtype == np.int64
+        assert columns["score"].dtype == np.float64
+        assert columns["augmented"].dtype == bool
+        assert columns["designation"][3] == "Produit n°3 — \"édition\" spéciale"
+        assert json.loads(columns["tags"][4]) == ["a", 4]
+        np.testing.assert_array_equal(columns["prdtypecode"][:3], [10, 2583, 1560])
+
+    def test_load_selected_columns(self, metadata_file, tmp_path):
+        """Seules les colonnes demandées sont chargées."""
+        output = tmp_path / "columns.npz"
+        convert_metadata_to_columns(metadata_file, output, fields=["productid", "prdtypecode"])
+        columns = load_metadata_columns(output, fields=["prdtypecode"])
+        assert list(columns) == ["prdtypecode"]
+        assert len(columns["prdtypecode"]) == 50
+        with pytest.raises(KeyError):
+            load_metadata_columns(output, fields=["designation"])
+
+    def test_missing_values(self, tmp_path):
+        """Entiers manquants -> NaN, chaînes manquantes -> ""."""
+        source = tmp_path / "meta.json"
+        source.write_text(json.dumps([{"id": 1, "name": "a"}, {"id": None}]), encoding="utf-8")
+        output = tmp_path / "columns.npz"
+        convert_metadata_to_columns(source, output)
+        columns = load_metadata_columns(output)
+
+        assert np.isnan(columns["id"][1])
+        assert columns["name"].tolist() == ["a", ""]
+
+    def test_missing_columns_file_raises(self, tmp_path):
+        """Sans conversion préalable: FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_metadata_columns(tmp_path / "absent.npz")
@@ -7,7 +7,16 @@ Ce module teste:
 - ClassificationResult: structure des résultats
 - TEXT_MODELS et IMAGE_MODELS: registres de modèles
 - MultiModelClassifier: comparaison multi-modèles
+- predict_batch(): génération vectorisée des lots
+- Exécution parallèle et prétraitement partagé des comparaisons
+- Simulation de la latence et de la mémoire des modèles
 """
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
 import pytest
 import sys
 from pathlib import Path
@@ -16,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from utils.mock_classifier import (
     DemoClassifier,
+    MockClassifier,
     MultiModelClassifier,
     ClassificationResult,
     ModelConfig,
@@ -23,8 +33,29 @@ from utils.mock_classifier import (
     IMAGE_MODELS,
     get_available_text_models,
     get_available_image_models,
+    get_shared_comparison_executor,
 )
 from utils.category_mapping import CATEGORY_MAPPING
+from utils import mock_classifier
+from utils.image_utils import compute_image_fingerprint
+from utils.model_interface import PreparedInput
+from utils.model_registry import ModelRegistry
+
+
+class _SlowDemoClassifier(DemoClassifier):
+    """DemoClassifier qui attend un délai fixe avant de répondre."""
+
+    def __init__(self, delay_s: float, **kwargs):
+        super().__init__(**kwargs)
+        self._delay_s = delay_s
+
+    def predict(self, image=None, text=None, top_k=5):
+        time.sleep(self._delay_s)
+        return super().predict(image=image, text=text, top_k=top_k)
+
+    def predict_prepared(self, prepared, top_k=5):
+        time.sleep(self._delay_s)
+        return super().predict_prepared(prepared, top_k=top_k)
 
 
 # =============================================================================
@@ -373,6 +404,168 @@ class TestDemoClassifierModels:
         assert len(predictions) == 3
 
 
+# =============================================================================
+# TESTS Génération vectorisée par lots
+# =============================================================================
+@pytest.mark.unit
+class TestMockClassifierBatch:
+    """Tests de predict_batch() et generate_probability_matrix()."""
+
+    def test_batch_matches_single_predictions(self, sample_image):
+        """Un produit donne le même résultat seul ou dans un lot."""
+        clf = MockClassifier(model_config=TEXT_MODELS["camembert"])
+        texts = [f"produit numéro {i}" for i in range(20)]
+        images = [None] * 19 + [sample_image]
+
+        batch = clf.predict_batch(images=images, texts=texts)
+        for image, text, result in zip(images, texts, batch):
+            single = clf.predict(image=image, text=text)
+            assert result.category == single.category
+            np.testing.assert_allclose(result.raw_probabilities, single.raw_probabilities)
+            assert result.source == single.source
+
+    def test_result_independent_of_batch_composition(self):
+        """Le résultat d'une ligne ne dépend pas des autres lignes du lot."""
+        clf = MockClassifier()
+        alone = clf.predict_batch(texts=["produit A"])[0]
+        mixed = clf.predict_batch(texts=["produit B", "produit A", "produit C"])[1]
+        np.testing.assert_allclose(alone.raw_probabilities, mixed.raw_probabilities)
+
+    def test_matrix_shape_and_normalization(self):
+        """La matrice est (N, 27) et chaque ligne somme à 1."""
+        clf = MockClassifier(model_config=IMAGE_MODELS["vgg16_svm"])
+        probabilities = clf.generate_probability_matrix(np.arange(1000, dtype=np.uint64))
+
+        assert probabilities.shape == (1000, 27)
+        assert np.all(probabilities >= 0)
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+
+    @pytest.mark.parametrize("model_key", list(TEXT_MODELS))
+    def test_confidence_profile_follows_config(self, model_key):
+        """La confiance max suit N(base_confidence, confidence_std) bornée."""
+        config = TEXT_MODELS[model_key]
+        clf = MockClassifier(model_config=config)
+        seeds = np.arange(5000, dtype=np.uint64) * np.uint64(2654435761)
+        confidences = clf.generate_probability_matrix(seeds).max(axis=1)
+
+        assert confidences.min() >= 0.4 - 1e-9
+        assert confidences.max() <= 0.98 + 1e-9
+        assert abs(confidences.mean() - config.base_confidence) < 0.02
+
+    def test_peaks_are_random(self):
+        """La classe prédite varie selon la graine."""
+        clf = MockClassifier()
+        top = clf.generate_probability_matrix(np.arange(2000, dtype=np.uint64)).argmax(axis=1)
+        assert len(np.unique(top)) == 27
+
+    def test_demo_batch_honors_keywords(self):
+        """Dans un lot, les mots-clés de DemoClassifier restent prioritaires."""
+        clf = DemoClassifier()
+        results = clf.predict_batch(texts=["Piscine gonflable", "xyz sans rapport", "Console"])
+
+        assert results[0].category == "2583"
+        assert results[0].source == "demo"
+        assert results[1].source.startswith("mock")
+        assert results[2].category == "2462"
+
+    def test_batch_requires_inputs(self):
+        """Un produit sans entrée fait échouer le lot."""
+        with pytest.raises(ValueError):
+            MockClassifier().predict_batch(texts=["ok", "  "])
+
+    def test_empty_batch(self):
+        """Un lot vide retourne une liste vide."""
+        assert MockClassifier().predict_batch(texts=[]) == []
+
+
+# =============================================================================
+# TESTS Simulation du coût
+# =============================================================================
+def _cost_config(**costs) -> ModelConfig:
+    """ModelConfig de test avec un profil de coût."""
+    return ModelConfig(
+        name="Coût", short_name="C", description="Modèle de test",
+        base_confidence=0.8, confidence_std=0.1, seed_offset=7, color="#000000",
+        **costs
+    )
+
+
+@pytest.mark.unit
+class TestMockCostSimulation:
+    """Tests de la latence et de la mémoire simulées."""
+
+    def test_cost_disabled_by_default(self, sample_text):
+        """Sans simulate_cost, le mock reste instantané."""
+        clf = MockClassifier(model_config=_cost_config(latency_ms=200, memory_mb=1))
+        start = time.perf_counter()
+        clf.predict(text=sample_text)
+
+        assert time.perf_counter() - start < 0.1
+        assert not clf.simulate_cost
+        assert clf.simulated_memory_bytes == 0
+
+    @pytest.mark.parametrize("cpu_bound", [False, True])
+    def test_single_prediction_latency(self, sample_text, cpu_bound):
+        """Une prédiction dure la latence configurée."""
+        clf = MockClassifier(model_config=_cost_config(latency_ms=30, cpu_bound=cpu_bound),
+                             simulate_cost=True)
+        start = time.perf_counter()
+        clf.predict(text=sample_text)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert 30 <= elapsed_ms < 60
+
+    def test_batch_latency_includes_per_item_cost(self):
+        """Un lot coûte latency_ms + per_item_latency_ms x taille."""
+        config = _cost_config(latency_ms=10, per_item_latency_ms=2)
+        clf = MockClassifier(model_config=config, simulate_cost=True)
+        start = time.perf_counter()
+        clf.predict_batch(texts=[f"produit {i}" for i in range(10)])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert config.expected_latency_ms(10) == pytest.approx(30)
+        assert 30 <= elapsed_ms < 60
+
+    def test_latency_distribution(self):
+        """La latence est log-normale autour de la médiane configurée."""
+        clf = MockClassifier(model_config=_cost_config(latency_ms=50, latency_sigma=0.3),
+                             simulate_cost=True)
+        samples = np.array([clf.sample_latency_ms() for _ in range(2000)])
+
+        assert np.median(samples) == pytest.approx(50, rel=0.05)
+        assert np.std(np.log(samples)) == pytest.approx(0.3, rel=0.1)
+
+    def test_memory_footprint_allocated(self):
+        """L'empreinte mémoire est réellement allouée et visible du registre."""
+        from utils.model_registry import estimate_memory_footprint
+
+        clf = MockClassifier(model_config=_cost_config(memory_mb=2), simulate_cost=True)
+        assert clf.simulated_memory_bytes == 2 * 2 ** 20
+        assert estimate_memory_footprint(clf) >= 2 * 2 ** 20
+
+    def test_predictions_unchanged_by_cost(self, sample_text):
+        """La simulation du coût ne change pas les prédictions."""
+        config = _cost_config(latency_ms=1)
+        plain = MockClassifier(model_config=config).predict(text=sample_text)
+        costly = MockClassifier(model_config=config, simulate_cost=True).predict(text=sample_text)
+        np.testing.assert_allclose(plain.raw_probabilities, costly.raw_probabilities)
+
+    def test_builtin_models_have_cost_profiles(self):
+        """Les modèles fournis déclarent une latence et une empreinte mémoire."""
+        for config in list(TEXT_MODELS.values()) + list(IMAGE_MODELS.values()):
+            assert config.latency_ms > 0
+            assert config.memory_mb > 0
+
+    def test_demo_keywords_also_pay_cost(self):
+        """Les prédictions par mot-clé de DemoClassifier subissent aussi la latence."""
+        clf = DemoClassifier(model_config=_cost_config(latency_ms=30), simulate_cost=True)
+        start = time.perf_counter()
+        result = clf.predict(text="piscine")
+
+        assert result.category == "2583"
+        assert time.perf_counter() - start >= 0.03
+
+
 # =============================================================================
 # TESTS MultiModelClassifier
 # =============================================================================
@@ -408,6 +601,101 @@ class TestMultiModelClassifier:
         for model_key, result in results.items():
             assert_valid_prediction(result)
 
+    def test_results_carry_latency(self, multi_model_classifier, sample_text):
+        """Chaque résultat porte sa durée d'exécution."""
+        results = multi_model_classifier.predict_all_text_models(sample_text)
+        assert all(r.latency_ms is not None and r.latency_ms >= 0 for r in results.values())
+
+    def test_results_match_direct_predictions(self, multi_model_classifier, sample_image):
+        """L'exécution parallèle donne les mêmes résultats qu'un appel direct."""
+        results = multi_model_classifier.predict_all_image_models(sample_image)
+        for model_id, result in results.items():
+            direct = multi_model_classifier.get_image_classifier(model_id).predict(image=sample_image)
+            assert result.category == direct.category
+            assert result.confidence == pytest.approx(direct.confidence)
+
+    def test_results_keep_model_order(self, multi_model_classifier, sample_text):
+        """Les résultats suivent l'ordre de déclaration des modèles."""
+        results = multi_model_classifier.predict_all_text_models(sample_text)
+        assert list(results) == list(TEXT_MODELS)
+
+    def test_models_run_in_parallel(self, sample_text):
+        """La latence suit le modèle le plus lent, pas la somme."""
+        registry = ModelRegistry()
+        for model_id, config in TEXT_MODELS.items():
+            registry.register(model_id, partial(_SlowDemoClassifier, 0.2, model_config=config))
+        multi = MultiModelClassifier(registry=registry)
+        multi.predict_all_text_models(sample_text)  # Chargement des modèles
+
+        start = time.perf_counter()
+        multi.predict_all_text_models(sample_text)
+        elapsed = time.perf_counter() - start
+        multi.close()
+
+        assert elapsed < 0.45, f"Modèles exécutés en série: {elapsed:.2f}s"
+
+    def test_instances_share_one_pool(self, sample_text):
+        """Créer des comparateurs ne crée pas de nouveaux threads."""
+        MultiModelClassifier().predict_all_text_models(sample_text)
+        threads_before = threading.active_count()
+        for _ in range(5):
+            multi = MultiModelClassifier()
+            multi.predict_all_text_models(sample_text)
+            assert multi._executor is get_shared_comparison_executor()
+        assert threading.active_count() <= threads_before
+
+    def test_caller_executor(self, sample_text):
+        """Un pool fourni par l'appelant est utilisé et n'est pas arrêté par close()."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            multi = MultiModelClassifier(executor=executor)
+            multi.predict_all_text_models(sample_text)
+            multi.close()
+            assert executor.submit(lambda: 1).result() == 1
+
+    def test_prepared_input(self, sample_image):
+        """PreparedInput normalise le texte et conserve l'empreinte fournie."""
+        fingerprint = compute_image_fingerprint(sample_image)
+        prepared = PreparedInput.from_inputs(
+            image=sample_image, text="  Console  ", image_fingerprint=fingerprint
+        )
+        assert prepared.text == "Console"
+        assert prepared.normalized_text == "console"
+        assert prepared.image_fingerprint == fingerprint
+
+        with pytest.raises(ValueError):
+            PreparedInput.from_inputs(text="   ")
+
+    @pytest.mark.parametrize("classifier_cls", [MockClassifier, DemoClassifier])
+    def test_predict_prepared_matches_predict(self, classifier_cls, sample_image):
+        """predict_prepared() donne le même résultat que predict()."""
+        classifier = classifier_cls(model_config=IMAGE_MODELS["resnet50_svm"])
+        prepared = PreparedInput.from_inputs(
+            image=sample_image, image_fingerprint=compute_image_fingerprint(sample_image)
+        )
+        direct = classifier.predict(image=sample_image)
+        shared = classifier.predict_prepared(prepared)
+        assert shared.category == direct.category
+        np.testing.assert_array_equal(shared.raw_probabilities, direct.raw_probabilities)
+
+        text = PreparedInput.from_inputs(text="  Piscine gonflable  ")
+        assert classifier.predict_prepared(text).top_k_predictions == (
+            classifier.predict(text="  Piscine gonflable  ").top_k_predictions
+        )
+
+    def test_predict_prepared_reuses_fingerprint(
+        self, sample_image, monkeypatch, assert_valid_prediction
+    ):
+        """L'empreinte fournie par PreparedInput n'est pas recalculée."""
+        prepared = PreparedInput.from_inputs(
+            image=sample_image, image_fingerprint=compute_image_fingerprint(sample_image)
+        )
+
+        def fail(image):
+            raise AssertionError("empreinte recalculée")
+
+        monkeypatch.setattr(mock_classifier, "compute_image_fingerprint", fail)
+        assert_valid_prediction(DemoClassifier().predict_prepared(prepared))
+
 
 # =============================================================================
 # TESTS Helper Functions
@@ -0,0 +1,321 @@
+"""
+Tests unitaires pour utils/model_registry.py
+
+Ce module teste:
+- ModelRegistry: chargement paresseux, éviction LRU, statistiques
+- estimate_memory_footprint(): estimation de la taille résidente
+- Intégration avec MultiModelClassifier
+"""
+import gc
+import pytest
+import sys
+import threading
+import weakref
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.model_registry import ModelRegistry, RegisteredClassifier, estimate_memory_footprint
+from utils.mock_classifier import (
+    DemoClassifier,
+    MultiModelClassifier,
+    TEXT_MODELS,
+    IMAGE_MODELS,
+)
+
+
+MB = 1024 * 1024
+
+
+class _SizedClassifier(DemoClassifier):
+    """DemoClassifier portant un buffer de taille contrôlée."""
+
+    def __init__(self, size_mb: float):
+        super().__init__()
+        self.weights = np.zeros(int(size_mb * MB), dtype=np.uint8)
+
+
+def _counting_loader(counter: dict, model_id: str, size_mb: float = 1.0):
+    def _load():
+        counter[model_id] = counter.get(model_id, 0) + 1
+        return _SizedClassifier(size_mb)
+    return _load
+
+
+# =============================================================================
+# TESTS estimate_memory_footprint()
+# =============================================================================
+@pytest.mark.unit
+class TestEstimateMemoryFootprint:
+    """Tests pour estimate_memory_footprint()."""
+
+    def test_counts_numpy_buffers(self):
+        """La taille des buffers numpy est prise en compte."""
+        clf = _SizedClassifier(2.0)
+        assert estimate_memory_footprint(clf) >= 2 * MB
+
+    def test_shared_buffer_counted_once(self):
+        """Un buffer partagé (vue) n'est compté qu'une fois."""
+        base = np.zeros(MB, dtype=np.uint8)
+        single = estimate_memory_footprint({"a": base})
+        shared = estimate_memory_footprint({"a": base, "b": base[: MB // 2]})
+        assert shared < single + MB // 4
+
+
+# =============================================================================
+# TESTS ModelRegistry
+# =============================================================================
+@pytest.mark.unit
+class TestModelRegistry:
+    """Tests pour ModelRegistry."""
+
+    def test_register_does_not_load(self):
+        """L'enregistrement ne déclenche pas de chargement."""
+        loads = {}
+        registry = ModelRegistry(memory_budget_mb=None)
+        registry.register("a", _counting_loader(loads, "a"))
+
+        assert "a" in registry
+        assert not registry.is_loaded("a")
+        assert loads == {}
+
+    def test_get_loads_once(self):
+        """Le modèle est chargé au premier accès puis réutilisé."""
+        loads = {}
+        registry = ModelRegistry(memory_budget_mb=None)
+        registry.register("a", _counting_loader(loads, "a"))
+
+        first = registry.get("a")
+        second = registry.get("a")
+
+        assert first is second
+        assert loads == {"a": 1}
+        stats = registry.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["load_times_s"]["a"] >= 0
+
+    def test_unknown_model_raises(self):
+        """Un modèle non enregistré lève KeyError."""
+        registry = ModelRegistry(memory_budget_mb=None)
+        with pytest.raises(KeyError):
+            registry.get("missing")
+
+    def test_lru_eviction_when_over_budget(self):
+        """Le modèle le moins récemment utilisé est évincé."""
+        loads = {}
+        registry = ModelRegistry(memory_budget_mb=2.5)
+        for model_id in ("a", "b", "c"):
+            registry.register(model_id, _counting_loader(loads, model_id))
+
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")  # "b" devient le moins récent
+        registry.get("c")
+
+        assert registry.loaded_models == ["a", "c"]
+        assert registry.get_stats()["evictions"] == 1
+
+    def test_evicted_model_is_reloaded(self):
+        """Un modèle évincé est rechargé au prochain accès."""
+        loads = {}
+        registry = ModelRegistry(memory_budget_mb=1.5)
+        registry.register("a", _counting_loader(loads, "a"))
+        registry.register("b", _counting_loader(loads, "b"))
+
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")
+
+        assert loads == {"a": 2, "b": 1}
+        assert registry.get_stats()["evictions"] == 2
+
+    def test_requested_model_kept_even_if_over_budget(self):
+        """Le modèle demandé n'est jamais évincé, même trop gros."""
+        loads = {}
+        registry = ModelRegistry(memory_budget_mb=0.5)
+        registry.register("big", _counting_loader(loads, "big", size_mb=2.0))
+
+        clf = registry.get("big")
+        assert clf is not None
+        assert registry.is_loaded("big")
+
+    def test_shrinking_budget_evicts(self):
+        """Réduire le budget évince immédiatement."""
+        loads = {}
+        registry = ModelRegistry(memory_budget_mb=None)
+        for model_id in ("a", "b", "c"):
+            registry.register(model_id, _counting_loader(loads, model_id))
+            registry.get(model_id)
+
+        registry.memory_budget_mb = 1.5
+        assert registry.loaded_models == ["c"]
+
+    def test_unload_and_clear(self):
+        """unload() et clear() libèrent les modèles."""
+        loads = {}
+        registry = ModelRegistry(memory_budget_mb=None)
+        registry.register("a", _counting_loader(loads, "a"))
+        registry.register("b", _counting_loader(loads, "b"))
+        registry.get("a")
+        registry.get("b")
+
+        assert registry.unload("a") is True
+        assert registry.unload("a") is False
+        registry.clear()
+        assert registry.loaded_models == []
+        assert registry.memory_usage_bytes == 0
+
+
+# =============================================================================
+# TESTS Chargements concurrents
+# =============================================================================
+@pytest.mark.unit
+class TestConcurrentLoading:
+    """Le chargement s'exécute hors du verrou du registre."""
+
+    def _blocking_loader(self, counter: dict, release: threading.Event):
+        started = threading.Event()
+
+        def _load():
+            counter["slow"] = counter.get("slow", 0) + 1
+            started.set()
+            release.wait(5)
+            return _SizedClassifier(0.1)
+        return _load, started
+
+    def test_slow_load_does_not_block_other_models(self):
+        """Pendant un chargement lent, les autres modèles restent accessibles."""
+        loads, release = {}, threading.Event()
+        registry = ModelRegistry(memory_budget_mb=None)
+        slow_loader, started = self._blocking_loader(loads, release)
+        registry.register("slow", slow_loader)
+        registry.register("a", _counting_loader(loads, "a"))
+        registry.register("b", _counting_loader(loads, "b"))
+        loaded_a = registry.get("a")
+
+        thread = threading.Thread(target=registry.get, args=("slow",))
+        thread.start()
+        assert started.wait(5)
+        try:
+            assert registry.get("a") is loaded_a
+            assert registry.get("b") is not None
+            assert not registry.is_loaded("slow")
+        finally:
+            release.set()
+            thread.join(5)
+        assert registry.is_loaded("slow")
+
+    def test_concurrent_gets_share_one_load(self):
+        """Des appels concurrents pour un même modèle attendent un seul chargement."""
+        loads, release = {}, threading.Event()
+        registry = ModelRegistry(memory_budget_mb=None)
+        slow_loader, started = self._blocking_loader(loads, release)
+        registry.register("slow", slow_loader)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.get("slow")))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        assert started.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert loads == {"slow": 1}
+        assert len(results) == 4 and all(r is results[0] for r in results)
+
+    def test_failed_load_is_retried(self):
+        """Un chargement en échec est propagé puis retenté au prochain accès."""
+        attempts = []
+
+        def _flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("artefact indisponible")
+            return _SizedClassifier(0.1)
+
+        registry = ModelRegistry(memory_budget_mb=None)
+        registry.register("flaky", _flaky)
+        with pytest.raises(RuntimeError):
+            registry.get("flaky")
+        assert registry.get("flaky") is not None
+        assert len(attempts) == 2
+
+
+# =============================================================================
+# TESTS RegisteredClassifier
+# =============================================================================
+@pytest.mark.unit
+class TestRegisteredClassifier:
+    """Une poignée résout le modèle dans le registre à chaque appel."""
+
+    def test_predicts_like_model(self, sample_text):
+        """La poignée donne les prédictions du modèle enregistré."""
+        registry = ModelRegistry(memory_budget_mb=None)
+        registry.register("camembert", lambda: DemoClassifier(model_config=TEXT_MODELS["camembert"]))
+        handle = registry.get_handle("camembert")
+
+        assert isinstance(handle, RegisteredClassifier)
+        assert not registry.is_loaded("camembert")
+        direct = registry.get("camembert")
+        assert handle.predict(text=sample_text).category == direct.predict(text=sample_text).category
+        assert handle.model_identity == direct.model_identity
+
+    def test_evicted_model_is_released(self, sample_text):
+        """Une poignée conservée ne retient pas un modèle évincé."""
+        loads = {}
+        registry = ModelRegistry(memory_budget_mb=1.5)
+        registry.register("a", _counting_loader(loads, "a"))
+        registry.register("b", _counting_loader(loads, "b"))
+        handle = registry.get_handle("a")
+
+        handle.predict(text=sample_text)
+        evicted = weakref.ref(registry.get("a"))
+        registry.get("b")  # Évince "a"
+        gc.collect()
+        assert evicted() is None
+
+        handle.predict(text=sample_text)
+        assert loads == {"a": 2, "b": 1}
+        assert registry.loaded_models == ["a"]
+
+    def test_unknown_model_raises(self):
+        """Une poignée sur un modèle non enregistré lève KeyError."""
+        with pytest.raises(KeyError):
+            ModelRegistry(memory_budget_mb=None).get_handle("missing")
+
+
+# =============================================================================
+# TESTS Intégration MultiModelClassifier
+# =============================================================================
+@pytest.mark.unit
+class TestMultiModelClassifierRegistry:
+    """MultiModelClassifier charge les modèles à la demande."""
+
+    def test_no_model_loaded_at_init(self):
+        """Aucun modèle n'est construit à l'initialisation."""
+        multi = MultiModelClassifier()
+        assert multi.registry.loaded_models == []
+        assert len(multi.registry) == len(TEXT_MODELS) + len(IMAGE_MODELS)
+
+    def test_text_comparison_loads_only_text_models(self, sample_text):
+        """Comparer les modèles texte ne charge pas les modèles image."""
+        multi = MultiModelClassifier()
+        multi.predict_all_text_models(sample_text)
+
+        assert set(multi.registry.loaded_models) == set(TEXT_MODELS)
+        assert multi.get_registry_stats()["loads"] == len(TEXT_MODELS)
+
+    def test_unknown_model_still_raises_value_error(self):
+        """Les accesseurs lèvent toujours ValueError pour un id inconnu."""
+        multi = MultiModelClassifier()
+        with pytest.raises(ValueError):
+            multi.get_text_classifier("resnet50_svm")
+        with pytest.raises(ValueError):
+            multi.get_image_classifier("unknown")
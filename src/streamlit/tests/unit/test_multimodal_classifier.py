@@ -0,0 +1,345 @@
+"""
+Tests unitaires pour utils/multimodal_classifier.py
+
+Ce module teste:
+- MultimodalClassifier: fusion pondérée des branches texte et image
+- Exécution concurrente des branches
+- Échéance (deadline_ms) et dégradation vers une seule branche
+- Pool borné: refus des branches quand il est saturé
+- Helpers BaseClassifier de conversion résultat <-> probabilités
+"""
+import time
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config import MODEL_CONFIG
+from utils.model_interface import ClassificationResult
+from utils.mock_classifier import DemoClassifier, TEXT_MODELS, IMAGE_MODELS
+from utils.multimodal_classifier import (
+    BoundedExecutor,
+    FusionSaturatedError,
+    MultimodalClassifier,
+)
+from utils.prediction_cache import CachedClassifier, PredictionCache
+
+
+class _SlowClassifier(DemoClassifier):
+    """DemoClassifier qui attend un délai fixe avant de répondre."""
+
+    def __init__(self, delay_s: float, **kwargs):
+        super().__init__(**kwargs)
+        self._delay_s = delay_s
+
+    def predict(self, image=None, text=None, top_k=5):
+        time.sleep(self._delay_s)
+        return super().predict(image=image, text=text, top_k=top_k)
+
+
+class _RecordingClassifier(DemoClassifier):
+    """DemoClassifier qui enregistre les chemins chargés."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.loaded = []
+
+    def load_model(self, path):
+        self.loaded.append(path)
+        super().load_model(path)
+
+
+@pytest.fixture
+def fusion_classifier():
+    clf = MultimodalClassifier(
+        DemoClassifier(model_config=TEXT_MODELS["camembert"]),
+        DemoClassifier(model_config=IMAGE_MODELS["resnet50_svm"]),
+    )
+    yield clf
+    clf.close()
+
+
+# =============================================================================
+# TESTS Fusion
+# =============================================================================
+@pytest.mark.unit
+class TestMultimodalFusion:
+    """Tests de la fusion pondérée."""
+
+    def test_default_weights_from_config(self, fusion_classifier):
+        """Les poids par défaut viennent de MODEL_CONFIG (image, texte)."""
+        image_w, text_w = MODEL_CONFIG["fusion_weights"]
+        total = image_w + text_w
+        assert fusion_classifier.fusion_weights == pytest.approx((image_w / total, text_w / total))
+
+    def test_multimodal_result_is_valid(self, fusion_classifier, sample_text, sample_image,
+                                        assert_valid_prediction):
+        """Le résultat fusionné est une prédiction valide."""
+        result = fusion_classifier.predict(image=sample_image, text=sample_text)
+        assert_valid_prediction(result)
+        assert result.source == "multimodal"
+
+    def test_probabilities_are_weighted_average(self, fusion_classifier, sample_text, sample_image):
+        """Les probabilités fusionnées sont la moyenne pondérée des branches."""
+        text_p = fusion_classifier.text_classifier.predict(text=sample_text).raw_probabilities
+        image_p = fusion_classifier.image_classifier.predict(image=sample_image).raw_probabilities
+        image_w, text_w = fusion_classifier.fusion_weights
+
+        expected = image_w * image_p + text_w * text_p
+        expected = expected / expected.sum()
+
+        result = fusion_classifier.predict(image=sample_image, text=sample_text)
+        np.testing.assert_allclose(result.raw_probabilities, expected)
+        assert result.raw_probabilities.sum() == pytest.approx(1.0)
+
+    def test_text_only_uses_text_branch(self, fusion_classifier, sample_text):
+        """Sans image, seule la branche texte est utilisée."""
+        result = fusion_classifier.predict(text=sample_text)
+        expected = fusion_classifier.text_classifier.predict(text=sample_text)
+        assert result.category == expected.category
+        assert result.source == expected.source
+
+    def test_image_only_uses_image_branch(self, fusion_classifier, sample_image):
+        """Sans texte, seule la branche image est utilisée."""
+        result = fusion_classifier.predict(image=sample_image)
+        expected = fusion_classifier.image_classifier.predict(image=sample_image)
+        assert result.category == expected.category
+
+    def test_no_input_raises(self, fusion_classifier):
+        """Sans entrée, ValueError est levée."""
+        with pytest.raises(ValueError):
+            fusion_classifier.predict(text="  ")
+
+    def test_invalid_weights_raise(self):
+        """Des poids négatifs ou nuls sont refusés."""
+        with pytest.raises(ValueError):
+            MultimodalClassifier(DemoClassifier(), DemoClassifier(), fusion_weights=(0, 0))
+
+    def test_load_model_delegates_to_branches(self, tmp_path):
+        """load_model() charge chaque branche depuis son sous-dossier."""
+        text_clf, image_clf = _RecordingClassifier(), _RecordingClassifier()
+        MultimodalClassifier(text_clf, image_clf).load_model(str(tmp_path))
+        assert text_clf.loaded == [str(tmp_path / "text")]
+        assert image_clf.loaded == [str(tmp_path / "image")]
+
+    def test_is_ready(self, fusion_classifier):
+        """Prêt si les deux branches le sont."""
+        assert fusion_classifier.is_ready
+
+
+# =============================================================================
+# TESTS Concurrence
+# =============================================================================
+@pytest.mark.unit
+class TestMultimodalConcurrency:
+    """Les branches s'exécutent en parallèle."""
+
+    def test_latency_close_to_slowest_branch(self, sample_text, sample_image):
+        """La latence suit la branche la plus lente, pas la somme."""
+        clf = MultimodalClassifier(_SlowClassifier(0.2), _SlowClassifier(0.2))
+        clf.predict(text=sample_text, image=sample_image)  # Démarre les workers
+
+        start = time.perf_counter()
+        clf.predict(text=sample_text, image=sample_image)
+        elapsed = time.perf_counter() - start
+        clf.close()
+
+        assert elapsed < 0.35, f"Branches exécutées en série: {elapsed:.2f}s"
+
+
+# =============================================================================
+# TESTS Échéance
+# =============================================================================
+@pytest.mark.unit
+class TestMultimodalDeadline:
+    """Tests de la prédiction sous échéance."""
+
+    def test_slow_image_degrades_to_text(self, sample_text, sample_image):
+        """Une branche image en retard donne un résultat texte seul, marqué partiel."""
+        clf = MultimodalClassifier(DemoClassifier(), _SlowClassifier(0.5))
+        start = time.perf_counter()
+        result = clf.predict(text=sample_text, image=sample_image, deadline_ms=100)
+        elapsed = time.perf_counter() - start
+        clf.close()
+
+        assert elapsed < 0.3
+        assert result.source == "multimodal_partial_text"
+        assert result.is_partial
+        assert result.category == DemoClassifier().predict(text=sample_text).category
+
+    def test_slow_text_degrades_to_image(self, sample_text, sample_image):
+        """Une branche texte en retard donne un résultat image seul."""
+        clf = MultimodalClassifier(_SlowClassifier(0.5), DemoClassifier())
+        result = clf.predict(text=sample_text, image=sample_image, deadline_ms=100)
+        clf.close()
+
+        assert result.source == "multimodal_partial_image"
+
+    def test_no_branch_in_time_raises(self, sample_text):
+        """Sans aucune branche terminée, TimeoutError est levée."""
+        clf = MultimodalClassifier(_SlowClassifier(0.5), DemoClassifier())
+        with pytest.raises(TimeoutError):
+            clf.predict(text=sample_text, deadline_ms=50)
+        assert clf.get_stats()["timeouts"] == 1
+        clf.close()
+
+    def test_fast_branches_meet_deadline(self, fusion_classifier, sample_text, sample_image):
+        """Des branches rapides donnent un résultat fusionné complet."""
+        result = fusion_classifier.predict(text=sample_text, image=sample_image, deadline_ms=1000)
+        assert result.source == "multimodal"
+        assert not result.is_partial
+
+    def test_deadline_misses_are_counted(self, sample_text, sample_image):
+        """Les dépassements sont comptabilisés par branche conservée."""
+        clf = MultimodalClassifier(DemoClassifier(), _SlowClassifier(0.3), deadline_ms=50)
+        clf.predict(text=sample_text, image=sample_image)
+        clf.predict(text=sample_text)
+        stats = clf.get_stats()
+        clf.close()
+
+        assert stats["predictions"] == 2
+        assert stats["deadline_misses"] == 1
+        assert stats["partial_results"]["text"] == 1
+        assert stats["deadline_miss_rate"] == pytest.approx(0.5)
+
+    def test_default_deadline_from_config(self, fusion_classifier):
+        """L'échéance par défaut vient de MODEL_CONFIG."""
+        assert fusion_classifier.deadline_ms == MODEL_CONFIG["prediction_deadline_ms"]
+
+    def test_invalid_deadline_raises(self, fusion_classifier, sample_text):
+        """Une échéance négative ou nulle est refusée."""
+        with pytest.raises(ValueError):
+            fusion_classifier.predict(text=sample_text, deadline_ms=0)
+
+    def test_none_disables_deadline(self, sample_text, sample_image):
+        """deadline_ms=None désactive l'échéance, au constructeur comme à l'appel."""
+        clf = MultimodalClassifier(DemoClassifier(), _SlowClassifier(0.2), deadline_ms=None)
+        assert clf.deadline_ms is None
+        assert clf.predict(text=sample_text, image=sample_image).source == "multimodal"
+
+        clf = MultimodalClassifier(DemoClassifier(), _SlowClassifier(0.2), deadline_ms=50)
+        result = clf.predict(text=sample_text, image=sample_image, deadline_ms=None)
+        assert result.source == "multimodal"
+        assert clf.get_stats()["deadline_misses"] == 0
+
+    def test_abandoned_branches_do_not_starve_later_calls(self, sample_text, sample_image):
+        """Des branches abandonnées n'empêchent pas les appels suivants de répondre."""
+        clf = MultimodalClassifier(DemoClassifier(), _SlowClassifier(0.5), deadline_ms=100)
+        for _ in range(4):
+            start = time.perf_counter()
+            result = clf.predict(text=sample_text, image=sample_image)
+            assert time.perf_counter() - start < 0.3
+            assert result.source == "multimodal_partial_text"
+        assert clf.get_stats()["timeouts"] == 0
+
+    def test_cached_classifier_passes_deadline(self, sample_text, sample_image):
+        """CachedClassifier transmet deadline_ms au classifieur enveloppé."""
+        cache = PredictionCache(max_entries=8, ttl_s=60)
+        clf = MultimodalClassifier(DemoClassifier(), _SlowClassifier(0.3), deadline_ms=None)
+        result = CachedClassifier(clf, cache=cache).predict(
+            text=sample_text, image=sample_image, deadline_ms=50
+        )
+        assert result.source == "multimodal_partial_text"
+
+    def test_partial_results_are_not_cached(self, sample_text, sample_image):
+        """Un résultat partiel n'est pas mis en cache."""
+        cache = PredictionCache(max_entries=8, ttl_s=60)
+        clf = MultimodalClassifier(DemoClassifier(), _SlowClassifier(0.3), deadline_ms=50)
+        CachedClassifier(clf, cache=cache).predict(text=sample_text, image=sample_image)
+        clf.close()
+
+        assert len(cache) == 0
+
+
+# =============================================================================
+# TESTS Pool borné
+# =============================================================================
+@pytest.mark.unit
+class TestMultimodalSaturation:
+    """Le pool de fusion borne les branches en cours, abandonnées comprises."""
+
+    def test_saturated_pool_rejects_branches(self, sample_text, sample_image):
+        """Pool plein de branches abandonnées: les branches suivantes sont refusées."""
+        executor = BoundedExecutor(max_workers=1)
+        clf = MultimodalClassifier(
+            DemoClassifier(), _SlowClassifier(0.3), deadline_ms=50, executor=executor
+        )
+        with pytest.raises(TimeoutError):
+            clf.predict(image=sample_image)  # Branche abandonnée, place occupée
+
+        start = time.perf_counter()
+        with pytest.raises(FusionSaturatedError):
+            clf.predict(text=sample_text, image=sample_image)
+        assert time.perf_counter() - start < 0.1
+
+        stats = clf.get_stats()
+        assert stats["rejections"] == 2
+        assert stats["rejection_rate"] == pytest.approx(0.5)
+        executor.shutdown()
+
+    def test_rejected_branch_gives_partial_result(self, sample_text, sample_image):
+        """Une seule place libre: la branche refusée donne un résultat partiel."""
+        executor = BoundedExecutor(max_workers=2)
+        clf = MultimodalClassifier(
+            DemoClassifier(), _SlowClassifier(0.3), deadline_ms=50, executor=executor
+        )
+        with pytest.raises(TimeoutError):
+            clf.predict(image=sample_image)
+
+        result = clf.predict(text=sample_text, image=sample_image)
+        assert result.source == "multimodal_partial_text"
+        assert clf.get_stats()["rejections"] == 1
+        executor.shutdown()
+
+    def test_slots_released_when_branches_finish(self, sample_text, sample_image):
+        """Les places se libèrent à la fin des branches abandonnées."""
+        executor = BoundedExecutor(max_workers=1)
+        clf = MultimodalClassifier(
+            DemoClassifier(), _SlowClassifier(0.1), deadline_ms=20, executor=executor
+        )
+        with pytest.raises(TimeoutError):
+            clf.predict(image=sample_image)
+        time.sleep(0.2)
+        assert clf.predict(text=sample_text, deadline_ms=None).source == "demo"
+        executor.shutdown()
+
+    def test_invalid_max_workers(self):
+        """Un pool sans worker est refusé."""
+        with pytest.raises(ValueError):
+            BoundedExecutor(max_workers=0)
+
+
+# =============================================================================
+# TESTS Helpers BaseClassifier
+# =============================================================================
+@pytest.mark.unit
+class TestResultProbabilitiesHelpers:
+    """Tests des conversions résultat <-> probabilités."""
+
+    def test_reconstructs_missing_raw_probabilities(self):
+        """Sans raw_probabilities, le vecteur est reconstruit depuis le top-k."""
+        clf = DemoClassifier()
+        result = ClassificationResult(
+            category="2583",
+            confidence=0.7,
+            top_k_predictions=[("2583", 0.7), ("10", 0.2)],
+        )
+        probabilities = clf.result_to_probabilities(result)
+
+        assert probabilities.shape == (27,)
+        assert probabilities.sum() == pytest.approx(1.0)
+        assert probabilities[clf.CATEGORY_CODES.index("2583")] == pytest.approx(0.7)
+
+    def test_result_from_probabilities(self):
+        """Le résultat construit reprend la classe la plus probable."""
+        clf = DemoClassifier()
+        probabilities = np.full(27, 0.01)
+        probabilities[3] = 0.74
+        result = clf._result_from_probabilities(probabilities, top_k=3, source="test")
+
+        assert result.category == clf.CATEGORY_CODES[3]
+        assert result.confidence == pytest.approx(0.74)
+        assert len(result.top_k_predictions) == 3
@@ -0,0 +1,193 @@
+"""
+Tests unitaires pour utils/numpy_inference.py
+
+Ce module teste:
+- export_text_pipeline(): export d'un pipeline TF-IDF + modèle en .npz
+- NumpyTextClassifier: inférence NumPy pure équivalente à sklearn
+- Absence d'import de sklearn sur le chemin de service
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.numpy_inference import NumpyTextClassifier, export_text_pipeline
+
+
+TRAIN_TEXTS = [
+    ("console playstation 5 sony jeux vidéo", "2462"),
+    ("manette xbox sans fil console", "2462"),
+    ("jeu nintendo switch console portable", "2462"),
+    ("piscine gonflable ronde jardin été", "2583"),
+    ("pompe filtration piscine hors sol", "2583"),
+    ("bâche piscine rectangulaire", "2583"),
+    ("roman harry potter livre fantastique", "2403"),
+    ("livre de cuisine recettes françaises", "2403"),
+    ("bande dessinée tintin album livre", "2403"),
+]
+
+TEST_TEXTS = [
+    "Console de jeux Sony",
+    "piscine tubulaire ronde",
+    "Livre ROMAN policier",
+    "mot inconnu du vocabulaire",
+    "",
+]
+
+
+@pytest.fixture
+def sklearn_pipelines():
+    """Pipelines sklearn entraînés (ignorés si sklearn est absent)."""
+    pytest.importorskip("sklearn")
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.neighbors import NearestCentroid
+    from sklearn.pipeline import make_pipeline
+    from sklearn.svm import LinearSVC
+
+    texts = [t for t, _ in TRAIN_TEXTS]
+    labels = [int(c) for _, c in TRAIN_TEXTS]
+
+    pipelines = {
+        "svm": make_pipeline(TfidfVectorizer(), LinearSVC()),
+        "logreg_ngrams": make_pipeline(
+            TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, strip_accents="unicode",
+                            stop_words=["de", "du"]),
+            LogisticRegression(max_iter=500),
+        ),
+        "centroid": make_pipeline(TfidfVectorizer(norm="l1"), NearestCentroid()),
+    }
+    for pipeline in pipelines.values():
+        pipeline.fit(texts, labels)
+    return pipelines
+
+
+def _reference_scores(pipeline, texts):
+    """Scores sklearn de référence (distances négatives pour les centroïdes)."""
+    vectorizer, model = pipeline.steps[0][1], pipeline.steps[1][1]
+    X = vectorizer.transform(texts)
+    if hasattr(model, "coef_"):
+        return model.decision_function(X)
+    X = X.toarray()
+    return -((X[:, None, :] - model.centroids_[None, :, :]) ** 2).sum(axis=2)
+
+
+# =============================================================================
+# TESTS Export + inférence
+# =============================================================================
+@pytest.mark.unit
+class TestNumpyTextClassifier:
+    """Équivalence entre l'inférence NumPy et sklearn."""
+
+    @pytest.mark.parametrize("name", ["svm", "logreg_ngrams", "centroid"])
+    def test_scores_match_sklearn(self, tmp_path, sklearn_pipelines, name):
+        """Les scores NumPy reproduisent ceux du pipeline sklearn."""
+        pipeline = sklearn_pipelines[name]
+        path = export_text_pipeline(pipeline, tmp_path / f"{name}.npz")
+        clf = NumpyTextClassifier(path)
+
+        expected = _reference_scores(pipeline, TEST_TEXTS)
+        actual = np.vstack([clf.decision_scores(text) for text in TEST_TEXTS])
+        np.testing.assert_allclose(actual, expected, rtol=1e-4, atol=1e-4)
+
+    def test_vectorize_matches_tfidf(self, tmp_path, sklearn_pipelines):
+        """La représentation creuse est identique à TfidfVectorizer.transform."""
+        pipeline = sklearn_pipelines["logreg_ngrams"]
+        clf = NumpyTextClassifier(export_text_pipeline(pipeline, tmp_path / "p.npz"))
+        vectorizer = pipeline.steps[0][1]
+
+        for text in TEST_TEXTS:
+            expected = vectorizer.transform([text]).toarray()[0]
+            indices, values = clf.vectorize(text)
+            actual = np.zeros_like(expected)
+            actual[indices] = values
+            np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-6)
+
+    def test_predict_returns_same_category(self, tmp_path, sklearn_pipelines, assert_valid_prediction):
+        """La catégorie prédite est celle du pipeline sklearn."""
+        pipeline = sklearn_pipelines["svm"]
+        clf = NumpyTextClassifier(export_text_pipeline(pipeline, tmp_path / "svm.npz"))
+
+        for text in TEST_TEXTS[:3]:
+            result = clf.predict(text=text)
+            assert_valid_prediction(result)
+            assert result.category == str(pipeline.predict([text])[0])
+            assert result.source == "numpy_text"
+
+    @pytest.mark.parametrize("dtype", ["float16", "int8"])
+    def test_quantized_export_agrees(self, tmp_path, sklearn_pipelines, dtype):
+        """Un export quantifié garde les mêmes prédictions top-1."""
+        pipeline = sklearn_pipelines["svm"]
+        clf = NumpyTextClassifier(
+            export_text_pipeline(pipeline, tmp_path / "q.npz", weights_dtype=dtype)
+        )
+        for text, _ in TRAIN_TEXTS:
+            assert clf.predict(text=text).category == str(pipeline.predict([text])[0])
+
+
+# =============================================================================
+# TESTS Erreurs
+# =============================================================================
+@pytest.mark.unit
+class TestNumpyTextClassifierErrors:
+    """Cas d'erreur du chargement et de la prédiction."""
+
+    def test_not_ready_without_bundle(self):
+        """Sans bundle, le classifieur n'est pas prêt."""
+        clf = NumpyTextClassifier()
+        assert not clf.is_ready
+        with pytest.raises(RuntimeError):
+            clf.predict(text="console")
+
+    def test_missing_bundle_raises(self, tmp_path):
+        """Un bundle absent lève FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            NumpyTextClassifier(tmp_path / "missing.npz")
+
+    def test_invalid_bundle_raises(self, tmp_path):
+        """Un fichier qui n'est pas un bundle lève RuntimeError."""
+        path = tmp_path / "bad.npz"
+        np.savez(path, foo=np.zeros(3))
+        with pytest.raises(RuntimeError):
+            NumpyTextClassifier(path)
+
+    def test_text_required(self, tmp_path, sklearn_pipelines, sample_image):
+        """Le texte est obligatoire."""
+        clf = NumpyTextClassifier(export_text_pipeline(sklearn_pipelines["svm"], tmp_path / "s.npz"))
+        with pytest.raises(ValueError):
+            clf.predict(image=sample_image)
+
+    def test_unsupported_model_raises(self, tmp_path):
+        """Un modèle sans coef_ ni centroids_ n'est pas exportable."""
+        pytest.importorskip("sklearn")
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer().fit([t for t, _ in TRAIN_TEXTS])
+
+        class _Tree:
+            classes_ = np.array([10, 40])
+
+        with pytest.raises(ValueError):
+            export_text_pipeline((vectorizer, _Tree()), tmp_path / "x.npz")
+
+
+# =============================================================================
+# TESTS Chemin de service
+# =============================================================================
+@pytest.mark.unit
+def test_serving_path_does_not_import_sklearn(tmp_path, sklearn_pipelines):
+    """Charger et utiliser le bundle n'importe ni sklearn ni scipy."""
+    path = export_text_pipeline(sklearn_pipelines["svm"], tmp_path / "svm.npz")
+    code = (
+        "import sys\n"
+        f"sys.path.insert(0, {str(Path(__file__).parent.parent.parent)!r})\n"
+        "from utils.numpy_inference import NumpyTextClassifier\n"
+        f"NumpyTextClassifier({str(path)!r}).predict(text='console sony')\n"
+        "assert 'sklearn' not in sys.modules, 'sklearn importé'\n"
+        "assert 'scipy' not in sys.modules, 'scipy importé'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
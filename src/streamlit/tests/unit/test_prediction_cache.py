@@ -0,0 +1,256 @@
+"""
+Tests unitaires pour utils/prediction_cache.py
+
+Ce module teste:
+- make_cache_key(): identité du modèle, texte, image et top_k
+- PredictionCache: TTL, éviction LRU, statistiques, concurrence
+- CachedClassifier: réutilisation des résultats entre sessions
+"""
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.image_utils import compute_image_digest
+from utils.mock_classifier import DemoClassifier, TEXT_MODELS
+from utils.model_interface import ClassificationResult
+from utils.prediction_cache import (
+    PredictionCache,
+    CachedClassifier,
+    make_cache_key,
+    hash_text,
+    get_shared_prediction_cache,
+)
+
+
+class _FakeClock:
+    """Horloge contrôlée manuellement."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _CountingClassifier(DemoClassifier):
+    """DemoClassifier qui compte ses appels à predict()."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    def predict(self, image=None, text=None, top_k=5):
+        self.calls += 1
+        return super().predict(image=image, text=text, top_k=top_k)
+
+
+def _result(category: str = "2583") -> ClassificationResult:
+    return ClassificationResult(category=category, confidence=0.5, source="test")
+
+
+# =============================================================================
+# TESTS Clés
+# =============================================================================
+@pytest.mark.unit
+class TestCacheKeys:
+    """Tests pour make_cache_key() et compute_image_digest()."""
+
+    def test_same_inputs_same_key(self, sample_image):
+        """Des entrées identiques donnent la même clé."""
+        copy = sample_image.copy()
+        assert make_cache_key("m", copy, "texte", 5) == make_cache_key("m", sample_image, "texte", 5)
+
+    def test_key_depends_on_model_identity(self):
+        """Deux modèles différents ne partagent pas leurs entrées."""
+        assert make_cache_key("a", text="texte") != make_cache_key("b", text="texte")
+
+    def test_key_depends_on_top_k(self):
+        """top_k fait partie de la clé."""
+        assert make_cache_key("m", text="texte", top_k=3) != make_cache_key("m", text="texte", top_k=5)
+
+    def test_empty_text_hashes_to_none(self):
+        """Un texte vide équivaut à une absence de texte."""
+        assert hash_text("   ") is None
+        assert hash_text(None) is None
+
+    def test_image_digest_detects_pixel_change(self, sample_image):
+        """Changer un pixel change l'empreinte."""
+        modified = sample_image.copy()
+        modified.putpixel((0, 0), (0, 0, 0))
+        assert compute_image_digest(modified) != compute_image_digest(sample_image)
+
+    def test_image_digest_depends_on_mode(self):
+        """Une même taille dans un autre mode donne une autre empreinte."""
+        rgb = Image.new("RGB", (4, 4), color=(0, 0, 0))
+        assert compute_image_digest(rgb) != compute_image_digest(rgb.convert("L"))
+
+
+# =============================================================================
+# TESTS PredictionCache
+# =============================================================================
+@pytest.mark.unit
+class TestPredictionCache:
+    """Tests pour PredictionCache."""
+
+    def test_get_put(self):
+        """Une entrée ajoutée est retrouvée."""
+        cache = PredictionCache(max_entries=4, ttl_s=60)
+        cache.put("k", _result())
+        assert cache.get("k").category == "2583"
+        assert cache.get("absent") is None
+
+    def test_ttl_expiration(self):
+        """Une entrée expirée n'est plus servie."""
+        clock = _FakeClock()
+        cache = PredictionCache(max_entries=4, ttl_s=10, clock=clock)
+        cache.put("k", _result())
+
+        clock.now = 9.9
+        assert cache.get("k") is not None
+        clock.now = 10.0
+        assert cache.get("k") is None
+        assert cache.get_stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """La borne de taille évince l'entrée la moins récemment utilisée."""
+        cache = PredictionCache(max_entries=2, ttl_s=60)
+        cache.put("a", _result("10"))
+        cache.put("b", _result("40"))
+        cache.get("a")
+        cache.put("c", _result("50"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_stats(self):
+        """Les hits et misses sont comptés."""
+        cache = PredictionCache(max_entries=4, ttl_s=60)
+        cache.put("k", _result())
+        cache.get("k")
+        cache.get("x")
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.5)
+
+    def test_invalidate_by_model(self):
+        """invalidate() cible les entrées d'un modèle."""
+        cache = PredictionCache(max_entries=8, ttl_s=60)
+        cache.put(make_cache_key("a", text="x"), _result())
+        cache.put(make_cache_key("b", text="x"), _result())
+
+        assert cache.invalidate("a") == 1
+        assert len(cache) == 1
+        assert cache.invalidate() == 1
+        assert len(cache) == 0
+
+    def test_invalid_parameters_raise(self):
+        """Des bornes invalides lèvent ValueError."""
+        with pytest.raises(ValueError):
+            PredictionCache(max_entries=0)
+        with pytest.raises(ValueError):
+            PredictionCache(ttl_s=-1)
+
+    def test_concurrent_access(self):
+        """Des accès concurrents ne corrompent pas le cache."""
+        cache = PredictionCache(max_entries=50, ttl_s=60)
+
+        def _worker(offset):
+            for i in range(200):
+                cache.put((offset + i) % 100, _result())
+                cache.get(i % 100)
+
+        threads = [threading.Thread(target=_worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.get_stats()
+        assert stats["size"] <= 50
+        assert stats["hits"] + stats["misses"] == 8 * 200
+
+    def test_shared_cache_is_singleton(self):
+        """Le cache partagé est unique dans le processus."""
+        assert get_shared_prediction_cache() is get_shared_prediction_cache()
+
+
+# =============================================================================
+# TESTS CachedClassifier
+# =============================================================================
+@pytest.mark.unit
+class TestCachedClassifier:
+    """Tests pour CachedClassifier."""
+
+    def test_second_call_is_served_from_cache(self, sample_text):
+        """Le classifieur enveloppé n'est appelé qu'une fois."""
+        inner = _CountingClassifier()
+        classifier = CachedClassifier(inner, cache=PredictionCache(max_entries=8, ttl_s=60))
+
+        first = classifier.predict(text=sample_text)
+        second = classifier.predict(text=sample_text)
+
+        assert inner.calls == 1
+        assert second.category == first.category
+        assert second.top_k_predictions == first.top_k_predictions
+
+    def test_sessions_share_cache(self, sample_image):
+        """Deux sessions partageant le cache ne recalculent pas la même image."""
+        cache = PredictionCache(max_entries=8, ttl_s=60)
+        inner_a, inner_b = _CountingClassifier(), _CountingClassifier()
+
+        CachedClassifier(inner_a, cache=cache).predict(image=sample_image)
+        CachedClassifier(inner_b, cache=cache).predict(image=sample_image.copy())
+
+        assert inner_a.calls == 1
+        assert inner_b.calls == 0
+
+    def test_model_change_invalidates(self, sample_text):
+        """Un modèle différent ne réutilise pas les entrées d'un autre."""
+        cache = PredictionCache(max_entries=8, ttl_s=60)
+        inner = _CountingClassifier(model_config=TEXT_MODELS["camembert"])
+        other = _CountingClassifier(model_config=TEXT_MODELS["tfidf_svm"])
+
+        CachedClassifier(inner, cache=cache).predict(text=sample_text)
+        CachedClassifier(other, cache=cache).predict(text=sample_text)
+
+        assert other.calls == 1
+
+    def test_returned_results_are_independent(self, sample_text):
+        """Modifier un résultat retourné n'altère pas le cache."""
+        classifier = CachedClassifier(
+            _CountingClassifier(), cache=PredictionCache(max_entries=8, ttl_s=60)
+        )
+        first = classifier.predict(text=sample_text)
+        first.top_k_predictions.clear()
+
+        assert classifier.predict(text=sample_text).top_k_predictions
+
+    def test_text_preprocessor_normalizes_key(self):
+        """Le prétraitement du texte unifie les variantes équivalentes."""
+        inner = _CountingClassifier()
+        classifier = CachedClassifier(
+            inner,
+            cache=PredictionCache(max_entries=8, ttl_s=60),
+            text_preprocessor=lambda t: " ".join(t.lower().split()),
+        )
+        classifier.predict(text="Console  PS5")
+        classifier.predict(text="console ps5")
+
+        assert inner.calls == 1
+
+    def test_delegates_identity(self):
+        """L'identité est celle du classifieur enveloppé."""
+        inner = DemoClassifier()
+        classifier = CachedClassifier(inner, cache=PredictionCache(max_entries=8, ttl_s=60))
+        assert classifier.model_identity == inner.model_identity
+        assert classifier.is_ready
@@ -0,0 +1,215 @@
+"""
+Tests unitaires pour utils/quantization.py
+
+Ce module teste:
+- quantize_linear_weights(): quantification int8/float16
+- QuantizedLinearWeights: inférence directe sur poids quantifiés
+- save/load_quantized_weights(): format .npz
+- evaluate_quantization(): accord top-1 et gain mémoire
+"""
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils import quantization
+from utils.quantization import (
+    QuantizedLinearWeights,
+    quantize_linear_weights,
+    quantize_sklearn_model,
+    save_quantized_weights,
+    load_quantized_weights,
+    evaluate_quantization,
+    top1_agreement,
+    softmax,
+)
+
+
+@pytest.fixture
+def linear_model():
+    """Coefficients et biais aléatoires (27 classes x 2048 features)."""
+    rng = np.random.RandomState(0)
+    coef = rng.normal(0, 0.05, size=(27, 2048))
+    intercept = rng.normal(0, 0.1, size=27)
+    return coef, intercept
+
+
+@pytest.fixture
+def features():
+    """Features non négatives de type ResNet50 (après ReLU + pooling)."""
+    rng = np.random.RandomState(1)
+    return np.abs(rng.normal(0, 1, size=(500, 2048)))
+
+
+# =============================================================================
+# TESTS Quantification
+# =============================================================================
+@pytest.mark.unit
+class TestQuantizeLinearWeights:
+    """Tests pour quantize_linear_weights()."""
+
+    def test_int8_dtype_and_scales(self, linear_model):
+        """int8: valeurs entières et une échelle par classe."""
+        coef, intercept = linear_model
+        weights = quantize_linear_weights(coef, intercept, dtype="int8")
+
+        assert weights.values.dtype == np.int8
+        assert weights.scales.shape == (27,)
+        assert np.abs(weights.values).max() <= 127
+
+    def test_float16_has_no_scales(self, linear_model):
+        """float16: pas d'échelle."""
+        coef, intercept = linear_model
+        weights = quantize_linear_weights(coef, intercept, dtype="float16")
+
+        assert weights.values.dtype == np.float16
+        assert weights.scales is None
+
+    @pytest.mark.parametrize("dtype,max_error", [("int8", 0.001), ("float16", 0.0001)])
+    def test_dequantize_close_to_original(self, linear_model, dtype, max_error):
+        """La reconstruction est proche des coefficients d'origine."""
+        coef, intercept = linear_model
+        weights = quantize_linear_weights(coef, intercept, dtype=dtype)
+        assert np.abs(weights.dequantize() - coef).max() < max_error
+
+    def test_zero_row_is_handled(self):
+        """Une classe aux coefficients nuls ne provoque pas de division par zéro."""
+        coef = np.zeros((2, 4))
+        coef[1] = [1.0, -2.0, 0.5, 0.0]
+        weights = quantize_linear_weights(coef, dtype="int8")
+
+        assert np.all(weights.dequantize()[0] == 0)
+        assert np.all(np.isfinite(weights.scales))
+
+    def test_memory_reduction(self, linear_model):
+        """int8 divise la mémoire par ~8, float16 par ~4."""
+        coef, intercept = linear_model
+        assert coef.nbytes / quantize_linear_weights(coef, intercept, "int8").nbytes > 7
+        assert coef.nbytes / quantize_linear_weights(coef, intercept, "float16").nbytes > 3.9
+
+    def test_invalid_dtype_raises(self, linear_model):
+        """Un type non supporté lève ValueError."""
+        coef, intercept = linear_model
+        with pytest.raises(ValueError):
+            quantize_linear_weights(coef, intercept, dtype="int4")
+
+    def test_int8_requires_scales(self):
+        """Des poids int8 sans échelles sont refusés."""
+        with pytest.raises(ValueError):
+            QuantizedLinearWeights(
+                values=np.zeros((2, 3), dtype=np.int8),
+                intercept=np.zeros(2, dtype=np.float32),
+                dtype="int8",
+            )
+
+    def test_sklearn_like_model(self, linear_model):
+        """Un estimateur exposant coef_/intercept_ est quantifiable."""
+        coef, intercept = linear_model
+
+        class _Estimator:
+            coef_ = coef
+            intercept_ = intercept
+
+        weights = quantize_sklearn_model(_Estimator(), dtype="float16")
+        assert weights.n_classes == 27
+        assert weights.n_features == 2048
+
+        with pytest.raises(ValueError):
+            quantize_sklearn_model(object())
+
+
+# =============================================================================
+# TESTS Inférence
+# =============================================================================
+@pytest.mark.unit
+class TestQuantizedInference:
+    """Tests de l'inférence sur poids quantifiés."""
+
+    @pytest.mark.parametrize("dtype", ["int8", "float16"])
+    def test_top1_agreement_high(self, linear_model, features, dtype):
+        """L'accord top-1 avec la pleine précision est >= 99%."""
+        coef, intercept = linear_model
+        report = evaluate_quantization(coef, intercept, features, dtype=dtype)
+        assert report["top1_agreement"] >= 0.99
+        assert report["compression_ratio"] > 3.9
+
+    def test_single_vector_input(self, linear_model, features):
+        """Un vecteur 1D est traité comme un échantillon unique."""
+        coef, intercept = linear_model
+        weights = quantize_linear_weights(coef, intercept)
+        assert weights.decision_function(features[0]).shape == (1, 27)
+
+    def test_evaluate_single_vector(self, linear_model, features):
+        """evaluate_quantization accepte un échantillon unique."""
+        coef, intercept = linear_model
+        report = evaluate_quantization(coef, intercept, features[0])
+        assert report["top1_agreement"] in (0.0, 1.0)
+
+    @pytest.mark.parametrize("dtype", ["int8", "float16"])
+    def test_blockwise_matches_dequantized(self, linear_model, features, dtype, monkeypatch):
+        """Le calcul par blocs donne les scores du produit avec les poids reconstruits."""
+        coef, intercept = linear_model
+        weights = quantize_linear_weights(coef, intercept, dtype=dtype)
+        expected = features.astype(np.float32) @ weights.dequantize().T + weights.intercept
+
+        monkeypatch.setattr(quantization, "DECISION_BLOCK_FEATURES", 300)
+        np.testing.assert_allclose(weights.decision_function(features), expected, rtol=1e-4, atol=1e-4)
+
+    def test_sparse_input(self, linear_model, features):
+        """Une matrice creuse donne les mêmes scores qu'un array dense."""
+        sparse = pytest.importorskip("scipy.sparse")
+        coef, intercept = linear_model
+        weights = quantize_linear_weights(coef, intercept)
+        np.testing.assert_allclose(
+            weights.decision_function(sparse.csr_matrix(features[:20])),
+            weights.decision_function(features[:20]),
+            rtol=1e-5, atol=1e-5,
+        )
+
+    def test_predict_proba_sums_to_one(self, linear_model, features):
+        """Les probabilités somment à 1."""
+        coef, intercept = linear_model
+        proba = quantize_linear_weights(coef, intercept).predict_proba(features[:10])
+        np.testing.assert_allclose(proba.sum(axis=1), 1.0, rtol=1e-5)
+
+    def test_top1_agreement_helper(self):
+        """top1_agreement compte les argmax identiques."""
+        a = np.array([[1, 0], [0, 1], [1, 0]])
+        b = np.array([[2, 0], [1, 0], [3, 1]])
+        assert top1_agreement(a, b) == pytest.approx(2 / 3)
+
+    def test_softmax_stable(self):
+        """softmax supporte des scores très grands."""
+        proba = softmax(np.array([[1000.0, 0.0]]))
+        assert np.all(np.isfinite(proba))
+
+
+# =============================================================================
+# TESTS Sérialisation
+# =============================================================================
+@pytest.mark.unit
+class TestQuantizedSerialization:
+    """Tests de sauvegarde/chargement."""
+
+    @pytest.mark.parametrize("dtype", ["int8", "float16"])
+    def test_roundtrip(self, tmp_path, linear_model, features, dtype):
+        """Les poids rechargés donnent les mêmes scores."""
+        coef, intercept = linear_model
+        weights = quantize_linear_weights(coef, intercept, dtype=dtype)
+        path = tmp_path / "weights.npz"
+
+        save_quantized_weights(weights, path)
+        loaded = load_quantized_weights(path)
+
+        assert loaded.dtype == dtype
+        np.testing.assert_array_equal(loaded.values, weights.values)
+        np.testing.assert_allclose(
+            loaded.decision_function(features[:5]), weights.decision_function(features[:5])
+        )
+
+    def test_missing_file_raises(self, tmp_path):
+        """Un fichier absent lève FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_quantized_weights(tmp_path / "missing.npz")
@@ -0,0 +1,244 @@
+"""
+Tests unitaires pour utils/thumbnail_cache.py
+
+Ce module teste:
+- make_thumbnail_key(): contenu et taille
+- get_upload_thumbnail(): clé sur les octets du fichier, aucun décodage en cas de succès
+- ThumbnailCache: niveaux mémoire et disque, éviction, statistiques
+"""
+import io
+import os
+import pytest
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils import thumbnail_cache
+from utils.image_utils import create_thumbnail
+from utils.thumbnail_cache import (
+    ThumbnailCache,
+    get_shared_thumbnail_cache,
+    make_thumbnail_key,
+    make_upload_key,
+)
+
+
+def _noise_image(seed: int, size=(640, 480)) -> Image.Image:
+    pixels = np.random.default_rng(seed).integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+    return Image.fromarray(pixels, mode="RGB")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ThumbnailCache(max_memory_entries=4, disk_dir=tmp_path, max_disk_mb=10)
+
+
+# =============================================================================
+# TESTS Clés
+# =============================================================================
+@pytest.mark.unit
+class TestThumbnailKey:
+    """Tests pour make_thumbnail_key()."""
+
+    def test_same_content_same_key(self):
+        """Deux objets de même contenu partagent la clé."""
+        assert make_thumbnail_key(_noise_image(0), (150, 150)) == make_thumbnail_key(_noise_image(0), (150, 150))
+
+    def test_key_depends_on_size_and_content(self):
+        """La taille et les pixels font partie de la clé."""
+        image = _noise_image(0)
+        assert make_thumbnail_key(image, (150, 150)) != make_thumbnail_key(image, (400, 400))
+        assert make_thumbnail_key(image, (150, 150)) != make_thumbnail_key(_noise_image(1), (150, 150))
+
+    def test_key_depends_on_display_quality(self, monkeypatch):
+        """Changer le niveau de rééchantillonnage d'affichage change la clé."""
+        image = _noise_image(0)
+        key = make_thumbnail_key(image, (150, 150))
+        monkeypatch.setitem(thumbnail_cache.IMAGE_CONFIG, "display_resample_quality", "fast")
+        assert make_thumbnail_key(image, (150, 150)) != key
+
+
+# =============================================================================
+# TESTS ThumbnailCache
+# =============================================================================
+@pytest.mark.unit
+class TestThumbnailCache:
+    """Tests pour ThumbnailCache."""
+
+    def test_matches_create_thumbnail(self, cache):
+        """La miniature est celle de create_thumbnail()."""
+        image = _noise_image(0)
+        thumbnail = cache.get_thumbnail(image, (150, 150))
+        assert max(thumbnail.size) == 150
+        assert thumbnail.tobytes() == create_thumbnail(image, (150, 150)).tobytes()
+
+    def test_memory_hit_across_objects(self, cache, monkeypatch):
+        """Un rerun (nouvel objet, même contenu) ne recalcule pas la miniature."""
+        calls = []
+        monkeypatch.setattr(
+            thumbnail_cache, "create_thumbnail",
+            lambda image, size: calls.append(1) or create_thumbnail(image, size),
+        )
+        first = cache.get_thumbnail(_noise_image(0), (150, 150))
+        second = cache.get_thumbnail(_noise_image(0), (150, 150))
+
+        assert second is first
+        assert len(calls) == 1
+        assert cache.get_stats()["memory_hits"] == 1
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        """Une autre instance (redémarrage, autre processus) relit le disque."""
+        image = _noise_image(0)
+        expected = ThumbnailCache(disk_dir=tmp_path, max_disk_mb=10).get_thumbnail(image, (150, 150))
+
+        other = ThumbnailCache(disk_dir=tmp_path, max_disk_mb=10)
+        thumbnail = other.get_thumbnail(image, (150, 150))
+
+        assert thumbnail.tobytes() == expected.tobytes()
+        assert other.get_stats()["disk_hits"] == 1
+        assert other.get_stats()["misses"] == 0
+
+    def test_memory_lru_bound(self, cache):
+        """Le niveau mémoire est borné en nombre d'entrées."""
+        for seed in range(6):
+            cache.get_thumbnail(_noise_image(seed, (64, 64)), (32, 32))
+        assert cache.get_stats()["memory_size"] == 4
+
+    def test_disk_eviction_removes_least_recent(self, tmp_path):
+        """Au-delà de la taille max, les fichiers les plus anciens sont supprimés."""
+        cache = ThumbnailCache(max_memory_entries=1, disk_dir=tmp_path, max_disk_mb=0.05)
+        keys = []
+        for seed in range(6):
+            image = _noise_image(seed, (200, 200))
+            cache.get_thumbnail(image, (100, 100))
+            keys.append(make_thumbnail_key(image, (100, 100)))
+            # Dates distinctes pour un ordre LRU déterministe
+            path = tmp_path / f"{keys[-1]}.png"
+            if path.exists():
+                stamp = time.time() - 100 + seed
+                os.utime(path, (stamp, stamp))
+
+        stats = cache.get_stats()
+        files = {path.stem for path in tmp_path.glob("*.png")}
+        assert stats["disk_evictions"] > 0
+        assert stats["disk_bytes"] <= stats["max_disk_bytes"]
+        assert keys[-1] in files
+        assert keys[0] not in files
+
+    def test_disk_disabled(self, tmp_path):
+        """max_disk_mb=0 désactive le niveau disque."""
+        cache = ThumbnailCache(disk_dir=tmp_path, max_disk_mb=0)
+        cache.get_thumbnail(_noise_image(0), (150, 150))
+        assert not list(tmp_path.iterdir())
+
+    def test_unwritable_disk_falls_back_to_memory(self, tmp_path):
+        """Un dossier disque inutilisable n'empêche pas le cache mémoire."""
+        blocker = tmp_path / "fichier"
+        blocker.write_text("x")
+        cache = ThumbnailCache(disk_dir=blocker / "sous-dossier", max_disk_mb=10)
+        image = _noise_image(0)
+        cache.get_thumbnail(image, (150, 150))
+        cache.get_thumbnail(image, (150, 150))
+        assert cache.get_stats()["memory_hits"] == 1
+
+    def test_clear(self, cache, tmp_path):
+        """clear(disk=True) vide les deux niveaux."""
+        cache.get_thumbnail(_noise_image(0), (150, 150))
+        cache.clear(disk=True)
+        stats = cache.get_stats()
+        assert stats["memory_size"] == 0
+        assert stats["disk_bytes"] == 0
+        assert not list(tmp_path.glob("*.png"))
+
+    def test_invalid_parameters_raise(self, tmp_path):
+        """Des bornes invalides lèvent ValueError."""
+        with pytest.raises(ValueError):
+            ThumbnailCache(max_memory_entries=0, disk_dir=tmp_path)
+        with pytest.raises(ValueError):
+            ThumbnailCache(disk_dir=tmp_path, max_disk_mb=-1)
+
+    def test_shared_cache_is_singleton(self):
+        """Le cache partagé est unique dans le processus."""
+        assert get_shared_thumbnail_cache() is get_shared_thumbnail_cache()
+
+
+# =============================================================================
+# TESTS Miniatures d'uploads
+# =============================================================================
+@pytest.fixture
+def upload_bytes():
+    """JPEG 3200x2400 (photo produit de plusieurs mégapixels)."""
+    buffer = io.BytesIO()
+    _noise_image(0, size=(400, 300)).resize((3200, 2400)).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+class TestUploadThumbnail:
+    """Tests pour make_upload_key() et ThumbnailCache.get_upload_thumbnail()."""
+
+    def test_key_from_file_bytes(self, upload_bytes, tmp_path):
+        """Même contenu -> même clé, qu'il s'agisse d'un flux ou d'un chemin."""
+        path = tmp_path / "upload.jpg"
+        path.write_bytes(upload_bytes)
+        key = make_upload_key(io.BytesIO(upload_bytes), (400, 400))
+        assert make_upload_key(path, (400, 400)) == key
+        assert make_upload_key(io.BytesIO(upload_bytes), (150, 150)) != key
+        assert make_upload_key(io.BytesIO(upload_bytes[:-1] + b"x"), (400, 400)) != key
+
+    def test_key_preserves_stream_position(self, upload_bytes):
+        """Le calcul de la clé ne déplace pas la position du flux."""
+        stream = io.BytesIO(upload_bytes)
+        stream.seek(10)
+        make_upload_key(stream, (400, 400))
+        assert stream.tell() == 10
+
+    def test_thumbnail_size(self, cache, upload_bytes):
+        """La miniature respecte la taille maximale."""
+        thumbnail = cache.get_upload_thumbnail(io.BytesIO(upload_bytes), (400, 400))
+        assert thumbnail.size == (400, 300)
+        assert thumbnail.mode == "RGB"
+
+    def test_hit_does_not_decode(self, cache, upload_bytes, monkeypatch):
+        """Un rerun (nouvel objet upload, mêmes octets) ne décode pas l'image."""
+        cache.get_upload_thumbnail(io.BytesIO(upload_bytes), (400, 400))
+        monkeypatch.setattr(
+            thumbnail_cache, "load_image_from_upload",
+            lambda *args, **kwargs: pytest.fail("image décodée malgré le cache")
+        )
+        cache.get_upload_thumbnail(io.BytesIO(upload_bytes), (400, 400))
+        assert cache.get_stats()["memory_hits"] == 1
+
+    def test_disk_hit_across_instances(self, tmp_path, upload_bytes, monkeypatch):
+        """Le niveau disque sert les uploads après redémarrage."""
+        ThumbnailCache(disk_dir=tmp_path, max_disk_mb=10).get_upload_thumbnail(
+            io.BytesIO(upload_bytes), (400, 400)
+        )
+        monkeypatch.setattr(
+            thumbnail_cache, "load_image_from_upload",
+            lambda *args, **kwargs: pytest.fail("image décodée malgré le cache")
+        )
+        cache = ThumbnailCache(disk_dir=tmp_path, max_disk_mb=10)
+        assert cache.get_upload_thumbnail(io.BytesIO(upload_bytes), (400, 400)).size == (400, 300)
+        assert cache.get_stats()["disk_hits"] == 1
+
+    def test_hit_cheaper_than_decode(self, cache, upload_bytes):
+        """Un succès coûte bien moins qu'un décodage suivi d'une réduction."""
+        cache.get_upload_thumbnail(io.BytesIO(upload_bytes), (400, 400))
+        start = time.perf_counter()
+        cache.get_upload_thumbnail(io.BytesIO(upload_bytes), (400, 400))
+        hit = time.perf_counter() - start
+        start = time.perf_counter()
+        create_thumbnail(Image.open(io.BytesIO(upload_bytes)).convert("RGB"), (400, 400))
+        baseline = time.perf_counter() - start
+        assert hit * 5 < baseline
+
+    def test_invalid_upload_raises(self, cache):
+        """Un contenu non image lève ValueError."""
+        with pytest.raises(ValueError):
+            cache.get_upload_thumbnail(io.BytesIO(b"pas une image"), (400, 400))
@@ -0,0 +1,174 @@
+"""
+Tests unitaires pour utils/warmup.py
+
+Ce module teste:
+- ModelWarmup: chargement en arrière-plan, état, statistiques
+- build_default_registry(): modèles enregistrés par défaut
+- get_warmup() / get_warmed_classifier(): préchauffeur partagé
+"""
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.warmup import (
+    ModelWarmup,
+    build_default_registry,
+    generate_synthetic_images,
+    get_warmup,
+    get_warmed_classifier,
+    DEFAULT_MODEL_ID,
+    NUMPY_TEXT_MODEL_ID,
+    STATUS_IDLE,
+    STATUS_READY,
+    STATUS_FAILED,
+)
+from utils.model_registry import ModelRegistry, RegisteredClassifier
+from utils.mock_classifier import DemoClassifier, MultiModelClassifier, TEXT_MODELS, IMAGE_MODELS
+from utils.numpy_inference import NumpyTextClassifier, export_text_pipeline
+
+
+class _TextOnlyClassifier(DemoClassifier):
+    """Classifieur qui refuse les images (branche non supportée)."""
+
+    def predict(self, image=None, text=None, top_k=5):
+        if image is not None:
+            raise ValueError("text only")
+        return super().predict(text=text, top_k=top_k)
+
+
+def _failing_loader():
+    raise RuntimeError("artefact manquant")
+
+
+# =============================================================================
+# TESTS build_default_registry()
+# =============================================================================
+@pytest.mark.unit
+class TestBuildDefaultRegistry:
+    """Tests pour build_default_registry()."""
+
+    def test_contains_all_models(self, tmp_path):
+        """Le registre contient la démo et tous les modèles simulés."""
+        registry = build_default_registry(text_bundle_path=tmp_path / "absent.npz")
+        expected = {DEFAULT_MODEL_ID, *TEXT_MODELS, *IMAGE_MODELS}
+        assert set(registry.registered_models) == expected
+
+    def test_numpy_text_bundle_is_warmed(self, tmp_path):
+        """Un bundle texte exporté est enregistré, chargé et préchauffé."""
+        pytest.importorskip("sklearn")
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.pipeline import make_pipeline
+        from sklearn.svm import LinearSVC
+
+        pipeline = make_pipeline(TfidfVectorizer(), LinearSVC())
+        pipeline.fit(["console playstation", "piscine gonflable", "livre roman"], [2462, 2583, 2403])
+        path = export_text_pipeline(pipeline, tmp_path / "text_classifier.npz")
+
+        registry = build_default_registry(text_bundle_path=path)
+        assert NUMPY_TEXT_MODEL_ID in registry.registered_models
+        warmup = ModelWarmup(registry, model_ids=[NUMPY_TEXT_MODEL_ID]).start()
+        assert warmup.wait(timeout=10)
+        assert warmup.status == STATUS_READY
+        assert isinstance(registry.get(NUMPY_TEXT_MODEL_ID), NumpyTextClassifier)
+
+    def test_nothing_loaded(self):
+        """Aucun modèle n'est chargé avant le préchauffage."""
+        assert build_default_registry().loaded_models == []
+
+
+# =============================================================================
+# TESTS ModelWarmup
+# =============================================================================
+@pytest.mark.unit
+class TestModelWarmup:
+    """Tests pour ModelWarmup."""
+
+    def test_not_ready_before_start(self):
+        """Le préchauffeur n'est pas prêt avant start()."""
+        warmup = ModelWarmup(build_default_registry())
+        assert warmup.status == STATUS_IDLE
+        assert not warmup.is_ready
+
+    def test_becomes_ready(self):
+        """Après start(), tous les modèles sont chargés et prêts."""
+        registry = build_default_registry()
+        warmup = ModelWarmup(registry).start()
+
+        assert warmup.wait(timeout=10)
+        assert warmup.status == STATUS_READY
+        assert warmup.progress == 1.0
+        assert set(registry.loaded_models) == set(registry.registered_models)
+
+    def test_runs_every_branch(self):
+        """Les branches texte, image et multimodale sont exercées."""
+        registry = ModelRegistry(memory_budget_mb=None)
+        registry.register("demo", DemoClassifier)
+        texts = ["console playstation", "piscine"]
+        images = generate_synthetic_images()[:2]
+
+        warmup = ModelWarmup(registry, texts=texts, images=images).start()
+        warmup.wait(timeout=10)
+
+        # 2 textes + 2 images + 2 paires multimodales
+        assert warmup.get_stats()["predictions"] == 6
+
+    def test_unsupported_branch_is_skipped(self):
+        """Une branche refusée (ValueError) n'empêche pas le préchauffage."""
+        registry = ModelRegistry(memory_budget_mb=None)
+        registry.register("text_only", _TextOnlyClassifier)
+        warmup = ModelWarmup(registry, texts=["livre"], images=generate_synthetic_images()[:1])
+
+        assert warmup.start().wait(timeout=10)
+        assert warmup.get_stats()["predictions"] == 1
+
+    def test_start_is_idempotent(self):
+        """Appeler start() plusieurs fois ne relance pas le préchauffage."""
+        registry = build_default_registry()
+        warmup = ModelWarmup(registry)
+        warmup.start()
+        warmup.start()
+        warmup.wait(timeout=10)
+
+        assert registry.get_stats()["loads"] == len(registry)
+
+    def test_failure_is_reported(self):
+        """Un échec de chargement est exposé via status et error."""
+        registry = ModelRegistry(memory_budget_mb=None)
+        registry.register("broken", _failing_loader)
+        warmup = ModelWarmup(registry).start()
+
+        assert warmup.wait(timeout=10) is False
+        assert warmup.status == STATUS_FAILED
+        assert isinstance(warmup.error, RuntimeError)
+
+
+# =============================================================================
+# TESTS Préchauffeur partagé
+# =============================================================================
+@pytest.mark.unit
+class TestSharedWarmup:
+    """Tests du préchauffeur partagé par le processus."""
+
+    def test_get_warmup_is_singleton(self):
+        """get_warmup() retourne toujours la même instance."""
+        assert get_warmup() is get_warmup()
+
+    def test_warmed_classifier_available_when_ready(self):
+        """get_warmed_classifier() retourne une poignée du modèle une fois prêt."""
+        get_warmup().start().wait(timeout=10)
+        classifier = get_warmed_classifier()
+        assert isinstance(classifier, RegisteredClassifier)
+        assert isinstance(classifier.classifier, DemoClassifier)
+
+    def test_multi_model_classifier_reuses_shared_registry(self):
+        """MultiModelClassifier réutilise les modèles du registre partagé."""
+        warmup = get_warmup().start()
+        warmup.wait(timeout=10)
+        loads_before = warmup.registry.get_stats()["loads"]
+
+        multi = MultiModelClassifier(registry=warmup.registry)
+        multi.predict_all_text_models("console playstation")
+
+        assert warmup.registry.get_stats()["loads"] == loads_before
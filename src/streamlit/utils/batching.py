@@ -0,0 +1,281 @@
+"""
+Regroupement des requêtes en micro-lots (micro-batching) devant un classifieur.
+
+Quand plusieurs utilisateurs classifient en même temps, chaque appel à
+predict() s'exécute seul et perd la vectorisation d'un produit matriciel
+sur un lot. Le MicroBatcher:
+- Met en file les prédictions unitaires concurrentes
+- Les envoie en un seul appel predict_batch() dès que le lot est plein
+  ou que le délai d'attente maximal (ex: 5 ms) est écoulé
+- Rend à chaque appelant son propre résultat
+
+Il implémente lui-même BaseClassifier et peut donc remplacer le
+classifieur qu'il enveloppe sans changer le code appelant.
+
+Usage:
+    batcher = MicroBatcher(classifier, max_batch_size=32, max_wait_ms=5)
+    result = batcher.predict(text="console playstation 5")  # Thread-safe
+"""
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from PIL import Image
+
+from .model_interface import BaseClassifier, ClassificationResult
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import MODEL_CONFIG
+
+
+# Marqueur d'arrêt du thread de dispatch
+_STOP = object()
+
+
+@dataclass
+class _PendingRequest:
+    """Prédiction unitaire en attente dans la file."""
+    image: Optional[Image.Image]
+    text: Optional[str]
+    top_k: int
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher(BaseClassifier):
+    """
+    Coalesce les prédictions concurrentes en appels predict_batch().
+
+    Un thread de dispatch dédié attend la première requête, puis collecte
+    les suivantes jusqu'à max_batch_size ou jusqu'à max_wait_ms après
+    l'arrivée de la première. Si un lot échoue, ses requêtes sont rejouées
+    une par une pour que l'erreur ne touche que l'entrée fautive.
+    """
+
+    def __init__(
+        self,
+        classifier: BaseClassifier,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        """
+        Args:
+            classifier: Classifieur enveloppé
+            max_batch_size: Taille maximale d'un lot.
+                Par défaut: MODEL_CONFIG["batch_max_size"]
+            max_wait_ms: Attente maximale avant envoi d'un lot incomplet.
+                Par défaut: MODEL_CONFIG["batch_max_wait_ms"]
+        """
+        if max_batch_size is None:
+            max_batch_size = MODEL_CONFIG["batch_max_size"]
+        if max_wait_ms is None:
+            max_wait_ms = MODEL_CONFIG["batch_max_wait_ms"]
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+
+        self._classifier = classifier
+        self._max_batch_size = max_batch_size
+        self._max_wait_s = max_wait_ms / 1000.0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = False
+        # Rend atomiques "vérifier _closed puis mettre en file" (submit) et
+        # "fermer puis mettre _STOP en file" (close): aucune requête ne peut
+        # arriver après _STOP, donc toutes sont résolues par le dispatch
+        self._submit_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes: Dict[int, int] = {}
+
+        self._thread = threading.Thread(
+            target=self._dispatch_loop, name="micro-batcher", daemon=True
+        )
+        self._thread.start()
+
+    # -------------------------------------------------------------------------
+    # API appelant
+    # -------------------------------------------------------------------------
+    def submit(
+        self,
+        image: Optional[Image.Image] = None,
+        text: Optional[str] = None,
+        top_k: int = 5
+    ) -> Future:
+        """
+        Met une prédiction en file sans attendre son résultat.
+
+        Returns:
+            Future résolu avec le ClassificationResult (ou l'exception)
+        """
+        request = _PendingRequest(image=image, text=text, top_k=top_k)
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher fermé")
+            self._queue.put(request)
+        return request.future
+
+    def predict(
+        self,
+        image: Optional[Image.Image] = None,
+        text: Optional[str] = None,
+        top_k: int = 5
+    ) -> ClassificationResult:
+        """Prédiction unitaire, exécutée au sein d'un micro-lot."""
+        return self.submit(image=image, text=text, top_k=top_k).result()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Traite les requêtes en file puis arrête le thread de dispatch."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # -------------------------------------------------------------------------
+    # Interface BaseClassifier
+    # -------------------------------------------------------------------------
+    def load_model(self, path: str) -> None:
+        """Délègue le chargement au classifieur enveloppé."""
+        self._classifier.load_model(path)
+
+    @property
+    def is_ready(self) -> bool:
+        return not self._closed and self._classifier.is_ready
+
+    @property
+    def classifier(self) -> BaseClassifier:
+        """Classifieur enveloppé."""
+        return self._classifier
+
+    @property
+    def model_identity(self) -> str:
+        """Le regroupement ne change pas les prédictions: identité du modèle enveloppé."""
+        return self._classifier.model_identity
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Statistiques de regroupement.
+
+        Returns:
+            Dict avec le nombre de lots, de requêtes, la taille moyenne
+            des lots et l'histogramme taille -> nombre de lots
+        """
+        with self._stats_lock:
+            histogram = dict(self._batch_sizes)
+        batches = sum(histogram.values())
+        requests = sum(size * count for size, count in histogram.items())
+        return {
+            "batches": batches,
+            "requests": requests,
+            "avg_batch_size": requests / batches if batches else 0.0,
+            "batch_size_histogram": histogram,
+        }
+
+    # -------------------------------------------------------------------------
+    # Dispatch
+    # -------------------------------------------------------------------------
+    def _dispatch_loop(self) -> None:
+        """Boucle du thread: collecte puis envoie les lots."""
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+
+            batch = [first]
+            deadline = first.enqueued_at + self._max_wait_s
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+
+        # Requêtes arrivées après l'arrêt: traitées sans attendre
+        remaining_requests = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                remaining_requests.append(item)
+        for start in range(0, len(remaining_requests), self._max_batch_size):
+            self._flush(remaining_requests[start:start + self._max_batch_size])
+
+    def _flush(self, batch: List[_PendingRequest]) -> None:
+        """
+        Exécute un lot, regroupé par top_k, et résout les futures.
+
+        Les requêtes annulées par l'appelant sont retirées du lot; les
+        autres passent à l'état "en cours" et ne peuvent plus être annulées.
+        """
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        with self._stats_lock:
+            self._batch_sizes[len(batch)] = self._batch_sizes.get(len(batch), 0) + 1
+
+        by_top_k: Dict[int, List[_PendingRequest]] = {}
+        for request in batch:
+            by_top_k.setdefault(request.top_k, []).append(request)
+
+        for top_k, requests in by_top_k.items():
+            try:
+                results = self._classifier.predict_batch(
+                    images=[r.image for r in requests],
+                    texts=[r.text for r in requests],
+                    top_k=top_k,
+                )
+            except BaseException:
+                results = None
+
+            if results is None or len(results) != len(requests):
+                # Rejouer individuellement pour isoler l'entrée fautive
+                self._run_individually(requests)
+                continue
+
+            for request, result in zip(requests, results):
+                self._resolve(request.future, result=result)
+
+    def _run_individually(self, requests: List[_PendingRequest]) -> None:
+        for request in requests:
+            try:
+                result = self._classifier.predict(
+                    image=request.image, text=request.text, top_k=request.top_k
+                )
+            except BaseException as e:
+                self._resolve(request.future, exception=e)
+            else:
+                self._resolve(request.future, result=result)
+
+    @staticmethod
+    def _resolve(
+        future: Future,
+        result: Optional[ClassificationResult] = None,
+        exception: Optional[BaseException] = None
+    ) -> None:
+        """Résout un future sans jamais faire échouer le thread de dispatch."""
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            # Déjà résolu: rien à faire, le dispatch continue
+            pass
+
@@ -0,0 +1,218 @@
+"""
+Classifieur en cascade avec sortie anticipée selon la confiance.
+
+L'extraction de features image (ResNet50/VGG16) coûte plusieurs ordres de
+grandeur de plus que le scoring TF-IDF, alors que la plupart des produits
+sont classés avec confiance par le texte seul. La cascade:
+- Exécute d'abord le modèle le moins coûteux
+- Ne sollicite les modèles plus coûteux (image, fusion) que si la
+  confiance reste sous le seuil de l'étage
+- Comptabilise la fraction du trafic qui sort à chaque étage
+
+Usage:
+    cascade = CascadeClassifier([
+        CascadeStage("text", text_clf, inputs=INPUTS_TEXT, threshold=0.8),
+        CascadeStage("fusion", fusion_clf, inputs=INPUTS_MULTIMODAL),
+    ])
+    result = cascade.predict(image=image, text=text)
+    cascade.get_stats()["exit_fractions"]  # {"text": 0.83, "fusion": 0.17}
+"""
+import sys
+import threading
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from PIL import Image
+
+from .model_interface import BaseClassifier, ClassificationResult
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import MODEL_CONFIG
+
+
+# Entrées consommées par un étage
+INPUTS_TEXT = "text"
+INPUTS_IMAGE = "image"
+INPUTS_MULTIMODAL = "multimodal"
+
+
+@dataclass
+class CascadeStage:
+    """
+    Étage de la cascade.
+
+    Attributes:
+        name: Nom de l'étage (clé des statistiques)
+        classifier: Classifieur exécuté à cet étage
+        inputs: Entrées transmises ("text", "image" ou "multimodal")
+        threshold: Confiance minimale pour sortir à cet étage.
+            None = MODEL_CONFIG["confidence_threshold"]
+    """
+    name: str
+    classifier: BaseClassifier
+    inputs: str = INPUTS_TEXT
+    threshold: Optional[float] = None
+
+    def __post_init__(self):
+        if self.inputs not in (INPUTS_TEXT, INPUTS_IMAGE, INPUTS_MULTIMODAL):
+            raise ValueError(f"Entrées d'étage inconnues: {self.inputs}")
+
+    @property
+    def effective_threshold(self) -> float:
+        """Seuil appliqué à cet étage."""
+        if self.threshold is None:
+            return MODEL_CONFIG["confidence_threshold"]
+        return self.threshold
+
+
+class CascadeClassifier(BaseClassifier):
+    """
+    Enchaîne des classifieurs du moins au plus coûteux.
+
+    Un étage dont les entrées ne sont pas disponibles (ex: étage image
+    sans image) est ignoré. Le dernier étage exécuté répond toujours,
+    même sous son seuil.
+    """
+
+    def __init__(self, stages: List[CascadeStage]):
+        """
+        Args:
+            stages: Étages ordonnés du moins au plus coûteux
+        """
+        if not stages:
+            raise ValueError("La cascade doit contenir au moins un étage")
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Noms d'étages dupliqués: {names}")
+
+        self._stages = list(stages)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def predict(
+        self,
+        image: Optional[Image.Image] = None,
+        text: Optional[str] = None,
+        top_k: int = 5
+    ) -> ClassificationResult:
+        """
+        Prédit en sortant au premier étage suffisamment confiant.
+
+        La source du résultat est "cascade_<nom de l'étage de sortie>".
+
+        Raises:
+            ValueError: Si aucun étage ne peut traiter les entrées fournies
+        """
+        has_text = text is not None and text.strip() != ""
+        applicable = [
+            stage for stage in self._stages
+            if self._accepts(stage, has_text, image is not None)
+        ]
+        if not applicable:
+            raise ValueError("Aucun étage de la cascade ne peut traiter ces entrées")
+
+        for position, stage in enumerate(applicable):
+            result = self._run_stage(stage, image, text, top_k)
+            is_last = position == len(applicable) - 1
+            if is_last or result.confidence >= stage.effective_threshold:
+                self._record_exit(stage.name, position + 1)
+                return replace(result, source=f"cascade_{stage.name}")
+
+    @staticmethod
+    def _accepts(stage: CascadeStage, has_text: bool, has_image: bool) -> bool:
+        """Vérifie que les entrées requises par l'étage sont présentes."""
+        if stage.inputs == INPUTS_TEXT:
+            return has_text
+        if stage.inputs == INPUTS_IMAGE:
+            return has_image
+        return has_text and has_image
+
+    def _run_stage(
+        self,
+        stage: CascadeStage,
+        image: Optional[Image.Image],
+        text: Optional[str],
+        top_k: int
+    ) -> ClassificationResult:
+        """Exécute un étage avec les seules entrées qu'il consomme."""
+        with self._lock:
+            self._invocations[stage.name] += 1
+
+        if stage.inputs == INPUTS_TEXT:
+            return stage.classifier.predict(text=text, top_k=top_k)
+        if stage.inputs == INPUTS_IMAGE:
+            return stage.classifier.predict(image=image, top_k=top_k)
+        return stage.classifier.predict(image=image, text=text, top_k=top_k)
+
+    def _record_exit(self, stage_name: str, stages_run: int) -> None:
+        with self._lock:
+            self._exits[stage_name] += 1
+            self._total += 1
+            self._stages_run += stages_run
+
+    # -------------------------------------------------------------------------
+    # Statistiques
+    # -------------------------------------------------------------------------
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne la répartition du trafic entre les étages.
+
+        Returns:
+            Dict avec le nombre total de prédictions, les sorties et
+            invocations par étage, la fraction de sortie par étage et le
+            nombre moyen d'étages exécutés par prédiction
+        """
+        with self._lock:
+            total = self._total
+            return {
+                "total": total,
+                "exits": dict(self._exits),
+                "invocations": dict(self._invocations),
+                "exit_fractions": {
+                    name: (count / total if total else 0.0)
+                    for name, count in self._exits.items()
+                },
+                "avg_stages_run": self._stages_run / total if total else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        """Remet les compteurs à zéro."""
+        with self._lock:
+            self._exits = {stage.name: 0 for stage in self._stages}
+            self._invocations = {stage.name: 0 for stage in self._stages}
+            self._total = 0
+            self._stages_run = 0
+
+    # -------------------------------------------------------------------------
+    # Interface BaseClassifier
+    # -------------------------------------------------------------------------
+    def load_model(self, path: str) -> None:
+        """
+        Délègue le chargement aux classifieurs de chaque étage.
+
+        Args:
+            path: Dossier contenant le modèle de chaque étage, sous
+                path/<nom de l'étage>
+        """
+        for stage in self._stages:
+            stage.classifier.load_model(str(Path(path) / stage.name))
+
+    @property
+    def is_ready(self) -> bool:
+        """Prêt si tous les étages le sont."""
+        return all(stage.classifier.is_ready for stage in self._stages)
+
+    @property
+    def model_identity(self) -> str:
+        """Identité combinant les étages, leurs entrées et leurs seuils."""
+        stages = ", ".join(
+            f"{stage.name}:{stage.inputs}:{stage.effective_threshold}:{stage.classifier.model_identity}"
+            for stage in self._stages
+        )
+        return f"{super().model_identity}({stages})"
+
+    @property
+    def stages(self) -> List[CascadeStage]:
+        """Étages de la cascade, dans l'ordre d'exécution."""
+        return list(self._stages)
@@ -25,6 +25,23 @@ IMAGES_TRAIN_DIR = IMAGES_DIR / "images" / "image_train"
 IMAGES_TEST_DIR = IMAGES_DIR / "images" / "image_test"
 
 
+def get_image_path(imageid: int, productid: int, images_dir: Optional[Path] = None) -> Path:
+    """
+    Retourne le chemin d'une image produit du dataset.
+
+    Args:
+        imageid: Identifiant de l'image (colonne imageid)
+        productid: Identifiant du produit (colonne productid)
+        images_dir: Dossier des images. Par défaut: IMAGES_TRAIN_DIR
+
+    Returns:
+        Chemin image_{imageid}_product_{productid}.jpg
+    """
+    if images_dir is None:
+        images_dir = IMAGES_TRAIN_DIR
+    return Path(images_dir) / f"image_{int(imageid)}_product_{int(productid)}.jpg"
+
+
 def is_data_available() -> bool:
     """Vérifie si les données réelles sont disponibles."""
     return X_TRAIN_PATH.exists() and Y_TRAIN_PATH.exists()
@@ -0,0 +1,513 @@
+"""
+Index des images en double (ou quasi identiques) du catalogue.
+
+De nombreux produits Rakuten partagent la même photo, parfois recompressée
+ou redimensionnée: chaque copie coûte une extraction de features et une
+ligne de stockage. Le DuplicateIndex:
+- Calcule l'empreinte perceptuelle (dHash 64 bits) de chaque image, sur un
+  décodage JPEG réduit et en parallèle sur un pool de processus
+- Range les empreintes dans des tables par tranche de bits (multi-index
+  hashing): pour un rayon r, les 64 bits sont coupés en r + 1 tranches et
+  deux empreintes à distance <= r ont au moins une tranche identique
+  (principe des tiroirs); une recherche ne compare donc que les empreintes
+  d'un même tiroir, pas tout le catalogue
+- Regroupe les images à distance <= r de leur représentant: l'extraction
+  de features est faite une fois par groupe, sur son représentant, et le
+  résultat est recopié sur les autres images du groupe
+
+Les groupes ne sont pas transitifs: A proche de B et B proche de C ne place
+pas C dans le groupe de A si A et C sont à distance > r (sinon une chaîne de
+retouches successives fusionnerait des photos différentes). Les empreintes à
+faible entropie (presque tous les bits à 0 ou à 1: produit sur fond blanc
+uni, image quasi unie) ne sont regroupées avec aucune autre image, pas même
+une copie exacte: deux produits différents sur fond blanc y ont souvent la
+même empreinte.
+
+Les empreintes de l'index et celles des requêtes doivent venir du même
+décodage: utiliser compute_file_fingerprint() pour interroger l'index.
+
+Usage:
+    index = build_dedup_index(list(zip(X_train["imageid"], X_train["productid"])))
+    index.save()
+    features = extract(index.representative_pairs())   # une ligne par groupe
+    all_features = index.expand(features)              # une ligne par image
+"""
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data_loader import get_image_path
+from .image_loader import ImageKey, InlineExecutor
+from .image_utils import compute_image_fingerprint, load_image_for_model
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import DEDUP_INDEX_PATH, IMAGE_CONFIG
+
+
+# Décodage réduit suffisant pour un dHash (grille 9x8)
+_FINGERPRINT_DRAFT_SIZE = (64, 64)
+
+# Lignes comparées par passe dans un tiroir (borne la mémoire des matrices de distances)
+_COMPARE_BLOCK_ROWS = 256
+
+# Nombre de bits à 1 de chaque octet
+_POPCOUNT_8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount64(values: np.ndarray) -> np.ndarray:
+    """Nombre de bits à 1 de chaque entier uint64 (vectorisé)."""
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    counts = _POPCOUNT_8[values.view(np.uint8)].reshape(values.shape + (8,))
+    return counts.sum(axis=-1, dtype=np.int64)
+
+
+def _chunk_bounds(radius: int) -> List[Tuple[int, int]]:
+    """Tranches de bits [début, fin) du multi-index pour un rayon donné."""
+    edges = np.linspace(0, 64, radius + 2).round().astype(int)
+    return [(int(lo), int(hi)) for lo, hi in zip(edges[:-1], edges[1:])]
+
+
+def _chunk_values(fingerprints: np.ndarray, lo: int, hi: int) -> np.ndarray:
+    mask = np.uint64((1 << (hi - lo)) - 1)
+    return (fingerprints >> np.uint64(lo)) & mask
+
+
+# =============================================================================
+# Calcul des empreintes
+# =============================================================================
+def compute_file_fingerprint(source) -> int:
+    """
+    Empreinte (dHash 64 bits) d'un fichier image, telle que stockée dans l'index.
+
+    Le décodage JPEG réduit change quelques bits par rapport à un dHash
+    calculé sur l'image pleine résolution: les requêtes sur l'index doivent
+    passer par cette fonction.
+
+    Args:
+        source: Chemin, flux binaire ou UploadedFile de Streamlit
+
+    Returns:
+        Entier non signé de 64 bits
+
+    Raises:
+        ValueError: Si le fichier n'est pas une image valide
+    """
+    return compute_image_fingerprint(load_image_for_model(source, _FINGERPRINT_DRAFT_SIZE))
+
+
+def _fingerprint_chunk(paths: Sequence[str]) -> Tuple[List[int], List[int], Dict[int, str]]:
+    """
+    Calcule les empreintes d'un lot dans un worker.
+
+    Returns:
+        Tuple (empreintes des images lues, positions lues, position -> erreur)
+    """
+    fingerprints: List[int] = []
+    loaded: List[int] = []
+    errors: Dict[int, str] = {}
+    for position, path in enumerate(paths):
+        try:
+            fingerprints.append(compute_file_fingerprint(path))
+            loaded.append(position)
+        except (OSError, ValueError) as e:
+            errors[position] = str(e)
+    return fingerprints, loaded, errors
+
+
+def compute_fingerprints(
+    pairs: Sequence[ImageKey],
+    images_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, Dict[ImageKey, str]]:
+    """
+    Calcule le dHash 64 bits des images du dataset.
+
+    Args:
+        pairs: Couples (imageid, productid)
+        images_dir: Dossier des images. Par défaut: IMAGES_TRAIN_DIR
+        max_workers: Nombre de processus (0 = processus courant).
+            Par défaut: IMAGE_CONFIG["loader_max_workers"], puis le nombre de coeurs
+        batch_size: Images par tâche. Par défaut: IMAGE_CONFIG["loader_batch_size"]
+
+    Returns:
+        Tuple (clés (n, 2) int64 des images lues, empreintes (n,) uint64,
+        clé -> message pour les images illisibles)
+    """
+    if max_workers is None:
+        max_workers = IMAGE_CONFIG["loader_max_workers"]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = IMAGE_CONFIG["loader_batch_size"]
+    if max_workers < 0:
+        raise ValueError(f"max_workers must be >= 0, got {max_workers}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+
+    pairs = [(int(imageid), int(productid)) for imageid, productid in pairs]
+    chunks = [pairs[start:start + batch_size] for start in range(0, len(pairs), batch_size)]
+    paths = [[str(get_image_path(i, p, images_dir)) for i, p in chunk] for chunk in chunks]
+
+    keys: List[ImageKey] = []
+    fingerprints: List[int] = []
+    errors: Dict[ImageKey, str] = {}
+    executor: Executor = (
+        InlineExecutor() if max_workers == 0 else ProcessPoolExecutor(max_workers=max_workers)
+    )
+    with executor:
+        for chunk, (values, loaded, chunk_errors) in zip(chunks, executor.map(_fingerprint_chunk, paths)):
+            keys.extend(chunk[position] for position in loaded)
+            fingerprints.extend(values)
+            errors.update({chunk[position]: message for position, message in chunk_errors.items()})
+
+    return (
+        np.array(keys, dtype=np.int64).reshape(-1, 2),
+        np.array(fingerprints, dtype=np.uint64),
+        errors,
+    )
+
+
+# =============================================================================
+# Index
+# =============================================================================
+class DuplicateIndex:
+    """
+    Index des empreintes avec recherche par rayon de Hamming et groupes de doublons.
+
+    Les lignes de l'index suivent l'ordre des clés fournies; le
+    représentant d'un groupe est sa première image dans cet ordre et
+    toutes les images du groupe sont à distance <= rayon de lui.
+    """
+
+    def __init__(
+        self,
+        keys: np.ndarray,
+        fingerprints: np.ndarray,
+        radius: Optional[int] = None,
+        min_hash_bits: Optional[int] = None
+    ):
+        """
+        Args:
+            keys: Clés (n, 2) (imageid, productid)
+            fingerprints: Empreintes (n,) uint64 alignées sur les clés
+            radius: Distance de Hamming max entre une image et le
+                représentant de son groupe.
+                Par défaut: IMAGE_CONFIG["dedup_hamming_radius"]
+            min_hash_bits: Bits à 1 (et à 0) minimum d'une empreinte pour
+                être regroupée; en dessous, l'image reste seule.
+                Par défaut: IMAGE_CONFIG["dedup_min_hash_bits"]
+
+        Raises:
+            ValueError: Si les tailles ne correspondent pas ou si le rayon
+                n'est pas dans [0, 63] ou min_hash_bits dans [0, 32]
+        """
+        if radius is None:
+            radius = IMAGE_CONFIG["dedup_hamming_radius"]
+        if min_hash_bits is None:
+            min_hash_bits = IMAGE_CONFIG["dedup_min_hash_bits"]
+        if not 0 <= radius <= 63:
+            raise ValueError(f"radius must be in [0, 63], got {radius}")
+        if not 0 <= min_hash_bits <= 32:
+            raise ValueError(f"min_hash_bits must be in [0, 32], got {min_hash_bits}")
+        keys = np.asarray(keys, dtype=np.int64).reshape(-1, 2)
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        if len(keys) != len(fingerprints):
+            raise ValueError(f"{len(keys)} clés pour {len(fingerprints)} empreintes")
+
+        self._keys = keys
+        self._fingerprints = fingerprints
+        self._radius = int(radius)
+        self._min_hash_bits = int(min_hash_bits)
+
+        # Copies exactes regroupées d'emblée: seules les empreintes
+        # distinctes passent par les tiroirs
+        self._unique, self._inverse = np.unique(fingerprints, return_inverse=True)
+        self._inverse = self._inverse.reshape(-1)
+        # Lignes de chaque empreinte distincte (CSR: rows_by_unique[offsets[u]:offsets[u + 1]])
+        self._rows_by_unique = np.argsort(self._inverse, kind="stable")
+        self._offsets = np.searchsorted(
+            self._inverse[self._rows_by_unique], np.arange(len(self._unique) + 1)
+        )
+        self._bounds = _chunk_bounds(self._radius)
+        self._tables = [self._build_table(lo, hi) for lo, hi in self._bounds]
+        self._representatives = self._build_groups()
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+    def _build_table(self, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Tiroirs d'une tranche: (valeurs triées, indices des empreintes distinctes)."""
+        values = _chunk_values(self._unique, lo, hi)
+        order = np.argsort(values, kind="stable")
+        return values[order], order
+
+    def _candidate_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Couples d'empreintes distinctes à distance <= rayon (chaque tiroir comparé)."""
+        left: List[np.ndarray] = []
+        right: List[np.ndarray] = []
+        for sorted_values, order in self._tables:
+            if len(sorted_values) < 2:
+                continue
+            starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+            ends = np.r_[starts[1:], len(sorted_values)]
+            for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+                members = order[start:end]
+                values = self._unique[members]
+                for row in range(0, len(members), _COMPARE_BLOCK_ROWS):
+                    block = values[row:row + _COMPARE_BLOCK_ROWS]
+                    distances = popcount64(block[:, None] ^ values[None, :])
+                    i, j = np.nonzero(distances <= self._radius)
+                    upper = j > i + row
+                    left.append(members[i[upper] + row])
+                    right.append(members[j[upper]])
+        if not left:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(left), np.concatenate(right)
+
+    def _build_groups(self) -> np.ndarray:
+        """
+        Ligne du représentant de chaque image.
+
+        Les empreintes distinctes sont parcourues dans l'ordre de leur
+        première ligne: une empreinte pas encore placée devient
+        représentante et prend ses voisines (distance <= rayon) encore
+        libres. Une image n'est donc jamais rattachée par une chaîne de
+        voisines.
+        """
+        n_unique = len(self._unique)
+        bits = popcount64(self._unique)
+        low_entropy = (bits < self._min_hash_bits) | (bits > 64 - self._min_hash_bits)
+
+        # Voisines de chaque empreinte distincte (CSR: neighbors[starts[u]:starts[u + 1]])
+        left, right = self._candidate_pairs()
+        kept = ~(low_entropy[left] | low_entropy[right])
+        sources = np.concatenate([left[kept], right[kept]])
+        targets = np.concatenate([right[kept], left[kept]])
+        order = np.argsort(sources, kind="stable")
+        neighbors = targets[order]
+        starts = np.searchsorted(sources[order], np.arange(n_unique + 1))
+
+        first_row = np.full(n_unique, len(self._keys), dtype=np.int64)
+        np.minimum.at(first_row, self._inverse, np.arange(len(self._keys)))
+
+        leader = np.full(n_unique, -1, dtype=np.int64)
+        for unique in np.argsort(first_row, kind="stable"):
+            if leader[unique] >= 0:
+                continue
+            leader[unique] = unique
+            candidates = neighbors[starts[unique]:starts[unique + 1]]
+            free = candidates[leader[candidates] < 0]
+            leader[free] = unique
+
+        representatives = first_row[leader[self._inverse]]
+        # Empreintes à faible entropie: chaque image est son propre représentant
+        isolated = low_entropy[self._inverse]
+        representatives[isolated] = np.flatnonzero(isolated)
+        return representatives
+
+    # -------------------------------------------------------------------------
+    # Recherche
+    # -------------------------------------------------------------------------
+    @property
+    def radius(self) -> int:
+        return self._radius
+
+    @property
+    def min_hash_bits(self) -> int:
+        return self._min_hash_bits
+
+    @property
+    def keys(self) -> np.ndarray:
+        """Clés (n, 2) (imageid, productid), dans l'ordre des lignes."""
+        return self._keys
+
+    @property
+    def fingerprints(self) -> np.ndarray:
+        return self._fingerprints
+
+    def query(self, fingerprint: int, radius: Optional[int] = None) -> List[Tuple[ImageKey, int]]:
+        """
+        Images dont l'empreinte est à distance <= radius.
+
+        Args:
+            fingerprint: Empreinte recherchée (voir compute_file_fingerprint)
+            radius: Rayon de recherche (<= rayon de l'index). Par défaut: celui de l'index
+
+        Returns:
+            Couples ((imageid, productid), distance), par distance croissante
+
+        Raises:
+            ValueError: Si radius dépasse le rayon de l'index (la recherche
+                par tiroirs ne garantit plus de tout trouver)
+        """
+        if radius is None:
+            radius = self._radius
+        if not 0 <= radius <= self._radius:
+            raise ValueError(f"radius must be in [0, {self._radius}], got {radius}")
+
+        query = np.array([fingerprint], dtype=np.uint64)
+        candidates = []
+        for (lo, hi), (sorted_values, order) in zip(self._bounds, self._tables):
+            value = _chunk_values(query, lo, hi)[0]
+            start = np.searchsorted(sorted_values, value, side="left")
+            end = np.searchsorted(sorted_values, value, side="right")
+            candidates.append(order[start:end])
+        candidates = np.unique(np.concatenate(candidates))
+        distances = popcount64(self._unique[candidates] ^ query[0])
+        close = candidates[distances <= radius]
+        close_distances = distances[distances <= radius]
+
+        # Empreintes distinctes -> images
+        results = []
+        for i in np.argsort(close_distances, kind="stable"):
+            unique = close[i]
+            for row in self._rows_by_unique[self._offsets[unique]:self._offsets[unique + 1]]:
+                results.append(((int(self._keys[row, 0]), int(self._keys[row, 1])), int(close_distances[i])))
+        return results
+
+    # -------------------------------------------------------------------------
+    # Groupes de doublons
+    # -------------------------------------------------------------------------
+    @property
+    def representative_rows(self) -> np.ndarray:
+        """Ligne du représentant de chaque image (n,)."""
+        return self._representatives
+
+    def duplicate_groups(self, min_size: int = 2) -> List[List[ImageKey]]:
+        """
+        Groupes de doublons, du plus grand au plus petit.
+
+        Args:
+            min_size: Taille minimale des groupes retournés (1 = toutes les images)
+
+        Returns:
+            Listes de clés (imageid, productid); le représentant en premier
+        """
+        groups: Dict[int, List[int]] = {}
+        for row, representative in enumerate(self._representatives):
+            groups.setdefault(int(representative), []).append(row)
+        return [
+            [(int(self._keys[row, 0]), int(self._keys[row, 1])) for row in rows]
+            for rows in sorted(groups.values(), key=len, reverse=True)
+            if len(rows) >= min_size
+        ]
+
+    def representative_pairs(self) -> List[ImageKey]:
+        """Une clé par groupe (images dont extraire les features), dans l'ordre des lignes."""
+        rows = np.unique(self._representatives)
+        return [(int(self._keys[row, 0]), int(self._keys[row, 1])) for row in rows]
+
+    def expand(self, values: np.ndarray) -> np.ndarray:
+        """
+        Recopie des valeurs calculées par groupe sur toutes les images.
+
+        Args:
+            values: (n_groupes, ...) alignées sur representative_pairs()
+
+        Returns:
+            (n_images, ...) alignées sur keys
+        """
+        representatives = np.unique(self._representatives)
+        if len(values) != len(representatives):
+            raise ValueError(f"{len(representatives)} groupes attendus, reçu {len(values)} lignes")
+        return np.asarray(values)[np.searchsorted(representatives, self._representatives)]
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Statistiques de dédoublonnage.
+
+        Returns:
+            Dict avec images, distinct_fingerprints, groups (images à
+            extraire), duplicate_groups (groupes de 2 images ou plus),
+            duplicates (extractions évitées) et saved_ratio
+        """
+        n_images = len(self._keys)
+        representatives, sizes = np.unique(self._representatives, return_counts=True)
+        return {
+            "images": n_images,
+            "distinct_fingerprints": len(self._unique),
+            "groups": len(representatives),
+            "duplicate_groups": int((sizes > 1).sum()),
+            "duplicates": n_images - len(representatives),
+            "saved_ratio": (n_images - len(representatives)) / n_images if n_images else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # -------------------------------------------------------------------------
+    # Persistance
+    # -------------------------------------------------------------------------
+    def save(self, path: Optional[Path] = None) -> Path:
+        """
+        Écrit les clés, empreintes et le rayon (.npz, écriture atomique).
+
+        Args:
+            path: Fichier de sortie. Par défaut: config.DEDUP_INDEX_PATH
+        """
+        path = Path(path) if path is not None else DEDUP_INDEX_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f, keys=self._keys, fingerprints=self._fingerprints,
+                radius=self._radius, min_hash_bits=self._min_hash_bits,
+            )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(
+        cls,
+        path: Optional[Path] = None,
+        radius: Optional[int] = None,
+        min_hash_bits: Optional[int] = None
+    ) -> "DuplicateIndex":
+        """
+        Relit un index sauvegardé (les tiroirs et groupes sont reconstruits).
+
+        Args:
+            path: Fichier .npz. Par défaut: config.DEDUP_INDEX_PATH
+            radius: Rayon à utiliser. Par défaut: celui de l'index sauvegardé
+            min_hash_bits: Voir DuplicateIndex. Par défaut: celui de l'index
+                sauvegardé, sinon la configuration
+
+        Raises:
+            FileNotFoundError: Si l'index n'a pas été construit
+        """
+        path = Path(path) if path is not None else DEDUP_INDEX_PATH
+        with np.load(path) as data:
+            if radius is None:
+                radius = int(data["radius"])
+            if min_hash_bits is None and "min_hash_bits" in data:
+                min_hash_bits = int(data["min_hash_bits"])
+            return cls(data["keys"], data["fingerprints"], radius=radius, min_hash_bits=min_hash_bits)
+
+
+def build_dedup_index(
+    pairs: Sequence[ImageKey],
+    images_dir: Optional[Path] = None,
+    radius: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    min_hash_bits: Optional[int] = None
+) -> DuplicateIndex:
+    """
+    Calcule les empreintes des images et construit l'index.
+
+    Les images illisibles sont absentes de l'index.
+
+    Args:
+        pairs: Couples (imageid, productid)
+        images_dir: Dossier des images. Par défaut: IMAGES_TRAIN_DIR
+        radius: Voir DuplicateIndex
+        max_workers: Voir compute_fingerprints()
+        min_hash_bits: Voir DuplicateIndex
+    """
+    keys, fingerprints, _ = compute_fingerprints(pairs, images_dir, max_workers=max_workers)
+    return DuplicateIndex(keys, fingerprints, radius=radius, min_hash_bits=min_hash_bits)
@@ -0,0 +1,261 @@
+"""
+Stockage des features CNN pré-extraites en float16 mappé en mémoire.
+
+Les vecteurs ResNet50 (2048-d) et VGG16 (4096-d) des ~85k images tiennent
+en ~350 Mo / ~700 Mo en float16 (moitié du float32). Le store:
+- Écrit la matrice (N, D) float16 dans un .npy relu par np.load(mmap_mode="r"),
+  sans rien charger tant qu'on ne lit pas de ligne
+- Trie les lignes par identifiant à l'écriture: la recherche d'un id est un
+  np.searchsorted en O(log n), sans dictionnaire Python
+- Rassemble les features d'un lot de produits en un seul gather vectorisé
+
+Usage:
+    write_feature_store(productids, features, name="resnet50")
+    store = get_shared_feature_store("resnet50")
+    X = store.gather(batch_productids)       # (n, 2048) float32
+"""
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import FEATURE_STORE_DIR
+
+
+# Dimension des features par extracteur
+FEATURE_DIMS: Dict[str, int] = {
+    "resnet50": 2048,
+    "vgg16": 4096,
+}
+
+# Lignes converties en float16 par passe lors de l'écriture
+_WRITE_CHUNK_ROWS = 8192
+
+_FLOAT16_MAX = float(np.finfo(np.float16).max)
+
+
+def get_feature_store_paths(name: str, store_dir: Optional[Path] = None) -> Dict[str, Path]:
+    """
+    Chemins des fichiers d'un store.
+
+    Returns:
+        Dict avec "features" (<nom>.f16.npy) et "ids" (<nom>.ids.npy)
+    """
+    store_dir = Path(store_dir) if store_dir is not None else FEATURE_STORE_DIR
+    return {
+        "features": store_dir / f"{name}.f16.npy",
+        "ids": store_dir / f"{name}.ids.npy",
+    }
+
+
+def write_feature_store(
+    ids: Sequence[int],
+    features: np.ndarray,
+    name: str,
+    store_dir: Optional[Path] = None
+) -> Dict[str, Path]:
+    """
+    Écrit des features dans un store float16 trié par identifiant.
+
+    Les features peuvent elles-mêmes être un memmap float32: la conversion
+    se fait par blocs de lignes, sans copie complète en mémoire.
+
+    Args:
+        ids: Identifiants (ex: productid), un par ligne, uniques
+        features: Matrice (N, D)
+        name: Nom du store (ex: "resnet50")
+        store_dir: Dossier de sortie. Par défaut: config.FEATURE_STORE_DIR
+
+    Returns:
+        Chemins écrits (voir get_feature_store_paths)
+
+    Raises:
+        ValueError: Si les tailles ne correspondent pas, si la dimension ne
+            correspond pas à FEATURE_DIMS[name], si un id est dupliqué ou si
+            une valeur dépasse la plage du float16
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    if features.ndim != 2 or features.shape[0] != len(ids):
+        raise ValueError(f"Expected ({len(ids)}, D) features, got shape {features.shape}")
+    expected_dim = FEATURE_DIMS.get(name)
+    if expected_dim is not None and features.shape[1] != expected_dim:
+        raise ValueError(f"{name}: dimension {expected_dim} attendue, reçu {features.shape[1]}")
+
+    order = np.argsort(ids, kind="stable")
+    sorted_ids = ids[order]
+    if len(sorted_ids) > 1 and (np.diff(sorted_ids) == 0).any():
+        raise ValueError("Identifiants dupliqués")
+
+    paths = get_feature_store_paths(name, store_dir)
+    paths["features"].parent.mkdir(parents=True, exist_ok=True)
+    tmp_features = paths["features"].with_name(paths["features"].name + ".tmp")
+    tmp_ids = paths["ids"].with_name(paths["ids"].name + ".tmp")
+
+    matrix = np.lib.format.open_memmap(
+        tmp_features, mode="w+", dtype=np.float16, shape=features.shape
+    )
+    try:
+        for start in range(0, len(order), _WRITE_CHUNK_ROWS):
+            # Indices triés: lecture quasi séquentielle d'une source memmap
+            rows = order[start:start + _WRITE_CHUNK_ROWS]
+            source_rows = np.sort(rows)
+            block = np.asarray(features[source_rows])
+            if np.abs(block).max(initial=0.0) > _FLOAT16_MAX:
+                raise ValueError("Valeur hors de la plage du float16")
+            # Replace les lignes du bloc dans l'ordre trié des ids
+            matrix[start:start + len(rows)] = block[np.searchsorted(source_rows, rows)]
+        matrix.flush()
+    except Exception:
+        del matrix
+        tmp_features.unlink(missing_ok=True)
+        raise
+    del matrix
+
+    with open(tmp_ids, "wb") as f:
+        np.save(f, sorted_ids)
+    os.replace(tmp_features, paths["features"])
+    os.replace(tmp_ids, paths["ids"])
+    return paths
+
+
+class FeatureStore:
+    """
+    Lecteur d'un store de features float16 (lecture seule).
+
+    get() renvoie une vue float16 sans copie; gather() renvoie une copie
+    contiguë, convertie en float32 par défaut pour les classifieurs.
+    """
+
+    def __init__(self, features: np.ndarray, ids: np.ndarray):
+        """
+        Args:
+            features: Matrice (N, D) float16, typiquement un np.memmap
+            ids: Identifiants (N,) int64 triés, alignés sur les lignes
+        """
+        if features.shape[0] != len(ids):
+            raise ValueError(f"{len(ids)} ids pour {features.shape[0]} lignes")
+        self._features = features
+        self._ids = ids
+
+    @classmethod
+    def open(cls, name: str, store_dir: Optional[Path] = None) -> "FeatureStore":
+        """
+        Ouvre un store existant sans charger les features.
+
+        Raises:
+            FileNotFoundError: Si le store n'existe pas
+        """
+        paths = get_feature_store_paths(name, store_dir)
+        return cls(np.load(paths["features"], mmap_mode="r"), np.load(paths["ids"]))
+
+    # -------------------------------------------------------------------------
+    # Recherche
+    # -------------------------------------------------------------------------
+    @property
+    def ids(self) -> np.ndarray:
+        """Identifiants triés."""
+        return self._ids
+
+    @property
+    def dim(self) -> int:
+        return self._features.shape[1]
+
+    def lookup(self, ids: Sequence[int]) -> np.ndarray:
+        """
+        Lignes des identifiants demandés (recherche dichotomique vectorisée).
+
+        Returns:
+            (n,) int64, -1 pour un identifiant absent
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        rows = np.searchsorted(self._ids, ids)
+        found = rows < len(self._ids)
+        found[found] = self._ids[rows[found]] == ids[found]
+        return np.where(found, rows, -1)
+
+    def contains(self, ids: Sequence[int]) -> np.ndarray:
+        """Masque (n,) des identifiants présents."""
+        return self.lookup(ids) >= 0
+
+    # -------------------------------------------------------------------------
+    # Accès
+    # -------------------------------------------------------------------------
+    def get(self, id_: int) -> np.ndarray:
+        """
+        Vue (D,) float16 sur les features d'un identifiant.
+
+        Raises:
+            KeyError: Si l'identifiant est absent
+        """
+        row = int(self.lookup([id_])[0])
+        if row < 0:
+            raise KeyError(id_)
+        return self._features[row]
+
+    def gather(
+        self,
+        ids: Sequence[int],
+        dtype: np.dtype = np.float32,
+        missing: str = "raise"
+    ) -> np.ndarray:
+        """
+        Features d'un lot d'identifiants en un seul gather.
+
+        Args:
+            ids: Identifiants demandés (ordre quelconque, doublons permis)
+            dtype: Type de sortie (float32 par défaut, float16 sans conversion)
+            missing: "raise" (KeyError) ou "zero" (ligne de zéros) pour un
+                identifiant absent
+
+        Returns:
+            (n, D) dans l'ordre des identifiants demandés
+        """
+        if missing not in ("raise", "zero"):
+            raise ValueError(f"missing must be 'raise' or 'zero', got {missing!r}")
+        rows = self.lookup(ids)
+        absent = rows < 0
+        if absent.any() and missing == "raise":
+            raise KeyError(np.asarray(ids)[absent][:5].tolist())
+
+        # Lecture dans l'ordre des lignes (accès séquentiel au memmap)
+        order = np.argsort(rows, kind="stable")
+        out = np.zeros((len(rows), self.dim), dtype=dtype)
+        present = order[~absent[order]]
+        out[present] = self._features[rows[present]]
+        return out
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, id_) -> bool:
+        try:
+            return bool(self.contains([id_])[0])
+        except (TypeError, ValueError):
+            return False
+
+
+# =============================================================================
+# Stores partagés (lecture seule) du processus
+# =============================================================================
+_shared_stores: Dict[str, FeatureStore] = {}
+_shared_lock = threading.Lock()
+
+
+def is_feature_store_available(name: str, store_dir: Optional[Path] = None) -> bool:
+    """Vérifie que les fichiers du store existent."""
+    return all(path.exists() for path in get_feature_store_paths(name, store_dir).values())
+
+
+def get_shared_feature_store(name: str) -> Optional[FeatureStore]:
+    """
+    Retourne le store `name` du processus (config.FEATURE_STORE_DIR), ou
+    None s'il n'a pas été construit.
+    """
+    with _shared_lock:
+        if name not in _shared_stores and is_feature_store_available(name):
+            _shared_stores[name] = FeatureStore.open(name)
+        return _shared_stores.get(name)
@@ -0,0 +1,343 @@
+"""
+Chargement parallèle des images du dataset (décodage + letterbox + normalisation).
+
+Extraire des features sur image_train signifie décoder des dizaines de
+milliers de JPEG: en séquentiel, le CPU de décodage est le goulot. Le
+ParallelImageLoader:
+- Répartit les lots d'images (imageid, productid) sur un pool de processus
+- Décode chaque JPEG en résolution réduite puis le letterboxe en 224x224
+- Renvoie des lots prêts (uint8 RGB, ou float32 normalisé ResNet)
+- Limite le nombre de lots en vol (file de préchargement bornée), ce qui
+  borne la mémoire quel que soit le nombre d'images
+- Produit les lots dans l'ordre d'entrée, ou dès qu'ils sont prêts
+
+Les workers renvoient des pixels uint8 (4x moins de données à transférer
+entre processus que du float32); la normalisation ResNet est faite côté
+appelant, vectorisée sur le lot.
+
+Usage:
+    pairs = list(zip(X_train["imageid"], X_train["productid"]))
+    with ParallelImageLoader(max_workers=8) as loader:
+        for batch in loader.iter_batches(pairs):
+            features = model.predict(batch.pixels)
+"""
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data_loader import get_image_path
+from .image_utils import IMAGENET_BGR_MEAN, load_image_for_model, resize_image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import IMAGE_CONFIG
+
+
+# (imageid, productid)
+ImageKey = Tuple[int, int]
+
+
+@dataclass
+class ImageBatch:
+    """
+    Lot d'images chargées.
+
+    Attributes:
+        index: Position du lot dans la séquence d'entrée (0, 1, ...)
+        keys: Clés (imageid, productid) des images chargées, dans l'ordre de `pixels`
+        pixels: (n, H, W, 3) uint8 RGB, ou float32 BGR centré si normalisé
+        errors: Clé -> message pour les images illisibles ou absentes
+    """
+    index: int
+    keys: List[ImageKey]
+    pixels: np.ndarray
+    errors: Dict[ImageKey, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def normalize_for_resnet(pixels: np.ndarray) -> np.ndarray:
+    """
+    Convertit un lot uint8 RGB en entrée ResNet50 (float32, BGR, moyenne ImageNet).
+
+    Équivalent à preprocess_for_resnet_batch() sur des images déjà letterboxées.
+    """
+    batch = pixels[..., ::-1].astype(np.float32)
+    batch -= IMAGENET_BGR_MEAN
+    return batch
+
+
+def _load_chunk(
+    paths: Sequence[str],
+    target_size: Tuple[int, int]
+) -> Tuple[np.ndarray, List[int], Dict[int, str]]:
+    """
+    Charge un lot dans un worker.
+
+    Returns:
+        Tuple (pixels uint8 des images lues, positions lues, position -> erreur)
+    """
+    target_w, target_h = target_size
+    pixels = np.empty((len(paths), target_h, target_w, 3), dtype=np.uint8)
+    loaded: List[int] = []
+    errors: Dict[int, str] = {}
+    for position, path in enumerate(paths):
+        try:
+            image = load_image_for_model(path, target_size)
+            pixels[len(loaded)] = np.asarray(resize_image(image, target_size))
+            loaded.append(position)
+        except (OSError, ValueError) as e:
+            errors[position] = str(e)
+    return pixels[:len(loaded)], loaded, errors
+
+
+class InlineExecutor(Executor):
+    """
+    Exécuteur synchrone (max_workers=0): pas de processus, utile pour déboguer.
+
+    Partagé par les chargements parallèles du dataset (ParallelImageLoader,
+    dedup_index.compute_fingerprints).
+    """
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class ParallelImageLoader:
+    """
+    Charge des images du dataset par lots sur un pool de processus.
+
+    Le pool est créé à la première utilisation et réutilisé entre les
+    appels à iter_batches(); fermer le loader (close() ou bloc with)
+    arrête les processus.
+    """
+
+    def __init__(
+        self,
+        images_dir: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        normalize: bool = True,
+        target_size: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Args:
+            images_dir: Dossier des images. Par défaut: IMAGES_TRAIN_DIR
+            batch_size: Images par lot. Par défaut: IMAGE_CONFIG["loader_batch_size"]
+            max_workers: Nombre de processus (0 = chargement dans le processus
+                courant). Par défaut: IMAGE_CONFIG["loader_max_workers"], puis
+                le nombre de coeurs
+            prefetch: Nombre maximal de lots en vol (chargés ou en cours) non
+                encore consommés. Par défaut: IMAGE_CONFIG["loader_prefetch_batches"]
+            normalize: True pour des lots float32 prêts pour ResNet50,
+                False pour des pixels uint8 RGB letterboxés
+            target_size: Taille (width, height). Par défaut: IMAGE_CONFIG["target_size"]
+        """
+        if batch_size is None:
+            batch_size = IMAGE_CONFIG["loader_batch_size"]
+        if max_workers is None:
+            max_workers = IMAGE_CONFIG["loader_max_workers"]
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if prefetch is None:
+            prefetch = IMAGE_CONFIG["loader_prefetch_batches"]
+        if target_size is None:
+            target_size = IMAGE_CONFIG["target_size"]
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        if prefetch < 1:
+            raise ValueError(f"prefetch must be >= 1, got {prefetch}")
+        if max_workers < 0:
+            raise ValueError(f"max_workers must be >= 0, got {max_workers}")
+
+        self._images_dir = images_dir
+        self._batch_size = batch_size
+        self._max_workers = max_workers
+        self._prefetch = prefetch
+        self._normalize = normalize
+        self._target_size = tuple(target_size)
+
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._images = 0
+        self._failed = 0
+        self._batches = 0
+        self._wait_s = 0.0
+        self._max_in_flight = 0
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def _get_executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                if self._max_workers == 0:
+                    self._executor = InlineExecutor()
+                else:
+                    self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            return self._executor
+
+    # -------------------------------------------------------------------------
+    # Chargement
+    # -------------------------------------------------------------------------
+    def iter_batches(
+        self,
+        pairs: Iterable[ImageKey],
+        ordered: bool = True
+    ) -> Iterator[ImageBatch]:
+        """
+        Charge les images par lots.
+
+        Args:
+            pairs: Couples (imageid, productid), éventuellement un générateur
+            ordered: True pour produire les lots dans l'ordre d'entrée,
+                False pour les produire dès qu'ils sont prêts (ImageBatch.index
+                permet de les replacer)
+
+        Yields:
+            ImageBatch; les images illisibles sont listées dans batch.errors
+        """
+        executor = self._get_executor()
+        chunks = self._iter_chunks(pairs)
+        in_flight: Deque[Tuple[int, List[ImageKey], Future]] = deque()
+        exhausted = False
+
+        try:
+            while True:
+                # Remplit la file de préchargement jusqu'à sa borne
+                while not exhausted and len(in_flight) < self._prefetch:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    index, keys = chunk
+                    paths = [str(get_image_path(i, p, self._images_dir)) for i, p in keys]
+                    future = executor.submit(_load_chunk, paths, self._target_size)
+                    in_flight.append((index, keys, future))
+                    with self._stats_lock:
+                        self._max_in_flight = max(self._max_in_flight, len(in_flight))
+
+                if not in_flight:
+                    return
+
+                start = time.perf_counter()
+                if ordered:
+                    entry = in_flight.popleft()
+                else:
+                    done, _ = wait([f for _, _, f in in_flight], return_when=FIRST_COMPLETED)
+                    entry = next(e for e in in_flight if e[2] in done)
+                    in_flight.remove(entry)
+                batch = self._to_batch(*entry)
+                with self._stats_lock:
+                    self._wait_s += time.perf_counter() - start
+
+                yield batch
+        finally:
+            for _, _, future in in_flight:
+                future.cancel()
+
+    def load(self, pairs: Iterable[ImageKey]) -> ImageBatch:
+        """Charge toutes les images en un seul lot (ordre d'entrée conservé)."""
+        batches = list(self.iter_batches(pairs, ordered=True))
+        target_w, target_h = self._target_size
+        dtype = np.float32 if self._normalize else np.uint8
+        pixels = (
+            np.concatenate([b.pixels for b in batches])
+            if batches else np.empty((0, target_h, target_w, 3), dtype=dtype)
+        )
+        keys = [key for b in batches for key in b.keys]
+        errors = {key: message for b in batches for key, message in b.errors.items()}
+        return ImageBatch(index=0, keys=keys, pixels=pixels, errors=errors)
+
+    def _iter_chunks(self, pairs: Iterable[ImageKey]) -> Iterator[Tuple[int, List[ImageKey]]]:
+        chunk: List[ImageKey] = []
+        index = 0
+        for imageid, productid in pairs:
+            chunk.append((int(imageid), int(productid)))
+            if len(chunk) == self._batch_size:
+                yield index, chunk
+                chunk, index = [], index + 1
+        if chunk:
+            yield index, chunk
+
+    def _to_batch(self, index: int, keys: List[ImageKey], future: Future) -> ImageBatch:
+        pixels, loaded, errors = future.result()
+        if self._normalize:
+            pixels = normalize_for_resnet(pixels)
+
+        batch = ImageBatch(
+            index=index,
+            keys=[keys[position] for position in loaded],
+            pixels=pixels,
+            errors={keys[position]: message for position, message in errors.items()},
+        )
+        with self._stats_lock:
+            self._images += len(batch.keys)
+            self._failed += len(batch.errors)
+            self._batches += 1
+        return batch
+
+    # -------------------------------------------------------------------------
+    # Statistiques et cycle de vie
+    # -------------------------------------------------------------------------
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Statistiques de chargement.
+
+        Returns:
+            Dict avec images, failed, batches, wait_s (temps passé par
+            l'appelant à attendre les lots), max_in_flight et max_workers
+        """
+        with self._stats_lock:
+            return {
+                "images": self._images,
+                "failed": self._failed,
+                "batches": self._batches,
+                "wait_s": self._wait_s,
+                "max_in_flight": self._max_in_flight,
+                "max_workers": self._max_workers,
+            }
+
+    def reset_stats(self) -> None:
+        """Remet les compteurs à zéro."""
+        with self._stats_lock:
+            self._images = 0
+            self._failed = 0
+            self._batches = 0
+            self._wait_s = 0.0
+            self._max_in_flight = 0
+
+    def close(self) -> None:
+        """Arrête le pool de processus."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def __enter__(self) -> "ParallelImageLoader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
@@ -0,0 +1,229 @@
+"""
+Stockage des images d'entraînement en tenseur uint8 mappé en mémoire.
+
+Chaque expérience re-décodait les JPEG bruts. Le store:
+- Est construit une seule fois (pack_image_store) à partir des JPEG,
+  letterboxés en 224x224x3 uint8 par le ParallelImageLoader
+- Écrit un unique fichier .npy (en-tête + tenseur (N, 224, 224, 3)) et un
+  index (productid, imageid) -> ligne à côté (.index.npz)
+- Est relu par np.load(mmap_mode="r"): chaque image est une vue NumPy sans
+  copie ni décodage, et plusieurs processus (entraînement, évaluation,
+  Streamlit) partagent les mêmes pages via le cache du système
+
+Usage:
+    pack_image_store(list(zip(X_train["imageid"], X_train["productid"])))
+    store = ImageStore.open()
+    pixels = store.get(productid, imageid)    # vue (224, 224, 3) uint8
+"""
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .image_loader import ImageKey, ParallelImageLoader
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import IMAGE_STORE_PATH, IMAGE_CONFIG
+
+
+def get_index_path(store_path: Path) -> Path:
+    """Chemin de l'index associé à un store (.npy -> .index.npz)."""
+    store_path = Path(store_path)
+    return store_path.with_name(store_path.stem + ".index.npz")
+
+
+def pack_image_store(
+    pairs: Sequence[ImageKey],
+    store_path: Optional[Path] = None,
+    images_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    target_size: Optional[Tuple[int, int]] = None
+) -> Dict[str, int]:
+    """
+    Décode toutes les images et les écrit dans un store mappé en mémoire.
+
+    La ligne i du tenseur correspond à pairs[i]; les images illisibles
+    gardent une ligne à zéro et sont absentes de l'index. Les fichiers
+    sont écrits sous un nom temporaire puis renommés, si bien qu'un lecteur
+    ne voit jamais un store à moitié écrit.
+
+    Args:
+        pairs: Couples (imageid, productid), comme pour ParallelImageLoader
+        store_path: Fichier .npy de sortie. Par défaut: config.IMAGE_STORE_PATH
+        images_dir: Dossier des JPEG. Par défaut: IMAGES_TRAIN_DIR
+        max_workers: Processus de décodage (voir ParallelImageLoader)
+        target_size: Taille (width, height). Par défaut: IMAGE_CONFIG["target_size"]
+
+    Returns:
+        Dict avec images (écrites) et failed (illisibles)
+
+    Raises:
+        ValueError: Si aucune image n'est fournie
+    """
+    if not pairs:
+        raise ValueError("Aucune image à stocker")
+    if store_path is None:
+        store_path = IMAGE_STORE_PATH
+    if target_size is None:
+        target_size = IMAGE_CONFIG["target_size"]
+    store_path = Path(store_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+
+    pairs = [(int(imageid), int(productid)) for imageid, productid in pairs]
+    rows = {key: row for row, key in enumerate(pairs)}
+    target_w, target_h = target_size
+
+    tmp_store = store_path.with_name(store_path.name + ".tmp")
+    tensor = np.lib.format.open_memmap(
+        tmp_store, mode="w+", dtype=np.uint8, shape=(len(pairs), target_h, target_w, 3)
+    )
+    written = np.zeros(len(pairs), dtype=bool)
+    failed = 0
+
+    with ParallelImageLoader(
+        images_dir=images_dir, max_workers=max_workers, normalize=False, target_size=target_size
+    ) as loader:
+        for batch in loader.iter_batches(pairs, ordered=False):
+            batch_rows = np.fromiter((rows[key] for key in batch.keys), dtype=np.int64, count=len(batch))
+            tensor[batch_rows] = batch.pixels
+            written[batch_rows] = True
+            failed += len(batch.errors)
+    tensor.flush()
+    del tensor
+
+    keys = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    tmp_index = get_index_path(store_path).with_name(get_index_path(store_path).name + ".tmp")
+    with open(tmp_index, "wb") as f:
+        np.savez(
+            f,
+            productid=keys[written, 1],
+            imageid=keys[written, 0],
+            row=np.flatnonzero(written),
+        )
+
+    os.replace(tmp_store, store_path)
+    os.replace(tmp_index, get_index_path(store_path))
+    return {"images": int(written.sum()), "failed": failed}
+
+
+class ImageStore:
+    """
+    Lecteur d'un store d'images mappé en mémoire (lecture seule).
+
+    Les accès unitaires renvoient des vues sur le fichier (aucune copie);
+    les accès groupés (get_many) renvoient une copie contiguë.
+    """
+
+    def __init__(self, tensor: np.ndarray, productids: np.ndarray, imageids: np.ndarray, rows: np.ndarray):
+        """
+        Args:
+            tensor: Tenseur (N, H, W, 3) uint8, typiquement un np.memmap
+            productids, imageids, rows: Index (productid, imageid) -> ligne
+        """
+        self._tensor = tensor
+        self._rows: Dict[Tuple[int, int], int] = {
+            (int(p), int(i)): int(r) for p, i, r in zip(productids, imageids, rows)
+        }
+
+    @classmethod
+    def open(cls, store_path: Optional[Path] = None) -> "ImageStore":
+        """
+        Ouvre un store existant en lecture seule, sans charger les pixels.
+
+        Args:
+            store_path: Fichier .npy. Par défaut: config.IMAGE_STORE_PATH
+
+        Raises:
+            FileNotFoundError: Si le store ou son index n'existe pas
+        """
+        if store_path is None:
+            store_path = IMAGE_STORE_PATH
+        store_path = Path(store_path)
+        tensor = np.load(store_path, mmap_mode="r")
+        with np.load(get_index_path(store_path)) as index:
+            return cls(tensor, index["productid"], index["imageid"], index["row"])
+
+    # -------------------------------------------------------------------------
+    # Accès
+    # -------------------------------------------------------------------------
+    @property
+    def pixels(self) -> np.ndarray:
+        """Tenseur complet (N, H, W, 3), y compris les lignes non indexées."""
+        return self._tensor
+
+    @property
+    def image_shape(self) -> Tuple[int, int, int]:
+        return tuple(self._tensor.shape[1:])
+
+    def row(self, productid: int, imageid: int) -> int:
+        """
+        Ligne d'une image dans le tenseur.
+
+        Raises:
+            KeyError: Si l'image n'est pas dans le store
+        """
+        return self._rows[(int(productid), int(imageid))]
+
+    def get(self, productid: int, imageid: int) -> np.ndarray:
+        """Vue (H, W, 3) uint8 sur l'image, sans copie."""
+        return self._tensor[self.row(productid, imageid)]
+
+    def get_many(self, keys: Iterable[Tuple[int, int]]) -> np.ndarray:
+        """
+        Images de plusieurs produits en un seul gather.
+
+        Args:
+            keys: Couples (productid, imageid)
+
+        Returns:
+            Copie (n, H, W, 3) uint8, dans l'ordre des clés
+        """
+        rows = np.fromiter((self.row(p, i) for p, i in keys), dtype=np.int64)
+        return self._tensor[rows]
+
+    def get_image(self, productid: int, imageid: int) -> Image.Image:
+        """Image PIL RGB (affichage)."""
+        return Image.fromarray(np.asarray(self.get(productid, imageid)), mode="RGB")
+
+    def keys(self) -> List[Tuple[int, int]]:
+        """Clés (productid, imageid) présentes."""
+        return list(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key) -> bool:
+        try:
+            productid, imageid = key
+            return (int(productid), int(imageid)) in self._rows
+        except (TypeError, ValueError):
+            return False
+
+
+# =============================================================================
+# Store partagé (lecture seule) du processus
+# =============================================================================
+_shared_store: Optional[ImageStore] = None
+_shared_lock = threading.Lock()
+
+
+def is_image_store_available(store_path: Optional[Path] = None) -> bool:
+    """Vérifie que le store et son index existent."""
+    store_path = Path(store_path) if store_path is not None else IMAGE_STORE_PATH
+    return store_path.exists() and get_index_path(store_path).exists()
+
+
+def get_shared_image_store() -> Optional[ImageStore]:
+    """
+    Retourne le store du processus (config.IMAGE_STORE_PATH), ou None s'il
+    n'a pas été construit.
+    """
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None and is_image_store_available():
+            _shared_store = ImageStore.open()
+        return _shared_store
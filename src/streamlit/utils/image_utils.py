@@ -2,14 +2,22 @@
 Utilitaires de traitement d'images pour l'application Rakuten.
 
 Ce module fournit des fonctions pour:
-- Charger et valider des images uploadées
-- Redimensionner les images pour le modèle
-- Prétraiter les images pour l'extraction de features ResNet50
+- Charger et valider des images uploadées (décodage JPEG réduit pour le modèle)
+- Rejeter les uploads invalides sur leur seul en-tête, avant tout décodage
+- Redimensionner les images pour le modèle (niveaux de qualité du rééchantillonnage)
+- Prétraiter les images (unitairement ou par lot) pour l'extraction de features ResNet50
+- Calculer une empreinte exacte du contenu (clés de cache)
+- Calculer une empreinte perceptuelle rapide (dHash 64 bits)
 """
-from typing import Tuple, Optional
+from typing import Any, Callable, Dict, Sequence, Tuple, Optional
 from pathlib import Path
+import hashlib
 import io
 import sys
+import os
+import threading
+import warnings
+import weakref
 
 from PIL import Image
 import numpy as np
@@ -19,12 +27,32 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import IMAGE_CONFIG
 
 
-def load_image_from_upload(uploaded_file) -> Image.Image:
+def _open_image(source, draft_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+    """Ouvre une image en RGB, avec décodage JPEG réduit si draft_size est fourni."""
+    image = Image.open(source)
+    if draft_size is not None:
+        # JPEG: le décodeur réduit l'échelle (1/2, 1/4, 1/8) en gardant une
+        # taille >= draft_size; sans effet pour les autres formats
+        image.draft("RGB", draft_size)
+    # Convertir en RGB si nécessaire (gère PNG avec transparence, etc.)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return image
+
+
+def load_image_from_upload(
+    uploaded_file,
+    draft_size: Optional[Tuple[int, int]] = None
+) -> Image.Image:
     """
     Charge une image depuis un fichier uploadé Streamlit.
 
     Args:
-        uploaded_file: Objet UploadedFile de Streamlit
+        uploaded_file: Objet UploadedFile de Streamlit (ou chemin / flux binaire)
+        draft_size: Taille minimale utile (width, height). Si fournie et que
+            IMAGE_CONFIG["jpeg_draft_decode"] est actif, un JPEG est décodé
+            directement à une résolution réduite proche de cette taille.
+            Par défaut: décodage pleine résolution (affichage).
 
     Returns:
         Image PIL en mode RGB
@@ -32,16 +60,40 @@ def load_image_from_upload(uploaded_file) -> Image.Image:
     Raises:
         ValueError: Si le fichier n'est pas une image valide
     """
+    if not IMAGE_CONFIG.get("jpeg_draft_decode", False):
+        draft_size = None
     try:
-        image = Image.open(uploaded_file)
-        # Convertir en RGB si nécessaire (gère PNG avec transparence, etc.)
-        if image.mode != "RGB":
-            image = image.convert("RGB")
-        return image
+        return _open_image(uploaded_file, draft_size)
     except Exception as e:
         raise ValueError(f"Impossible de charger l'image: {e}")
 
 
+def load_image_for_model(
+    uploaded_file,
+    target_size: Optional[Tuple[int, int]] = None
+) -> Image.Image:
+    """
+    Charge une image destinée au redimensionnement vers la taille du modèle.
+
+    Les photos produits de plusieurs mégapixels sont décodées à une
+    résolution réduite (>= target_size) au lieu d'être entièrement décodées
+    puis réduites: le redimensionnement final reste identique en qualité.
+
+    Args:
+        uploaded_file: Objet UploadedFile de Streamlit (ou chemin / flux binaire)
+        target_size: Taille cible (width, height). Par défaut: config.IMAGE_CONFIG
+
+    Returns:
+        Image PIL en mode RGB
+
+    Raises:
+        ValueError: Si le fichier n'est pas une image valide
+    """
+    if target_size is None:
+        target_size = IMAGE_CONFIG["target_size"]
+    return load_image_from_upload(uploaded_file, draft_size=target_size)
+
+
 def validate_image(image: Image.Image) -> Tuple[bool, str]:
     """
     Valide une image selon les critères de l'application.
@@ -52,23 +104,188 @@ def validate_image(image: Image.Image) -> Tuple[bool, str]:
     Returns:
         Tuple (is_valid, message)
     """
+    return _check_dimensions(image.width, image.height)
+
+
+def _check_dimensions(
+    width: int,
+    height: int,
+    max_pixels: Optional[int] = None
+) -> Tuple[bool, str]:
+    """Vérifie les dimensions selon IMAGE_CONFIG (côtés min/max, pixels max)."""
     # Vérifier les dimensions minimales
-    min_size = 32
-    if image.width < min_size or image.height < min_size:
+    min_size = IMAGE_CONFIG["min_image_side"]
+    if width < min_size or height < min_size:
         return False, f"Image trop petite (minimum {min_size}x{min_size})"
 
     # Vérifier les dimensions maximales
-    max_size = 10000
-    if image.width > max_size or image.height > max_size:
+    max_size = IMAGE_CONFIG["max_image_side"]
+    if width > max_size or height > max_size:
         return False, f"Image trop grande (maximum {max_size}x{max_size})"
 
+    if max_pixels is not None and width * height > max_pixels:
+        return False, (
+            f"Image trop grande ({width * height / 1e6:.0f} Mpx, "
+            f"maximum {max_pixels / 1e6:.0f} Mpx)"
+        )
+
     return True, "Image valide"
 
 
+# =============================================================================
+# Validation avant décodage (en-tête uniquement)
+# =============================================================================
+# Formats PIL -> extension de IMAGE_CONFIG["allowed_formats"]
+# (MPO: JPEG multi-images produit par de nombreux appareils photo)
+_FORMAT_EXTENSIONS = {"JPEG": "jpeg", "MPO": "jpeg", "PNG": "png", "WEBP": "webp"}
+
+
+def _source_byte_size(source) -> Optional[int]:
+    """Taille en octets d'un upload, d'un chemin ou d'un flux (None si inconnue)."""
+    size = getattr(source, "size", None)
+    if isinstance(size, int):
+        # UploadedFile de Streamlit
+        return size
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if hasattr(source, "seek") and hasattr(source, "tell"):
+        position = source.tell()
+        try:
+            return source.seek(0, io.SEEK_END)
+        finally:
+            source.seek(position)
+    return None
+
+
+def read_image_header(source) -> Dict[str, Any]:
+    """
+    Lit le format et les dimensions d'une image sans décoder ses pixels.
+
+    Image.open() ne lit que l'en-tête: le coût est indépendant de la
+    résolution. La position d'un flux est restaurée, si bien qu'il peut
+    ensuite être passé à load_image_from_upload().
+
+    Args:
+        source: Objet UploadedFile de Streamlit (ou chemin / flux binaire)
+
+    Returns:
+        Dict avec format (ex: "JPEG"), width, height, mode et n_bytes
+        (None si la taille du flux est inconnue)
+
+    Raises:
+        ValueError: Si l'en-tête n'est pas celui d'une image reconnue
+    """
+    n_bytes = _source_byte_size(source)
+    position = source.tell() if hasattr(source, "tell") else None
+    try:
+        with warnings.catch_warnings():
+            # Les dimensions sont vérifiées par validate_image_upload()
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            with Image.open(source) as image:
+                width, height = image.size
+                return {
+                    "format": image.format,
+                    "width": width,
+                    "height": height,
+                    "mode": image.mode,
+                    "n_bytes": n_bytes,
+                }
+    except Image.DecompressionBombError as e:
+        raise ValueError(f"Dimensions suspectes: {e}")
+    except Exception as e:
+        raise ValueError(f"Fichier image non reconnu: {e}")
+    finally:
+        if position is not None:
+            source.seek(position)
+
+
+def validate_image_upload(
+    source,
+    max_size_mb: Optional[float] = None,
+    allowed_formats: Optional[Sequence[str]] = None,
+    max_pixels: Optional[int] = None
+) -> Tuple[bool, str]:
+    """
+    Valide un upload avant décodage: taille du fichier, format et dimensions.
+
+    À appeler avant load_image_from_upload(): un fichier trop lourd, d'un
+    format non accepté ou annonçant des dimensions démesurées (image
+    "decompression bomb": quelques Ko de PNG pour des milliards de pixels)
+    est rejeté en quelques microsecondes, sans allouer les pixels.
+
+    Args:
+        source: Objet UploadedFile de Streamlit (ou chemin / flux binaire)
+        max_size_mb: Taille max du fichier. Par défaut: IMAGE_CONFIG["max_size_mb"]
+        allowed_formats: Extensions acceptées. Par défaut: IMAGE_CONFIG["allowed_formats"]
+        max_pixels: Nombre max de pixels. Par défaut: IMAGE_CONFIG["max_image_pixels"]
+
+    Returns:
+        Tuple (is_valid, message)
+    """
+    if max_size_mb is None:
+        max_size_mb = IMAGE_CONFIG["max_size_mb"]
+    if allowed_formats is None:
+        allowed_formats = IMAGE_CONFIG["allowed_formats"]
+    if max_pixels is None:
+        max_pixels = IMAGE_CONFIG["max_image_pixels"]
+
+    # Taille du fichier: connue sans rien lire
+    n_bytes = _source_byte_size(source)
+    if n_bytes is not None and n_bytes > max_size_mb * 1024 * 1024:
+        return False, f"Fichier trop lourd ({n_bytes / (1024 * 1024):.1f} MB, maximum {max_size_mb} MB)"
+
+    try:
+        header = read_image_header(source)
+    except ValueError as e:
+        return False, str(e)
+
+    extension = _FORMAT_EXTENSIONS.get(header["format"])
+    if extension not in {fmt.lower() for fmt in allowed_formats}:
+        return False, f"Format non accepté: {header['format']}"
+
+    return _check_dimensions(header["width"], header["height"], max_pixels)
+
+
+# =============================================================================
+# Redimensionnement
+# =============================================================================
+# Niveau de qualité -> (filtre, reducing_gap). Avec un reducing_gap, PIL
+# réduit d'abord l'image d'un facteur entier par moyenne de blocs (reduce,
+# équivalent BOX, en C) puis applique le filtre sur un écart d'échelle
+# < reducing_gap: le coût ne dépend presque plus de la résolution d'origine.
+RESAMPLING_TIERS: Dict[str, Tuple[Image.Resampling, Optional[float]]] = {
+    "fast": (Image.Resampling.BILINEAR, 2.0),
+    "balanced": (Image.Resampling.BICUBIC, 3.0),
+    "best": (Image.Resampling.LANCZOS, None),
+}
+
+
+# reducing_gap par défaut de Image.thumbnail()
+_THUMBNAIL_REDUCING_GAP = 2.0
+
+
+def get_resampling(quality: Optional[str] = None) -> Tuple[Image.Resampling, Optional[float]]:
+    """
+    Filtre et reducing_gap d'un niveau de qualité.
+
+    Args:
+        quality: "fast", "balanced" ou "best". Par défaut: IMAGE_CONFIG["resample_quality"]
+
+    Raises:
+        ValueError: Si le niveau est inconnu
+    """
+    if quality is None:
+        quality = IMAGE_CONFIG["resample_quality"]
+    if quality not in RESAMPLING_TIERS:
+        raise ValueError(f"quality must be one of {sorted(RESAMPLING_TIERS)}, got {quality!r}")
+    return RESAMPLING_TIERS[quality]
+
+
 def resize_image(
     image: Image.Image,
     target_size: Tuple[int, int] = None,
-    maintain_aspect_ratio: bool = True
+    maintain_aspect_ratio: bool = True,
+    quality: Optional[str] = None
 ) -> Image.Image:
     """
     Redimensionne une image vers la taille cible.
@@ -77,6 +294,8 @@ def resize_image(
         image: Image PIL à redimensionner
         target_size: Taille cible (width, height). Par défaut: config.IMAGE_CONFIG
         maintain_aspect_ratio: Si True, conserve le ratio et ajoute du padding
+        quality: Niveau de rééchantillonnage (voir RESAMPLING_TIERS).
+            Par défaut: IMAGE_CONFIG["resample_quality"]
 
     Returns:
         Image PIL redimensionnée
@@ -85,15 +304,17 @@ def resize_image(
         target_size = IMAGE_CONFIG["target_size"]
 
     if maintain_aspect_ratio:
-        return _resize_with_padding(image, target_size)
+        return _resize_with_padding(image, target_size, quality=quality)
     else:
-        return image.resize(target_size, Image.Resampling.LANCZOS)
+        resample, reducing_gap = get_resampling(quality)
+        return image.resize(target_size, resample, reducing_gap=reducing_gap)
 
 
 def _resize_with_padding(
     image: Image.Image,
     target_size: Tuple[int, int],
-    fill_color: Tuple[int, int, int] = (255, 255, 255)
+    fill_color: Tuple[int, int, int] = (255, 255, 255),
+    quality: Optional[str] = None
 ) -> Image.Image:
     """
     Redimensionne une image en conservant le ratio et en ajoutant du padding.
@@ -102,10 +323,12 @@ def _resize_with_padding(
         image: Image PIL source
         target_size: Taille cible (width, height)
         fill_color: Couleur de remplissage RGB pour le padding
+        quality: Niveau de rééchantillonnage (voir RESAMPLING_TIERS)
 
     Returns:
         Image PIL avec padding
     """
+    resample, reducing_gap = get_resampling(quality)
     target_w, target_h = target_size
     original_w, original_h = image.size
 
@@ -115,7 +338,7 @@ def _resize_with_padding(
     new_h = int(original_h * ratio)
 
     # Redimensionner l'image
-    resized = image.resize((new_w, new_h), Image.Resampling.LANCZOS)
+    resized = image.resize((new_w, new_h), resample, reducing_gap=reducing_gap)
 
     # Créer l'image avec padding
     padded = Image.new("RGB", target_size, fill_color)
@@ -128,6 +351,11 @@ def _resize_with_padding(
     return padded
 
 
+# Taille d'entrée et moyennes ImageNet (ordre BGR) du preprocessing Keras 'caffe'
+RESNET_INPUT_SIZE = (224, 224)
+IMAGENET_BGR_MEAN = np.array([103.939, 116.779, 123.68], dtype=np.float32)
+
+
 def preprocess_for_resnet(image: Image.Image) -> np.ndarray:
     """
     Prétraite une image pour l'extraction de features ResNet50.
@@ -143,23 +371,55 @@ def preprocess_for_resnet(image: Image.Image) -> np.ndarray:
     Returns:
         Array numpy de shape (1, 224, 224, 3) prêt pour ResNet50
     """
-    # Redimensionner à 224x224
-    resized = resize_image(image, (224, 224), maintain_aspect_ratio=True)
+    return preprocess_for_resnet_batch([image])
+
+
+def preprocess_for_resnet_batch(
+    images: Sequence[Image.Image],
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Prétraite un lot d'images pour ResNet50 dans un buffer unique.
+
+    Chaque image est redimensionnée avec padding puis copiée directement
+    en ordre BGR dans le buffer float32; la moyenne ImageNet est ensuite
+    soustraite en place, par broadcasting, sur tout le lot. Passer le même
+    `out` d'un appel à l'autre évite toute allocation par lot lors d'une
+    extraction de features sur un dossier complet.
+
+    Args:
+        images: Images PIL en RGB
+        out: Buffer float32 de shape (B, 224, 224, 3) avec B >= len(images),
+            réutilisé entre les appels (optionnel)
+
+    Returns:
+        Array (N, 224, 224, 3) float32; une vue sur `out` si fourni
 
-    # Convertir en array numpy
-    img_array = np.array(resized, dtype=np.float32)
+    Raises:
+        ValueError: Si `out` n'a pas le bon dtype, la bonne shape ou est trop petit
+    """
+    target_w, target_h = RESNET_INPUT_SIZE
+    n_images = len(images)
 
-    # Normalisation ImageNet (preprocessing Keras)
-    # Mode 'caffe': BGR, centré sur ImageNet mean
-    img_array = img_array[..., ::-1]  # RGB -> BGR
-    img_array[..., 0] -= 103.939
-    img_array[..., 1] -= 116.779
-    img_array[..., 2] -= 123.68
+    if out is None:
+        batch = np.empty((n_images, target_h, target_w, 3), dtype=np.float32)
+    else:
+        if out.dtype != np.float32 or out.shape[1:] != (target_h, target_w, 3):
+            raise ValueError(
+                f"Buffer invalide: attendu (B, {target_h}, {target_w}, 3) float32, "
+                f"reçu {out.shape} {out.dtype}"
+            )
+        if out.shape[0] < n_images:
+            raise ValueError(f"Buffer trop petit: {out.shape[0]} < {n_images} images")
+        batch = out[:n_images]
 
-    # Ajouter la dimension batch
-    img_array = np.expand_dims(img_array, axis=0)
+    for i, image in enumerate(images):
+        resized = resize_image(image, RESNET_INPUT_SIZE, maintain_aspect_ratio=True)
+        # RGB -> BGR par vue inversée, converti en float32 à la copie
+        batch[i] = np.asarray(resized)[..., ::-1]
 
-    return img_array
+    batch -= IMAGENET_BGR_MEAN
+    return batch
 
 
 def image_to_bytes(image: Image.Image, format: str = "PNG") -> bytes:
@@ -178,9 +438,122 @@ def image_to_bytes(image: Image.Image, format: str = "PNG") -> bytes:
     return buffer.getvalue()
 
 
+# =============================================================================
+# Empreintes d'images (mémoïsées par objet image)
+# =============================================================================
+# id(image) -> (référence faible, {nom d'empreinte: valeur})
+_image_memo: Dict[int, Tuple[weakref.ref, Dict[str, Any]]] = {}
+# Réentrant: une allocation faite sous le verrou peut déclencher le GC, et
+# donc le callback _forget_image() d'une image détruite, sur le même thread
+_image_memo_lock = threading.RLock()
+
+# Taille de la grille du dHash: 9x8 pixels -> 8x8 = 64 comparaisons
+DHASH_SIZE = 8
+
+
+def _forget_image(image_id: int, ref: weakref.ref) -> None:
+    """Callback de la référence faible: purge l'entrée de l'image détruite."""
+    with _image_memo_lock:
+        entry = _image_memo.get(image_id)
+        if entry is not None and entry[0] is ref:
+            del _image_memo[image_id]
+
+
+def _memoized(image: Image.Image, name: str, compute: Callable[[Image.Image], Any]) -> Any:
+    """
+    Calcule une empreinte une seule fois par objet image.
+
+    Les images sont considérées immuables après chargement (c'est le cas
+    dans l'application): modifier les pixels d'une image déjà hashée
+    n'invalide pas son empreinte.
+    """
+    image_id = id(image)
+    with _image_memo_lock:
+        entry = _image_memo.get(image_id)
+        if entry is not None and entry[0]() is image and name in entry[1]:
+            return entry[1][name]
+
+    value = compute(image)
+
+    with _image_memo_lock:
+        entry = _image_memo.get(image_id)
+        if entry is None or entry[0]() is not image:
+            ref = weakref.ref(image, lambda r, i=image_id: _forget_image(i, r))
+            entry = (ref, {})
+            _image_memo[image_id] = entry
+        entry[1][name] = value
+    return value
+
+
+def _compute_digest(image: Image.Image, digest_size: int) -> str:
+    hasher = hashlib.blake2b(digest_size=digest_size)
+    hasher.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    hasher.update(image.tobytes())
+    return hasher.hexdigest()
+
+
+def compute_image_digest(image: Image.Image, digest_size: int = 16) -> str:
+    """
+    Calcule une empreinte exacte du contenu d'une image.
+
+    Le hash porte sur le mode, la taille et les pixels décodés: deux
+    uploads du même fichier donnent la même empreinte, quel que soit
+    l'objet PIL. Le résultat est mémoïsé par objet image.
+
+    Args:
+        image: Image PIL
+        digest_size: Taille de l'empreinte en octets
+
+    Returns:
+        Empreinte hexadécimale (2 * digest_size caractères)
+    """
+    return _memoized(
+        image, f"digest_{digest_size}", lambda img: _compute_digest(img, digest_size)
+    )
+
+
+def _compute_dhash(image: Image.Image) -> int:
+    if image.mode not in ("L", "RGB", "RGBA"):
+        image = image.convert("RGB")
+    # reducing_gap: réduction entière (box) en C avant le rééchantillonnage,
+    # coût quasi indépendant de la résolution d'origine
+    small = image.resize(
+        (DHASH_SIZE + 1, DHASH_SIZE), Image.Resampling.BILINEAR, reducing_gap=2.0
+    ).convert("L")
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), byteorder="big")
+
+
+def compute_image_fingerprint(image: Image.Image) -> int:
+    """
+    Calcule l'empreinte perceptuelle (dHash 64 bits) d'une image.
+
+    L'image est réduite à 9x8 niveaux de gris et chaque bit indique si un
+    pixel est plus clair que son voisin de droite. Deux images visuellement
+    proches (recompression, redimensionnement) ont des empreintes à faible
+    distance de Hamming. Le résultat est mémoïsé par objet image.
+
+    Pour une clé de cache exacte, utiliser compute_image_digest().
+
+    Args:
+        image: Image PIL
+
+    Returns:
+        Entier non signé de 64 bits
+    """
+    return _memoized(image, "dhash", _compute_dhash)
+
+
+def hamming_distance(fingerprint_a: int, fingerprint_b: int) -> int:
+    """Nombre de bits différents entre deux empreintes perceptuelles."""
+    return bin(fingerprint_a ^ fingerprint_b).count("1")
+
+
 def create_thumbnail(
     image: Image.Image,
-    max_size: Tuple[int, int] = (150, 150)
+    max_size: Tuple[int, int] = (150, 150),
+    quality: Optional[str] = None
 ) -> Image.Image:
     """
     Crée une miniature d'une image.
@@ -188,12 +561,21 @@ def create_thumbnail(
     Args:
         image: Image PIL source
         max_size: Taille maximale de la miniature
+        quality: Niveau de rééchantillonnage (voir RESAMPLING_TIERS).
+            Par défaut: IMAGE_CONFIG["display_resample_quality"]
 
     Returns:
         Image PIL miniature
     """
+    if quality is None:
+        quality = IMAGE_CONFIG["display_resample_quality"]
+    resample, reducing_gap = get_resampling(quality)
+    if reducing_gap is None:
+        # Réduction préalable par défaut de Image.thumbnail() conservée pour
+        # l'affichage: sans elle, LANCZOS sur une photo de 12 Mpx coûte ~4x plus
+        reducing_gap = _THUMBNAIL_REDUCING_GAP
     thumbnail = image.copy()
-    thumbnail.thumbnail(max_size, Image.Resampling.LANCZOS)
+    thumbnail.thumbnail(max_size, resample, reducing_gap=reducing_gap)
     return thumbnail
 
 
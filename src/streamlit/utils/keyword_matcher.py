@@ -0,0 +1,174 @@
+"""
+Recherche multi-motifs de mots-clés par automate d'Aho-Corasick.
+
+Tester chaque mot-clé avec `keyword in text` coûte O(mots-clés x longueur
+du texte) et retient le premier mot-clé du dictionnaire, pas le plus
+pertinent. L'automate:
+- Est compilé une seule fois à partir de la table de mots-clés
+- Trouve toutes les occurrences en un seul passage sur le texte,
+  en O(longueur du texte + nombre d'occurrences)
+- Applique une priorité déterministe: le mot-clé le plus long l'emporte,
+  puis, à longueur égale, celui qui apparaît le plus tôt
+
+Usage:
+    matcher = KeywordMatcher({"console": "2462", "harry potter": "2403"})
+    match = matcher.best_match("Coffret Harry Potter pour console")
+    match.keyword, match.value  # ("harry potter", "2403")
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Generic, Iterator, List, Mapping, Optional, TypeVar
+
+
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class KeywordMatch(Generic[V]):
+    """
+    Occurrence d'un mot-clé dans un texte.
+
+    Attributes:
+        keyword: Mot-clé trouvé (normalisé en minuscules)
+        value: Valeur associée au mot-clé
+        start: Position de début dans le texte normalisé
+        end: Position de fin (exclue) dans le texte normalisé
+    """
+    keyword: str
+    value: V
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+class KeywordMatcher(Generic[V]):
+    """
+    Automate d'Aho-Corasick sur une table mot-clé -> valeur.
+
+    La recherche est insensible à la casse (texte et mots-clés passés par
+    str.lower()) et porte sur des sous-chaînes, comme `keyword in text`.
+    """
+
+    def __init__(self, keywords: Mapping[str, V]):
+        """
+        Args:
+            keywords: Table mot-clé -> valeur. Deux mots-clés identiques
+                après passage en minuscules sont refusés.
+
+        Raises:
+            ValueError: Si un mot-clé est vide ou dupliqué
+        """
+        # Noeud = dict caractère -> noeud suivant; la racine est le noeud 0
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Mot-clé se terminant exactement sur ce noeud (ou None)
+        self._terminal: List[Optional[str]] = [None]
+        # Noeud terminal suivant le long des liens d'échec (-1 = aucun)
+        self._output_link: List[int] = [-1]
+        self._values: Dict[str, V] = {}
+
+        for keyword, value in keywords.items():
+            normalized = keyword.lower()
+            if not normalized:
+                raise ValueError("Mot-clé vide")
+            if normalized in self._values:
+                raise ValueError(f"Mot-clé dupliqué: {keyword!r}")
+            self._values[normalized] = value
+            self._insert(normalized)
+
+        self._build_links()
+
+    def _insert(self, keyword: str) -> None:
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(None)
+                self._output_link.append(-1)
+            node = next_node
+        self._terminal[node] = keyword
+
+    def _build_links(self) -> None:
+        """Calcule les liens d'échec et de sortie par parcours en largeur."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+
+                fail = self._fail[child]
+                self._output_link[child] = fail if self._terminal[fail] is not None else self._output_link[fail]
+
+    # -------------------------------------------------------------------------
+    # Recherche
+    # -------------------------------------------------------------------------
+    def iter_matches(self, text: str, lowered: bool = False) -> Iterator[KeywordMatch[V]]:
+        """
+        Parcourt toutes les occurrences (chevauchantes comprises).
+
+        Les occurrences sont produites par position de fin croissante.
+        lowered=True indique un texte déjà en minuscules (pas de copie).
+        """
+        goto, fail = self._goto, self._fail
+        terminal, output_link = self._terminal, self._output_link
+
+        node = 0
+        for position, char in enumerate(text if lowered else text.lower()):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            hit = node if terminal[node] is not None else output_link[node]
+            while hit > 0:
+                keyword = terminal[hit]
+                end = position + 1
+                yield KeywordMatch(keyword, self._values[keyword], end - len(keyword), end)
+                hit = output_link[hit]
+
+    def find_all(self, text: str) -> List[KeywordMatch[V]]:
+        """Retourne toutes les occurrences, par position de fin croissante."""
+        return list(self.iter_matches(text))
+
+    def best_match(self, text: str, lowered: bool = False) -> Optional[KeywordMatch[V]]:
+        """
+        Retourne l'occurrence prioritaire, ou None.
+
+        Priorité: mot-clé le plus long, puis occurrence la plus précoce.
+        """
+        best = None
+        for match in self.iter_matches(text, lowered=lowered):
+            if best is None or (match.length, -match.start) > (best.length, -best.start):
+                best = match
+        return best
+
+    # -------------------------------------------------------------------------
+    # Introspection
+    # -------------------------------------------------------------------------
+    @property
+    def keywords(self) -> List[str]:
+        """Mots-clés compilés (normalisés)."""
+        return list(self._values)
+
+    @property
+    def n_states(self) -> int:
+        """Nombre d'états de l'automate."""
+        return len(self._goto)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, keyword: Any) -> bool:
+        return isinstance(keyword, str) and keyword.lower() in self._values
@@ -0,0 +1,280 @@
+"""
+Lecture incrémentale de metadata_augmented.json et conversion en colonnes.
+
+json.load() matérialise tout le fichier en dicts Python avant de rendre
+la main. Ce module:
+- Parcourt les enregistrements un par un (iter_metadata) en lisant le
+  fichier par blocs: la mémoire utilisée est celle d'un bloc et d'un
+  enregistrement, pas celle du fichier
+- Convertit une fois pour toutes le fichier en colonnes NumPy (.npz, une
+  clé par champ); relire uniquement les labels ou les ids est alors un
+  simple np.load de la colonne voulue
+
+Formats acceptés: un tableau d'enregistrements au premier niveau
+(`[{...}, ...]`) ou un objet contenant ce tableau (`{"samples": [...]}`).
+
+Usage:
+    for record in iter_metadata(fields=["productid", "prdtypecode"]):
+        ...
+    convert_metadata_to_columns()
+    labels = load_metadata_columns(fields=["prdtypecode"])["prdtypecode"]
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import METADATA_PATH, METADATA_COLUMNS_PATH
+
+
+# Taille des blocs lus dans le fichier
+_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]}"
+
+
+class _JsonStream:
+    """Tampon de lecture: décode des valeurs JSON au fil d'un fichier texte."""
+
+    def __init__(self, fp: IO[str], chunk_size: int):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Lit un bloc de plus; False en fin de fichier."""
+        if self._eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Abandonne la partie déjà consommée: mémoire bornée
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Prochain caractère non blanc (sans le consommer), "" en fin de fichier."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"JSON invalide: {char!r} attendu, reçu {self.peek()!r}")
+        self._pos += 1
+
+    def decode(self) -> Any:
+        """Décode la valeur JSON suivante, en lisant autant de blocs que nécessaire."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Un nombre en fin de tampon peut être tronqué ("12" de "1234",
+            # "1" de "1.5"): il doit être suivi d'un délimiteur
+            is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if is_number and (end == len(self._buffer) or self._buffer[end] not in _DELIMITERS):
+                if self._fill():
+                    continue
+            self._pos = end
+            return value
+
+
+def _iter_items(stream: _JsonStream) -> Iterator[Any]:
+    """Parcourt les éléments restants d'un tableau JSON dont '[' a été consommé."""
+    if stream.peek() == "]":
+        stream.expect("]")
+        return
+    while True:
+        yield stream.decode()
+        if stream.peek() == ",":
+            stream.expect(",")
+            continue
+        stream.expect("]")
+        return
+
+
+def iter_json_records(
+    fp: IO[str],
+    records_key: Optional[str] = None,
+    chunk_size: int = _CHUNK_SIZE
+) -> Iterator[Any]:
+    """
+    Parcourt les enregistrements d'un document JSON sans le charger entièrement.
+
+    Args:
+        fp: Fichier texte ouvert
+        records_key: Clé du tableau d'enregistrements si le document est un
+            objet. Par défaut: le premier champ dont la valeur est un
+            tableau d'objets
+        chunk_size: Taille des blocs lus
+
+    Yields:
+        Enregistrements, dans l'ordre du fichier
+
+    Raises:
+        ValueError: Si le document n'a pas la forme attendue
+    """
+    stream = _JsonStream(fp, chunk_size)
+    first = stream.peek()
+    if first == "[":
+        stream.expect("[")
+        yield from _iter_items(stream)
+        return
+    if first != "{":
+        raise ValueError("JSON invalide: tableau ou objet attendu")
+
+    stream.expect("{")
+    while stream.peek() != "}":
+        key = stream.decode()
+        stream.expect(":")
+        if stream.peek() == "[" and (records_key is None or key == records_key):
+            stream.expect("[")
+            # Sans records_key: premier tableau d'objets (ou tableau vide)
+            if records_key is not None or stream.peek() in "{]":
+                yield from _iter_items(stream)
+                return
+            for _ in _iter_items(stream):
+                pass
+        else:
+            # Champ annexe (ex: version, liste des catégories): décodé puis ignoré
+            stream.decode()
+        if stream.peek() == ",":
+            stream.expect(",")
+    raise ValueError(f"Tableau d'enregistrements introuvable (clé {records_key!r})")
+
+
+def iter_metadata(
+    path: Optional[Path] = None,
+    fields: Optional[Sequence[str]] = None,
+    records_key: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parcourt les enregistrements de metadata_augmented.json en mémoire constante.
+
+    Args:
+        path: Fichier JSON. Par défaut: config.METADATA_PATH
+        fields: Champs à conserver (les autres sont ignorés; None = tous)
+        records_key: Voir iter_json_records()
+
+    Yields:
+        Un dict par enregistrement (champs absents -> None si fields est donné)
+    """
+    if path is None:
+        path = METADATA_PATH
+    with open(path, "r", encoding="utf-8") as fp:
+        for record in iter_json_records(fp, records_key=records_key):
+            if fields is None:
+                yield record
+            else:
+                yield {field: record.get(field) for field in fields}
+
+
+# =============================================================================
+# Conversion en colonnes
+# =============================================================================
+def _to_column(values: List[Any]) -> np.ndarray:
+    """
+    Convertit les valeurs d'un champ en tableau NumPy typé.
+
+    Entiers -> int64 (float64 avec NaN si valeurs manquantes), flottants ->
+    float64, booléens -> bool, le reste -> chaînes unicode ("" si manquant).
+    Les valeurs non scalaires (listes, dicts) sont sérialisées en JSON.
+    """
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, bool) for v in present) and len(present) == len(values):
+        return np.array(values, dtype=bool)
+    if present and all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        if len(present) == len(values):
+            return np.array(values, dtype=np.int64)
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.array([
+        "" if v is None else v if isinstance(v, str) else json.dumps(v, ensure_ascii=False)
+        for v in values
+    ], dtype=np.str_)
+
+
+def convert_metadata_to_columns(
+    path: Optional[Path] = None,
+    output_path: Optional[Path] = None,
+    fields: Optional[Sequence[str]] = None,
+    records_key: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Convertit metadata_augmented.json en colonnes NumPy (.npz).
+
+    Seules les valeurs des champs retenus sont conservées pendant le
+    parcours (listes Python par colonne), jamais les dicts complets.
+
+    Args:
+        path: Fichier JSON. Par défaut: config.METADATA_PATH
+        output_path: Fichier .npz. Par défaut: config.METADATA_COLUMNS_PATH
+        fields: Champs à convertir. Par défaut: les champs du premier
+            enregistrement
+        records_key: Voir iter_json_records()
+
+    Returns:
+        Dict avec records (nombre d'enregistrements) et fields (nombre de colonnes)
+    """
+    if output_path is None:
+        output_path = METADATA_COLUMNS_PATH
+    output_path = Path(output_path)
+
+    columns: Optional[Dict[str, List[Any]]] = None
+    n_records = 0
+    for record in iter_metadata(path, records_key=records_key):
+        if columns is None:
+            columns = {field: [] for field in (fields if fields is not None else record)}
+        for field, values in columns.items():
+            values.append(record.get(field))
+        n_records += 1
+
+    arrays = {field: _to_column(values) for field, values in (columns or {}).items()}
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, output_path)
+    return {"records": n_records, "fields": len(arrays)}
+
+
+def load_metadata_columns(
+    path: Optional[Path] = None,
+    fields: Optional[Sequence[str]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Charge les colonnes converties (seules celles demandées sont lues).
+
+    Args:
+        path: Fichier .npz. Par défaut: config.METADATA_COLUMNS_PATH
+        fields: Colonnes à charger (None = toutes)
+
+    Raises:
+        FileNotFoundError: Si la conversion n'a pas été faite
+        KeyError: Si une colonne demandée n'existe pas
+    """
+    if path is None:
+        path = METADATA_COLUMNS_PATH
+    with np.load(path) as columns:
+        names = list(fields) if fields is not None else list(columns.files)
+        return {name: columns[name] for name in names}
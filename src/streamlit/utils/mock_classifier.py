@@ -12,13 +12,26 @@ Supporte plusieurs modèles simulés pour texte et image:
 - Image: ResNet50 + SVM, ResNet50 + Random Forest, VGG16 + SVM
 """
 import hashlib
+import sys
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
 import numpy as np
+from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 from PIL import Image
 from dataclasses import dataclass
 
-from .model_interface import BaseClassifier, ClassificationResult
+from .model_interface import BaseClassifier, ClassificationResult, PreparedInput
 from .category_mapping import CATEGORY_CODES, get_category_name
+from .image_utils import compute_image_fingerprint
+from .keyword_matcher import KeywordMatcher
+from .model_registry import ModelRegistry
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import MODEL_CONFIG
 
 
 # =============================================================================
@@ -26,7 +39,12 @@ from .category_mapping import CATEGORY_CODES, get_category_name
 # =============================================================================
 @dataclass
 class ModelConfig:
-    """Configuration d'un modèle simulé."""
+    """
+    Configuration d'un modèle simulé.
+
+    Les champs de coût (latence, mémoire) ne sont appliqués que par un
+    MockClassifier créé avec simulate_cost=True.
+    """
     name: str
     short_name: str
     description: str
@@ -34,6 +52,15 @@ class ModelConfig:
     confidence_std: float   # Écart-type de la confiance
     seed_offset: int        # Offset pour différencier les résultats
     color: str              # Couleur pour les graphiques
+    latency_ms: float = 0.0           # Latence médiane d'un appel (ms)
+    latency_sigma: float = 0.0        # Dispersion log-normale de la latence
+    per_item_latency_ms: float = 0.0  # Coût marginal par produit d'un lot (ms)
+    memory_mb: float = 0.0            # Empreinte mémoire simulée (MB)
+    cpu_bound: bool = False           # Attente active (tient le GIL) plutôt que sleep
+
+    def expected_latency_ms(self, batch_size: int = 1) -> float:
+        """Latence médiane attendue pour un lot de batch_size produits."""
+        return self.latency_ms + self.per_item_latency_ms * batch_size
 
 
 # Modèles de texte disponibles
@@ -45,7 +72,12 @@ TEXT_MODELS: Dict[str, ModelConfig] = {
         base_confidence=0.78,
         confidence_std=0.12,
         seed_offset=100,
-        color="#2196F3"  # Bleu
+        color="#2196F3",  # Bleu
+        latency_ms=2.0,
+        latency_sigma=0.2,
+        per_item_latency_ms=0.05,
+        memory_mb=60,
+        cpu_bound=True,
     ),
     "tfidf_rf": ModelConfig(
         name="TF-IDF + Random Forest",
@@ -54,7 +86,12 @@ TEXT_MODELS: Dict[str, ModelConfig] = {
         base_confidence=0.75,
         confidence_std=0.15,
         seed_offset=200,
-        color="#4CAF50"  # Vert
+        color="#4CAF50",  # Vert
+        latency_ms=8.0,
+        latency_sigma=0.3,
+        per_item_latency_ms=0.4,
+        memory_mb=350,
+        cpu_bound=True,
     ),
     "camembert": ModelConfig(
         name="CamemBERT",
@@ -63,7 +100,12 @@ TEXT_MODELS: Dict[str, ModelConfig] = {
         base_confidence=0.85,
         confidence_std=0.08,
         seed_offset=300,
-        color="#9C27B0"  # Violet
+        color="#9C27B0",  # Violet
+        latency_ms=45.0,
+        latency_sigma=0.25,
+        per_item_latency_ms=6.0,
+        memory_mb=450,
+        cpu_bound=False,
     ),
 }
 
@@ -76,7 +118,12 @@ IMAGE_MODELS: Dict[str, ModelConfig] = {
         base_confidence=0.72,
         confidence_std=0.14,
         seed_offset=400,
-        color="#FF5722"  # Orange
+        color="#FF5722",  # Orange
+        latency_ms=60.0,
+        latency_sigma=0.2,
+        per_item_latency_ms=8.0,
+        memory_mb=200,
+        cpu_bound=False,
     ),
     "resnet50_rf": ModelConfig(
         name="ResNet50 + Random Forest",
@@ -85,7 +132,12 @@ IMAGE_MODELS: Dict[str, ModelConfig] = {
         base_confidence=0.70,
         confidence_std=0.16,
         seed_offset=500,
-        color="#795548"  # Marron
+        color="#795548",  # Marron
+        latency_ms=70.0,
+        latency_sigma=0.25,
+        per_item_latency_ms=9.0,
+        memory_mb=420,
+        cpu_bound=False,
     ),
     "vgg16_svm": ModelConfig(
         name="VGG16 + SVM",
@@ -94,7 +146,12 @@ IMAGE_MODELS: Dict[str, ModelConfig] = {
         base_confidence=0.68,
         confidence_std=0.15,
         seed_offset=600,
-        color="#607D8B"  # Gris-bleu
+        color="#607D8B",  # Gris-bleu
+        latency_ms=120.0,
+        latency_sigma=0.2,
+        per_item_latency_ms=15.0,
+        memory_mb=600,
+        cpu_bound=False,
     ),
 }
 
@@ -109,6 +166,92 @@ def get_available_image_models() -> Dict[str, ModelConfig]:
     return IMAGE_MODELS
 
 
+# =============================================================================
+# Générateur aléatoire à compteur (vectorisé)
+# =============================================================================
+# Chaque tirage est une fonction pure de (graine, flux, compteur): une ligne
+# d'un lot reçoit les mêmes nombres quelle que soit la composition du lot,
+# sans créer un générateur par ligne.
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+# Flux indépendants utilisés par MockClassifier.generate_probability_matrix
+_STREAM_PEAKS = 1
+_STREAM_PEAK_ALPHA = 2
+_STREAM_TARGET = 3
+_STREAM_GAMMA = 16
+
+# Tentatives de l'algorithme de rejet de Marsaglia-Tsang (acceptation > 95%)
+_GAMMA_ROUNDS = 8
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Fonction de mélange SplitMix64 appliquée élément par élément (uint64)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * _MIX_1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _MIX_2
+    return x ^ (x >> np.uint64(31))
+
+
+def _counter_uniform(keys: np.ndarray, stream: int, size: int) -> np.ndarray:
+    """Tire (N, size) uniformes dans ]0, 1[ pour le flux `stream`."""
+    counters = np.arange(1, size + 1, dtype=np.uint64) + np.uint64(stream << 32)
+    with np.errstate(over="ignore"):
+        bits = _splitmix64(_splitmix64(keys)[:, None] + counters * _GOLDEN_GAMMA)
+    return ((bits >> np.uint64(11)).astype(np.float64) + 0.5) * (1.0 / 2 ** 53)
+
+
+def _counter_normal(keys: np.ndarray, stream: int) -> np.ndarray:
+    """Tire N normales centrées réduites (Box-Muller) pour le flux `stream`."""
+    u = _counter_uniform(keys, stream, 2)
+    return np.sqrt(-2.0 * np.log(u[:, 0])) * np.cos(2.0 * np.pi * u[:, 1])
+
+
+def _counter_gamma(keys: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    """
+    Tire des lois Gamma(alpha, 1) de forme (N, K) par Marsaglia-Tsang.
+
+    Pour alpha < 1, Gamma(alpha) = Gamma(alpha + 1) * U^(1/alpha).
+    """
+    n, k = alpha.shape
+    boosted = alpha < 1.0
+    shape = np.where(boosted, alpha + 1.0, alpha)
+    d = shape - 1.0 / 3.0
+    c = 1.0 / np.sqrt(9.0 * d)
+
+    samples = np.empty(alpha.shape)
+    pending = np.arange(n)
+    for attempt in range(_GAMMA_ROUNDS):
+        # Seules les lignes ayant encore un rejet sont retirées
+        rows_d, rows_c = d[pending], c[pending]
+        u = _counter_uniform(keys[pending], _STREAM_GAMMA + attempt, 3 * k).reshape(-1, k, 3)
+        z = np.sqrt(-2.0 * np.log(u[..., 0])) * np.cos(2.0 * np.pi * u[..., 1])
+        v = (1.0 + rows_c * z) ** 3
+        positive = v > 0
+        log_v = np.log(np.where(positive, v, 1.0))
+        accepted = positive & (np.log(u[..., 2]) < 0.5 * z ** 2 + rows_d - rows_d * v + rows_d * log_v)
+
+        candidates = np.where(accepted, rows_d * v, np.nan)
+        if attempt == 0:
+            samples[pending] = candidates
+        else:
+            current = samples[pending]
+            samples[pending] = np.where(np.isnan(current), candidates, current)
+
+        pending = pending[np.isnan(samples[pending]).any(axis=1)]
+        if len(pending) == 0:
+            break
+
+    # Repli (probabilité < 1e-10): moyenne de la loi
+    missing = np.isnan(samples)
+    samples[missing] = d[missing]
+
+    u_boost = _counter_uniform(keys, _STREAM_GAMMA + _GAMMA_ROUNDS, k)
+    return np.where(boosted, samples * u_boost ** (1.0 / alpha), samples)
+
+
 # =============================================================================
 # Classifieur Mock de base
 # =============================================================================
@@ -120,18 +263,35 @@ class MockClassifier(BaseClassifier):
     déterministes basées sur le hash des entrées.
     """
 
-    def __init__(self, seed: int = 42, model_config: Optional[ModelConfig] = None):
+    def __init__(
+        self,
+        seed: int = 42,
+        model_config: Optional[ModelConfig] = None,
+        simulate_cost: Optional[bool] = None
+    ):
         """
         Initialise le classifieur mock.
 
         Args:
             seed: Graine de base pour la génération aléatoire
             model_config: Configuration du modèle simulé (optionnel)
+            simulate_cost: Appliquer la latence et l'empreinte mémoire du
+                ModelConfig. Par défaut: MODEL_CONFIG["simulate_model_cost"]
         """
         self._ready = True
         self._seed = seed
         self._model_config = model_config
 
+        if simulate_cost is None:
+            simulate_cost = MODEL_CONFIG.get("simulate_model_cost", False)
+        self._simulate_cost = bool(simulate_cost and model_config is not None)
+        self._cost_rng = np.random.default_rng(seed)
+        self._cost_lock = threading.Lock()
+        self._simulated_memory: Optional[np.ndarray] = None
+        if self._simulate_cost and model_config.memory_mb > 0:
+            # np.ones écrit chaque page: la mémoire est réellement résidente
+            self._simulated_memory = np.ones(int(model_config.memory_mb * 2 ** 20), dtype=np.uint8)
+
     def predict(
         self,
         image: Optional[Image.Image] = None,
@@ -141,18 +301,162 @@ class MockClassifier(BaseClassifier):
         """
         Génère une prédiction simulée basée sur les entrées.
         """
-        if image is None and (text is None or text.strip() == ""):
-            raise ValueError("Au moins une image ou un texte est requis")
+        return self.predict_batch(images=[image], texts=[text], top_k=top_k)[0]
+
+    def predict_batch(
+        self,
+        images: Optional[List[Optional[Image.Image]]] = None,
+        texts: Optional[List[Optional[str]]] = None,
+        top_k: int = 5
+    ) -> List[ClassificationResult]:
+        """
+        Génère les prédictions simulées d'un lot en un seul tirage vectorisé.
 
-        # Générer une graine déterministe basée sur les entrées
+        Chaque produit reçoit une graine dérivée du hash de ses entrées: son
+        résultat est identique qu'il soit prédit seul ou dans un lot.
+        Avec simulate_cost, l'appel dure la latence simulée du lot.
+
+        Raises:
+            ValueError: Si un produit n'a ni image ni texte
+        """
+        start = time.perf_counter()
+        images, texts = self._align_batch_inputs(images, texts)
+        for image, text in zip(images, texts):
+            if image is None and (text is None or text.strip() == ""):
+                raise ValueError("Au moins une image ou un texte est requis")
+        if not images:
+            return []
+
+        results = self._generate_batch(images, texts, top_k)
+        if self._simulate_cost:
+            self._wait_until(start + self.sample_latency_ms(len(images)) / 1000.0)
+        return results
+
+    def predict_prepared(
+        self,
+        prepared: PreparedInput,
+        top_k: int = 5
+    ) -> ClassificationResult:
+        """
+        Prédit une entrée prétraitée en réutilisant son empreinte et son texte normalisé.
+
+        Même résultat que predict(prepared.image, prepared.text).
+        """
+        start = time.perf_counter()
+        result = self._generate_batch(
+            [prepared.image],
+            [prepared.text],
+            top_k,
+            fingerprints=[prepared.image_fingerprint],
+            normalized_texts=[prepared.normalized_text],
+        )[0]
+        if self._simulate_cost:
+            self._wait_until(start + self.sample_latency_ms(1) / 1000.0)
+        return result
+
+    def _generate_batch(
+        self,
+        images: List[Optional[Image.Image]],
+        texts: List[Optional[str]],
+        top_k: int,
+        fingerprints: Optional[List[Optional[int]]] = None,
+        normalized_texts: Optional[List[Optional[str]]] = None
+    ) -> List[ClassificationResult]:
+        """
+        Génère les résultats d'un lot validé, sans simulation de coût.
+
+        fingerprints et normalized_texts (optionnels) proviennent d'un
+        PreparedInput: une empreinte fournie n'est pas recalculée.
+        """
+        # Graines déterministes basées sur les entrées
         seed_offset = self._model_config.seed_offset if self._model_config else 0
-        hash_input = self._generate_hash(image, text, seed_offset)
-        rng = np.random.RandomState(hash_input)
+        if fingerprints is None:
+            fingerprints = [None] * len(images)
+        seeds = np.array(
+            [
+                self._generate_hash(image, text, seed_offset, fingerprint)
+                for image, text, fingerprint in zip(images, texts, fingerprints)
+            ],
+            dtype=np.uint64,
+        )
 
         # Générer des probabilités avec les caractéristiques du modèle
-        probabilities = self._generate_probabilities(rng)
+        probabilities = self.generate_probability_matrix(seeds)
+
+        # Top-k de tout le lot en un seul tri
+        top_indices = np.argsort(probabilities, axis=1)[:, ::-1][:, :top_k]
+        top_scores = np.take_along_axis(probabilities, top_indices, axis=1).tolist()
+
+        results = []
+        for row, indices, scores, image, text in zip(
+            probabilities, top_indices.tolist(), top_scores, images, texts
+        ):
+            top_predictions = [
+                (self.CATEGORY_CODES[idx], score) for idx, score in zip(indices, scores)
+            ]
+            results.append(ClassificationResult(
+                category=top_predictions[0][0],
+                confidence=top_predictions[0][1],
+                top_k_predictions=top_predictions,
+                source=self._source_for(image, text),
+                raw_probabilities=row
+            ))
+        return results
 
-        # Déterminer la source
+    # -------------------------------------------------------------------------
+    # Simulation du coût
+    # -------------------------------------------------------------------------
+    def sample_latency_ms(self, batch_size: int = 1) -> float:
+        """
+        Tire la latence simulée d'un appel sur un lot.
+
+        La latence suit une loi log-normale de médiane
+        ModelConfig.expected_latency_ms(batch_size) et de dispersion
+        latency_sigma.
+
+        Returns:
+            Latence en millisecondes (0 sans ModelConfig)
+        """
+        if self._model_config is None:
+            return 0.0
+        median = self._model_config.expected_latency_ms(batch_size)
+        if median <= 0:
+            return 0.0
+        with self._cost_lock:
+            noise = self._cost_rng.normal(0.0, self._model_config.latency_sigma)
+        return float(median * np.exp(noise))
+
+    def _wait_until(self, deadline: float) -> None:
+        """
+        Attend jusqu'à l'instant deadline (horloge perf_counter).
+
+        Modèle CPU: attente active, qui tient le GIL comme un calcul Python.
+        Sinon: sleep (libère le GIL, comme une inférence en code natif),
+        avec une fin en attente active pour la précision.
+        """
+        if self._model_config.cpu_bound:
+            while time.perf_counter() < deadline:
+                pass
+            return
+
+        remaining = deadline - time.perf_counter()
+        if remaining > 0.002:
+            time.sleep(remaining - 0.001)
+        while time.perf_counter() < deadline:
+            pass
+
+    @property
+    def simulate_cost(self) -> bool:
+        """Vrai si la latence et la mémoire du modèle sont simulées."""
+        return self._simulate_cost
+
+    @property
+    def simulated_memory_bytes(self) -> int:
+        """Mémoire allouée pour simuler l'empreinte du modèle."""
+        return 0 if self._simulated_memory is None else self._simulated_memory.nbytes
+
+    def _source_for(self, image: Optional[Image.Image], text: Optional[str]) -> str:
+        """Détermine la source d'une prédiction simulée."""
         if image is not None and text and text.strip():
             source = "mock_multimodal"
         elif image is not None:
@@ -163,51 +467,58 @@ class MockClassifier(BaseClassifier):
         # Ajouter le nom du modèle si configuré
         if self._model_config:
             source = f"{source}_{self._model_config.short_name}"
+        return source
 
-        # Construire le résultat
-        top_predictions = self._probabilities_to_predictions(probabilities, top_k)
-        best_category, best_confidence = top_predictions[0]
+    def generate_probability_matrix(self, seeds: np.ndarray) -> np.ndarray:
+        """
+        Génère une matrice (N, 27) de probabilités avec le profil du modèle.
 
-        return ClassificationResult(
-            category=best_category,
-            confidence=best_confidence,
-            top_k_predictions=top_predictions,
-            source=source,
-            raw_probabilities=probabilities
-        )
+        Le profil est celui d'une prédiction unitaire: trois classes
+        dominantes tirées au hasard, loi de Dirichlet, puis confiance
+        maximale ramenée à N(base_confidence, confidence_std) bornée à
+        [0.4, 0.98] si un ModelConfig est défini. Tous les tirages sont
+        vectorisés sur le lot.
+
+        Args:
+            seeds: Graines uint64, une par ligne
+
+        Returns:
+            Array (N, 27) dont chaque ligne somme à 1
+        """
+        keys = np.asarray(seeds, dtype=np.uint64).reshape(-1)
+        n = len(keys)
 
-    def _generate_probabilities(self, rng: np.random.RandomState) -> np.ndarray:
-        """Génère des probabilités avec les caractéristiques du modèle."""
-        alpha = np.ones(self.NUM_CLASSES) * 0.5
-        peak_indices = rng.choice(self.NUM_CLASSES, size=3, replace=False)
+        # Trois classes dominantes distinctes: premiers indices d'une permutation aléatoire
+        peak_indices = np.argsort(_counter_uniform(keys, _STREAM_PEAKS, self.NUM_CLASSES), axis=1)[:, :3]
 
         if self._model_config:
             # Ajuster selon la confiance de base du modèle
             peak_strength = 2.0 + (self._model_config.base_confidence - 0.7) * 10
-            alpha[peak_indices] = rng.uniform(peak_strength, peak_strength + 3.0, size=3)
         else:
-            alpha[peak_indices] = rng.uniform(2.0, 5.0, size=3)
+            peak_strength = 2.0
 
-        probabilities = rng.dirichlet(alpha)
+        alpha = np.full((n, self.NUM_CLASSES), 0.5)
+        peak_alpha = peak_strength + 3.0 * _counter_uniform(keys, _STREAM_PEAK_ALPHA, 3)
+        np.put_along_axis(alpha, peak_indices, peak_alpha, axis=1)
+
+        # Dirichlet = gammas normalisés
+        gammas = _counter_gamma(keys, alpha)
+        probabilities = gammas / gammas.sum(axis=1, keepdims=True)
 
         # Ajuster la confiance maximale selon le modèle
         if self._model_config:
-            max_idx = np.argmax(probabilities)
+            rows = np.arange(n)
+            max_idx = probabilities.argmax(axis=1)
             target_conf = np.clip(
-                rng.normal(self._model_config.base_confidence, self._model_config.confidence_std),
+                self._model_config.base_confidence
+                + self._model_config.confidence_std * _counter_normal(keys, _STREAM_TARGET),
                 0.4, 0.98
             )
-            # Rescale pour atteindre la confiance cible
-            current_max = probabilities[max_idx]
-            if current_max > 0:
-                scale_factor = target_conf / current_max
-                probabilities[max_idx] = target_conf
-                # Redistribuer le reste
-                other_mask = np.ones(len(probabilities), dtype=bool)
-                other_mask[max_idx] = False
-                remaining = 1.0 - target_conf
-                if probabilities[other_mask].sum() > 0:
-                    probabilities[other_mask] *= remaining / probabilities[other_mask].sum()
+            # Redistribuer le reste proportionnellement aux autres classes
+            others_sum = 1.0 - probabilities[rows, max_idx]
+            scale = np.where(others_sum > 0, (1.0 - target_conf) / np.maximum(others_sum, 1e-300), 0.0)
+            probabilities *= scale[:, None]
+            probabilities[rows, max_idx] = target_conf
 
         return probabilities
 
@@ -225,26 +536,33 @@ class MockClassifier(BaseClassifier):
         """Retourne la configuration du modèle."""
         return self._model_config
 
+    @property
+    def model_identity(self) -> str:
+        """Identité incluant la graine et la configuration simulée."""
+        return f"{super().model_identity}(seed={self._seed}, config={self._model_config!r})"
+
     def _generate_hash(
         self,
         image: Optional[Image.Image],
         text: Optional[str],
-        seed_offset: int = 0
+        seed_offset: int = 0,
+        fingerprint: Optional[int] = None
     ) -> int:
         """Génère un hash déterministe à partir des entrées."""
         hash_parts = [str(self._seed + seed_offset)]
 
         if image is not None:
+            if fingerprint is None:
+                fingerprint = compute_image_fingerprint(image)
             hash_parts.append(f"{image.size}")
-            small = image.resize((8, 8)).convert("L")
-            hash_parts.append(small.tobytes().hex()[:32])
+            hash_parts.append(f"{fingerprint:016x}")
 
         if text and text.strip():
             hash_parts.append(text.strip()[:200])
 
         combined = "|".join(hash_parts)
         hash_bytes = hashlib.md5(combined.encode()).digest()
-        return int.from_bytes(hash_bytes[:4], byteorder="big")
+        return int.from_bytes(hash_bytes[:8], byteorder="big")
 
 
 # =============================================================================
@@ -254,6 +572,10 @@ class DemoClassifier(MockClassifier):
     """
     Classifieur de démonstration avec des prédictions prédéfinies
     pour certains mots-clés, permettant des démos contrôlées.
+
+    Les mots-clés sont compilés une fois par classe dans un automate
+    d'Aho-Corasick: le mot-clé le plus long trouvé dans le texte
+    l'emporte, puis le plus précoce à longueur égale.
     """
 
     KEYWORD_PREDICTIONS = {
@@ -289,10 +611,25 @@ class DemoClassifier(MockClassifier):
         "bougie": ("1302", 0.84),
     }
 
-    def __init__(self, seed: int = 42, model_config: Optional[ModelConfig] = None):
-        super().__init__(seed, model_config)
+    def __init__(
+        self,
+        seed: int = 42,
+        model_config: Optional[ModelConfig] = None,
+        simulate_cost: Optional[bool] = None
+    ):
+        super().__init__(seed, model_config, simulate_cost)
         # Ajuster les confiances selon le modèle
         self._adjusted_predictions = self._adjust_predictions_for_model()
+        self._keyword_base_probabilities: Optional[np.ndarray] = None
+
+    @classmethod
+    def get_keyword_matcher(cls) -> KeywordMatcher:
+        """Retourne l'automate des mots-clés de la classe (compilé au premier appel)."""
+        matcher = cls.__dict__.get("_keyword_matcher")
+        if matcher is None:
+            matcher = KeywordMatcher({keyword: keyword for keyword in cls.KEYWORD_PREDICTIONS})
+            cls._keyword_matcher = matcher
+        return matcher
 
     def _adjust_predictions_for_model(self) -> Dict[str, Tuple[str, float]]:
         """Ajuste les prédictions selon les caractéristiques du modèle."""
@@ -311,39 +648,70 @@ class DemoClassifier(MockClassifier):
 
         return adjusted
 
-    def predict(
+    def _generate_batch(
         self,
-        image: Optional[Image.Image] = None,
-        text: Optional[str] = None,
-        top_k: int = 5
-    ) -> ClassificationResult:
-        """Génère une prédiction basée sur des mots-clés ou le mock standard."""
+        images: List[Optional[Image.Image]],
+        texts: List[Optional[str]],
+        top_k: int,
+        fingerprints: Optional[List[Optional[int]]] = None,
+        normalized_texts: Optional[List[Optional[str]]] = None
+    ) -> List[ClassificationResult]:
+        """
+        Génère les prédictions d'un lot: mots-clés d'abord, mock vectorisé sinon.
+
+        Les produits dont le texte contient un mot-clé reçoivent la
+        prédiction prédéfinie; les autres sont générés en un seul tirage
+        par MockClassifier._generate_batch(). Un texte déjà normalisé
+        (normalized_texts) est recherché sans nouveau passage en minuscules.
+        """
+        matcher = self.get_keyword_matcher()
+        if fingerprints is None:
+            fingerprints = [None] * len(images)
+
+        results: List[Optional[ClassificationResult]] = [None] * len(images)
+        fallback_positions = []
+        for position, text in enumerate(texts):
+            if normalized_texts is not None:
+                normalized = normalized_texts[position]
+                match = matcher.best_match(normalized, lowered=True) if normalized else None
+            else:
+                match = matcher.best_match(text) if text else None
+            if match is not None:
+                results[position] = self._keyword_result(match.value, top_k)
+            else:
+                fallback_positions.append(position)
+
+        if fallback_positions:
+            fallback_results = super()._generate_batch(
+                [images[i] for i in fallback_positions],
+                [texts[i] for i in fallback_positions],
+                top_k,
+                fingerprints=[fingerprints[i] for i in fallback_positions],
+            )
+            for position, result in zip(fallback_positions, fallback_results):
+                results[position] = result
+
+        return results
+
+    def _keyword_result(self, keyword: str, top_k: int) -> ClassificationResult:
+        """Construit la prédiction prédéfinie d'un mot-clé."""
         predictions_to_use = self._adjusted_predictions if self._model_config else self.KEYWORD_PREDICTIONS
+        category, confidence = predictions_to_use[keyword]
+
+        probabilities = self._generate_keyword_probabilities(category, confidence)
+        top_predictions = self._probabilities_to_predictions(probabilities, top_k)
+
+        source = "demo"
+        if self._model_config:
+            source = f"demo_{self._model_config.short_name}"
 
-        if text:
-            text_lower = text.lower()
-            for keyword, (category, confidence) in predictions_to_use.items():
-                if keyword in text_lower:
-                    probabilities = self._generate_keyword_probabilities(
-                        category, confidence
-                    )
-                    top_predictions = self._probabilities_to_predictions(
-                        probabilities, top_k
-                    )
-
-                    source = "demo"
-                    if self._model_config:
-                        source = f"demo_{self._model_config.short_name}"
-
-                    return ClassificationResult(
-                        category=category,
-                        confidence=confidence,
-                        top_k_predictions=top_predictions,
-                        source=source,
-                        raw_probabilities=probabilities
-                    )
-
-        return super().predict(image, text, top_k)
+        return ClassificationResult(
+            category=category,
+            confidence=confidence,
+            top_k_predictions=top_predictions,
+            source=source,
+            raw_probabilities=probabilities
+        )
 
     def _generate_keyword_probabilities(
         self,
@@ -351,9 +719,12 @@ class DemoClassifier(MockClassifier):
         main_confidence: float
     ) -> np.ndarray:
         """Génère des probabilités cohérentes avec une prédiction principale."""
-        seed = self._model_config.seed_offset if self._model_config else 42
-        rng = np.random.RandomState(seed)
-        probabilities = rng.dirichlet(np.ones(self.NUM_CLASSES) * 0.3)
+        if self._keyword_base_probabilities is None:
+            # Le tirage de base ne dépend que du modèle: calculé une seule fois
+            seed = self._model_config.seed_offset if self._model_config else 42
+            rng = np.random.RandomState(seed)
+            self._keyword_base_probabilities = rng.dirichlet(np.ones(self.NUM_CLASSES) * 0.3)
+        probabilities = self._keyword_base_probabilities.copy()
 
         main_idx = CATEGORY_CODES.index(main_category)
         remaining = 1.0 - main_confidence
@@ -366,6 +737,25 @@ class DemoClassifier(MockClassifier):
         return probabilities
 
 
+# =============================================================================
+# Pool partagé par le processus
+# =============================================================================
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_comparison_executor() -> ThreadPoolExecutor:
+    """Retourne le pool des comparaisons multi-modèles (créé au premier appel)."""
+    global _shared_executor
+    with _shared_lock:
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(
+                max_workers=MODEL_CONFIG["comparison_max_workers"],
+                thread_name_prefix="multi-model",
+            )
+        return _shared_executor
+
+
 # =============================================================================
 # Factory pour créer des classifieurs avec différents modèles
 # =============================================================================
@@ -375,32 +765,73 @@ class MultiModelClassifier:
 
     Permet de créer et gérer plusieurs classifieurs avec différentes
     configurations pour comparer leurs performances.
+
+    Les classifieurs sont enregistrés dans un ModelRegistry et ne sont
+    construits qu'au premier usage, dans la limite du budget mémoire.
+    Ils sont résolus dans le registre à chaque comparaison, sans être
+    conservés: un modèle évincé est réellement libéré.
+
+    L'entrée est prétraitée une seule fois (PreparedInput) puis les modèles
+    s'exécutent en parallèle sur un pool de threads partagé par le processus
+    (get_shared_comparison_executor()): la latence d'une comparaison suit
+    le modèle le plus lent, pas la somme des modèles. Chaque résultat porte
+    sa durée dans latency_ms.
     """
 
-    def __init__(self):
-        self._text_classifiers: Dict[str, DemoClassifier] = {}
-        self._image_classifiers: Dict[str, DemoClassifier] = {}
+    def __init__(
+        self,
+        memory_budget_mb: Optional[float] = None,
+        registry: Optional[ModelRegistry] = None,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            memory_budget_mb: Budget mémoire du registre de modèles.
+                Par défaut: MODEL_CONFIG["memory_budget_mb"]
+            registry: Registre partagé à réutiliser (ex: celui préchauffé
+                au démarrage). Les modèles déjà enregistrés sont conservés.
+            executor: Pool de threads à utiliser, géré par l'appelant.
+                Par défaut: le pool partagé du processus
+                (get_shared_comparison_executor())
+        """
+        self._registry = registry if registry is not None else ModelRegistry(memory_budget_mb)
+        self._text_model_ids: List[str] = []
+        self._image_model_ids: List[str] = []
         self._initialize_classifiers()
+        self._executor = executor if executor is not None else get_shared_comparison_executor()
 
     def _initialize_classifiers(self):
-        """Initialise tous les classifieurs disponibles."""
+        """Enregistre tous les classifieurs disponibles (sans les charger)."""
         for model_id, config in TEXT_MODELS.items():
-            self._text_classifiers[model_id] = DemoClassifier(model_config=config)
+            if model_id not in self._registry:
+                self._registry.register(model_id, partial(DemoClassifier, model_config=config))
+            self._text_model_ids.append(model_id)
 
         for model_id, config in IMAGE_MODELS.items():
-            self._image_classifiers[model_id] = DemoClassifier(model_config=config)
+            if model_id not in self._registry:
+                self._registry.register(model_id, partial(DemoClassifier, model_config=config))
+            self._image_model_ids.append(model_id)
+
+    @property
+    def registry(self) -> ModelRegistry:
+        """Retourne le registre de modèles sous-jacent."""
+        return self._registry
+
+    def get_registry_stats(self) -> Dict[str, any]:
+        """Statistiques de chargement et d'éviction des modèles."""
+        return self._registry.get_stats()
 
     def get_text_classifier(self, model_id: str) -> DemoClassifier:
-        """Retourne un classifieur texte spécifique."""
-        if model_id not in self._text_classifiers:
+        """Retourne un classifieur texte spécifique (à ne pas conserver)."""
+        if model_id not in self._text_model_ids:
             raise ValueError(f"Modèle texte inconnu: {model_id}")
-        return self._text_classifiers[model_id]
+        return self._registry.get(model_id)
 
     def get_image_classifier(self, model_id: str) -> DemoClassifier:
-        """Retourne un classifieur image spécifique."""
-        if model_id not in self._image_classifiers:
+        """Retourne un classifieur image spécifique (à ne pas conserver)."""
+        if model_id not in self._image_model_ids:
             raise ValueError(f"Modèle image inconnu: {model_id}")
-        return self._image_classifiers[model_id]
+        return self._registry.get(model_id)
 
     def predict_all_text_models(
         self,
@@ -408,15 +839,14 @@ class MultiModelClassifier:
         top_k: int = 5
     ) -> Dict[str, ClassificationResult]:
         """
-        Exécute tous les modèles texte sur la même entrée.
+        Exécute tous les modèles texte en parallèle sur la même entrée.
 
         Returns:
-            Dict avec model_id -> ClassificationResult
+            Dict avec model_id -> ClassificationResult (latency_ms renseigné),
+            dans l'ordre des modèles
         """
-        results = {}
-        for model_id, classifier in self._text_classifiers.items():
-            results[model_id] = classifier.predict(text=text, top_k=top_k)
-        return results
+        prepared = PreparedInput.from_inputs(text=text)
+        return self._predict_all(self._text_model_ids, self.get_text_classifier, prepared, top_k)
 
     def predict_all_image_models(
         self,
@@ -424,15 +854,49 @@ class MultiModelClassifier:
         top_k: int = 5
     ) -> Dict[str, ClassificationResult]:
         """
-        Exécute tous les modèles image sur la même entrée.
+        Exécute tous les modèles image en parallèle sur la même entrée.
 
         Returns:
-            Dict avec model_id -> ClassificationResult
+            Dict avec model_id -> ClassificationResult (latency_ms renseigné),
+            dans l'ordre des modèles
+        """
+        prepared = PreparedInput.from_inputs(
+            image=image, image_fingerprint=compute_image_fingerprint(image)
+        )
+        return self._predict_all(self._image_model_ids, self.get_image_classifier, prepared, top_k)
+
+    def _predict_all(
+        self,
+        model_ids: List[str],
+        get_classifier,
+        prepared: PreparedInput,
+        top_k: int
+    ) -> Dict[str, ClassificationResult]:
+        """Répartit l'entrée prétraitée sur les modèles et collecte les résultats."""
+        futures = {
+            model_id: self._executor.submit(
+                self._timed_predict, get_classifier(model_id), prepared, top_k
+            )
+            for model_id in model_ids
+        }
+        return {model_id: future.result() for model_id, future in futures.items()}
+
+    @staticmethod
+    def _timed_predict(
+        classifier: BaseClassifier,
+        prepared: PreparedInput,
+        top_k: int
+    ) -> ClassificationResult:
+        """Exécute un modèle et mesure sa durée (hors chargement)."""
+        start = time.perf_counter()
+        result = classifier.predict_prepared(prepared, top_k=top_k)
+        return replace(result, latency_ms=(time.perf_counter() - start) * 1000)
+
+    def close(self) -> None:
+        """
+        Sans effet: le pool partagé vit avec le processus et un pool
+        fourni au constructeur reste géré par l'appelant.
         """
-        results = {}
-        for model_id, classifier in self._image_classifiers.items():
-            results[model_id] = classifier.predict(image=image, top_k=top_k)
-        return results
 
     def get_comparison_metrics(
         self,
@@ -16,6 +16,10 @@ import numpy as np
 from PIL import Image
 
 
+# Marqueur présent dans ClassificationResult.source pour un résultat dégradé
+PARTIAL_SOURCE_MARKER = "_partial"
+
+
 @dataclass
 class ClassificationResult:
     """
@@ -27,18 +31,25 @@ class ClassificationResult:
         top_k_predictions: Liste des (code_catégorie, score) triées par score décroissant
         source: Source de la prédiction ("image", "text", "multimodal", "mock")
         raw_probabilities: Vecteur complet des probabilités (27 classes)
+        latency_ms: Durée de la prédiction en millisecondes (si mesurée)
     """
     category: str
     confidence: float
     top_k_predictions: List[Tuple[str, float]] = field(default_factory=list)
     source: str = "unknown"
     raw_probabilities: Optional[np.ndarray] = None
+    latency_ms: Optional[float] = None
 
     def __post_init__(self):
         """Validation des données après initialisation."""
         if not 0 <= self.confidence <= 1:
             raise ValueError(f"Confidence must be in [0, 1], got {self.confidence}")
 
+    @property
+    def is_partial(self) -> bool:
+        """Vrai si le résultat provient d'une dégradation (ex: échéance dépassée)."""
+        return PARTIAL_SOURCE_MARKER in self.source
+
     def to_dict(self) -> dict:
         """Convertit le résultat en dictionnaire pour affichage."""
         return {
@@ -49,6 +60,53 @@ class ClassificationResult:
         }
 
 
+@dataclass(frozen=True)
+class PreparedInput:
+    """
+    Entrée d'un produit prétraitée une seule fois, partageable entre modèles.
+
+    Attributes:
+        image: Image PIL du produit (ou None)
+        text: Texte débarrassé des espaces de bord (None si absent ou vide)
+        normalized_text: Texte en minuscules, pour la recherche de mots-clés
+        image_fingerprint: Empreinte perceptuelle de l'image, fournie par
+            l'appelant (ou None)
+    """
+    image: Optional[Image.Image] = None
+    text: Optional[str] = None
+    normalized_text: Optional[str] = None
+    image_fingerprint: Optional[int] = None
+
+    @classmethod
+    def from_inputs(
+        cls,
+        image: Optional[Image.Image] = None,
+        text: Optional[str] = None,
+        image_fingerprint: Optional[int] = None
+    ) -> "PreparedInput":
+        """
+        Prépare une entrée brute.
+
+        L'empreinte n'est pas calculée ici, pour garder ce module sans
+        dépendance: l'appelant qui la partage entre modèles la passe
+        (voir image_utils.compute_image_fingerprint).
+
+        Raises:
+            ValueError: Si ni image ni texte n'est fourni
+        """
+        text = text.strip() if text is not None else None
+        if not text:
+            text = None
+        if image is None and text is None:
+            raise ValueError("Au moins une image ou un texte est requis")
+        return cls(
+            image=image,
+            text=text,
+            normalized_text=text.lower() if text is not None else None,
+            image_fingerprint=image_fingerprint if image is not None else None,
+        )
+
+
 class BaseClassifier(ABC):
     """
     Classe abstraite définissant l'interface pour tous les classifieurs.
@@ -106,6 +164,56 @@ class BaseClassifier(ABC):
         """
         pass
 
+    def predict_batch(
+        self,
+        images: Optional[List[Optional[Image.Image]]] = None,
+        texts: Optional[List[Optional[str]]] = None,
+        top_k: int = 5
+    ) -> List[ClassificationResult]:
+        """
+        Effectue les prédictions d'un lot de produits.
+
+        L'implémentation par défaut appelle predict() pour chaque produit.
+        Les classifieurs capables de vectoriser (produit matriciel sur tout
+        le lot) doivent la surcharger.
+
+        Args:
+            images: Images des produits (None pour un produit sans image)
+            texts: Textes des produits (None pour un produit sans texte)
+            top_k: Nombre de prédictions à retourner par produit
+
+        Returns:
+            Liste de ClassificationResult, dans l'ordre des entrées
+
+        Raises:
+            ValueError: Si les listes n'ont pas la même longueur
+        """
+        images, texts = self._align_batch_inputs(images, texts)
+        return [
+            self.predict(image=image, text=text, top_k=top_k)
+            for image, text in zip(images, texts)
+        ]
+
+    def predict_prepared(
+        self,
+        prepared: PreparedInput,
+        top_k: int = 5
+    ) -> ClassificationResult:
+        """
+        Effectue la prédiction d'une entrée déjà prétraitée.
+
+        L'implémentation par défaut appelle predict(). Les classifieurs
+        pouvant réutiliser un prétraitement partagé doivent la surcharger.
+
+        Args:
+            prepared: Entrée prétraitée (PreparedInput.from_inputs)
+            top_k: Nombre de prédictions à retourner
+
+        Returns:
+            ClassificationResult
+        """
+        return self.predict(image=prepared.image, text=prepared.text, top_k=top_k)
+
     @abstractmethod
     def load_model(self, path: str) -> None:
         """
@@ -136,6 +244,20 @@ class BaseClassifier(ABC):
         """Retourne le nom du classifieur."""
         return self.__class__.__name__
 
+    @property
+    def model_identity(self) -> str:
+        """
+        Identifiant stable du modèle servi, utilisé comme clé de cache.
+
+        Doit changer dès que les prédictions peuvent changer (autre
+        configuration, autre artefact chargé). Par défaut: classe du
+        classifieur et attribut optionnel model_version.
+        """
+        cls = self.__class__
+        version = getattr(self, "model_version", None)
+        identity = f"{cls.__module__}.{cls.__qualname__}"
+        return f"{identity}@{version}" if version is not None else identity
+
     def _validate_inputs(
         self,
         image: Optional[Image.Image],
@@ -160,6 +282,31 @@ class BaseClassifier(ABC):
         if require_text and (text is None or text.strip() == ""):
             raise ValueError(f"{self.name} requires a text input")
 
+    @staticmethod
+    def _align_batch_inputs(
+        images: Optional[List[Optional[Image.Image]]],
+        texts: Optional[List[Optional[str]]]
+    ) -> Tuple[List[Optional[Image.Image]], List[Optional[str]]]:
+        """
+        Aligne les listes d'images et de textes d'un lot.
+
+        Une liste absente est remplacée par des None de même longueur.
+
+        Raises:
+            ValueError: Si les deux listes sont fournies avec des longueurs différentes
+        """
+        if images is None and texts is None:
+            return [], []
+        if images is None:
+            images = [None] * len(texts)
+        if texts is None:
+            texts = [None] * len(images)
+        if len(images) != len(texts):
+            raise ValueError(
+                f"Batch size mismatch: {len(images)} images, {len(texts)} texts"
+            )
+        return list(images), list(texts)
+
     def _probabilities_to_predictions(
         self,
         probabilities: np.ndarray,
@@ -190,3 +337,58 @@ class BaseClassifier(ABC):
             predictions.append((category_code, score))
 
         return predictions
+
+    def _result_from_probabilities(
+        self,
+        probabilities: np.ndarray,
+        top_k: int = 5,
+        source: str = "unknown"
+    ) -> ClassificationResult:
+        """
+        Construit un ClassificationResult à partir d'un vecteur de probabilités.
+
+        Args:
+            probabilities: Array de shape (27,) avec les probabilités par classe
+            top_k: Nombre de prédictions à retourner
+            source: Source de la prédiction
+
+        Returns:
+            ClassificationResult dont la catégorie est la classe la plus probable
+        """
+        top_predictions = self._probabilities_to_predictions(probabilities, top_k)
+        best_category, best_confidence = top_predictions[0]
+
+        return ClassificationResult(
+            category=best_category,
+            confidence=float(np.clip(best_confidence, 0.0, 1.0)),
+            top_k_predictions=top_predictions,
+            source=source,
+            raw_probabilities=probabilities
+        )
+
+    def result_to_probabilities(self, result: ClassificationResult) -> np.ndarray:
+        """
+        Retourne le vecteur complet de probabilités d'un résultat.
+
+        Si raw_probabilities est absent, le vecteur est reconstruit depuis
+        top_k_predictions et la masse restante est répartie uniformément
+        sur les autres classes.
+
+        Args:
+            result: Résultat d'un classifieur
+
+        Returns:
+            Array de shape (27,)
+        """
+        if result.raw_probabilities is not None:
+            return np.asarray(result.raw_probabilities, dtype=np.float64)
+
+        probabilities = np.zeros(self.NUM_CLASSES)
+        for code, score in result.top_k_predictions:
+            probabilities[self.CATEGORY_CODES.index(code)] = score
+
+        remaining = max(0.0, 1.0 - probabilities.sum())
+        missing = probabilities == 0
+        if missing.any():
+            probabilities[missing] = remaining / missing.sum()
+        return probabilities
@@ -0,0 +1,434 @@
+"""
+Registre de modèles avec chargement paresseux et éviction LRU.
+
+Les vrais artefacts (SVM, Random Forest, VGG16...) pèsent plusieurs centaines
+de MB chacun. Plutôt que de tout charger à la construction, le registre:
+- Charge un modèle au premier accès (lazy loading)
+- Estime la taille résidente de chaque modèle chargé
+- Évince les modèles les moins récemment utilisés (LRU) quand le
+  budget mémoire configuré est dépassé
+- Expose les temps de chargement et le nombre d'évictions
+
+Un classifieur obtenu par get() et conservé par l'appelant (session
+Streamlit, branche d'un MultimodalClassifier...) reste en mémoire après
+son éviction, sans être compté dans le budget, et un get() ultérieur en
+charge une seconde copie. Les références durables passent donc par
+get_handle(), qui résout le modèle dans le registre à chaque prédiction.
+
+Usage:
+    registry = ModelRegistry(memory_budget_mb=2048)
+    registry.register("tfidf_svm", lambda: load_svm("models/svm.joblib"))
+    classifier = registry.get("tfidf_svm")  # Chargé ici, pas avant
+    session_classifier = registry.get_handle("tfidf_svm")  # À conserver
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from PIL import Image
+
+from .model_interface import BaseClassifier, ClassificationResult, PreparedInput
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import MODEL_CONFIG
+
+
+# Type d'une fonction de chargement: ne prend rien, retourne un classifieur
+ModelLoader = Callable[[], BaseClassifier]
+
+
+def estimate_memory_footprint(obj: Any) -> int:
+    """
+    Estime la mémoire résidente (en octets) d'un objet Python.
+
+    Parcourt récursivement les attributs, dictionnaires et séquences,
+    en comptant la taille réelle des buffers numpy (nbytes) plutôt que
+    celle de l'en-tête. Chaque objet n'est compté qu'une seule fois.
+
+    Args:
+        obj: Objet à mesurer (typiquement un classifieur)
+
+    Returns:
+        Taille estimée en octets
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+
+        # getsizeof inclut le buffer d'un array numpy qui possède ses données
+        total += sys.getsizeof(current)
+
+        if isinstance(current, np.ndarray):
+            # Une vue ne possède pas ses données: compter la base une seule fois
+            if current.base is not None:
+                stack.append(current.base)
+            continue
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__") and not isinstance(current, type):
+            stack.append(vars(current))
+
+    return total
+
+
+class ModelRegistry:
+    """
+    Registre thread-safe de classifieurs chargés à la demande.
+
+    Les modèles sont enregistrés avec une fonction de chargement, puis
+    instanciés au premier appel à get(). Quand la somme des tailles
+    résidentes dépasse le budget, les modèles les moins récemment
+    utilisés sont déchargés. Le modèle demandé n'est jamais évincé,
+    même s'il dépasse à lui seul le budget.
+
+    Le chargement s'exécute hors du verrou du registre: un modèle lent à
+    charger ne bloque ni les accès aux modèles déjà en mémoire ni le
+    chargement des autres. Les appels concurrents pour un même modèle
+    attendent un unique chargement.
+    """
+
+    def __init__(self, memory_budget_mb: Optional[float] = None):
+        """
+        Initialise le registre.
+
+        Args:
+            memory_budget_mb: Budget mémoire en MB. Par défaut:
+                MODEL_CONFIG["memory_budget_mb"]. None = pas de limite.
+        """
+        if memory_budget_mb is None:
+            memory_budget_mb = MODEL_CONFIG.get("memory_budget_mb")
+        self._memory_budget_mb = memory_budget_mb
+
+        self._loaders: Dict[str, ModelLoader] = {}
+        self._size_estimators: Dict[str, Callable[[BaseClassifier], int]] = {}
+        # Ordre LRU: le plus ancien en tête, le plus récent en fin
+        self._loaded: "OrderedDict[str, BaseClassifier]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        # Chargements en cours: les appels concurrents attendent le même Future
+        self._loading: Dict[str, Future] = {}
+
+        self._load_times: Dict[str, float] = {}
+        self._load_counts: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._lock = threading.RLock()
+
+    # -------------------------------------------------------------------------
+    # Enregistrement
+    # -------------------------------------------------------------------------
+    def register(
+        self,
+        model_id: str,
+        loader: ModelLoader,
+        size_estimator: Optional[Callable[[BaseClassifier], int]] = None
+    ) -> None:
+        """
+        Enregistre un modèle sans le charger.
+
+        Args:
+            model_id: Identifiant unique du modèle
+            loader: Fonction sans argument qui construit le classifieur
+            size_estimator: Fonction retournant la taille en octets du
+                modèle chargé (par défaut: estimate_memory_footprint)
+        """
+        with self._lock:
+            if model_id in self._loaded:
+                self._unload(model_id)
+            # Un chargement en cours de l'ancien loader n'est plus partagé
+            self._loading.pop(model_id, None)
+            self._loaders[model_id] = loader
+            if size_estimator is not None:
+                self._size_estimators[model_id] = size_estimator
+            else:
+                self._size_estimators.pop(model_id, None)
+
+    @property
+    def registered_models(self) -> List[str]:
+        """Retourne les identifiants de tous les modèles enregistrés."""
+        return list(self._loaders.keys())
+
+    def __contains__(self, model_id: str) -> bool:
+        return model_id in self._loaders
+
+    def __len__(self) -> int:
+        return len(self._loaders)
+
+    # -------------------------------------------------------------------------
+    # Accès aux modèles
+    # -------------------------------------------------------------------------
+    def get(self, model_id: str) -> BaseClassifier:
+        """
+        Retourne un modèle, en le chargeant si nécessaire.
+
+        Args:
+            model_id: Identifiant du modèle
+
+        Returns:
+            Classifieur prêt à l'emploi
+
+        Raises:
+            KeyError: Si le modèle n'est pas enregistré
+            Exception: Celle levée par la fonction de chargement
+        """
+        with self._lock:
+            if model_id not in self._loaders:
+                raise KeyError(f"Modèle non enregistré: {model_id}")
+
+            if model_id in self._loaded:
+                self._hits += 1
+                self._loaded.move_to_end(model_id)
+                return self._loaded[model_id]
+
+            self._misses += 1
+            pending = self._loading.get(model_id)
+            if pending is None:
+                pending = self._loading[model_id] = Future()
+                loader = self._loaders[model_id]
+                estimator = self._size_estimators.get(model_id, estimate_memory_footprint)
+            else:
+                loader = None
+
+        if loader is None:
+            # Chargement déjà lancé par un autre appelant
+            return pending.result()
+        return self._load(model_id, loader, estimator, pending)
+
+    def get_handle(self, model_id: str) -> "RegisteredClassifier":
+        """
+        Retourne un classifieur qui résout model_id à chaque prédiction.
+
+        À utiliser pour toute référence conservée au-delà d'un appel: le
+        modèle reste évinçable et n'est jamais chargé en double.
+
+        Raises:
+            KeyError: Si le modèle n'est pas enregistré
+        """
+        return RegisteredClassifier(self, model_id)
+
+    def is_loaded(self, model_id: str) -> bool:
+        """Vérifie si un modèle est actuellement en mémoire."""
+        return model_id in self._loaded
+
+    @property
+    def loaded_models(self) -> List[str]:
+        """Modèles en mémoire, du moins au plus récemment utilisé."""
+        with self._lock:
+            return list(self._loaded.keys())
+
+    def unload(self, model_id: str) -> bool:
+        """
+        Décharge explicitement un modèle.
+
+        Returns:
+            True si le modèle était chargé
+        """
+        with self._lock:
+            if model_id not in self._loaded:
+                return False
+            self._unload(model_id)
+            return True
+
+    def clear(self) -> None:
+        """Décharge tous les modèles (les enregistrements sont conservés)."""
+        with self._lock:
+            for model_id in list(self._loaded.keys()):
+                self._unload(model_id)
+
+    # -------------------------------------------------------------------------
+    # Mémoire et statistiques
+    # -------------------------------------------------------------------------
+    @property
+    def memory_budget_mb(self) -> Optional[float]:
+        """Budget mémoire en MB (None = illimité)."""
+        return self._memory_budget_mb
+
+    @memory_budget_mb.setter
+    def memory_budget_mb(self, value: Optional[float]) -> None:
+        with self._lock:
+            self._memory_budget_mb = value
+            self._evict_if_needed()
+
+    @property
+    def memory_usage_bytes(self) -> int:
+        """Somme des tailles résidentes estimées des modèles chargés."""
+        return sum(self._sizes.values())
+
+    def get_model_size(self, model_id: str) -> Optional[int]:
+        """Taille résidente estimée (octets) d'un modèle chargé, sinon None."""
+        return self._sizes.get(model_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les statistiques du registre.
+
+        Returns:
+            Dict avec chargements, évictions, hits/misses, temps de
+            chargement (secondes, dernier chargement) et mémoire utilisée
+        """
+        with self._lock:
+            return {
+                "registered": len(self._loaders),
+                "loaded": list(self._loaded.keys()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "loads": sum(self._load_counts.values()),
+                "load_counts": dict(self._load_counts),
+                "evictions": self._evictions,
+                "load_times_s": dict(self._load_times),
+                "model_sizes_bytes": dict(self._sizes),
+                "memory_usage_mb": self.memory_usage_bytes / (1024 * 1024),
+                "memory_budget_mb": self._memory_budget_mb,
+            }
+
+    # -------------------------------------------------------------------------
+    # Interne
+    # -------------------------------------------------------------------------
+    def _load(
+        self,
+        model_id: str,
+        loader: ModelLoader,
+        estimator: Callable[[BaseClassifier], int],
+        pending: Future
+    ) -> BaseClassifier:
+        """
+        Charge un modèle hors verrou, puis l'insère et évince sous verrou.
+
+        Le résultat (ou l'exception) est aussi transmis par pending aux
+        appelants qui attendent ce chargement.
+        """
+        try:
+            start = time.perf_counter()
+            classifier = loader()
+            load_time = time.perf_counter() - start
+            size = int(estimator(classifier))
+        except BaseException as e:
+            with self._lock:
+                self._release_loading(model_id, pending)
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self._release_loading(model_id, pending)
+            self._load_times[model_id] = load_time
+            self._load_counts[model_id] = self._load_counts.get(model_id, 0) + 1
+            # Modèle ré-enregistré pendant le chargement: résultat non conservé
+            if self._loaders.get(model_id) is loader:
+                self._sizes[model_id] = size
+                self._loaded[model_id] = classifier
+                self._evict_if_needed(keep=model_id)
+        pending.set_result(classifier)
+        return classifier
+
+    def _release_loading(self, model_id: str, pending: Future) -> None:
+        """Retire un chargement terminé, sauf s'il a été remplacé entre-temps."""
+        if self._loading.get(model_id) is pending:
+            del self._loading[model_id]
+
+    def _unload(self, model_id: str) -> None:
+        """Retire un modèle de la mémoire du registre."""
+        self._loaded.pop(model_id, None)
+        self._sizes.pop(model_id, None)
+
+    def _evict_if_needed(self, keep: Optional[str] = None) -> None:
+        """Évince les modèles LRU tant que le budget est dépassé."""
+        if self._memory_budget_mb is None:
+            return
+
+        budget_bytes = self._memory_budget_mb * 1024 * 1024
+        for model_id in list(self._loaded.keys()):
+            if self.memory_usage_bytes <= budget_bytes:
+                break
+            if model_id == keep:
+                continue
+            self._unload(model_id)
+            self._evictions += 1
+
+
+class RegisteredClassifier(BaseClassifier):
+    """
+    Classifieur délégant chaque appel au modèle courant du registre.
+
+    Ne garde aucune référence au modèle chargé: après une éviction, la
+    mémoire est réellement libérée et le prochain appel recharge le
+    modèle via le registre (un seul exemplaire en mémoire).
+    """
+
+    def __init__(self, registry: ModelRegistry, model_id: str):
+        """
+        Args:
+            registry: Registre contenant le modèle
+            model_id: Identifiant du modèle
+
+        Raises:
+            KeyError: Si le modèle n'est pas enregistré
+        """
+        if model_id not in registry:
+            raise KeyError(f"Modèle non enregistré: {model_id}")
+        self._registry = registry
+        self._model_id = model_id
+        self._model_identity: Optional[str] = None
+
+    @property
+    def classifier(self) -> BaseClassifier:
+        """Modèle courant (chargé si nécessaire). Ne pas le conserver."""
+        return self._registry.get(self._model_id)
+
+    @property
+    def model_id(self) -> str:
+        return self._model_id
+
+    def predict(
+        self,
+        image: Optional[Image.Image] = None,
+        text: Optional[str] = None,
+        top_k: int = 5
+    ) -> ClassificationResult:
+        return self.classifier.predict(image=image, text=text, top_k=top_k)
+
+    def predict_batch(
+        self,
+        images: Optional[List[Optional[Image.Image]]] = None,
+        texts: Optional[List[Optional[str]]] = None,
+        top_k: int = 5
+    ) -> List[ClassificationResult]:
+        return self.classifier.predict_batch(images=images, texts=texts, top_k=top_k)
+
+    def predict_prepared(self, prepared: PreparedInput, top_k: int = 5) -> ClassificationResult:
+        return self.classifier.predict_prepared(prepared, top_k=top_k)
+
+    def load_model(self, path: str) -> None:
+        """Délègue le chargement au modèle courant."""
+        self.classifier.load_model(path)
+
+    @property
+    def is_ready(self) -> bool:
+        """Prêt tant que le modèle est enregistré (chargé à la demande)."""
+        return self._model_id in self._registry
+
+    @property
+    def model_identity(self) -> str:
+        """
+        Identité du modèle, mémorisée à la première résolution: une clé de
+        cache ne force pas le rechargement d'un modèle évincé.
+        """
+        if self._model_identity is None:
+            self._model_identity = self.classifier.model_identity
+        return self._model_identity
@@ -0,0 +1,394 @@
+"""
+Classifieur multimodal par fusion tardive (late fusion).
+
+Les branches texte et image sont exécutées en parallèle sur un pool de
+threads borné partagé par le processus, puis leurs vecteurs de probabilités
+sont combinés avec les poids MODEL_CONFIG["fusion_weights"] (image, texte).
+La latence est ainsi proche de celle de la branche la plus lente, et non
+de la somme des deux.
+
+Une échéance (deadline_ms) borne la durée d'une prédiction: si une
+branche n'a pas répondu à temps, le résultat de l'autre est retourné seul,
+marqué "multimodal_partial_<branche>", et le dépassement est comptabilisé.
+deadline_ms=None désactive l'échéance; sans argument, l'échéance vient de
+MODEL_CONFIG["prediction_deadline_ms"].
+
+Une branche abandonnée occupe son worker jusqu'à la fin de son calcul. Le
+pool n'accepte pas plus de branches que de workers: quand il est saturé,
+la branche est refusée (résultat partiel de l'autre branche, ou
+FusionSaturatedError) et le refus est comptabilisé, au lieu d'attendre
+derrière des branches abandonnées.
+
+Usage:
+    fusion = MultimodalClassifier(text_classifier, image_classifier)
+    result = fusion.predict(image=image, text=text, deadline_ms=500)
+    if result.is_partial: ...
+"""
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from PIL import Image
+
+from .model_interface import BaseClassifier, ClassificationResult
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import MODEL_CONFIG
+
+
+# Valeur par défaut de deadline_ms: "échéance de la config / du constructeur".
+# None reste disponible pour "aucune échéance".
+_DEFAULT_DEADLINE = object()
+
+DeadlineArg = Union[Optional[float], object]
+
+
+class FusionSaturatedError(TimeoutError):
+    """Aucune branche n'a pu être lancée: pool de fusion saturé."""
+
+
+class BoundedExecutor:
+    """
+    Pool de threads qui refuse les tâches au-delà de sa capacité.
+
+    Une tâche occupe une place de sa soumission à sa fin, même si son
+    appelant ne l'attend plus: le nombre de threads et de tâches en cours
+    reste borné par max_workers, et aucune tâche n'attend en file.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Nombre de workers et de tâches simultanées.
+                Par défaut: MODEL_CONFIG["fusion_max_workers"]
+        """
+        if max_workers is None:
+            max_workers = MODEL_CONFIG["fusion_max_workers"]
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {max_workers}")
+        self._max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fusion")
+
+    def try_submit(self, fn: Callable[..., Any], **kwargs) -> Optional[Future]:
+        """Soumet fn(**kwargs), ou retourne None si toutes les places sont prises."""
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            future = self._executor.submit(fn, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Arrête le pool."""
+        self._executor.shutdown(wait=wait)
+
+
+class MultimodalClassifier(BaseClassifier):
+    """
+    Fusionne un classifieur texte et un classifieur image.
+
+    Avec les deux entrées, les branches tournent simultanément et les
+    probabilités sont moyennées avec les poids de fusion. Avec une seule
+    entrée, seule la branche correspondante est exécutée et son résultat
+    est retourné tel quel.
+
+    Sous échéance, une branche en retard est abandonnée (son calcul se
+    termine en arrière-plan mais n'est pas attendu). Les branches sont
+    soumises à un BoundedExecutor: pool saturé, la branche est refusée
+    et comptée dans les statistiques ("rejections").
+    """
+
+    def __init__(
+        self,
+        text_classifier: BaseClassifier,
+        image_classifier: BaseClassifier,
+        fusion_weights: Optional[Tuple[float, float]] = None,
+        executor: Optional[BoundedExecutor] = None,
+        deadline_ms: DeadlineArg = _DEFAULT_DEADLINE
+    ):
+        """
+        Args:
+            text_classifier: Classifieur de la branche texte
+            image_classifier: Classifieur de la branche image
+            fusion_weights: Poids (image, texte). Par défaut:
+                MODEL_CONFIG["fusion_weights"]
+            executor: Pool borné à utiliser, géré par l'appelant.
+                Par défaut: pool partagé du processus
+                (get_shared_fusion_executor())
+            deadline_ms: Échéance par défaut des prédictions, None pour
+                aucune. Par défaut: MODEL_CONFIG["prediction_deadline_ms"]
+        """
+        if fusion_weights is None:
+            fusion_weights = MODEL_CONFIG["fusion_weights"]
+        if deadline_ms is _DEFAULT_DEADLINE:
+            deadline_ms = MODEL_CONFIG.get("prediction_deadline_ms")
+        self._validate_deadline(deadline_ms)
+        self._deadline_ms = deadline_ms
+
+        image_weight, text_weight = fusion_weights
+        if image_weight < 0 or text_weight < 0 or image_weight + text_weight <= 0:
+            raise ValueError(f"Poids de fusion invalides: {fusion_weights}")
+
+        total = image_weight + text_weight
+        self._image_weight = image_weight / total
+        self._text_weight = text_weight / total
+
+        self._text_classifier = text_classifier
+        self._image_classifier = image_classifier
+
+        self._executor = executor if executor is not None else get_shared_fusion_executor()
+
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    @staticmethod
+    def _validate_deadline(deadline_ms: Optional[float]) -> None:
+        if deadline_ms is not None and deadline_ms <= 0:
+            raise ValueError(f"deadline_ms must be > 0, got {deadline_ms}")
+
+    def predict(
+        self,
+        image: Optional[Image.Image] = None,
+        text: Optional[str] = None,
+        top_k: int = 5,
+        deadline_ms: DeadlineArg = _DEFAULT_DEADLINE
+    ) -> ClassificationResult:
+        """
+        Prédit la catégorie en combinant les branches disponibles.
+
+        Args:
+            image: Image PIL du produit
+            text: Texte du produit
+            top_k: Nombre de prédictions à retourner
+            deadline_ms: Échéance de cet appel, None pour aucune (par
+                défaut: celle du constructeur)
+
+        Returns:
+            Résultat fusionné, ou résultat d'une seule branche marqué
+            "multimodal_partial_text" / "multimodal_partial_image" si
+            l'autre a dépassé l'échéance ou a été refusée (pool saturé)
+
+        Raises:
+            ValueError: Si ni image ni texte n'est fourni
+            TimeoutError: Si aucune branche n'a répondu avant l'échéance
+            FusionSaturatedError: Si aucune branche n'a pu être lancée
+        """
+        has_text = text is not None and text.strip() != ""
+        if image is None and not has_text:
+            raise ValueError("Au moins une image ou un texte est requis")
+
+        if deadline_ms is _DEFAULT_DEADLINE:
+            deadline_ms = self._deadline_ms
+        self._validate_deadline(deadline_ms)
+        deadline = None if deadline_ms is None else time.perf_counter() + deadline_ms / 1000.0
+
+        branches: Dict[str, Tuple[Callable[..., ClassificationResult], Dict[str, Any]]] = {}
+        if has_text:
+            branches["text"] = (self._text_classifier.predict, {"text": text, "top_k": top_k})
+        if image is not None:
+            branches["image"] = (self._image_classifier.predict, {"image": image, "top_k": top_k})
+
+        futures: Dict[str, Future] = {}
+        rejected = 0
+        for branch, (fn, kwargs) in branches.items():
+            future = self._executor.try_submit(fn, **kwargs)
+            if future is None:
+                rejected += 1
+            else:
+                futures[branch] = future
+
+        if not futures:
+            self._record(missed=False, rejected=rejected)
+            raise FusionSaturatedError("Pool de fusion saturé: aucune branche lancée")
+
+        timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        done, pending = wait(futures.values(), timeout=timeout, return_when=FIRST_EXCEPTION)
+
+        # Une exception de branche est propagée telle quelle
+        for future in done:
+            if future.exception() is not None:
+                raise future.exception()
+
+        if not pending:
+            if len(futures) == len(branches):
+                self._record(missed=False)
+                if len(futures) == 1:
+                    return next(iter(futures.values())).result()
+                return self._fuse(futures["text"].result(), futures["image"].result(), top_k)
+            # L'autre branche a été refusée: résultat partiel
+            branch = next(iter(futures))
+            self._record(missed=False, partial_branch=branch, rejected=rejected)
+            return replace(futures[branch].result(), source=f"multimodal_partial_{branch}")
+
+        for future in pending:
+            future.cancel()
+
+        completed = [branch for branch, future in futures.items() if future in done]
+        if not completed:
+            self._record(missed=True, rejected=rejected)
+            raise TimeoutError(
+                f"Aucune branche n'a répondu avant l'échéance de {deadline_ms} ms"
+            )
+
+        branch = completed[0]
+        self._record(missed=True, partial_branch=branch, rejected=rejected)
+        return replace(futures[branch].result(), source=f"multimodal_partial_{branch}")
+
+    def _fuse(
+        self,
+        text_result: ClassificationResult,
+        image_result: ClassificationResult,
+        top_k: int
+    ) -> ClassificationResult:
+        """Combine les probabilités des deux branches avec les poids de fusion."""
+        probabilities = (
+            self._image_weight * self.result_to_probabilities(image_result)
+            + self._text_weight * self.result_to_probabilities(text_result)
+        )
+        probabilities = probabilities / probabilities.sum()
+        return self._result_from_probabilities(probabilities, top_k, source="multimodal")
+
+    # -------------------------------------------------------------------------
+    # Statistiques
+    # -------------------------------------------------------------------------
+    def _record(
+        self,
+        missed: bool,
+        partial_branch: Optional[str] = None,
+        rejected: int = 0
+    ) -> None:
+        """
+        Comptabilise une prédiction.
+
+        Args:
+            missed: Une branche a dépassé l'échéance
+            partial_branch: Branche conservée d'un résultat partiel
+            rejected: Nombre de branches refusées (pool saturé)
+        """
+        with self._stats_lock:
+            self._predictions += 1
+            self._rejections += rejected
+            if rejected:
+                self._rejected_predictions += 1
+            if missed:
+                self._deadline_misses += 1
+                if partial_branch is None:
+                    self._timeouts += 1
+            if partial_branch is not None:
+                self._partial[partial_branch] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Statistiques de respect de l'échéance et de saturation du pool.
+
+        Returns:
+            Dict avec le nombre de prédictions, de dépassements d'échéance,
+            de résultats partiels par branche conservée, d'échecs complets
+            (timeouts), de branches refusées (rejections) et les taux de
+            dépassement et de refus
+        """
+        with self._stats_lock:
+            total = self._predictions
+            return {
+                "predictions": total,
+                "deadline_misses": self._deadline_misses,
+                "partial_results": dict(self._partial),
+                "timeouts": self._timeouts,
+                "deadline_miss_rate": self._deadline_misses / total if total else 0.0,
+                "rejections": self._rejections,
+                "rejection_rate": self._rejected_predictions / total if total else 0.0,
+                "deadline_ms": self._deadline_ms,
+            }
+
+    def reset_stats(self) -> None:
+        """Remet les compteurs à zéro."""
+        with self._stats_lock:
+            self._predictions = 0
+            self._deadline_misses = 0
+            self._timeouts = 0
+            self._rejections = 0
+            self._rejected_predictions = 0
+            self._partial = {"text": 0, "image": 0}
+
+    # -------------------------------------------------------------------------
+    # Interface BaseClassifier
+    # -------------------------------------------------------------------------
+    def load_model(self, path: str) -> None:
+        """
+        Délègue le chargement aux classifieurs de chaque branche.
+
+        Args:
+            path: Dossier contenant le modèle de chaque branche, sous
+                path/text et path/image (fichier ou dossier selon le
+                classifieur de la branche)
+        """
+        self._text_classifier.load_model(str(Path(path) / "text"))
+        self._image_classifier.load_model(str(Path(path) / "image"))
+
+    @property
+    def is_ready(self) -> bool:
+        """Prêt si les deux branches le sont."""
+        return self._text_classifier.is_ready and self._image_classifier.is_ready
+
+    @property
+    def model_identity(self) -> str:
+        """Identité combinant les deux branches et les poids de fusion."""
+        return (
+            f"{super().model_identity}(text={self._text_classifier.model_identity}, "
+            f"image={self._image_classifier.model_identity}, "
+            f"weights={self.fusion_weights})"
+        )
+
+    @property
+    def deadline_ms(self) -> Optional[float]:
+        """Échéance par défaut des prédictions (None = aucune)."""
+        return self._deadline_ms
+
+    @property
+    def fusion_weights(self) -> Tuple[float, float]:
+        """Poids normalisés (image, texte)."""
+        return self._image_weight, self._text_weight
+
+    @property
+    def text_classifier(self) -> BaseClassifier:
+        """Classifieur de la branche texte."""
+        return self._text_classifier
+
+    @property
+    def image_classifier(self) -> BaseClassifier:
+        """Classifieur de la branche image."""
+        return self._image_classifier
+
+    def close(self) -> None:
+        """
+        Sans effet: le pool partagé vit avec le processus et un pool
+        fourni au constructeur reste géré par l'appelant.
+        """
+
+
+# =============================================================================
+# Pool partagé par le processus
+# =============================================================================
+_shared_executor: Optional[BoundedExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_fusion_executor() -> BoundedExecutor:
+    """Retourne le pool de fusion partagé (créé au premier appel)."""
+    global _shared_executor
+    with _shared_lock:
+        if _shared_executor is None:
+            _shared_executor = BoundedExecutor()
+        return _shared_executor
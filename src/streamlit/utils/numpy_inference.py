@@ -0,0 +1,365 @@
+"""
+Format d'inférence NumPy pur pour les pipelines texte scikit-learn.
+
+Charger un pipeline sklearn picklé par joblib importe scikit-learn, SciPy
+et joblib, ce qui ajoute plusieurs secondes au démarrage de Streamlit et de
+chaque worker. Ce module:
+- Exporte le vocabulaire TF-IDF, le vecteur IDF et les poids du modèle
+  (linéaire ou centroïdes) dans un bundle .npz sans pickle
+- Fournit NumpyTextClassifier, un BaseClassifier qui reproduit
+  l'inférence du pipeline avec NumPy seul
+
+Le chemin de service n'importe jamais sklearn: l'export se fait par
+introspection des attributs des estimateurs entraînés.
+
+Usage (hors ligne, là où sklearn est installé):
+    pipeline = joblib.load(TEXT_MODEL_PATH)
+    export_text_pipeline(pipeline, TEXT_MODEL_NPZ_PATH)
+
+Usage (service):
+    classifier = NumpyTextClassifier(TEXT_MODEL_NPZ_PATH)
+    result = classifier.predict(text="console playstation 5")
+
+Quand TEXT_MODEL_NPZ_PATH existe, le registre préchauffé au démarrage
+(warmup.build_default_registry) le sert sous l'identifiant "numpy_text".
+"""
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from .model_interface import BaseClassifier, ClassificationResult
+from .quantization import quantize_linear_weights, softmax
+
+
+# Version du format de bundle
+BUNDLE_FORMAT_VERSION = 1
+
+# Types de modèles supportés
+MODEL_KIND_LINEAR = "linear"
+MODEL_KIND_CENTROID = "centroid"
+
+# Pattern de tokenisation par défaut de TfidfVectorizer
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+# =============================================================================
+# Export (nécessite un pipeline entraîné, pas sklearn lui-même)
+# =============================================================================
+def _split_pipeline(pipeline: Any) -> Tuple[Any, Any]:
+    """Sépare un pipeline (ou un tuple) en (vectoriseur, modèle)."""
+    if isinstance(pipeline, (tuple, list)) and len(pipeline) == 2:
+        return pipeline[0], pipeline[1]
+    if hasattr(pipeline, "steps") and len(pipeline.steps) == 2:
+        return pipeline.steps[0][1], pipeline.steps[1][1]
+    raise ValueError(
+        "Pipeline non supporté: attendu (vectoriseur TF-IDF, modèle) en deux étapes"
+    )
+
+
+def _export_vectorizer(vectorizer: Any) -> Dict[str, np.ndarray]:
+    """Extrait les paramètres d'inférence d'un TfidfVectorizer entraîné."""
+    if not hasattr(vectorizer, "vocabulary_"):
+        raise ValueError(f"{type(vectorizer).__name__} n'est pas un vectoriseur entraîné")
+    if getattr(vectorizer, "analyzer", "word") != "word":
+        raise ValueError("Seul analyzer='word' est supporté")
+    if getattr(vectorizer, "tokenizer", None) is not None or getattr(vectorizer, "preprocessor", None) is not None:
+        raise ValueError("Les tokenizers/préprocesseurs personnalisés ne sont pas exportables")
+    if getattr(vectorizer, "binary", False):
+        raise ValueError("binary=True n'est pas supporté")
+
+    vocabulary = vectorizer.vocabulary_
+    terms = np.empty(len(vocabulary), dtype=object)
+    for term, index in vocabulary.items():
+        terms[index] = term
+
+    use_idf = getattr(vectorizer, "use_idf", True)
+    stop_words = vectorizer.get_stop_words() if hasattr(vectorizer, "get_stop_words") else None
+
+    return {
+        "terms": terms.astype(str),
+        "idf": np.asarray(vectorizer.idf_, dtype=np.float32) if use_idf else np.ones(len(terms), dtype=np.float32),
+        "stop_words": np.array(sorted(stop_words or []), dtype=str),
+        "token_pattern": np.array(vectorizer.token_pattern or DEFAULT_TOKEN_PATTERN),
+        "lowercase": np.array(bool(vectorizer.lowercase)),
+        "strip_accents": np.array(vectorizer.strip_accents or ""),
+        "ngram_range": np.array(vectorizer.ngram_range, dtype=np.int64),
+        "sublinear_tf": np.array(bool(getattr(vectorizer, "sublinear_tf", False))),
+        "norm": np.array(getattr(vectorizer, "norm", "l2") or ""),
+    }
+
+
+def _export_model(model: Any, weights_dtype: str) -> Dict[str, np.ndarray]:
+    """Extrait les poids d'un modèle linéaire ou à centroïdes."""
+    arrays = {"classes": np.asarray(model.classes_).astype(str)}
+
+    if hasattr(model, "coef_"):
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        intercept = np.asarray(getattr(model, "intercept_", np.zeros(coef.shape[0])), dtype=np.float64)
+        if coef.shape[0] == 1 and len(arrays["classes"]) == 2:
+            # Cas binaire sklearn: une seule ligne de coefficients
+            coef = np.vstack([-coef, coef])
+            intercept = np.concatenate([-intercept, intercept])
+        arrays["model_kind"] = np.array(MODEL_KIND_LINEAR)
+        arrays["intercept"] = intercept.astype(np.float32)
+
+        if weights_dtype == "float32":
+            arrays["coef"] = coef.astype(np.float32)
+        else:
+            quantized = quantize_linear_weights(coef, intercept, dtype=weights_dtype)
+            arrays["coef"] = quantized.values
+            if quantized.scales is not None:
+                arrays["coef_scales"] = quantized.scales
+        return arrays
+
+    if hasattr(model, "centroids_"):
+        if getattr(model, "metric", "euclidean") != "euclidean":
+            raise ValueError("Seule la métrique euclidienne est supportée pour les centroïdes")
+        centroids = np.asarray(model.centroids_, dtype=np.float32)
+        arrays["model_kind"] = np.array(MODEL_KIND_CENTROID)
+        arrays["centroids"] = centroids
+        arrays["centroid_sq_norms"] = (centroids.astype(np.float64) ** 2).sum(axis=1).astype(np.float32)
+        return arrays
+
+    raise ValueError(
+        f"{type(model).__name__} non supporté: attendu un modèle linéaire (coef_) "
+        "ou à centroïdes (centroids_)"
+    )
+
+
+def export_text_pipeline(
+    pipeline: Any,
+    path: Union[str, Path],
+    weights_dtype: str = "float32"
+) -> Path:
+    """
+    Exporte un pipeline TF-IDF + modèle entraîné vers un bundle .npz.
+
+    Args:
+        pipeline: Pipeline sklearn à deux étapes, ou tuple (vectoriseur, modèle).
+            Modèles supportés: linéaires (LinearSVC, LogisticRegression,
+            SGDClassifier...) et NearestCentroid
+        path: Fichier .npz de sortie
+        weights_dtype: Précision des poids linéaires ("float32", "float16", "int8")
+
+    Returns:
+        Chemin du bundle écrit
+
+    Raises:
+        ValueError: Si le pipeline utilise un composant non exportable
+    """
+    if weights_dtype not in ("float32", "float16", "int8"):
+        raise ValueError(f"weights_dtype non supporté: {weights_dtype}")
+
+    vectorizer, model = _split_pipeline(pipeline)
+    arrays = {"format_version": np.array(BUNDLE_FORMAT_VERSION)}
+    arrays.update(_export_vectorizer(vectorizer))
+    arrays.update(_export_model(model, weights_dtype))
+
+    n_features = len(arrays["terms"])
+    weights = arrays.get("coef", arrays.get("centroids"))
+    if weights.shape[1] != n_features:
+        raise ValueError(
+            f"Le modèle attend {weights.shape[1]} features, le vocabulaire en a {n_features}"
+        )
+
+    path = Path(path)
+    np.savez(path, **arrays)
+    return path
+
+
+# =============================================================================
+# Inférence NumPy pure
+# =============================================================================
+class NumpyTextClassifier(BaseClassifier):
+    """
+    Classifieur texte exécutant un pipeline TF-IDF exporté avec NumPy seul.
+
+    Reproduit le prétraitement de TfidfVectorizer (minuscules, accents,
+    tokenisation regex, stop words, n-grammes, tf sous-linéaire, IDF,
+    normalisation) sur une représentation creuse (indices, valeurs), puis
+    applique le modèle sur les seules colonnes actives.
+    """
+
+    def __init__(self, bundle_path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            bundle_path: Bundle .npz à charger immédiatement (optionnel)
+        """
+        self._ready = False
+        if bundle_path is not None:
+            self.load_model(str(bundle_path))
+
+    # -------------------------------------------------------------------------
+    # Chargement
+    # -------------------------------------------------------------------------
+    def load_model(self, path: str) -> None:
+        """
+        Charge un bundle produit par export_text_pipeline().
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas
+            RuntimeError: Si le bundle est invalide
+        """
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Bundle introuvable: {path}")
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {key: data[key] for key in data.files}
+        except Exception as e:
+            raise RuntimeError(f"Impossible de charger le bundle {path}: {e}")
+
+        version = int(arrays.get("format_version", -1))
+        if version != BUNDLE_FORMAT_VERSION:
+            raise RuntimeError(f"Version de bundle non supportée: {version}")
+
+        self._vocabulary = {str(term): index for index, term in enumerate(arrays["terms"])}
+        self._idf = arrays["idf"].astype(np.float32)
+        self._stop_words = frozenset(str(word) for word in arrays["stop_words"])
+        self._token_re = re.compile(str(arrays["token_pattern"]))
+        self._lowercase = bool(arrays["lowercase"])
+        self._strip_accents = str(arrays["strip_accents"])
+        self._ngram_range = tuple(int(n) for n in arrays["ngram_range"])
+        self._sublinear_tf = bool(arrays["sublinear_tf"])
+        self._norm = str(arrays["norm"])
+
+        self._model_kind = str(arrays["model_kind"])
+        if self._model_kind == MODEL_KIND_LINEAR:
+            self._coef = arrays["coef"]
+            self._coef_scales = arrays.get("coef_scales")
+            self._intercept = arrays["intercept"].astype(np.float32)
+        elif self._model_kind == MODEL_KIND_CENTROID:
+            self._centroids = arrays["centroids"]
+            self._centroid_sq_norms = arrays["centroid_sq_norms"]
+        else:
+            raise RuntimeError(f"Type de modèle inconnu: {self._model_kind}")
+
+        stat = Path(path).stat()
+        self.model_version = f"{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+        # Colonne de chaque classe du modèle dans les 27 catégories
+        self._classes = [str(code) for code in arrays["classes"]]
+        self._class_columns = np.array([
+            self.CATEGORY_CODES.index(code) if code in self.CATEGORY_CODES else -1
+            for code in self._classes
+        ])
+        self._ready = True
+
+    @property
+    def is_ready(self) -> bool:
+        """Prêt une fois un bundle chargé."""
+        return self._ready
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Nombre de termes du vocabulaire."""
+        return len(self._vocabulary) if self._ready else 0
+
+    # -------------------------------------------------------------------------
+    # Vectorisation TF-IDF
+    # -------------------------------------------------------------------------
+    def _preprocess(self, text: str) -> str:
+        if self._lowercase:
+            text = text.lower()
+        if self._strip_accents == "unicode":
+            text = "".join(
+                c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)
+            )
+        elif self._strip_accents == "ascii":
+            text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+        return text
+
+    def _analyze(self, text: str) -> List[str]:
+        """Tokenise et génère les n-grammes comme TfidfVectorizer."""
+        tokens = self._token_re.findall(self._preprocess(text))
+        if self._stop_words:
+            tokens = [token for token in tokens if token not in self._stop_words]
+
+        min_n, max_n = self._ngram_range
+        if max_n == 1:
+            return tokens
+
+        terms = tokens[:] if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcule la représentation TF-IDF creuse d'un texte.
+
+        Returns:
+            Tuple (indices, valeurs) des colonnes non nulles
+        """
+        counts = Counter(
+            self._vocabulary[term] for term in self._analyze(text) if term in self._vocabulary
+        )
+        if not counts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+
+        if self._sublinear_tf:
+            values = 1.0 + np.log(values)
+        values = values * self._idf[indices]
+
+        if self._norm == "l2":
+            norm = np.sqrt(np.dot(values, values))
+        elif self._norm == "l1":
+            norm = np.abs(values).sum()
+        else:
+            norm = 0.0
+        if norm > 0:
+            values = values / norm
+
+        return indices, values
+
+    # -------------------------------------------------------------------------
+    # Prédiction
+    # -------------------------------------------------------------------------
+    def decision_scores(self, text: str) -> np.ndarray:
+        """
+        Scores bruts du modèle pour chaque classe du bundle.
+
+        Linéaire: scores de décision. Centroïdes: distances euclidiennes
+        au carré négatives (plus grand = plus proche).
+        """
+        if not self._ready:
+            raise RuntimeError("Aucun bundle chargé")
+
+        indices, values = self.vectorize(text)
+
+        if self._model_kind == MODEL_KIND_LINEAR:
+            scores = self._coef[:, indices].astype(np.float32) @ values
+            if self._coef_scales is not None:
+                scores *= self._coef_scales
+            return scores + self._intercept
+
+        dot = self._centroids[:, indices].astype(np.float32) @ values
+        sq_norm = np.dot(values, values)
+        return -(sq_norm - 2.0 * dot + self._centroid_sq_norms)
+
+    def predict(
+        self,
+        image: Optional[Image.Image] = None,
+        text: Optional[str] = None,
+        top_k: int = 5
+    ) -> ClassificationResult:
+        """Prédit la catégorie d'un texte (l'image est ignorée)."""
+        self._validate_inputs(image, text, require_text=True)
+        if not self._ready:
+            raise RuntimeError("Aucun bundle chargé")
+
+        class_probabilities = softmax(self.decision_scores(text))
+
+        probabilities = np.zeros(self.NUM_CLASSES)
+        known = self._class_columns >= 0
+        probabilities[self._class_columns[known]] = class_probabilities[known]
+
+        return self._result_from_probabilities(probabilities, top_k, source="numpy_text")
@@ -0,0 +1,306 @@
+"""
+Cache de prédictions partagé par le processus Streamlit.
+
+Chaque session Streamlit possède son propre classifieur: un même produit
+soumis par deux utilisateurs est recalculé deux fois. Ce module fournit:
+- PredictionCache: cache LRU borné en taille, avec durée de vie (TTL),
+  thread-safe (les scripts Streamlit tournent dans des threads distincts)
+- CachedClassifier: BaseClassifier qui consulte le cache avant de
+  déléguer au classifieur enveloppé
+- get_shared_prediction_cache(): instance unique du processus
+
+La clé combine l'identité du modèle (model_identity), un hash du texte
+et l'empreinte des pixels de l'image: changer de modèle invalide
+naturellement les entrées existantes.
+
+Usage:
+    classifier = CachedClassifier(DemoClassifier())
+    result = classifier.predict(text="console playstation 5")
+"""
+import copy
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from PIL import Image
+
+from .image_utils import compute_image_digest
+from .model_interface import BaseClassifier, ClassificationResult
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import MODEL_CONFIG
+
+
+# =============================================================================
+# Clés de cache
+# =============================================================================
+def hash_text(text: Optional[str]) -> Optional[str]:
+    """
+    Hash compact d'un texte (None si absent ou vide).
+
+    Args:
+        text: Texte déjà prétraité
+
+    Returns:
+        Empreinte hexadécimale blake2b de 16 octets
+    """
+    if text is None or text.strip() == "":
+        return None
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def make_cache_key(
+    model_identity: str,
+    image: Optional[Image.Image] = None,
+    text: Optional[str] = None,
+    top_k: int = 5
+) -> Tuple[str, Optional[str], Optional[str], int]:
+    """
+    Construit la clé de cache d'une prédiction.
+
+    Args:
+        model_identity: Identité du modèle (BaseClassifier.model_identity)
+        image: Image PIL (optionnelle)
+        text: Texte (optionnel)
+        top_k: Nombre de prédictions demandées
+
+    Returns:
+        Tuple (identité, hash texte, empreinte image, top_k)
+    """
+    image_digest = compute_image_digest(image) if image is not None else None
+    return (model_identity, hash_text(text), image_digest, top_k)
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+class PredictionCache:
+    """
+    Cache LRU thread-safe avec durée de vie des entrées.
+
+    Une entrée expirée est supprimée au moment où elle est lue; quand le
+    nombre d'entrées dépasse max_entries, la moins récemment utilisée est
+    évincée.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_s: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: Nombre maximal d'entrées.
+                Par défaut: MODEL_CONFIG["prediction_cache_size"]
+            ttl_s: Durée de vie d'une entrée en secondes.
+                Par défaut: MODEL_CONFIG["prediction_cache_ttl_s"]
+                (None dans la config = pas d'expiration)
+            clock: Horloge monotone (injectable pour les tests)
+        """
+        if max_entries is None:
+            max_entries = MODEL_CONFIG["prediction_cache_size"]
+        if ttl_s is None:
+            ttl_s = MODEL_CONFIG["prediction_cache_ttl_s"]
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        if ttl_s is not None and ttl_s <= 0:
+            raise ValueError(f"ttl_s must be > 0, got {ttl_s}")
+
+        self._max_entries = max_entries
+        self._ttl_s = ttl_s
+        self._clock = clock
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, ClassificationResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> Optional[ClassificationResult]:
+        """Retourne le résultat en cache, ou None (absent ou expiré)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, result = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def put(self, key: Hashable, result: ClassificationResult) -> None:
+        """Ajoute (ou remplace) une entrée puis applique la borne de taille."""
+        expires_at = self._clock() + self._ttl_s if self._ttl_s is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, model_identity: Optional[str] = None) -> int:
+        """
+        Supprime des entrées.
+
+        Args:
+            model_identity: Si fourni, seules les entrées de ce modèle sont
+                supprimées; sinon le cache est vidé
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._lock:
+            if model_identity is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+
+            keys = [
+                key for key in self._entries
+                if isinstance(key, tuple) and key and key[0] == model_identity
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du cache.
+
+        Returns:
+            Dict avec hits, misses, hit_rate, evictions, expirations,
+            size, max_entries et ttl_s
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_s": self._ttl_s,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# =============================================================================
+# Classifieur avec cache
+# =============================================================================
+class CachedClassifier(BaseClassifier):
+    """
+    Enveloppe un classifieur avec un PredictionCache.
+
+    Chaque appel retourne une copie du résultat en cache: un appelant qui
+    modifie son résultat n'affecte pas les autres sessions.
+    """
+
+    def __init__(
+        self,
+        classifier: BaseClassifier,
+        cache: Optional[PredictionCache] = None,
+        text_preprocessor: Optional[Callable[[str], str]] = None
+    ):
+        """
+        Args:
+            classifier: Classifieur enveloppé
+            cache: Cache à utiliser (par défaut: cache partagé du processus)
+            text_preprocessor: Normalisation appliquée au texte avant le
+                hash (ex: preprocess_product_text). Par défaut le texte est
+                hashé tel quel, ce qui est sûr pour tout classifieur
+        """
+        self._classifier = classifier
+        self._cache = cache if cache is not None else get_shared_prediction_cache()
+        self._text_preprocessor = text_preprocessor
+
+    def predict(
+        self,
+        image: Optional[Image.Image] = None,
+        text: Optional[str] = None,
+        top_k: int = 5,
+        **predict_kwargs
+    ) -> ClassificationResult:
+        """
+        Retourne le résultat en cache ou le calcule puis le met en cache.
+
+        predict_kwargs (ex: deadline_ms d'un MultimodalClassifier) sont
+        transmis au classifieur enveloppé sans entrer dans la clé: seuls
+        les résultats complets sont mis en cache.
+        """
+        key_text = text
+        if text is not None and self._text_preprocessor is not None:
+            key_text = self._text_preprocessor(text)
+        key = make_cache_key(self._classifier.model_identity, image, key_text, top_k)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        result = self._classifier.predict(image=image, text=text, top_k=top_k, **predict_kwargs)
+        if not result.is_partial:
+            # Un résultat dégradé ne doit pas masquer le résultat complet
+            self._cache.put(key, copy.deepcopy(result))
+        return result
+
+    def load_model(self, path: str) -> None:
+        """Délègue le chargement au classifieur enveloppé."""
+        self._classifier.load_model(path)
+
+    @property
+    def is_ready(self) -> bool:
+        return self._classifier.is_ready
+
+    @property
+    def model_identity(self) -> str:
+        """Le cache ne change pas les prédictions: identité du modèle enveloppé."""
+        return self._classifier.model_identity
+
+    @property
+    def classifier(self) -> BaseClassifier:
+        """Classifieur enveloppé."""
+        return self._classifier
+
+    @property
+    def cache(self) -> PredictionCache:
+        """Cache utilisé."""
+        return self._cache
+
+
+# =============================================================================
+# Cache partagé par le processus
+# =============================================================================
+_shared_cache: Optional[PredictionCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_prediction_cache() -> PredictionCache:
+    """Retourne le cache de prédictions partagé (créé au premier appel)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = PredictionCache()
+        return _shared_cache
@@ -0,0 +1,279 @@
+"""
+Quantification des poids des modèles linéaires (SVM linéaire, régression
+logistique...).
+
+Les matrices de coefficients (27x10000 sur TF-IDF, 27x2048/4096 sur les
+features ResNet50/VGG16) sont stockées en float64. Ce module:
+- Quantifie les poids en float16 ou en int8 avec une échelle par classe
+- Sauvegarde/charge les poids quantifiés au format .npz
+- Calcule les scores de décision directement depuis les poids quantifiés
+- Mesure l'accord top-1 avec le modèle pleine précision
+
+Gain mémoire: 4x en float16, 8x en int8 par rapport au float64.
+
+Usage:
+    weights = quantize_linear_weights(svm.coef_, svm.intercept_, dtype="int8")
+    save_quantized_weights(weights, "models/svm_int8.npz")
+    scores = load_quantized_weights("models/svm_int8.npz").decision_function(X)
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+
+# Types de quantification supportés
+QUANTIZATION_DTYPES = ("float16", "int8")
+
+# Valeur maximale représentable en int8 symétrique
+INT8_MAX = 127
+
+# Nombre de colonnes de poids converties en float32 à la fois par decision_function()
+DECISION_BLOCK_FEATURES = 2048
+
+
+@dataclass
+class QuantizedLinearWeights:
+    """
+    Poids d'un modèle linéaire multi-classes en précision réduite.
+
+    Attributes:
+        values: Coefficients quantifiés, shape (n_classes, n_features),
+            en int8 ou float16
+        intercept: Biais par classe, shape (n_classes,), en float32
+        dtype: Type de quantification ("int8" ou "float16")
+        scales: Échelle par classe (int8 uniquement), shape (n_classes,):
+            coef ≈ values * scales[:, None]
+    """
+    values: np.ndarray
+    intercept: np.ndarray
+    dtype: str
+    scales: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        """Validation des données après initialisation."""
+        if self.dtype not in QUANTIZATION_DTYPES:
+            raise ValueError(f"dtype must be one of {QUANTIZATION_DTYPES}, got {self.dtype}")
+        if self.dtype == "int8" and self.scales is None:
+            raise ValueError("int8 weights require per-class scales")
+        if self.values.ndim != 2 or self.intercept.shape != (self.values.shape[0],):
+            raise ValueError(
+                f"Incompatible shapes: values {self.values.shape}, intercept {self.intercept.shape}"
+            )
+
+    @property
+    def n_classes(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def n_features(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les poids quantifiés (octets)."""
+        total = self.values.nbytes + self.intercept.nbytes
+        if self.scales is not None:
+            total += self.scales.nbytes
+        return total
+
+    def dequantize(self) -> np.ndarray:
+        """Reconstruit les coefficients en float32."""
+        values = self.values.astype(np.float32)
+        if self.scales is not None:
+            values *= self.scales[:, None]
+        return values
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        """
+        Calcule les scores de décision par blocs de features.
+
+        Les poids ne sont convertis en float32 que par tranches de
+        DECISION_BLOCK_FEATURES colonnes: la copie temporaire reste bornée
+        à n_classes x DECISION_BLOCK_FEATURES flottants, quelle que soit la
+        taille du vocabulaire. Pour int8, l'échelle par classe est
+        appliquée après le produit: (X @ values.T) * scales + intercept.
+
+        Args:
+            X: Features de shape (n_samples, n_features) ou (n_features,),
+                array numpy ou matrice creuse scipy
+
+        Returns:
+            Scores de shape (n_samples, n_classes)
+        """
+        if isinstance(X, np.ndarray):
+            if X.ndim == 1:
+                X = X[None, :]
+            X = X.astype(np.float32, copy=False)
+
+        n_features = self.n_features
+        scores = np.zeros((X.shape[0], self.n_classes), dtype=np.float32)
+        for start in range(0, n_features, DECISION_BLOCK_FEATURES):
+            stop = min(start + DECISION_BLOCK_FEATURES, n_features)
+            block = self.values[:, start:stop].astype(np.float32).T
+            X_block = X if (start, stop) == (0, n_features) else X[:, start:stop]
+            scores += np.asarray(X_block @ block, dtype=np.float32)
+        if self.scales is not None:
+            scores *= self.scales
+        return scores + self.intercept
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Probabilités par softmax des scores de décision."""
+        return softmax(self.decision_function(X))
+
+    def predict(self, X: Any) -> np.ndarray:
+        """Indices des classes prédites."""
+        return np.argmax(self.decision_function(X), axis=1)
+
+
+def softmax(scores: np.ndarray) -> np.ndarray:
+    """Softmax numériquement stable ligne par ligne."""
+    shifted = scores - scores.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def quantize_linear_weights(
+    coef: np.ndarray,
+    intercept: Optional[np.ndarray] = None,
+    dtype: str = "int8"
+) -> QuantizedLinearWeights:
+    """
+    Quantifie les coefficients d'un modèle linéaire.
+
+    En int8, la quantification est symétrique avec une échelle par classe
+    (max(|coef|) de la ligne / 127), ce qui préserve la dynamique de
+    chaque classe indépendamment des autres.
+
+    Args:
+        coef: Coefficients de shape (n_classes, n_features)
+        intercept: Biais de shape (n_classes,) (par défaut: zéros)
+        dtype: "int8" ou "float16"
+
+    Returns:
+        QuantizedLinearWeights
+    """
+    if dtype not in QUANTIZATION_DTYPES:
+        raise ValueError(f"dtype must be one of {QUANTIZATION_DTYPES}, got {dtype}")
+
+    coef = np.asarray(coef, dtype=np.float64)
+    if coef.ndim != 2:
+        raise ValueError(f"Expected 2D coefficients, got shape {coef.shape}")
+
+    if intercept is None:
+        intercept = np.zeros(coef.shape[0])
+    intercept = np.asarray(intercept, dtype=np.float32).reshape(coef.shape[0])
+
+    if dtype == "float16":
+        return QuantizedLinearWeights(
+            values=coef.astype(np.float16),
+            intercept=intercept,
+            dtype=dtype,
+        )
+
+    max_abs = np.abs(coef).max(axis=1)
+    # Une ligne nulle garde une échelle de 1 pour éviter la division par zéro
+    scales = np.where(max_abs > 0, max_abs / INT8_MAX, 1.0)
+    values = np.clip(np.rint(coef / scales[:, None]), -INT8_MAX, INT8_MAX).astype(np.int8)
+
+    return QuantizedLinearWeights(
+        values=values,
+        intercept=intercept,
+        dtype=dtype,
+        scales=scales.astype(np.float32),
+    )
+
+
+def quantize_sklearn_model(model: Any, dtype: str = "int8") -> QuantizedLinearWeights:
+    """
+    Quantifie un estimateur linéaire scikit-learn entraîné.
+
+    Args:
+        model: Estimateur exposant coef_ et intercept_ (LinearSVC,
+            LogisticRegression, SGDClassifier, RidgeClassifier...)
+        dtype: "int8" ou "float16"
+    """
+    if not hasattr(model, "coef_"):
+        raise ValueError(f"{type(model).__name__} n'expose pas de coef_ (modèle non linéaire ?)")
+    intercept = getattr(model, "intercept_", None)
+    return quantize_linear_weights(model.coef_, intercept, dtype=dtype)
+
+
+def save_quantized_weights(weights: QuantizedLinearWeights, path: Union[str, Path]) -> None:
+    """Sauvegarde des poids quantifiés au format .npz (sans pickle)."""
+    arrays = {
+        "values": weights.values,
+        "intercept": weights.intercept,
+        "dtype": np.array(weights.dtype),
+    }
+    if weights.scales is not None:
+        arrays["scales"] = weights.scales
+    np.savez(path, **arrays)
+
+
+def load_quantized_weights(path: Union[str, Path]) -> QuantizedLinearWeights:
+    """
+    Charge des poids quantifiés sauvegardés par save_quantized_weights().
+
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(f"Poids quantifiés introuvables: {path}")
+
+    with np.load(path, allow_pickle=False) as data:
+        return QuantizedLinearWeights(
+            values=data["values"],
+            intercept=data["intercept"],
+            dtype=str(data["dtype"]),
+            scales=data["scales"] if "scales" in data else None,
+        )
+
+
+def top1_agreement(reference_scores: np.ndarray, quantized_scores: np.ndarray) -> float:
+    """Fraction des échantillons dont la classe top-1 est identique."""
+    return float(np.mean(
+        np.argmax(reference_scores, axis=1) == np.argmax(quantized_scores, axis=1)
+    ))
+
+
+def evaluate_quantization(
+    coef: np.ndarray,
+    intercept: Optional[np.ndarray],
+    X: Any,
+    dtype: str = "int8"
+) -> Dict[str, Any]:
+    """
+    Compare un modèle quantifié au modèle pleine précision sur des données.
+
+    Args:
+        coef: Coefficients pleine précision (n_classes, n_features)
+        intercept: Biais (n_classes,)
+        X: Échantillon de features représentatif, shape (n_samples,
+            n_features) ou (n_features,) pour un échantillon unique
+        dtype: "int8" ou "float16"
+
+    Returns:
+        Dict avec accord top-1, erreur max sur les scores, mémoire
+        pleine précision/quantifiée (octets) et ratio de compression
+    """
+    coef = np.asarray(coef, dtype=np.float64)
+    if isinstance(X, np.ndarray) and X.ndim == 1:
+        X = X[None, :]
+    if intercept is None:
+        intercept = np.zeros(coef.shape[0])
+
+    quantized = quantize_linear_weights(coef, intercept, dtype=dtype)
+    reference_scores = np.asarray(X @ coef.T) + np.asarray(intercept, dtype=np.float64)
+    quantized_scores = quantized.decision_function(X)
+
+    full_bytes = coef.nbytes + np.asarray(intercept, dtype=np.float64).nbytes
+    return {
+        "dtype": dtype,
+        "top1_agreement": top1_agreement(reference_scores, quantized_scores),
+        "max_abs_score_error": float(np.abs(reference_scores - quantized_scores).max()),
+        "full_precision_bytes": full_bytes,
+        "quantized_bytes": quantized.nbytes,
+        "compression_ratio": full_bytes / quantized.nbytes,
+    }
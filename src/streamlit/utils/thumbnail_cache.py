@@ -0,0 +1,331 @@
+"""
+Cache des miniatures et aperçus, indexé par le contenu de l'image.
+
+create_thumbnail() copie l'image complète puis la réduit en LANCZOS à
+chaque appel, et Streamlit ré-exécute la page à chaque interaction: le
+même aperçu est recalculé à chaque rerun. Le ThumbnailCache:
+- Indexe chaque miniature par l'empreinte exacte des pixels
+  (compute_image_digest) et la taille demandée
+- Garde les miniatures récentes en mémoire (LRU borné en entrées)
+- Les écrit aussi sur disque (PNG), avec éviction des fichiers les moins
+  récemment utilisés au-delà d'une taille totale maximale: les aperçus
+  survivent au redémarrage de l'application et sont partagés entre processus
+
+Pour un fichier uploadé, get_upload_thumbnail() indexe la miniature par
+l'empreinte des octets du fichier: à chaque rerun, Streamlit relit
+l'upload, et un accès au cache ne décode ni ne hashe aucun pixel.
+
+Usage:
+    cache = get_shared_thumbnail_cache()
+    st.image(cache.get_upload_thumbnail(uploaded_file, (400, 400)), width=200)
+    st.image(cache.get_thumbnail(image, (400, 400)), width=200)
+"""
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PIL import Image
+
+from .image_utils import compute_image_digest, create_thumbnail, load_image_from_upload
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import IMAGE_CONFIG, THUMBNAIL_CACHE_DIR
+
+
+def make_thumbnail_key(image: Image.Image, max_size: Tuple[int, int]) -> str:
+    """
+    Clé d'une miniature: empreinte du contenu, taille maximale et niveau de
+    rééchantillonnage d'affichage (changer ce niveau invalide le cache disque).
+    """
+    return _format_key(compute_image_digest(image), max_size)
+
+
+def _format_key(digest: str, max_size: Tuple[int, int]) -> str:
+    quality = IMAGE_CONFIG["display_resample_quality"]
+    return f"{digest}_{int(max_size[0])}x{int(max_size[1])}_{quality}"
+
+
+def _read_upload_bytes(uploaded_file) -> bytes:
+    """Octets bruts d'un UploadedFile Streamlit, d'un chemin ou d'un flux binaire."""
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        return Path(uploaded_file).read_bytes()
+    position = uploaded_file.tell()
+    try:
+        uploaded_file.seek(0)
+        return uploaded_file.read()
+    finally:
+        uploaded_file.seek(position)
+
+
+def make_upload_key(uploaded_file, max_size: Tuple[int, int]) -> str:
+    """
+    Clé de la miniature d'un fichier uploadé, calculée sur les octets du
+    fichier (sans décodage): le même upload donne la même clé à chaque rerun.
+    """
+    digest = hashlib.blake2b(_read_upload_bytes(uploaded_file), digest_size=16).hexdigest()
+    return _format_key(f"file-{digest}", max_size)
+
+
+class ThumbnailCache:
+    """
+    Cache thread-safe à deux niveaux (mémoire puis disque) de miniatures.
+
+    Les miniatures retournées sont partagées entre appelants et ne doivent
+    pas être modifiées.
+    """
+
+    def __init__(
+        self,
+        max_memory_entries: Optional[int] = None,
+        disk_dir: Optional[Path] = None,
+        max_disk_mb: Optional[float] = None
+    ):
+        """
+        Args:
+            max_memory_entries: Nombre maximal de miniatures en mémoire.
+                Par défaut: IMAGE_CONFIG["thumbnail_cache_entries"]
+            disk_dir: Dossier du cache disque. Par défaut: config.THUMBNAIL_CACHE_DIR
+            max_disk_mb: Taille maximale du cache disque (0 = pas de disque).
+                Par défaut: IMAGE_CONFIG["thumbnail_cache_disk_mb"]
+        """
+        if max_memory_entries is None:
+            max_memory_entries = IMAGE_CONFIG["thumbnail_cache_entries"]
+        if disk_dir is None:
+            disk_dir = THUMBNAIL_CACHE_DIR
+        if max_disk_mb is None:
+            max_disk_mb = IMAGE_CONFIG["thumbnail_cache_disk_mb"]
+        if max_memory_entries < 1:
+            raise ValueError(f"max_memory_entries must be >= 1, got {max_memory_entries}")
+        if max_disk_mb < 0:
+            raise ValueError(f"max_disk_mb must be >= 0, got {max_disk_mb}")
+
+        self._max_memory_entries = max_memory_entries
+        self._disk_dir = Path(disk_dir)
+        self._max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+
+        self._memory: "OrderedDict[str, Image.Image]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._disk_evictions = 0
+        self._disk_bytes = self._scan_disk()
+
+    # -------------------------------------------------------------------------
+    # API
+    # -------------------------------------------------------------------------
+    def get_thumbnail(
+        self,
+        image: Image.Image,
+        max_size: Tuple[int, int] = (150, 150)
+    ) -> Image.Image:
+        """
+        Retourne la miniature de l'image (mémoire, disque, sinon calculée).
+
+        Args:
+            image: Image PIL source
+            max_size: Taille maximale de la miniature
+
+        Returns:
+            Image PIL miniature (partagée: ne pas modifier)
+        """
+        return self._get(make_thumbnail_key(image, max_size), lambda: create_thumbnail(image, max_size))
+
+    def get_upload_thumbnail(
+        self,
+        uploaded_file,
+        max_size: Tuple[int, int] = (150, 150)
+    ) -> Image.Image:
+        """
+        Retourne la miniature d'un fichier uploadé.
+
+        La clé porte sur les octets du fichier: en cas de succès (mémoire
+        ou disque), l'image n'est pas décodée. Sinon elle est ouverte sans
+        décodage préalable, et la réduction d'un JPEG se fait au décodage
+        (draft) vers la taille de la miniature.
+
+        Args:
+            uploaded_file: Objet UploadedFile de Streamlit (ou chemin / flux binaire)
+            max_size: Taille maximale de la miniature
+
+        Returns:
+            Image PIL miniature (partagée: ne pas modifier)
+
+        Raises:
+            ValueError: Si le fichier n'est pas une image valide
+        """
+        def compute() -> Image.Image:
+            image = load_image_from_upload(uploaded_file, draft_size=max_size)
+            return create_thumbnail(image, max_size)
+
+        return self._get(make_upload_key(uploaded_file, max_size), compute)
+
+    def _get(self, key: str, compute: Callable[[], Image.Image]) -> Image.Image:
+        """Cherche la clé en mémoire puis sur disque, sinon calcule et mémorise."""
+        with self._lock:
+            thumbnail = self._memory.get(key)
+            if thumbnail is not None:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return thumbnail
+
+        thumbnail = self._read_disk(key)
+        if thumbnail is not None:
+            with self._lock:
+                self._disk_hits += 1
+                self._remember(key, thumbnail)
+            return thumbnail
+
+        thumbnail = compute()
+        with self._lock:
+            self._misses += 1
+            self._remember(key, thumbnail)
+        self._write_disk(key, thumbnail)
+        return thumbnail
+
+    def clear(self, disk: bool = False) -> None:
+        """
+        Vide le niveau mémoire (et le niveau disque si disk=True), et remet
+        les compteurs à zéro.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._memory_hits = self._disk_hits = self._misses = self._disk_evictions = 0
+            if disk:
+                for path in self._disk_files():
+                    path.unlink(missing_ok=True)
+                self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du cache.
+
+        Returns:
+            Dict avec memory_hits, disk_hits, misses, hit_rate, memory_size,
+            disk_bytes, disk_evictions et max_disk_bytes
+        """
+        with self._lock:
+            lookups = self._memory_hits + self._disk_hits + self._misses
+            return {
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": (self._memory_hits + self._disk_hits) / lookups if lookups else 0.0,
+                "memory_size": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+                "disk_evictions": self._disk_evictions,
+                "max_disk_bytes": self._max_disk_bytes,
+            }
+
+    # -------------------------------------------------------------------------
+    # Niveau mémoire
+    # -------------------------------------------------------------------------
+    def _remember(self, key: str, thumbnail: Image.Image) -> None:
+        """Ajoute au niveau mémoire (appelé sous le verrou)."""
+        self._memory[key] = thumbnail
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory_entries:
+            self._memory.popitem(last=False)
+
+    # -------------------------------------------------------------------------
+    # Niveau disque
+    # -------------------------------------------------------------------------
+    @property
+    def _disk_enabled(self) -> bool:
+        return self._max_disk_bytes > 0
+
+    def _disk_path(self, key: str) -> Path:
+        return self._disk_dir / f"{key}.png"
+
+    def _disk_files(self):
+        if not self._disk_dir.is_dir():
+            return []
+        return list(self._disk_dir.glob("*.png"))
+
+    def _scan_disk(self) -> int:
+        total = 0
+        for path in self._disk_files():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _read_disk(self, key: str) -> Optional[Image.Image]:
+        if not self._disk_enabled:
+            return None
+        path = self._disk_path(key)
+        try:
+            with Image.open(path) as stored:
+                thumbnail = stored.copy()
+            # Date d'accès utilisée par l'éviction LRU
+            os.utime(path)
+            return thumbnail
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, thumbnail: Image.Image) -> None:
+        """Écrit la miniature (écriture atomique) puis applique la borne de taille."""
+        if not self._disk_enabled:
+            return
+        path = self._disk_path(key)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            thumbnail.save(tmp_path, format="PNG")
+            size = tmp_path.stat().st_size
+            os.replace(tmp_path, path)
+        except OSError:
+            # Disque en lecture seule ou plein: le niveau mémoire suffit
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._disk_bytes += size
+            if self._disk_bytes > self._max_disk_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Supprime les fichiers les moins récemment utilisés (appelé sous le verrou)."""
+        entries = []
+        for path in self._disk_files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self._max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self._disk_evictions += 1
+        self._disk_bytes = total
+
+
+# =============================================================================
+# Cache partagé par le processus
+# =============================================================================
+_shared_cache: Optional[ThumbnailCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_thumbnail_cache() -> ThumbnailCache:
+    """Retourne le cache de miniatures partagé (créé au premier appel)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ThumbnailCache()
+        return _shared_cache
@@ -0,0 +1,288 @@
+"""
+Préchauffage des modèles en arrière-plan au démarrage de l'application.
+
+Sans préchauffage, le premier utilisateur paie le chargement des modèles
+et les caches froids de la première inférence. Ce module:
+- Charge les modèles configurés dans un thread d'arrière-plan
+- Exécute des prédictions synthétiques sur chaque branche (texte, image,
+  multimodal) pour chauffer allocateurs et caches
+- Expose l'état via is_ready, pour que les pages affichent
+  "préchauffage en cours" au lieu de bloquer
+
+Le préchauffeur et son registre sont partagés par tout le processus:
+toutes les sessions Streamlit réutilisent les mêmes modèles chargés.
+
+Usage:
+    warmup = start_warmup()  # Idempotent, non bloquant
+    if warmup.is_ready:
+        classifier = warmup.registry.get_handle(DEFAULT_MODEL_ID)
+"""
+import sys
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from .model_interface import BaseClassifier
+from .model_registry import ModelRegistry
+from .mock_classifier import DemoClassifier, TEXT_MODELS, IMAGE_MODELS
+from .numpy_inference import NumpyTextClassifier
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import TEXT_MODEL_NPZ_PATH
+
+
+# Identifiant du classifieur utilisé par défaut dans la page Démo
+DEFAULT_MODEL_ID = "demo"
+
+# Identifiant du pipeline texte exporté en NumPy (numpy_inference)
+NUMPY_TEXT_MODEL_ID = "numpy_text"
+
+# Textes synthétiques: courts, longs, avec et sans mots-clés connus
+SYNTHETIC_TEXTS = [
+    "console playstation 5 . -//- jeux vidéo sony nouvelle génération",
+    "piscine gonflable ronde 3m",
+    "lot de 3 coussins décoratifs . -//- " + "housse en coton lavable " * 40,
+    "produit sans catégorie évidente",
+]
+
+# Tailles d'images synthétiques: carrée, paysage, portrait, grande
+SYNTHETIC_IMAGE_SIZES = [(224, 224), (640, 480), (300, 800), (1200, 1200)]
+
+# États possibles du préchauffage
+STATUS_IDLE = "idle"
+STATUS_WARMING = "warming"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+
+def build_default_registry(
+    memory_budget_mb: Optional[float] = None,
+    text_bundle_path: Optional[Path] = None
+) -> ModelRegistry:
+    """
+    Construit le registre des modèles de l'application.
+
+    Contient le classifieur de démo par défaut, tous les modèles texte et
+    image simulés et, si le bundle a été exporté, le pipeline texte réel
+    servi par NumpyTextClassifier (NUMPY_TEXT_MODEL_ID).
+
+    Args:
+        memory_budget_mb: Budget mémoire du registre
+        text_bundle_path: Bundle .npz du pipeline texte.
+            Par défaut: config.TEXT_MODEL_NPZ_PATH
+    """
+    if text_bundle_path is None:
+        text_bundle_path = TEXT_MODEL_NPZ_PATH
+
+    registry = ModelRegistry(memory_budget_mb)
+    registry.register(DEFAULT_MODEL_ID, DemoClassifier)
+    for model_id, config in {**TEXT_MODELS, **IMAGE_MODELS}.items():
+        registry.register(model_id, partial(DemoClassifier, model_config=config))
+    if Path(text_bundle_path).exists():
+        registry.register(NUMPY_TEXT_MODEL_ID, partial(NumpyTextClassifier, text_bundle_path))
+    return registry
+
+
+def generate_synthetic_images(seed: int = 0) -> List[Image.Image]:
+    """Génère des images RGB de bruit aux tailles de SYNTHETIC_IMAGE_SIZES."""
+    rng = np.random.RandomState(seed)
+    images = []
+    for width, height in SYNTHETIC_IMAGE_SIZES:
+        pixels = rng.randint(0, 256, size=(height, width, 3), dtype=np.uint8)
+        images.append(Image.fromarray(pixels, mode="RGB"))
+    return images
+
+
+class ModelWarmup:
+    """
+    Charge et préchauffe des modèles dans un thread d'arrière-plan.
+
+    Chaque modèle est chargé via le registre puis reçoit des prédictions
+    synthétiques sur les branches texte, image et multimodale. Une branche
+    refusée par le modèle (ValueError) est simplement ignorée.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        model_ids: Optional[List[str]] = None,
+        texts: Optional[List[str]] = None,
+        images: Optional[List[Image.Image]] = None
+    ):
+        """
+        Args:
+            registry: Registre contenant les modèles à préchauffer
+            model_ids: Modèles à préchauffer (par défaut: tous ceux du registre)
+            texts: Textes synthétiques (par défaut: SYNTHETIC_TEXTS)
+            images: Images synthétiques (par défaut: bruit aléatoire)
+        """
+        self._registry = registry
+        self._model_ids = model_ids if model_ids is not None else registry.registered_models
+        self._texts = texts if texts is not None else SYNTHETIC_TEXTS
+        self._images = images
+
+        self._status = STATUS_IDLE
+        self._error: Optional[BaseException] = None
+        self._warmed: List[str] = []
+        self._predictions = 0
+        self._started_at: Optional[float] = None
+        self._duration_s: Optional[float] = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # Cycle de vie
+    # -------------------------------------------------------------------------
+    def start(self) -> "ModelWarmup":
+        """
+        Lance le préchauffage en arrière-plan (sans effet s'il est déjà lancé).
+
+        Returns:
+            L'instance elle-même, pour chaîner les appels
+        """
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._status = STATUS_WARMING
+            self._started_at = time.perf_counter()
+            self._thread = threading.Thread(
+                target=self._run, name="model-warmup", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend la fin du préchauffage.
+
+        Args:
+            timeout: Délai maximum en secondes (None = illimité)
+
+        Returns:
+            True si les modèles sont prêts
+        """
+        self._done.wait(timeout)
+        return self.is_ready
+
+    # -------------------------------------------------------------------------
+    # État
+    # -------------------------------------------------------------------------
+    @property
+    def registry(self) -> ModelRegistry:
+        """Registre contenant les modèles préchauffés."""
+        return self._registry
+
+    @property
+    def is_ready(self) -> bool:
+        """True quand tous les modèles sont chargés et préchauffés."""
+        return self._status == STATUS_READY
+
+    @property
+    def status(self) -> str:
+        """État courant: idle, warming, ready ou failed."""
+        return self._status
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """Exception ayant interrompu le préchauffage, le cas échéant."""
+        return self._error
+
+    @property
+    def progress(self) -> float:
+        """Fraction des modèles préchauffés, dans [0, 1]."""
+        if not self._model_ids:
+            return 1.0 if self._status == STATUS_READY else 0.0
+        return len(self._warmed) / len(self._model_ids)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne l'état et les statistiques du préchauffage."""
+        return {
+            "status": self._status,
+            "models_total": len(self._model_ids),
+            "models_warmed": list(self._warmed),
+            "predictions": self._predictions,
+            "duration_s": self._duration_s,
+            "error": repr(self._error) if self._error else None,
+        }
+
+    # -------------------------------------------------------------------------
+    # Interne
+    # -------------------------------------------------------------------------
+    def _run(self) -> None:
+        """Corps du thread: charge puis préchauffe chaque modèle."""
+        try:
+            images = self._images if self._images is not None else generate_synthetic_images()
+            for model_id in self._model_ids:
+                classifier = self._registry.get(model_id)
+                self._predictions += self._warm_classifier(classifier, images)
+                self._warmed.append(model_id)
+            self._status = STATUS_READY
+        except Exception as e:
+            self._error = e
+            self._status = STATUS_FAILED
+        finally:
+            self._duration_s = time.perf_counter() - self._started_at
+            self._done.set()
+
+    def _warm_classifier(self, classifier: BaseClassifier, images: List[Image.Image]) -> int:
+        """Exécute les prédictions synthétiques sur chaque branche."""
+        branches = [{"text": text} for text in self._texts]
+        branches += [{"image": image} for image in images]
+        branches += [
+            {"text": text, "image": image}
+            for text, image in zip(self._texts, images)
+        ]
+
+        count = 0
+        for inputs in branches:
+            try:
+                classifier.predict(**inputs)
+                count += 1
+            except ValueError:
+                # Branche non supportée par ce modèle (ex: image sur un modèle texte)
+                continue
+        return count
+
+
+# =============================================================================
+# Préchauffeur partagé par le processus
+# =============================================================================
+_shared_warmup: Optional[ModelWarmup] = None
+_shared_lock = threading.Lock()
+
+
+def get_warmup() -> ModelWarmup:
+    """Retourne le préchauffeur partagé (créé au premier appel, non démarré)."""
+    global _shared_warmup
+    with _shared_lock:
+        if _shared_warmup is None:
+            _shared_warmup = ModelWarmup(build_default_registry())
+        return _shared_warmup
+
+
+def start_warmup() -> ModelWarmup:
+    """Démarre le préchauffage partagé s'il ne l'est pas déjà et le retourne."""
+    return get_warmup().start()
+
+
+def get_warmed_classifier(model_id: str = DEFAULT_MODEL_ID) -> Optional[BaseClassifier]:
+    """
+    Retourne un classifieur préchauffé, ou None si le préchauffage n'est pas terminé.
+
+    Le classifieur est une poignée du registre (ModelRegistry.get_handle):
+    une session peut le conserver sans empêcher l'éviction du modèle.
+
+    Args:
+        model_id: Identifiant du modèle dans le registre partagé
+    """
+    warmup = get_warmup()
+    if not warmup.is_ready:
+        return None
+    return warmup.registry.get_handle(model_id)